@@ -45,6 +45,11 @@ if exist "dist\iScoutTool.exe" (
     echo.
     echo Executable created: dist\iScoutTool.exe
     echo.
+    echo Measuring cold start time...
+    set "ISCOUT_STARTUP_LOG=%~dp0startup_times.csv"
+    "dist\iScoutTool.exe" --startup-probe
+    echo Startup time appended to startup_times.csv
+    echo.
     echo To deploy to another computer:
     echo 1. Copy the entire 'dist' folder to the target computer
     echo 2. Install BlueStacks 5 and enable ADB debugging
@@ -10,46 +10,60 @@ Version: 1.0.0
 
 import sys
 import os
+import logging
+import threading
 import time
-import winsound
-import xml.etree.ElementTree as ET
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
-from PyQt5 import QtWidgets, QtCore, uic
+from dataclasses import replace
+from typing import TYPE_CHECKING, List, Optional
+from iscout.procinfo import process_start_time   # Imported first: startup-time fallback clock
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QTableWidgetItem,
-    QPushButton, QCheckBox, QMessageBox, QHeaderView, QInputDialog
+    QPushButton, QCheckBox, QMessageBox, QHeaderView, QInputDialog, QFileDialog
 )
 from PyQt5.QtCore import QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QPainter, QColor, QFont
-from ppadb.client import Client as AdbClient
-
-@dataclass
-class ScoutTarget:
-    """Target data structure as specified in PRD section 4.1"""
-    target_type: str        # Boss/Barbarian name with level, power, status
-    x_coordinate: int       # Map X position
-    y_coordinate: int       # Map Y position
-    completed: bool = False # User marked as completed
-
-@dataclass
-class LocationPreset:
-    """Location preset structure as specified in PRD section 4.2"""
-    name: str              # Preset identifier
-    x_loc: float          # X coordinate (0.0-1.0)
-    y_loc: float          # Y coordinate (0.0-1.0)
-    x_dest: float         # Destination X (0.0-1.0)
-    y_dest: float         # Destination Y (0.0-1.0)
-    click_and_drag: bool  # Action type flag
-
-@dataclass
-class AppConfig:
-    """Configuration data structure as specified in PRD section 4.3"""
-    home_server: int = 0      # User's home server
-    home_x: int = 0          # Home X coordinate
-    home_y: int = 0          # Home Y coordinate
-    enemy_server: int = 0    # Target server for operations
-    adb_port: int = 5555     # BlueStacks connection port
+from iscout.connection import ConnectionManager, ConnectionStatus, CONNECTING, DISCONNECTED
+from iscout.gui.overlay import MovingOverlay, create_window_tracker
+from iscout.heartbeat import DeviceHealth
+from iscout.flight import flight_recorder
+from iscout.gui.metrics import MetricsReadout
+from iscout.gui.signals import CallbackBridge, GuiInvoker
+from iscout.batch import (
+    BatchItem, BatchProgress, BatchRunner,
+    NAVIGATING, ARRIVED, COMPLETED, SKIPPED, FAILED as BATCH_FAILED, PAUSING, PAUSED, CANCELLED, FINISHED as BATCH_FINISHED
+)
+from iscout.instances import (
+    Dispatcher, InstanceEvent, InstanceProfile, NavRequest,
+    load_profiles, save_profiles, STARTED, FINISHED, FAILED
+)
+from iscout.calibration import CalibrationProgress, DelayCalibrator
+from iscout.config import validate_config
+from iscout.engine import ENEMY_LANDING, LOG_FILE, VIEW_ENEMY_LANDING, Engine, EngineBusy, NavigationQueue, PresetReload
+from iscout.log import get_logger, set_debug, setup_logging
+from iscout.macros import MacroPlayer, MacroRecorder, load_macro, save_macro
+from iscout.metrics import metrics
+from iscout.models import AppConfig, ScoutTarget
+from iscout.navigator import DEFAULT_ROUTE, validate_coordinates
+from iscout.parser import parse_scout_text
+from iscout.readback import numpy_available
+from iscout.spawns import SpawnError
+from iscout.trace import UI, tracer
+from iscout.gui.startup import FirstPaintProbe, load_ui_class, setup_compiled_ui
+
+if TYPE_CHECKING:   # Loaded on first use or after the first paint: http.server, sqlite3, subprocess
+    from iscout.api import ControlServer
+    from iscout.audio import AudioService
+    from iscout.session import Session, SessionStore
+
+adb_log = get_logger("adb")
+nav_log = get_logger("nav")
+overlay_log = get_logger("overlay")
+ui_log = get_logger("ui")
+timer_log = get_logger("timer")
+api_log = get_logger("api")
+
+# Heavy modules (ppadb, subprocess, xml.etree) are imported where first used
+# so they stay off the cold-start path.
 
 class TimerThread(QThread):
     """Timer thread for countdown functionality as specified in PRD section 5.1.2"""
@@ -95,184 +109,6 @@ class TimerThread(QThread):
             self.timer_finished.emit()
         self.running = False
 
-class ColoredRect(QtWidgets.QWidget):
-    """Overlay widget for blocking Go button during navigation"""
-
-    def __init__(self, text, color=QColor("#00d4ff")):
-        super().__init__()
-        self.text = text
-        self.color = color
-        self.resize(200, 100)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setBrush(self.color)
-        painter.drawRect(self.rect())
-        painter.setFont(QFont("Consolas", 16, QFont.Bold))
-        painter.setPen(QColor("white"))
-        painter.drawText(self.rect(), QtCore.Qt.AlignCenter, self.text)
-
-import sys
-import os
-import time
-import winsound
-import xml.etree.ElementTree as ET
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
-from PyQt5 import QtWidgets, QtCore, uic
-from PyQt5.QtWidgets import (
-    QMainWindow, QApplication, QTableWidgetItem, 
-    QPushButton, QCheckBox, QMessageBox, QHeaderView, QInputDialog
-)
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QPainter, QColor, QFont
-from ppadb.client import Client as AdbClient
-
-# ...existing code...
-
-class iScoutToolApp(QMainWindow):
-    """Main application class implementing PRD specifications"""
-    # ...existing code...
-    def show_moving_overlay(self):
-        """Show a small overlay window over the Go button in Bluestacks emulator window as specified in PRD section 3.3.3"""
-        try:
-            import win32gui
-            import win32con
-            import win32api
-        except ImportError:
-            print("pywin32 is required for overlay functionality. Please install with 'pip install pywin32'.")
-            return None
-
-        try:
-            print("=== OVERLAY DEBUG: Starting overlay creation ===")
-
-            # Find Bluestacks window by title
-            hwnd = win32gui.FindWindow(None, "Main")
-            if hwnd == 0:
-                print("OVERLAY DEBUG: Bluestacks window not found (title 'Main')")
-                return None
-
-            # Get window rect (absolute coordinates)
-            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
-            em_width = right - left
-            em_height = bottom - top
-            print(f"OVERLAY DEBUG: BlueStacks window found - Handle: {hwnd}")
-            print(f"OVERLAY DEBUG: BlueStacks absolute coordinates: Left={left}, Top={top}, Right={right}, Bottom={bottom}")
-            print(f"OVERLAY DEBUG: BlueStacks window size: {em_width}x{em_height}")
-
-            # Get NavGo button relative coordinates
-            if 'NavGo' not in self.location_presets:
-                print("OVERLAY DEBUG: NavGo preset not found in location_presets")
-                print(f"OVERLAY DEBUG: Available presets: {list(self.location_presets.keys())}")
-                return None
-
-            preset = self.location_presets['NavGo']
-            print(f"OVERLAY DEBUG: NavGo preset found: x_loc={preset.x_loc}, y_loc={preset.y_loc}, x_dest={preset.x_dest}, y_dest={preset.y_dest}")
-
-            # Calculate pixel coordinates for overlay
-            screen_width, screen_height = self.get_evony_screen_dimensions()
-            print(f"OVERLAY DEBUG: Evony screen dimensions: {screen_width}x{screen_height}")
-
-            x1 = int(preset.x_loc * screen_width)
-            y1 = int(preset.y_loc * screen_height)
-            x2 = int(preset.x_dest * screen_width)
-            y2 = int(preset.y_dest * screen_height)
-            print(f"OVERLAY DEBUG: NavGo button pixel coordinates: x1={x1}, y1={y1}, x2={x2}, y2={y2}")
-
-            overlay_x = left + min(x1, x2)
-            overlay_y = top + min(y1, y2)
-            overlay_w = abs(x2 - x1)
-            overlay_h = abs(y2 - y1)
-            print(f"OVERLAY DEBUG: Overlay absolute coordinates: X={overlay_x}, Y={overlay_y}, Width={overlay_w}, Height={overlay_h}")
-
-            # Create overlay window
-            print("OVERLAY DEBUG: Creating overlay widget...")
-            self.moving_overlay = ColoredRect("MOVING...", QColor("#222"))
-            self.moving_overlay.setWindowFlags(QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint)
-            self.moving_overlay.setAttribute(QtCore.Qt.WA_TranslucentBackground)
-            self.moving_overlay.resize(max(overlay_w, 80), max(overlay_h, 32))
-            self.moving_overlay.move(overlay_x, overlay_y)
-            self.moving_overlay.show()
-            QApplication.processEvents()
-            print("OVERLAY DEBUG: Overlay widget created and shown successfully")
-            return self.moving_overlay
-
-        except Exception as e:
-            print(f"OVERLAY DEBUG: Error showing moving overlay: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-
-    def hide_moving_overlay(self):
-        """Remove the moving overlay window after navigation completes"""
-        try:
-            print("OVERLAY DEBUG: Attempting to hide overlay...")
-            if hasattr(self, 'moving_overlay') and self.moving_overlay:
-                print("OVERLAY DEBUG: Overlay widget found, hiding and deleting...")
-                self.moving_overlay.hide()
-                self.moving_overlay.deleteLater()
-                self.moving_overlay = None
-                QApplication.processEvents()
-                print("OVERLAY DEBUG: Overlay successfully hidden and cleaned up")
-            else:
-                print("OVERLAY DEBUG: No overlay widget found to hide")
-        except Exception as e:
-            print(f"OVERLAY DEBUG: Error hiding moving overlay: {e}")
-            import traceback
-            traceback.print_exc()
-    """Configuration data structure as specified in PRD section 4.3"""
-    home_server: int = 0      # User's home server
-    home_x: int = 0          # Home X coordinate
-    home_y: int = 0          # Home Y coordinate
-    enemy_server: int = 0    # Target server for operations
-    adb_port: int = 5555     # BlueStacks connection port
-
-
-class TimerThread(QThread):
-    """Timer thread for countdown functionality as specified in PRD section 5.1.2"""
-    time_updated = pyqtSignal(str)  # Signal to update UI with formatted time
-    beep_signal = pyqtSignal()      # Signal to trigger beep sound
-    timer_finished = pyqtSignal()   # Signal when timer reaches zero
-    
-    def __init__(self):
-        super().__init__()
-        self.timer_seconds = 0
-        self.running = False
-        
-    def start_timer(self, seconds: int = 300):
-        """Start countdown timer (default 5 minutes)"""
-        self.timer_seconds = seconds
-        self.running = True
-        self.start()
-        
-    def stop_timer(self):
-        """Stop and reset countdown timer"""
-        self.running = False
-        self.timer_seconds = 0
-        # Don't emit time_updated to avoid triggering beep or unwanted updates
-        
-    def run(self):
-        """Timer thread main loop"""
-        while self.running and self.timer_seconds > 0:
-            # Format time as MM:SS
-            minutes = self.timer_seconds // 60
-            seconds = self.timer_seconds % 60
-            time_str = f"{minutes:02d}:{seconds:02d}"
-            self.time_updated.emit(time_str)
-            
-            # Beep during final 30 seconds
-            if self.timer_seconds <= 30:
-                self.beep_signal.emit()
-                
-            time.sleep(1)
-            self.timer_seconds -= 1
-            
-        if self.running and self.timer_seconds <= 0:
-            self.time_updated.emit("00:00")
-            self.timer_finished.emit()
-        self.running = False
-
-
 class iScoutToolApp(QMainWindow):
     """Main application class implementing PRD specifications"""
     
@@ -280,24 +116,57 @@ class iScoutToolApp(QMainWindow):
         super().__init__()
         
         # Initialize application state
-        self.config = AppConfig()
+        self.engine = Engine(os.path.dirname(os.path.abspath(__file__)))
         self.targets: List[ScoutTarget] = []
-        self.location_presets: dict = {}
         self.adb_client = None
         self.adb_device = None
+        self.connection: Optional[ConnectionManager] = None
+        self.device_health = DeviceHealth()     # Cached by the background heartbeat
+        self.dispatcher: Optional[Dispatcher] = None   # Set while multi-instance mode is on
+        self.instances_file = os.path.join(os.path.dirname(__file__), 'iScoutInstances.json')
+        self.batch_runner: Optional[BatchRunner] = None
+        self.batch_dwell = 8.0   # Seconds at each target during auto-scout (0 = wait for Done)
+        self.nav_queue: Optional[NavigationQueue] = None     # Navigations queued by the control API
+        self.api_server: Optional["ControlServer"] = None
+        self.macro_recorder: Optional[MacroRecorder] = None
+        self.macro_player: Optional[MacroPlayer] = None      # Set while a macro replays
+        self.calibrator: Optional[DelayCalibrator] = None    # Set while delays are calibrated
         self.timer_thread = TimerThread()
+        self._audio: Optional["AudioService"] = None      # Created on the first beep
         self.screen_width = 0
         self.screen_height = 0
         
         # Initialize UI and components
         self.setup_application()
+    
+    @property
+    def config(self) -> AppConfig:
+        return self.engine.config
+    
+    @property
+    def location_presets(self) -> dict:
+        return self.engine.active_presets
+    
+    @property
+    def sessions(self) -> "SessionStore":
+        return self.engine.open_sessions()
+    
+    @property
+    def audio(self) -> "AudioService":
+        """Alert player, started on the first beep rather than at launch"""
+        if self._audio is None:
+            from iscout.audio import AudioService, Tone
+            self._audio = AudioService()
+            self._audio.register('tick', Tone(1000, 200))     # Countdown beep, final 30 seconds
+            self._audio.register('final', Tone(1000, 1000))   # Extended beep at 00:00
+        return self._audio
         
     def setup_application(self):
         """Initialize main application as specified in PRD section 5.1.1"""
         try:
-            # Always load iScoutToolModern.ui for the UI
+            # Build the UI from the precompiled iScoutToolModern_ui module
             ui_file = os.path.join(os.path.dirname(__file__), 'iScoutToolModern.ui')
-            uic.loadUi(ui_file, self)
+            setup_compiled_ui(self, load_ui_class(ui_file, 'iScoutToolModern_ui'))
             # Set initial splitter sizes: inputGroup 25% shorter, targetGroup 25% taller
             if hasattr(self, 'mainSplitter'):
                 self.mainSplitter.setSizes([110, 330])
@@ -316,15 +185,18 @@ class iScoutToolApp(QMainWindow):
             # Load configuration and presets
             self.load_config()
             self.load_location_presets()
+            self.setup_moving_overlay()
             
             # Set up timer and signals
             self.setup_timer()
             self.connect_ui_signals()
+            self.metrics_readout = MetricsReadout(metrics, self)
+            self.statusBar().addPermanentWidget(self.metrics_readout)
             
-            # Delay ADB connection check until UI is fully displayed
-            QTimer.singleShot(500, self.initialize_adb_connection)
+            # Discover the emulator in the background once the event loop runs
+            QTimer.singleShot(0, self.initialize_adb_connection)
             
-            print("iScoutTool initialized successfully with modern UI")
+            ui_log.info("iScoutTool initialized successfully with modern UI")
             
         except Exception as e:
             QMessageBox.critical(None, "Initialization Error", 
@@ -335,108 +207,85 @@ class iScoutToolApp(QMainWindow):
     # Configuration Management Methods (PRD Section 5.1.3)
     
     def load_config(self):
-        """Load configuration from iScoutTool.cfg file as specified in PRD"""
-        config_file = os.path.join(os.path.dirname(__file__), 'iScoutTool.cfg')
-        try:
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    if line := f.readline().strip():
-                        parts = line.split(',')
-                        if len(parts) >= 4:
-                            self.config.home_server = int(parts[0])
-                            self.config.home_x = int(parts[1])
-                            self.config.home_y = int(parts[2])
-                            self.config.enemy_server = int(parts[3])
-                            
-                            # Populate UI fields
-                            self.intHomeServer.setText(str(self.config.home_server))
-                            self.intHomeXLoc.setText(str(self.config.home_x))
-                            self.intHomeYLoc.setText(str(self.config.home_y))
-                            self.intEnemyServer.setText(str(self.config.enemy_server))
-                            
-                            print(f"Configuration loaded: Server {self.config.home_server}, "
-                                  f"Home ({self.config.home_x},{self.config.home_y}), "
-                                  f"Enemy {self.config.enemy_server}")
+        """Load configuration from iScoutConfig.json (migrating iScoutTool.cfg) as specified in PRD"""
+        try:
+            if self.engine.store.exists:
+                self.engine.load_config()
+                self.show_config()
+                
+                ui_log.info("Configuration loaded (profile %s): Server %s, Home (%s,%s), Enemy %s",
+                            self.engine.store.active, self.config.home_server,
+                            self.config.home_x, self.config.home_y, self.config.enemy_server)
             else:
                 # Create default config
                 self.save_config()
-                print("Default configuration created")
+                ui_log.info("Default configuration created")
                 
         except Exception as e:
-            print(f"Error loading configuration: {e}")
+            ui_log.error("Error loading configuration: %s", e)
             QMessageBox.warning(self, "Config Error", f"Error loading configuration: {e}")
     
-    def save_config(self):
-        """Save current configuration to iScoutTool.cfg file as specified in PRD"""
-        config_file = os.path.join(os.path.dirname(__file__), 'iScoutTool.cfg')
+    def show_config(self):
+        """Populate the home and enemy fields from the active config profile"""
+        self.intHomeServer.setText(str(self.config.home_server))
+        self.intHomeXLoc.setText(str(self.config.home_x))
+        self.intHomeYLoc.setText(str(self.config.home_y))
+        self.intEnemyServer.setText(str(self.config.enemy_server))
+    
+    def save_config(self) -> bool:
+        """Keep the current configuration; it is written in the background only when it changed
+
+        Returns False when the fields did not validate.
+        """
         try:
-            # Get values from UI fields
-            home_server = int(self.intHomeServer.text() or "0")
-            home_x = int(self.intHomeXLoc.text() or "0")
-            home_y = int(self.intHomeYLoc.text() or "0")
-            enemy_server = int(self.intEnemyServer.text() or "0")
-            
-            # Validate data
-            if not (1 <= home_server <= 9999):
-                raise ValueError("Home server must be between 1-9999")
-            if not (1 <= home_x <= 1198):
-                raise ValueError("Home X coordinate must be between 1-1198")
-            if not (1 <= home_y <= 1200):
-                raise ValueError("Home Y coordinate must be between 1-1200")
-            if not (1 <= enemy_server <= 9999):
-                raise ValueError("Enemy server must be between 1-9999")
-            
-            # Update config object
-            self.config.home_server = home_server
-            self.config.home_x = home_x
-            self.config.home_y = home_y
-            self.config.enemy_server = enemy_server
-            
-            # Write CSV format
-            with open(config_file, 'w') as f:
-                f.write(f"{home_server},{home_x},{home_y},{enemy_server}\n")
-                
-            print("Configuration saved successfully")
+            # Get values from UI fields; the config only changes once they validate
+            config = replace(
+                self.config,
+                home_server=int(self.intHomeServer.text() or "0"),
+                home_x=int(self.intHomeXLoc.text() or "0"),
+                home_y=int(self.intHomeYLoc.text() or "0"),
+                enemy_server=int(self.intEnemyServer.text() or "0")
+            )
+            validate_config(config)
+            self.engine.config = config
+            if self.engine.save_config():
+                ui_log.info("Configuration saved successfully")
+            return True
             
         except ValueError as e:
             QMessageBox.warning(self, "Validation Error", str(e))
         except Exception as e:
-            print(f"Error saving configuration: {e}")
+            ui_log.error("Error saving configuration: %s", e)
             QMessageBox.warning(self, "Save Error", f"Error saving configuration: {e}")
+        return False
     
     def load_location_presets(self):
         """Load location presets from Resources/locations.xml as specified in PRD"""
-        presets_file = os.path.join(os.path.dirname(__file__), 'Resources', 'locations.xml')
         try:
-            if os.path.exists(presets_file):
-                tree = ET.parse(presets_file)
-                root = tree.getroot()
-                
-                # Parse navigation elements (not preset elements)
-                for navigation in root.findall('navigation'):
-                    name = navigation.get('name')
-                    x_loc = float(navigation.get('xLoc', '0.0'))
-                    y_loc = float(navigation.get('yLoc', '0.0'))
-                    x_dest = float(navigation.get('xDest', x_loc))
-                    y_dest = float(navigation.get('yDest', y_loc))
-                    click_and_drag = navigation.get('ClickAndDrag', 'false').lower() == 'true'
-                    
-                    self.location_presets[name] = LocationPreset(
-                        name=name,
-                        x_loc=x_loc,
-                        y_loc=y_loc,
-                        x_dest=x_dest,
-                        y_dest=y_dest,
-                        click_and_drag=click_and_drag
-                    )
-                
-                print(f"Loaded {len(self.location_presets)} location presets")
-            else:
-                print(f"Location presets file not found: {presets_file}")
+            self.engine.load_presets()
                 
         except Exception as e:
-            print(f"Error loading location presets: {e}")
+            ui_log.error("Error loading location presets: %s", e)
             QMessageBox.warning(self, "Presets Error", f"Error loading presets: {e}")
+        # Edits to locations.xml (or a profile file) apply without a restart, also after a load error
+        self.engine.watch_presets(CallbackBridge(self.on_presets_reloaded, self))
+    
+    def on_presets_reloaded(self, result: PresetReload):
+        """Apply presets the watcher reloaded after a file changed"""
+        try:
+            names = ", ".join(os.path.basename(f) for f in result.files)
+            if result.error:
+                self.statusBar().showMessage(f"{names} not reloaded: {result.error}", 10000)
+                return
+            if self.dispatcher:
+                self.dispatcher.routes = self.engine.routes
+            self.update_overlay_target()
+            layout = self.engine.active_layout
+            self.statusBar().showMessage(f"Reloaded {names} - using "
+                                         f"{f'the {layout} layout' if layout else 'locations.xml'}", 5000)
+            
+        except Exception as e:
+            ui_log.error("Error applying reloaded presets: %s", e)
     
     # Modern UI Initialization Methods (PRD Section 5.1.2)
     
@@ -472,20 +321,20 @@ class iScoutToolApp(QMainWindow):
                 }
             """)
             
-            print("Modern interface setup completed")
+            ui_log.info("Modern interface setup completed")
             
         except Exception as e:
-            print(f"Error setting up modern interface: {e}")
+            ui_log.error("Error setting up modern interface: %s", e)
     
     def configure_splitter_layout(self):
         """Set up optimal splitter proportions as specified in PRD"""
         try:
             # Set mainSplitter sizes: Data Input compact (180px), Scout Targets expanded (600px)
             self.mainSplitter.setSizes([180, 600])
-            print("Splitter layout configured: Data Input (180px), Scout Targets (600px)")
+            ui_log.info("Splitter layout configured: Data Input (180px), Scout Targets (600px)")
             
         except Exception as e:
-            print(f"Error configuring splitter layout: {e}")
+            ui_log.error("Error configuring splitter layout: %s", e)
     
     def setup_enhanced_table(self):
         """Configure Scout Targets table as specified in PRD section 5.1.2"""
@@ -526,23 +375,28 @@ class iScoutToolApp(QMainWindow):
             header = self.tblBossList.horizontalHeader()
             header.setSectionResizeMode(2, QHeaderView.Stretch)  # Target column stretches
             
-            print("Enhanced table setup completed")
+            ui_log.info("Enhanced table setup completed")
             
         except Exception as e:
-            print(f"Error setting up enhanced table: {e}")
+            ui_log.error("Error setting up enhanced table: %s", e)
     
-    def update_connection_status(self, connected: bool):
+    def update_connection_status(self, connected: bool, connecting: bool = False, message: str = ""):
         """Update connection status indicator as specified in PRD"""
         try:
             if connected:
                 self.lblConnectionStatus.setText("🟢 Emulator Connected")
                 self.lblConnectionStatus.setStyleSheet("color: #28a745; font-weight: bold;")
+            elif connecting:
+                self.lblConnectionStatus.setText("🟡 Connecting...")
+                self.lblConnectionStatus.setStyleSheet("color: #ffc107; font-weight: bold;")
             else:
                 self.lblConnectionStatus.setText("🔴 Emulator Disconnected")
                 self.lblConnectionStatus.setStyleSheet("color: #dc3545; font-weight: bold;")
+            # Details (e.g. why the last attempt failed) go to the tooltip, never a modal dialog
+            self.lblConnectionStatus.setToolTip(message)
                 
         except Exception as e:
-            print(f"Error updating connection status: {e}")
+            ui_log.error("Error updating connection status: %s", e)
     
     def update_target_count(self, total: int = None, completed: int = None):
         """Update target counter to show completed/total format"""
@@ -556,14 +410,14 @@ class iScoutToolApp(QMainWindow):
             self.lblTargetCount.setText(f"Targets: {completed}/{total}")
             
         except Exception as e:
-            print(f"Error updating target count: {e}")
+            ui_log.error("Error updating target count: %s", e)
     
     def count_completed_targets(self) -> int:
         """Count how many targets have checkmarks"""
         try:
             return len([target for target in self.targets if target.completed])
         except Exception as e:
-            print(f"Error counting completed targets: {e}")
+            ui_log.error("Error counting completed targets: %s", e)
             return 0
     
     def update_clear_all_button_state(self, has_targets: bool = None):
@@ -615,275 +469,174 @@ class iScoutToolApp(QMainWindow):
                         }
                     """)
         except Exception as e:
-            print(f"Error updating clear all button state: {e}")
+            ui_log.error("Error updating clear all button state: %s", e)
     
     # ADB Connection Management Methods (PRD Section 5.1.4)
     
     def initialize_adb_connection(self):
-        """Initialize ADB connection to BlueStacks as specified in PRD"""
+        """Start background discovery of BlueStacks as specified in PRD"""
         try:
-            success = self.connect_to_bluestacks()
-            if not success:
-                self.show_connection_error("Unable to connect to Bluestacks 5.\n\nPlease ensure:\n• Bluestacks 5 is running\n• ADB debugging is enabled in Bluestacks\n• Android SDK platform-tools are installed")
+            self.connection = self.engine.start_connection(CallbackBridge(self.on_connection_status, self))
+            self.engine.start_heartbeat(CallbackBridge(self.on_device_health, self))
             
         except Exception as e:
-            print(f"Error initializing ADB connection: {e}")
-            self.update_connection_status(False)
-            if "FileNotFoundError" in str(e) or "adb" in str(e).lower():
-                self.show_connection_error("ADB (Android Debug Bridge) not found.\n\nPlease install Android SDK platform-tools and add to PATH.\n\nAlternatively, ensure Bluestacks ADB is properly configured.")
-            else:
-                self.show_connection_error("Unable to connect to Bluestacks 5.\n\nPlease ensure:\n• Bluestacks 5 is running\n• ADB debugging is enabled in Bluestacks\n• Android SDK platform-tools are installed")
-    
-    def show_connection_error(self, message):
-        """Display connection error message on top of application window"""
-        msg_box = QMessageBox(self)
-        msg_box.setIcon(QMessageBox.Critical)
-        msg_box.setWindowTitle("iScoutTool - Connection Error")
-        msg_box.setText(message)
-        msg_box.setStandardButtons(QMessageBox.Ok)
-        
-        # Force black text color to ensure visibility
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QLabel {
-                color: black;
-                font-size: 12px;
-                padding: 10px;
-            }
-        """)
-        
-        msg_box.exec_()
+            adb_log.error("Error initializing ADB connection: %s", e)
+            self.update_connection_status(False, message=str(e))
     
-    def connect_to_bluestacks(self):
-        """Establish ADB connection to BlueStacks on port 5555 as specified in PRD"""
+    def on_connection_status(self, status: ConnectionStatus):
+        """Apply a connection state change published by the connection manager"""
         try:
-            # Start ADB server if not running
-            print("Starting ADB server...")
-            import subprocess
-            try:
-                # Try to start ADB server
-                subprocess.run(['adb', 'start-server'], check=True, capture_output=True, text=True, timeout=10)
-                print("ADB server started successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"Failed to start ADB server: {e}")
-                return False
-            except FileNotFoundError:
-                print("ADB executable not found. Please ensure Android SDK platform-tools are installed and in PATH")
-                return False
-            except subprocess.TimeoutExpired:
-                print("ADB server startup timed out")
-                return False
-            
-            # Wait a moment for server to fully initialize
-            import time
-            time.sleep(1)
-            
-            # Connect to ADB server
-            print("Attempting to connect to ADB server on localhost:5037...")
-            self.adb_client = AdbClient(host='localhost', port=5037)
-            
-            # Try to connect to BlueStacks device directly first
-            print("Attempting direct connection to 127.0.0.1:5555...")
-            try:
-                self.adb_client.remote_connect("127.0.0.1", 5555)
-                print("Direct connection attempt completed")
-            except Exception as e:
-                print(f"Direct connection failed (may already be connected): {e}")
-            
-            # Get list of connected devices
-            devices = self.adb_client.devices()
-            print(f"Found {len(devices)} ADB devices:")
-            for i, device in enumerate(devices):
-                # Get actual device serial/address
-                device_serial = getattr(device, 'serial', 'Unknown')
-                print(f"  Device {i}: {device_serial}")
-            
-            # Find BlueStacks device on port 5555
-            self.adb_device = None
-            for device in devices:
-                device_serial = getattr(device, 'serial', '')
-                print(f"Checking device: {device_serial}")
-                if "127.0.0.1:5555" in device_serial or "localhost:5555" in device_serial or "5555" in device_serial:
-                    self.adb_device = device
-                    print(f"Found BlueStacks device: {device_serial}")
-                    break
-            
-            if self.adb_device:
-                print("BlueStacks device found, verifying connection...")
-                # Verify Evony is running
-                if self.verify_evony_running():
-                    self.get_evony_screen_dimensions()
-                    self.update_connection_status(True)
-                    print("Connected to BlueStacks successfully")
-                    return True
-                else:
-                    print("BlueStacks connected but Evony not detected")
+            adb_log.info("Connection: %s - %s", status.state, status.message)
+            self.publish_api_event('connection', {'state': status.state, 'message': status.message})
+            if status.connected:
+                self.adb_client = status.client
+                self.adb_device = status.device
+                self.screen_width, self.screen_height = status.screen_size
+                # The preset layout may differ per resolution or device
+                self.update_overlay_target()
+                if layout := self.engine.active_layout:
+                    adb_log.info("Using the %s preset layout", layout)
             else:
-                print("BlueStacks device not found on port 5555")
-                print("Available devices:", [str(d) for d in devices])
-                
-            self.update_connection_status(False)
-            return False
+                self.adb_device = None
+            self.update_connection_status(status.connected, status.state == CONNECTING, status.message)
             
         except Exception as e:
-            print(f"Error connecting to BlueStacks: {e}")
-            self.update_connection_status(False)
-            return False
+            adb_log.error("Error handling connection status: %s", e)
     
-    def verify_evony_running(self):
-        """Check if Evony application is active as specified in PRD"""
+    def on_device_health(self, health: DeviceHealth):
+        """Apply a health change found by the heartbeat"""
         try:
-            if not self.adb_device:
-                return False
-                
-            # Check running apps - simplified check
-            # In real implementation, check for specific Evony package
-            result = self.adb_device.shell("dumpsys window windows | grep -E 'mCurrentFocus'")
-            return "evony" in result.lower() or True  # Allow for testing
+            self.device_health = health
+            self.publish_api_event('health', {'responsive': health.responsive,
+                                              'foreground': health.foreground_package,
+                                              'message': health.message})
+            if not health.connected:
+                return      # The connection status already says so
+            if not health.responsive:
+                self.lblConnectionStatus.setText("🟡 Emulator Not Responding")
+                self.lblConnectionStatus.setStyleSheet("color: #ffc107; font-weight: bold;")
+                self.lblConnectionStatus.setToolTip(health.message)
+            elif health.evony_foreground is False:
+                self.lblConnectionStatus.setText("🟠 Evony Not In Foreground")
+                self.lblConnectionStatus.setStyleSheet("color: #fd7e14; font-weight: bold;")
+                self.lblConnectionStatus.setToolTip(health.message)
+            else:
+                self.update_connection_status(True, message=self.connection.status.message)
             
         except Exception as e:
-            print(f"Error verifying Evony: {e}")
-            return False
-    
-    def get_evony_screen_dimensions(self):
-        """Detect Evony application screen size via ADB as specified in PRD"""
-        try:
-            if not self.adb_device:
-                return (0, 0)
-                
-            # Get screen size
-            result = self.adb_device.shell("wm size")
-            if "Physical size:" not in result:
-                print("Could not detect screen dimensions")
-                return (0, 0)
-                
-            size_str = result.split("Physical size: ")[1].strip()
-            width, height = map(int, size_str.split('x'))
-            self.screen_width = width
-            self.screen_height = height
-            print(f"Screen dimensions detected: {width}x{height}")
-            return (width, height)
-                
-        except Exception as e:
-            print(f"Error getting screen dimensions: {e}")
-            return (0, 0)
+            adb_log.error("Error handling device health: %s", e)
     
-    def get_navbox_coordinates(self) -> Optional[Tuple[float, float, float, float]]:
-        """Extract NavBox click coordinates from locations.xml as specified in PRD section 3.3.3"""
+    def on_select_device_clicked(self):
+        """Let the user pick (and pin) one of the discovered emulators"""
         try:
-            if 'NavBox' not in self.location_presets:
-                print("NavBox not found in location presets")
-                QMessageBox.warning(self, "Configuration Error", "NavBox coordinates not found in locations.xml")
-                return None
-                
-            preset = self.location_presets['NavBox']
-            
-            # Validate coordinate ranges (must be 0.0-1.0)
-            if not (0.0 <= preset.x_loc <= 1.0 and 0.0 <= preset.y_loc <= 1.0 and 
-                    0.0 <= preset.x_dest <= 1.0 and 0.0 <= preset.y_dest <= 1.0):
-                print(f"Invalid NavBox coordinates: ({preset.x_loc}, {preset.y_loc}) to ({preset.x_dest}, {preset.y_dest})")
-                QMessageBox.warning(self, "Configuration Error", "NavBox coordinates are out of valid range (0.0-1.0)")
-                return None
-                
-            return (preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
+            if self.connection is None:
+                self.initialize_adb_connection()
+            automatic = "Automatic (first emulator found)"
+            rescan = "Rescan for emulators"
+            devices = self.connection.devices
+            items = [automatic] + [d.label for d in devices] + [rescan]
+            current = next((i + 1 for i, d in enumerate(devices) if d.serial == self.config.device_serial), 0)
+            choice, ok = QInputDialog.getItem(self, "Select Device",
+                                              "Emulator to control (the choice is saved):",
+                                              items, current, False)
+            if not ok:
+                return
+            if choice == rescan:
+                self.connection.request_connect()
+                return
+            serial = next((d.serial for d in devices if d.label == choice), "")
+            self.config.device_serial = serial
+            self.save_config()
+            self.connection.select_device(serial)
+            adb_log.info("Device selection: %s", serial or 'automatic')
             
         except Exception as e:
-            print(f"Error getting NavBox coordinates: {e}")
-            QMessageBox.critical(self, "Error", f"Error getting NavBox coordinates: {e}")
-            return None
+            adb_log.error("Error selecting device: %s", e)
     
-    def calculate_click_coordinates(self, screen_width: int, screen_height: int, 
-                                  x_loc: float, y_loc: float, x_dest: float, y_dest: float) -> Tuple[int, int]:
-        """Calculate absolute centerpoint coordinates for NavBox click as specified in PRD section 3.3.3"""
+    def on_select_profile_clicked(self):
+        """Switch config profile (account, servers and device); a new name starts as a copy of the current one"""
         try:
-            # Convert relative to pixel coordinates
-            x1 = x_loc * screen_width    # Left edge pixel
-            y1 = y_loc * screen_height   # Top edge pixel  
-            x2 = x_dest * screen_width   # Right edge pixel
-            y2 = y_dest * screen_height  # Bottom edge pixel
-            
-            # Calculate centerpoint using absolute value as specified
-            center_x = int(abs(x1 + x2) / 2)  # Absolute value of average
-            center_y = int(abs(y1 + y2) / 2)  # Absolute value of average
-            
-            print(f"Calculated click coordinates: ({center_x}, {center_y}) from relative ({x_loc:.3f}, {y_loc:.3f}) to ({x_dest:.3f}, {y_dest:.3f})")
-            return (center_x, center_y)
+            store = self.engine.store
+            names = store.names()
+            name, ok = QInputDialog.getItem(self, "Config Profile",
+                                            "Profile to use (type a new name to copy the current one):",
+                                            names, names.index(store.active), True)
+            name = name.strip()
+            if not ok or not name or name == store.active:
+                return
+            # Keep the edits of the profile being left
+            if not self.save_config():
+                return
+            self.engine.select_profile(name)
+            self.show_config()
+            self.statusBar().showMessage(f"Using config profile '{name}'", 5000)
+            ui_log.info("Config profile: %s", name)
             
         except Exception as e:
-            print(f"Error calculating click coordinates: {e}")
-            return (0, 0)
+            ui_log.error("Error switching config profile: %s", e)
     
-    def click_navbox(self, center_x: int, center_y: int) -> bool:
-        """Send click command to NavBox centerpoint as specified in PRD section 3.3.3"""
+    def connect_to_bluestacks(self, timeout: float = 10.0):
+        """Wait for the connection manager to reach BlueStacks on the configured port"""
         try:
-            if not self.adb_device:
-                print("DEBUG click_navbox: No ADB device connection")
-                return False
-                
-            # Execute click command
-            tap_command = f"input tap {center_x} {center_y}"
-            print(f"DEBUG click_navbox: Executing ADB command: '{tap_command}'")
-            result = self.adb_device.shell(tap_command)
-            print(f"DEBUG click_navbox: ADB result: {result}")
-            
-            # Minimal wait for dialog - optimize for speed
-            print(f"DEBUG click_navbox: Waiting 0.4 seconds for navigation dialog to open")
-            time.sleep(0.4)  # Reduced from 0.8 to 0.4 seconds
-            print(f"DEBUG click_navbox: NavBox click completed successfully")
-            return True
+            if self.connection is None:
+                self.initialize_adb_connection()
+            if self.connection.device is None:
+                self.connection.request_connect()
+            device = self.connection.wait_connected(timeout)
+            if device is not None:
+                # Apply immediately; the queued status signal may not have been delivered yet
+                self.on_connection_status(self.connection.status)
+                return True
+            return False
             
         except Exception as e:
-            print(f"DEBUG click_navbox: ERROR clicking NavBox: {e}")
+            adb_log.error("Error connecting to BlueStacks: %s", e)
+            self.update_connection_status(False, message=str(e))
             return False
     
-    def click_at_pixel(self, center_x: int, center_y: int, description: str = "coordinate") -> bool:
-        """Send direct pixel click command for calculated centerpoints"""
+    def verify_evony_running(self):
+        """Check if Evony application is active as specified in PRD"""
+        # Cached by the heartbeat; an app that has not been read yet counts as running
+        return self.device_health.connected and self.device_health.evony_foreground is not False
+    
+    def get_evony_screen_dimensions(self):
+        """Detect Evony application screen size via ADB as specified in PRD"""
         try:
             if not self.adb_device:
-                print("No ADB device connection")
-                return False
-                
-            # Execute click command using exact pixel coordinates
-            result = self.adb_device.shell(f"input tap {center_x} {center_y}")
-            print(f"Clicked {description} at pixel ({center_x}, {center_y})")
-            return True
+                return (0, 0)
             
-        except Exception as e:
-            print(f"Error clicking {description}: {e}")
-            return False
-    
-    def convert_relative_to_pixel(self, x_rel: float, y_rel: float) -> Tuple[int, int]:
-        """Convert relative coordinates (0.0-1.0) to pixel coordinates as specified in PRD"""
-        try:
-            if self.screen_width == 0 or self.screen_height == 0:
-                self.get_evony_screen_dimensions()
+            # Detected once per connection by the connection manager
+            if self.screen_width and self.screen_height:
+                return (self.screen_width, self.screen_height)
+                
+            # Get screen size
+            width, height = self.adb_device.screen_size()
+            if not width or not height:
+                adb_log.warning("Could not detect screen dimensions")
+                return (0, 0)
+            self.screen_width = width
+            self.screen_height = height
+            if getattr(self, 'moving_overlay', None):
+                self.moving_overlay.set_device_size(width, height)
+            adb_log.info("Screen dimensions detected: %sx%s", width, height)
+            return (width, height)
                 
-            pixel_x = int(x_rel * self.screen_width)
-            pixel_y = int(y_rel * self.screen_height)
-            return (pixel_x, pixel_y)
-            
         except Exception as e:
-            print(f"Error converting coordinates: {e}")
+            adb_log.error("Error getting screen dimensions: %s", e)
             return (0, 0)
     
     def reconnect_if_needed(self):
         """Handle connection drops and reconnection as specified in PRD"""
         try:
+            # Trust the cached state: a live device recovers failed commands itself
+            # (iscout.recovery) and the heartbeat reports when it stops responding,
+            # so only wait when the connection manager has lost it
             if not self.adb_device:
                 return self.connect_to_bluestacks()
-                
-            # Test connection
-            try:
-                self.adb_device.shell("echo test")
-                return True
-            except:
-                print("Connection lost, attempting to reconnect...")
-                return self.connect_to_bluestacks()
+            return True
                 
         except Exception as e:
-            print(f"Error in reconnect: {e}")
+            adb_log.error("Error in reconnect: %s", e)
             return False
     
     # Timer Management Methods (PRD Section 5.1.2)
@@ -896,10 +649,10 @@ class iScoutToolApp(QMainWindow):
             self.timer_thread.beep_signal.connect(self.beep_sound)
             self.timer_thread.timer_finished.connect(self.on_timer_finished)
             
-            print("Timer setup completed")
+            timer_log.info("Timer setup completed")
             
         except Exception as e:
-            print(f"Error setting up timer: {e}")
+            timer_log.error("Error setting up timer: %s", e)
     
     def start_timer(self, seconds: int = 300):
         """Start 5 minute countdown timer as specified in PRD"""
@@ -908,10 +661,11 @@ class iScoutToolApp(QMainWindow):
                 self.stop_timer()
                 
             self.timer_thread.start_timer(seconds)
-            print(f"Timer started: {seconds} seconds")
+            timer_log.info("Timer started: %s seconds", seconds)
+            self.publish_api_event('timer', {'running': True, 'remaining': seconds})
             
         except Exception as e:
-            print(f"Error starting timer: {e}")
+            timer_log.error("Error starting timer: %s", e)
     
     def stop_timer(self, reset_display=True):
         """Stop and reset countdown timer as specified in PRD"""
@@ -919,25 +673,28 @@ class iScoutToolApp(QMainWindow):
             self.timer_thread.stop_timer()
             if reset_display:
                 self.lblTimer.setText("00:00")
-            print("Timer stopped")
+            timer_log.info("Timer stopped")
             
         except Exception as e:
-            print(f"Error stopping timer: {e}")
+            timer_log.error("Error stopping timer: %s", e)
     
     def on_reset_timer_clicked(self):
         """Reset timer to 05:00 and stop any running countdown"""
-        print("[DEBUG] Reset Timer button pressed")
+        timer_log.debug("Reset Timer button pressed")
         try:
             # Stop the timer thread completely
             if hasattr(self, 'timer_thread') and self.timer_thread:
-                print(f"[DEBUG] Before stop: running={self.timer_thread.running}, timer_seconds={self.timer_thread.timer_seconds}")
+                timer_log.debug("Before stop: running=%s, timer_seconds=%s",
+                                self.timer_thread.running, self.timer_thread.timer_seconds)
                 self.timer_thread.stop_timer()  # Use the proper stop method
-                print(f"[DEBUG] After stop: running={self.timer_thread.running}, timer_seconds={self.timer_thread.timer_seconds}")
+                timer_log.debug("After stop: running=%s, timer_seconds=%s",
+                                self.timer_thread.running, self.timer_thread.timer_seconds)
                 self.timer_thread.timer_seconds = 300  # Reset to 5:00
                 self.timer_thread.running = False      # Ensure stopped
-                print(f"[DEBUG] After reset: running={self.timer_thread.running}, timer_seconds={self.timer_thread.timer_seconds}")
+                timer_log.debug("After reset: running=%s, timer_seconds=%s",
+                                self.timer_thread.running, self.timer_thread.timer_seconds)
             else:
-                print("[DEBUG] timer_thread not found or not initialized")
+                timer_log.debug("timer_thread not found or not initialized")
             # Reset timer display to 05:00
             self.lblTimer.setText("05:00")
             # Restore teal styling from .ui file
@@ -952,9 +709,9 @@ class iScoutToolApp(QMainWindow):
                 "font-weight: bold;"
                 "}"
             )
-            print("[DEBUG] Timer reset to 05:00 and teal formatting restored")
+            timer_log.debug("Timer reset to 05:00 and teal formatting restored")
         except Exception as e:
-            print(f"[DEBUG] Error resetting timer: {e}")
+            timer_log.error("Error resetting timer: %s", e)
     
     def update_timer_display(self, time_str: str):
         """Update lblTimer with current countdown time and visual warnings"""
@@ -993,26 +750,28 @@ class iScoutToolApp(QMainWindow):
                 """)
             
         except Exception as e:
-            print(f"Error updating timer display: {e}")
+            timer_log.error("Error updating timer display: %s", e)
     
     def beep_sound(self):
         """Generate system beep sound for final 30 seconds with extended final beep"""
         try:
+            # Alerts are queued to the audio thread so the GUI never blocks
             # Check if this is the final beep (timer at 0)
             if hasattr(self, 'timer_thread') and self.timer_thread and self.timer_thread.timer_seconds <= 0:
                 # Extended final beep - hold tone for 1 second
-                winsound.Beep(1000, 1000)  # 1000Hz for 1000ms (1 second)
+                self.audio.play('final')
             else:
                 # Normal beep for countdown - 1000Hz tone for 200ms
-                winsound.Beep(1000, 200)
+                self.audio.play('tick')
             
         except Exception as e:
-            print(f"Error playing beep sound: {e}")
+            timer_log.error("Error playing beep sound: %s", e)
     
     def on_timer_finished(self):
         """Handle timer completion with final extended beep"""
         try:
-            print("Timer finished!")
+            timer_log.info("Timer finished!")
+            self.publish_api_event('timer', {'running': False, 'remaining': 0})
             # Play final extended beep (1 second duration)
             self.beep_sound()
             
@@ -1026,7 +785,7 @@ class iScoutToolApp(QMainWindow):
             """)
             
         except Exception as e:
-            print(f"Error handling timer finish: {e}")
+            timer_log.error("Error handling timer finish: %s", e)
     
 
     
@@ -1037,76 +796,90 @@ class iScoutToolApp(QMainWindow):
             self.update_clear_all_button_state()
             
         except Exception as e:
-            print(f"Error handling data input text change: {e}")
+            ui_log.error("Error handling data input text change: %s", e)
 
     def on_got_it_checkbox_changed(self, row: int, checked: bool):
         """Update completed status for the target at the given row and refresh target count."""
         try:
             if 0 <= row < len(self.targets):
                 self.targets[row].completed = checked
+                self.sessions.set_completed(row, checked)
                 self.update_target_count()
+                self.publish_api_event('target', {'index': row, 'completed': checked})
         except Exception as e:
-            print(f"Error updating checkbox state: {e}")
+            ui_log.error("Error updating checkbox state: %s", e)
 
     # Data Parsing Methods (PRD Section 5.1.5)
     
-    def parse_scout_text(self, text_input: str) -> List[ScoutTarget]:
-        """Parse tab-separated scout report into target objects as specified in PRD section 3.1.3"""
-        targets = []
-        # Bounding box corners
-        min_x, max_x = 574, 626
-        min_y, max_y = 574, 626
-        try:
-            lines = text_input.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                # Split by tabs
-                parts = line.split('\t')
-                if len(parts) < 3:
-                    continue
-                # Parse from right to left as specified in PRD
-                try:
-                    y_coordinate = int(parts[-1].strip())  # Last field: Y coordinate
-                    x_coordinate = int(parts[-2].strip())  # Second-to-last: X Coordinate
-                    # Remaining fields (left side): Combined into Boss/Barb description
-                    description_parts = parts[:-2]
-                    target_type = ' '.join(description_parts).strip()
-                    # Validate coordinates per PRD section 7.2
-                    if not (1 <= x_coordinate <= 1198):
-                        continue
-                    if not (1 <= y_coordinate <= 1200):
-                        continue
-                    # Check if coordinates are OUTSIDE bounding box
-                    if not (min_x <= x_coordinate <= max_x and min_y <= y_coordinate <= max_y):
-                        target = ScoutTarget(
-                            target_type=target_type,
-                            x_coordinate=x_coordinate,
-                            y_coordinate=y_coordinate,
-                            completed=False
-                        )
-                        targets.append(target)
-                except (ValueError, IndexError) as e:
-                    print(f"Error parsing line '{line}': {e}")
-                    continue
-            print(f"Parsed {len(targets)} targets successfully (outside bounding box)")
-            return targets
-        except Exception as e:
-            print(f"Error parsing scout text: {e}")
-            return []
-    def load_targets_to_table(self):
-        """Populate UI table with parsed target data as specified in PRD"""
+    def restore_session(self):
+        """Reload the report and Got It state of the last session, so a half-done sweep can go on"""
+        try:
+            session = self.sessions.last_session()
+            if session is None or not session.targets:
+                return
+            self.txtiScoutBoss.setPlainText(session.report)
+            self.load_targets_to_table(resume=session)
+            self.statusBar().showMessage(f"Resumed last session: {self.count_completed_targets()}/"
+                                         f"{len(self.targets)} targets done", 10000)
+            
+        except Exception as e:
+            ui_log.error("Error restoring the last session: %s", e)
+    
+    def after_first_paint(self):
+        """Startup work that needs sqlite3 or http.server, once the window is on screen"""
+        # Bring back the report (and Got It ticks) of the last run
+        self.restore_session()
+        if self.config.api_port:
+            self.start_control_api()
+    
+    def record_spawns(self):
+        """Add the loaded targets to the spawn history"""
+        try:
+            self.engine.spawns.record(self.targets, self.config.enemy_server)
+        except Exception as e:
+            ui_log.error("Error recording spawn history: %s", e)
+    
+    def show_spawn_history(self):
+        """Summarise where spawn types appeared on the enemy server over the last week"""
+        try:
+            server = self.config.enemy_server
+            spawns = self.engine.spawns.load()
+            stats = spawns.recurrence(spawns.select(server, since=time.time() - 7 * 86400))
+            lines = [f"{s.name}{f' Lv{s.level}' if s.level else ''}: {s.sightings} sightings on {s.days} days, "
+                     f"busiest around {s.hotspot[0]},{s.hotspot[1]} ({s.hotspot_share:.0%})" for s in stats[:20]]
+            QMessageBox.information(self, "Spawn History",
+                                    "\n".join(lines) or f"No sightings on server {server} in the last 7 days")
+            
+        except SpawnError as e:
+            QMessageBox.warning(self, "Spawn History", str(e))
+        except Exception as e:
+            ui_log.error("Error showing spawn history: %s", e)
+    
+    def load_targets_to_table(self, resume: Optional["Session"] = None, interactive: bool = True):
+        """Populate UI table with parsed target data as specified in PRD
+
+        With resume, the targets of a stored session are shown instead of
+        parsing the input again; otherwise the load starts a new session.
+        With interactive False (control API calls) errors are raised instead
+        of shown in a dialog nobody may be watching.
+        """
 
         try:
             # Get text from input field
             text_input = self.txtiScoutBoss.toPlainText()
-            if not text_input.strip():
+            if resume is None and not text_input.strip():
+                if not interactive:
+                    raise ValueError("No scout data")
                 QMessageBox.warning(self, "No Data", "Please paste scout data first")
                 return
 
-            # Parse the text
-            self.targets = self.parse_scout_text(text_input)
+            if resume is not None:
+                self.targets = resume.targets
+            else:
+                # Parse the text
+                self.targets = parse_scout_text(text_input)
+                self.sessions.start(self.targets, self.config.enemy_server, text_input)
+                self.record_spawns()
 
             # Disable sorting before populating
             self.tblBossList.setSortingEnabled(False)
@@ -1197,78 +970,17 @@ class iScoutToolApp(QMainWindow):
 
             # Re-enable sorting but do NOT sort by Target column; preserve import order (newest first)
             self.tblBossList.setSortingEnabled(True)
-            print(f"Loaded {len(self.targets)} targets to table (import order, newest first)")
+            ui_log.info("Loaded %s targets to table (import order, newest first)", len(self.targets))
+            self.publish_api_event('targets', {'count': len(self.targets)})
 
         except Exception as e:
-            print(f"Error loading targets to table: {e}")
+            ui_log.error("Error loading targets to table: %s", e)
+            if not interactive:
+                raise
             QMessageBox.critical(self, "Load Error", f"Error loading targets: {e}")
 
-    def validate_coordinates(self, x: int, y: int, server: int) -> bool:
-        """Ensure coordinate values are within game bounds as specified in PRD section 7.2"""
-        try:
-            # Coordinate range checking per PRD
-            if not (1 <= x <= 1198):
-                raise ValueError(f"X coordinate {x} out of range (1-1198)")
-            if not (1 <= y <= 1200):
-                raise ValueError(f"Y coordinate {y} out of range (1-1200)")
-            if not (1 <= server <= 9999):
-                raise ValueError(f"Server {server} out of range (1-9999)")
-            
-            return True
-            
-        except ValueError as e:
-            QMessageBox.warning(self, "Validation Error", str(e))
-            return False
-    
-    # Game Automation Methods (PRD Section 5.1.6)
-    
-    def perform_click(self, x_relative: float, y_relative: float) -> bool:
-        """Send click command to specific screen location as specified in PRD"""
-        try:
-            if not self.adb_device and not self.reconnect_if_needed():
-                return False
-            
-            # Convert relative coordinates to pixels
-            pixel_x, pixel_y = self.convert_relative_to_pixel(x_relative, y_relative)
-            
-            if pixel_x == 0 and pixel_y == 0:
-                print("Invalid coordinates for click")
-                return False
-            
-            # Send ADB click command
-            command = f"input tap {pixel_x} {pixel_y}"
-            result = self.adb_device.shell(command)
-            
-            print(f"Click sent: ({pixel_x}, {pixel_y}) - Relative: ({x_relative}, {y_relative})")
-            return True
-            
-        except Exception as e:
-            print(f"Error performing click: {e}")
-            return False
-    
-    def send_text_input(self, text: str) -> bool:
-        """Simple reliable approach - optimized backspace clearing"""
-        try:
-            if not self.adb_device and not self.reconnect_if_needed():
-                return False
-            
-            # Most reliable method: Go to end, backspace to clear, then type
-            self.adb_device.shell("input keyevent 123")  # Move to end of field
-            # Extra delete to ensure field is cleared
-            self.adb_device.shell("input keyevent 67")  # One extra backspace
-            # Fast backspace clearing - send multiple deletes in single commands
-            self.adb_device.shell("input keyevent 67 67 67 67 67")  # 5 backspaces at once
-            # Send text and enter
-            self.adb_device.shell(f"input text '{text}'")
-            self.adb_device.shell("input keyevent 66")
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error sending text: {e}")
-            return False
-    
-    def navigate_to_coordinates(self, x: int, y: int, server: int = None, skip_server: bool = False) -> bool:
+    def navigate_to_coordinates(self, x: int, y: int, server: int = None, skip_server: bool = False,
+                                route: str = DEFAULT_ROUTE) -> bool:
         """Navigate to specified map coordinates in Evony as specified in PRD section 3.3.3"""
         try:
             # Use the server parameter directly (don't override with config)
@@ -1277,233 +989,79 @@ class iScoutToolApp(QMainWindow):
                 server = self.config.enemy_server or 0
 
             # Validate coordinates
-            if not self.validate_coordinates(x, y, server):
+            try:
+                validate_coordinates(x, y, server)
+            except ValueError as e:
+                QMessageBox.warning(self, "Validation Error", str(e))
                 return False
 
             # Check connection
-            print(f"DEBUG: Checking ADB connection...")
             if not self.reconnect_if_needed():
-                print(f"DEBUG: FAILED to establish ADB connection")
                 QMessageBox.warning(self, "Connection Error", "No connection to BlueStacks")
                 return False
-            else:
-                print(f"DEBUG: ADB connection verified - device: {self.adb_device}")
-
-            print(f"Navigating to Server {server}, X: {x}, Y: {y}")
 
-            # Step 1: Get screen dimensions
-            print(f"DEBUG: Getting Evony screen dimensions...")
-            screen_width, screen_height = self.get_evony_screen_dimensions()
-            print(f"DEBUG: Screen dimensions: {screen_width} x {screen_height}")
-            if screen_width == 0 or screen_height == 0:
-                print("DEBUG: FAILED - Could not detect screen dimensions")
-                return False
-
-            # Step 2: Get NavBox coordinates and calculate centerpoint
-            print(f"DEBUG: Getting NavBox coordinates...")
-            navbox_coords = self.get_navbox_coordinates()
-            print(f"DEBUG: NavBox coordinates: {navbox_coords}")
-            if not navbox_coords:
-                print("DEBUG: FAILED - Could not get NavBox coordinates")
-                return False
-
-            x_loc, y_loc, x_dest, y_dest = navbox_coords
-            center_x, center_y = self.calculate_click_coordinates(
-                screen_width, screen_height, x_loc, y_loc, x_dest, y_dest
-            )
-
-            # Step 3: Click NavBox to open navigation
-            print(f"DEBUG: About to click NavBox at ({center_x}, {center_y})")
-            if not self.click_navbox(center_x, center_y):
-                print(f"DEBUG: FAILED to click NavBox")
-                return False
-            else:
-                print(f"DEBUG: SUCCESS clicked NavBox - navigation dialog should be open")
-                # Extra delay when skipping server to ensure dialog is ready
-                if skip_server:
-                    time.sleep(0.2)  # Additional delay when skipping server step
-
-            # Step 4: Show overlay to block Go button during coordinate entry
-            print("DEBUG: Showing moving overlay to block Go button during coordinate entry...")
-            self.show_moving_overlay()
-
-            # Step 5: Enter server (skip if skip_server is True)
-            if not skip_server and 'NavServer' in self.location_presets:
-                preset = self.location_presets['NavServer']
-                center_x, center_y = self.calculate_click_coordinates(
-                    screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest
-                )
-                server_value = str(server)
-                print(f"DEBUG NavServer: About to send server value '{server_value}' via ADB")
-                if self.click_at_pixel(center_x, center_y, "NavServer"):
-                    time.sleep(0.1)  # Small delay after click before text input
-                    if not self.send_text_input(server_value):
-                        print(f"DEBUG NavServer: FAILED to send server value '{server_value}'")
-                        self.hide_moving_overlay()
-                        return False
-                    else:
-                        print(f"DEBUG NavServer: SUCCESS sent server value '{server_value}'")
-                else:
-                    print(f"DEBUG NavServer: FAILED to click NavServer field")
-                    self.hide_moving_overlay()
-                    return False
-
-            # Step 6: Enter X coordinate (no delays)
-            if 'NavX' in self.location_presets:
-                preset = self.location_presets['NavX']
-                center_x, center_y = self.calculate_click_coordinates(
-                    screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest
-                )
-                x_value = str(x)
-                print(f"DEBUG NavX: About to send X coordinate '{x_value}' via ADB")
-                if self.click_at_pixel(center_x, center_y, "NavX"):
-                    time.sleep(0.2)  # Increased delay after click before text input
-                    if not self.send_text_input(x_value):
-                        print(f"DEBUG NavX: FAILED to send X coordinate '{x_value}'")
-                        self.hide_moving_overlay()
-                        return False
-                    else:
-                        print(f"DEBUG NavX: SUCCESS sent X coordinate '{x_value}'")
-                        time.sleep(0.1)  # Small delay after X input before Y
-                else:
-                    print(f"DEBUG NavX: FAILED to click NavX field")
-                    self.hide_moving_overlay()
-                    return False
-
-            # Step 7: Enter Y coordinate (no delays)
-            if 'NavY' in self.location_presets:
-                preset = self.location_presets['NavY']
-                center_x, center_y = self.calculate_click_coordinates(
-                    screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest
+            nav_log.info("Navigating to Server %s, X: %s, Y: %s", server, x, y)
+            with tracer.span("navigate_to_coordinates", UI):
+                landed = self.engine.navigate(
+                    x, y, server, skip_server=skip_server, route=route, wait=False,
+                    on_entry=lambda active: self.show_moving_overlay() if active else self.hide_moving_overlay()
                 )
-                y_value = str(int(y))  # Ensure integer conversion, then string
-                print(f"DEBUG NavY: About to send Y coordinate '{y_value}' (original: {y}) via ADB")
-                if self.click_at_pixel(center_x, center_y, "NavY"):
-                    time.sleep(0.1)  # Small delay after click before text input
-                    if not self.send_text_input(y_value):
-                        print(f"DEBUG NavY: FAILED to send Y coordinate '{y_value}'")
-                        self.hide_moving_overlay()
-                        return False
-                    else:
-                        print(f"DEBUG NavY: SUCCESS sent Y coordinate '{y_value}'")
-                else:
-                    print(f"DEBUG NavY: FAILED to click NavY field")
-                    self.hide_moving_overlay()
-                    return False
 
-            # Step 8: Click NavGo button and hide overlay
-            if 'NavGo' in self.location_presets:
-                preset = self.location_presets['NavGo']
-                center_x, center_y = self.calculate_click_coordinates(
-                    screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest
-                )
-                print(f"DEBUG NavGo: About to click NavGo button and hide overlay...")
-                if not self.click_at_pixel(center_x, center_y, "NavGo"):
-                    self.hide_moving_overlay()
-                    return False
-                # Hide overlay after clicking NavGo
-                self.hide_moving_overlay()
-                # No wait - return immediately for manual action
-
-            print(f"Fast navigation to {server}:{x},{y} - ready for manual action")
+            nav_log.info("Fast navigation to %s:%s,%s%s - ready for manual action", server, x, y,
+                         " (confirmed on screen)" if landed else "")
             return True
 
+        except EngineBusy as e:
+            # Never block the window on a worker's jump; the user can click again
+            self.statusBar().showMessage(f"{e} - try again when it finishes", 5000)
+            return False
         except Exception as e:
-            print(f"Error navigating to coordinates: {e}")
-            # Make sure to hide overlay on error
-            self.hide_moving_overlay()
+            nav_log.error("Error navigating to coordinates: %s", e)
+            if self.engine.heartbeat:
+                self.engine.heartbeat.refresh()     # Evony may have left the foreground
             QMessageBox.critical(self, "Navigation Error", f"Failed to navigate: {e}")
             return False
     
     # Navigation Workflow Methods (PRD Section 5.1.7)
     
+    def setup_moving_overlay(self):
+        """Create the persistent NavGo overlay window once at startup"""
+        try:
+            self.moving_overlay = MovingOverlay(create_window_tracker("Main"))
+            self.update_overlay_target()
+        except Exception as e:
+            overlay_log.error("Error creating moving overlay: %s", e)
+            self.moving_overlay = None
+    
+    def update_overlay_target(self):
+        """Point the overlay at the NavGo preset and the detected screen size"""
+        if not getattr(self, 'moving_overlay', None):
+            return
+        if preset := self.location_presets.get('NavGo'):
+            self.moving_overlay.set_target(preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
+        self.moving_overlay.set_device_size(self.screen_width, self.screen_height)
+    
     def show_moving_overlay(self):
-        """Show a small overlay window over the Go button in Bluestacks emulator window as specified in PRD section 3.3.3"""
+        """Show the overlay over the Go button in the Bluestacks emulator window as specified in PRD section 3.3.3"""
         try:
-            import win32gui
-            import win32con
-            import win32api
-        except ImportError:
-            print("pywin32 is required for overlay functionality. Please install with 'pip install pywin32'.")
+            with tracer.span("overlay.show", UI):
+                if getattr(self, 'moving_overlay', None) and self.moving_overlay.show():
+                    # Paint now; navigation keeps the event loop busy until it finishes
+                    self.moving_overlay.widget.repaint()
+                    return self.moving_overlay
             return None
-
-        try:
-            print("=== OVERLAY DEBUG: Starting overlay creation ===")
-
-            # Find Bluestacks window by title
-            hwnd = win32gui.FindWindow(None, "Main")
-            if hwnd == 0:
-                print("OVERLAY DEBUG: Bluestacks window not found (title 'Main')")
-                return None
-
-            # Get window rect (absolute coordinates)
-            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
-            em_width = right - left
-            em_height = bottom - top
-            print(f"OVERLAY DEBUG: BlueStacks window found - Handle: {hwnd}")
-            print(f"OVERLAY DEBUG: BlueStacks absolute coordinates: Left={left}, Top={top}, Right={right}, Bottom={bottom}")
-            print(f"OVERLAY DEBUG: BlueStacks window size: {em_width}x{em_height}")
-
-            # Get NavGo button relative coordinates
-            if 'NavGo' not in self.location_presets:
-                print("OVERLAY DEBUG: NavGo preset not found in location_presets")
-                print(f"OVERLAY DEBUG: Available presets: {list(self.location_presets.keys())}")
-                return None
-
-            preset = self.location_presets['NavGo']
-            print(f"OVERLAY DEBUG: NavGo preset found: x_loc={preset.x_loc}, y_loc={preset.y_loc}, x_dest={preset.x_dest}, y_dest={preset.y_dest}")
-
-            # Calculate pixel coordinates for overlay
-            screen_width, screen_height = self.get_evony_screen_dimensions()
-            print(f"OVERLAY DEBUG: Evony screen dimensions: {screen_width}x{screen_height}")
-
-            x1 = int(preset.x_loc * screen_width)
-            y1 = int(preset.y_loc * screen_height)
-            x2 = int(preset.x_dest * screen_width)
-            y2 = int(preset.y_dest * screen_height)
-            print(f"OVERLAY DEBUG: NavGo button pixel coordinates: x1={x1}, y1={y1}, x2={x2}, y2={y2}")
-
-            overlay_x = left + min(x1, x2) + 2 # +2 for left edge pixel
-            overlay_y = top + min(y1, y2) + 60  # +60 for title bar offset
-            overlay_w = abs(x2 - x1)
-            overlay_h = abs(y2 - y1)
-            print(f"OVERLAY DEBUG: Overlay absolute coordinates: X={overlay_x}, Y={overlay_y}, Width={overlay_w}, Height={overlay_h}")
-
-            # Create overlay window
-            print("OVERLAY DEBUG: Creating overlay widget...")
-            self.moving_overlay = ColoredRect("MOVING...", QColor("#222"))
-            self.moving_overlay.setWindowFlags(QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint)
-            self.moving_overlay.setAttribute(QtCore.Qt.WA_TranslucentBackground)
-            self.moving_overlay.resize(max(overlay_w, 80), max(overlay_h, 32))
-            self.moving_overlay.move(overlay_x, overlay_y)
-            self.moving_overlay.show()
-            QApplication.processEvents()
-            print("OVERLAY DEBUG: Overlay widget created and shown successfully")
-            return self.moving_overlay
-
         except Exception as e:
-            print(f"OVERLAY DEBUG: Error showing moving overlay: {e}")
-            import traceback
-            traceback.print_exc()
+            overlay_log.error("Error showing moving overlay: %s", e)
             return None
 
     def hide_moving_overlay(self):
-        """Remove the moving overlay window after navigation completes"""
-        try:
-            print("OVERLAY DEBUG: Attempting to hide overlay...")
-            if hasattr(self, 'moving_overlay') and self.moving_overlay:
-                print("OVERLAY DEBUG: Overlay widget found, hiding and deleting...")
-                self.moving_overlay.hide()
-                self.moving_overlay.deleteLater()
-                self.moving_overlay = None
-                QApplication.processEvents()
-                print("OVERLAY DEBUG: Overlay successfully hidden and cleaned up")
-            else:
-                print("OVERLAY DEBUG: No overlay widget found to hide")
+        """Hide the moving overlay window after navigation completes"""
+        try:
+            with tracer.span("overlay.hide", UI):
+                if getattr(self, 'moving_overlay', None):
+                    self.moving_overlay.hide()
         except Exception as e:
-            print(f"OVERLAY DEBUG: Error hiding moving overlay: {e}")
-            import traceback
-            traceback.print_exc()
+            overlay_log.error("Error hiding moving overlay: %s", e)
     
     def return_home(self) -> bool:
         """Navigate back to user's home location as specified in PRD"""
@@ -1515,7 +1073,7 @@ class iScoutToolApp(QMainWindow):
             )
             
         except Exception as e:
-            print(f"Error returning home: {e}")
+            nav_log.error("Error returning home: %s", e)
             return False
     
     def go_to_target(self, target_index: int) -> bool:
@@ -1540,11 +1098,11 @@ class iScoutToolApp(QMainWindow):
                     
                 return success
             
-            print(f"Invalid target index: {target_index}")
+            nav_log.warning("Invalid target index: %s", target_index)
             return False
                 
         except Exception as e:
-            print(f"Error going to target: {e}")
+            nav_log.error("Error going to target: %s", e)
             return False
     
     # UI Event Handlers (PRD Section 5.2)
@@ -1580,14 +1138,28 @@ class iScoutToolApp(QMainWindow):
                 self.actionLoadConfig.triggered.connect(self.load_config)
             if hasattr(self, 'actionTestConnection'):
                 self.actionTestConnection.triggered.connect(self.test_connection)
+            if hasattr(self, 'menuTools'):
+                self.actionSelectDevice = QtWidgets.QAction("Select &Device...", self)
+                self.actionSelectDevice.triggered.connect(self.on_select_device_clicked)
+                self.menuTools.insertAction(self.actionScreenshot, self.actionSelectDevice)
+                self.actionSelectProfile = QtWidgets.QAction("Config &Profile...", self)
+                self.actionSelectProfile.triggered.connect(self.on_select_profile_clicked)
+                self.menuTools.insertAction(self.actionScreenshot, self.actionSelectProfile)
+                self.setup_multi_instance_menu()
+                self.setup_batch_menu()
+                self.setup_macro_menu()
+                self.setup_calibration_menu()
+                self.setup_logging_menu()
+                self.setup_trace_menu()
+                self.setup_control_api()
             
             # Connect keyboard shortcuts
             self.setup_keyboard_shortcuts()
             
-            print("UI signals connected successfully")
+            ui_log.info("UI signals connected successfully")
             
         except Exception as e:
-            print(f"Error connecting UI signals: {e}")
+            ui_log.error("Error connecting UI signals: %s", e)
     
     def setup_keyboard_shortcuts(self):
         """Set up keyboard shortcuts as specified in PRD"""
@@ -1603,10 +1175,10 @@ class iScoutToolApp(QMainWindow):
             shortcut_f5 = QShortcut(QKeySequence("F5"), self)
             shortcut_f5.activated.connect(self.test_connection)
             
-            print("Keyboard shortcuts setup completed")
+            ui_log.info("Keyboard shortcuts setup completed")
             
         except Exception as e:
-            print(f"Error setting up shortcuts: {e}")
+            ui_log.error("Error setting up shortcuts: %s", e)
     
     def on_load_table_clicked(self):
         """Process text input and populate target table as specified in PRD section 5.2.2"""
@@ -1614,7 +1186,7 @@ class iScoutToolApp(QMainWindow):
             self.load_targets_to_table()
             
         except Exception as e:
-            print(f"Error in load table clicked: {e}")
+            ui_log.error("Error in load table clicked: %s", e)
     
     def on_clear_all_clicked(self):
         """Clear all rows in tblBossList, clear txtiScoutBoss, and reset UI state as specified in PRD"""
@@ -1625,8 +1197,9 @@ class iScoutToolApp(QMainWindow):
             # Clear text input area
             self.txtiScoutBoss.clear()
             
-            # Reset targets list
+            # Reset targets list; the cleared session is not resumed at the next start
             self.targets = []
+            self.sessions.clear()
             
             # Reset target counter
             self.update_target_count(0, 0)
@@ -1634,21 +1207,31 @@ class iScoutToolApp(QMainWindow):
             # Update Clear All button state after clearing all data
             self.update_clear_all_button_state()
             
-            print("All data cleared")
+            ui_log.info("All data cleared")
             
         except Exception as e:
-            print(f"Error clearing data: {e}")
+            ui_log.error("Error clearing data: %s", e)
     
     def on_go_home_clicked(self):
         """Execute return to home coordinates and start timer as specified in PRD"""
         try:
+            if self.emulator_is_busy():
+                return
+            
             # Save current config from UI
             self.save_config()
             
+            if self.dispatcher:
+                # Every instance returns to its own account's home
+                self.dispatcher.submit_to_all(
+                    lambda p: NavRequest(p.home_x, p.home_y, p.home_server, label="home"))
+                self.statusBar().showMessage("Sending all instances home - remember to bubble!", 5000)
+                return
+            
             # Navigate home
             if self.return_home():
                 # Go Home does not start timer - only Go Enemy starts timer
-                print("Navigated home successfully.")
+                nav_log.info("Navigated home successfully.")
                 
                 # Show bubble reminder dialog with black text
                 msg_box = QMessageBox(self)
@@ -1674,36 +1257,48 @@ class iScoutToolApp(QMainWindow):
             QMessageBox.warning(self, "Navigation Failed", "Failed to navigate to home coordinates")
             
         except Exception as e:
-            print(f"Error going home: {e}")
+            nav_log.error("Error going home: %s", e)
             QMessageBox.critical(self, "Error", f"Error going home: {e}")
     
     def on_go_enemy_clicked(self):
         """Navigate to enemy server coordinates as specified in PRD"""
         try:
+            if self.emulator_is_busy():
+                return
+            
             # Save current config
             self.save_config()
             
+            if self.dispatcher:
+                # Each instance jumps to its own enemy server and starts its own bubble timer
+                self.dispatcher.submit_to_all(
+                    lambda p: NavRequest(*ENEMY_LANDING, p.enemy_server, start_bubble=True, label="enemy"))
+                return
+            
             # Navigate to enemy server (use first target if available, or just server)
             enemy_server = int(self.intEnemyServer.text() or "0")
             if enemy_server == 0:
                 QMessageBox.warning(self, "Invalid Server", "Please set enemy server number")
                 return
             
-            # Use (10, 10) as default coordinates
-            if self.navigate_to_coordinates(10, 10, enemy_server):
+            # Land on (10, 10); any tile of the server will do
+            if self.navigate_to_coordinates(*ENEMY_LANDING, enemy_server):
                 self.start_timer(300)  # Start bubble timer (only Go Enemy starts timer)
-                print("Navigated to enemy server. Timer started.")
+                nav_log.info("Navigated to enemy server. Timer started.")
                 return
             
             QMessageBox.warning(self, "Navigation Failed", "Failed to navigate to enemy server")
             
         except Exception as e:
-            print(f"Error going to enemy: {e}")
+            nav_log.error("Error going to enemy: %s", e)
             QMessageBox.critical(self, "Error", f"Error going to enemy: {e}")
     
     def on_target_go_clicked(self, row_index: int):
         """Navigate to specific target from table row as specified in PRD section 3.3.3"""
         try:
+            if self.emulator_is_busy():
+                return
+            
             # Check the checkbox immediately when Go button is pressed
             if checkbox_container := self.tblBossList.cellWidget(row_index, 1):  # Column 1 has checkbox containers
                 if checkbox_layout := checkbox_container.layout():
@@ -1714,7 +1309,8 @@ class iScoutToolApp(QMainWindow):
             # Table columns: 0=Action (Go button), 1=Got It checkbox, 2=Target, 3=X, 4=Y
             x_item = self.tblBossList.item(row_index, 3)  # X column
             y_item = self.tblBossList.item(row_index, 4)  # Y column
-            print(f"DEBUG get: Go button row {row_index} X item: {x_item.text() if x_item else 'None'} Y item: {y_item.text() if y_item else 'None'}")
+            nav_log.debug("Go button row %s X item: %s Y item: %s", row_index,
+                          x_item.text() if x_item else None, y_item.text() if y_item else None)
             
             if not x_item or not y_item:
                 QMessageBox.warning(self, "Missing Coordinates", "X or Y coordinates not found in table")
@@ -1730,6 +1326,13 @@ class iScoutToolApp(QMainWindow):
             # Mark target as completed in data model
             if 0 <= row_index < len(self.targets):
                 self.targets[row_index].completed = True
+                self.sessions.set_completed(row_index, True)
+            
+            if self.dispatcher:
+                # Whichever instance is idle first takes the target (on its own enemy server)
+                self.dispatcher.submit(NavRequest(target_x, target_y, target_index=row_index,
+                                                  label=f"target {row_index + 1}"))
+                return
             
             # Get enemy server directly from Enemy Server text field (current value)
             try:
@@ -1742,85 +1345,816 @@ class iScoutToolApp(QMainWindow):
                 return
             
             # Perform navigation using coordinates from table (keep current server)
-            print(f"Navigating to coordinates from table: X={target_x}, Y={target_y} (keeping current server)")
+            nav_log.info("Navigating to coordinates from table: X=%s, Y=%s (keeping current server)", target_x, target_y)
             if self.navigate_to_coordinates(target_x, target_y, enemy_server, skip_server=True):
-                print(f"Successfully navigated to target {row_index + 1} at ({target_x}, {target_y})")
+                nav_log.info("Successfully navigated to target %s at (%s, %s)", row_index + 1, target_x, target_y)
             else:
                 QMessageBox.warning(self, "Navigation Failed", f"Failed to navigate to target {row_index + 1}")
             
         except Exception as e:
-            print(f"Error navigating to target: {e}")
+            nav_log.error("Error navigating to target: %s", e)
             QMessageBox.critical(self, "Error", f"Error navigating to target: {e}")
     
     def on_view_enemy_clicked(self):
         """Navigate to Enemy Server at coordinates 600,600 and click NavGo"""
         try:
-            # Ensure connection
-            if not self.reconnect_if_needed():
-                QMessageBox.warning(self, "Connection Error", "No connection to BlueStacks")
+            if self.emulator_is_busy():
                 return
-
-            # Get screen dimensions
-            screen_width, screen_height = self.get_evony_screen_dimensions()
-            if screen_width == 0 or screen_height == 0:
-                QMessageBox.warning(self, "Screen Error", "Could not detect screen dimensions")
+            
+            if self.navigate_to_coordinates(*VIEW_ENEMY_LANDING, self.config.enemy_server, route="view_enemy"):
+                nav_log.info("ViewEnemy: Navigated to Enemy Server %s at 600,600", self.config.enemy_server)
+        except Exception as e:
+            nav_log.error("Error in ViewEnemy: %s", e)
+            QMessageBox.critical(self, "ViewEnemy Error", f"Failed to view enemy: {e}")
+    
+    # Multi-Instance Methods
+    
+    def setup_multi_instance_menu(self):
+        """Add multi-instance actions to the Tools menu"""
+        self.menuTools.addSeparator()
+        self.actionMultiInstance = QtWidgets.QAction("&Multi-Instance Mode", self)
+        self.actionMultiInstance.setCheckable(True)
+        self.actionMultiInstance.toggled.connect(self.set_multi_instance_mode)
+        self.menuTools.addAction(self.actionMultiInstance)
+        self.actionAddInstance = QtWidgets.QAction("&Add Current Device as Instance...", self)
+        self.actionAddInstance.triggered.connect(self.on_add_instance_clicked)
+        self.menuTools.addAction(self.actionAddInstance)
+        self.actionRemoveInstance = QtWidgets.QAction("&Remove Instance...", self)
+        self.actionRemoveInstance.triggered.connect(self.on_remove_instance_clicked)
+        self.menuTools.addAction(self.actionRemoveInstance)
+        
+        self.lblInstances = QtWidgets.QLabel("")
+        self.statusBar().addPermanentWidget(self.lblInstances)
+        self.instance_timer = QTimer(self)
+        self.instance_timer.timeout.connect(self.update_instance_status)
+    
+    def set_multi_instance_mode(self, enabled: bool):
+        """Start or stop one connection and navigation worker per saved instance profile"""
+        try:
+            if self.dispatcher:
+                self.dispatcher.stop()
+                self.dispatcher = None
+            self.instance_timer.stop()
+            self.lblInstances.setText("")
+            if not enabled:
+                nav_log.info("Multi-instance mode off")
                 return
-
-            # Step 1: Click NavBox to open navigation dialog
-            navbox_coords = self.get_navbox_coordinates()
-            if not navbox_coords:
-                QMessageBox.warning(self, "NavBox Error", "Could not get NavBox coordinates")
+            
+            profiles = load_profiles(self.instances_file)
+            if not profiles:
+                self.statusBar().showMessage("No instances saved - use Tools > Add Current Device as Instance", 5000)
+                self.actionMultiInstance.setChecked(False)
                 return
-            x_loc, y_loc, x_dest, y_dest = navbox_coords
-            center_x, center_y = self.calculate_click_coordinates(screen_width, screen_height, x_loc, y_loc, x_dest, y_dest)
-            if not self.click_navbox(center_x, center_y):
-                QMessageBox.warning(self, "NavBox Error", "Failed to click NavBox")
+            
+            self.dispatcher = Dispatcher(self.engine.routes, CallbackBridge(self.on_instance_event, self),
+                                         discovery=self.connection.discovery if self.connection else None)
+            for profile in profiles:
+                self.dispatcher.add_instance(profile, self.config.adb_port)
+            self.instance_timer.start(1000)
+            self.update_instance_status()
+            nav_log.info("Multi-instance mode on: %s", ', '.join(p.name for p in profiles))
+            
+        except Exception as e:
+            nav_log.error("Error switching multi-instance mode: %s", e)
+            self.statusBar().showMessage(f"Multi-instance mode failed: {e}", 5000)
+    
+    def on_add_instance_clicked(self):
+        """Save the connected device and the current server fields as a new instance profile"""
+        try:
+            serial = getattr(self.adb_device, 'serial', '') if self.adb_device else ''
+            if not serial:
+                QMessageBox.warning(self, "No Device", "Connect to (or select) the emulator for this account first")
                 return
-            time.sleep(0.2)
-
-            # Step 2: Enter Enemy Server in NavServer field
-            if 'NavServer' in self.location_presets:
-                preset = self.location_presets['NavServer']
-                center_x, center_y = self.calculate_click_coordinates(screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
-                server_value = str(self.config.enemy_server)
-                if self.click_at_pixel(center_x, center_y, "NavServer"):
-                    time.sleep(0.1)
-                    self.send_text_input(server_value)
-                else:
-                    QMessageBox.warning(self, "NavServer Error", "Failed to click NavServer field")
-                    return
-
-            # Step 3: Enter X=600 in NavX field
-            if 'NavX' in self.location_presets:
-                preset = self.location_presets['NavX']
-                center_x, center_y = self.calculate_click_coordinates(screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
-                if self.click_at_pixel(center_x, center_y, "NavX"):
-                    time.sleep(0.2)
-                    self.send_text_input("600")
+            name, ok = QInputDialog.getText(self, "Add Instance", f"Account name for {serial}:")
+            if not ok or not name.strip():
+                return
+            profile = InstanceProfile(
+                name=name.strip(), device_serial=serial,
+                home_server=int(self.intHomeServer.text() or "0"),
+                home_x=int(self.intHomeXLoc.text() or "0"),
+                home_y=int(self.intHomeYLoc.text() or "0"),
+                enemy_server=int(self.intEnemyServer.text() or "0")
+            )
+            profiles = [p for p in load_profiles(self.instances_file) if p.name != profile.name]
+            save_profiles(self.instances_file, profiles + [profile])
+            self.statusBar().showMessage(f"Instance '{profile.name}' saved", 5000)
+            if self.dispatcher:
+                self.set_multi_instance_mode(True)
+            
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Settings", "Home and enemy fields must be numbers")
+        except Exception as e:
+            nav_log.error("Error adding instance: %s", e)
+    
+    def on_remove_instance_clicked(self):
+        """Delete a saved instance profile"""
+        try:
+            profiles = load_profiles(self.instances_file)
+            if not profiles:
+                return
+            labels = [f"{p.name} ({p.device_serial})" for p in profiles]
+            choice, ok = QInputDialog.getItem(self, "Remove Instance", "Instance to remove:", labels, 0, False)
+            if not ok:
+                return
+            del profiles[labels.index(choice)]
+            save_profiles(self.instances_file, profiles)
+            if self.dispatcher:
+                self.set_multi_instance_mode(bool(profiles))
+            
+        except Exception as e:
+            nav_log.error("Error removing instance: %s", e)
+    
+    def on_instance_event(self, event: InstanceEvent):
+        """Report progress of a dispatched navigation"""
+        try:
+            label = event.request.label or f"{event.request.x},{event.request.y}"
+            if event.kind == STARTED:
+                self.statusBar().showMessage(f"{event.instance}: going to {label}...")
+            elif event.kind == FINISHED:
+                self.statusBar().showMessage(f"{event.instance}: {label} done in {event.elapsed:.1f}s", 5000)
+                if event.instance == NavigationQueue.NAME and event.request.start_bubble:
+                    self.start_timer(300)
+            elif event.kind == FAILED:
+                nav_log.warning("%s: %s failed: %s", event.instance, label, event.error)
+                self.statusBar().showMessage(f"{event.instance}: {label} failed - {event.error}", 10000)
+            self.update_instance_status()
+            self.publish_api_event('navigation', event)
+            
+        except Exception as e:
+            nav_log.error("Error handling instance event: %s", e)
+    
+    def update_instance_status(self):
+        """Refresh the per-instance status/bubble readout and play timer alerts"""
+        if not self.dispatcher:
+            return
+        parts = []
+        beep = None
+        for instance in self.dispatcher.instances:
+            state = "offline" if instance.connection.device is None else ("busy" if instance.busy else "idle")
+            remaining = instance.bubble_remaining()
+            if remaining is None:
+                timer = "--:--"
+            else:
+                timer = f"{remaining // 60:02d}:{remaining % 60:02d}"
+                if remaining == 0:
+                    beep = 'final'
+                    instance.stop_bubble()
+                elif remaining <= 30 and beep is None:
+                    beep = 'tick'
+            parts.append(f"{instance.name} {state} {timer}")
+        pending = self.dispatcher.pending()
+        self.lblInstances.setText(" | ".join(parts) + (f"  (queued: {pending})" if pending else ""))
+        if beep:
+            self.audio.play(beep)
+    
+    # Auto-Scout Batch Methods
+    
+    def setup_batch_menu(self):
+        """Add auto-scout controls to the Tools menu (their shortcuts work app-wide)"""
+        self.menuTools.addSeparator()
+        self.actionBatchStart = QtWidgets.QAction("Start &Auto-Scout", self)
+        self.actionBatchStart.setShortcut("F6")
+        self.actionBatchStart.triggered.connect(self.on_batch_start_clicked)
+        self.actionBatchDone = QtWidgets.QAction("Auto-Scout: &Done, Next Target", self)
+        self.actionBatchDone.setShortcut("F7")
+        self.actionBatchDone.triggered.connect(lambda: self.batch_runner and self.batch_runner.done())
+        self.actionBatchSkip = QtWidgets.QAction("Auto-Scout: S&kip Target", self)
+        self.actionBatchSkip.setShortcut("F8")
+        self.actionBatchSkip.triggered.connect(lambda: self.batch_runner and self.batch_runner.skip())
+        self.actionBatchCancel = QtWidgets.QAction("Auto-Scout: &Cancel", self)
+        self.actionBatchCancel.setShortcut("Shift+F6")
+        self.actionBatchCancel.triggered.connect(lambda: self.batch_runner and self.batch_runner.cancel())
+        for action in (self.actionBatchStart, self.actionBatchDone, self.actionBatchSkip, self.actionBatchCancel):
+            action.setShortcutContext(QtCore.Qt.ApplicationShortcut)
+            self.menuTools.addAction(action)
+        self.actionSpawnHistory = QtWidgets.QAction("Spa&wn History", self)
+        self.actionSpawnHistory.triggered.connect(self.show_spawn_history)
+        self.menuTools.addAction(self.actionSpawnHistory)
+        self.update_batch_actions()
+        
+        # Overlay show/hide requests from the batch thread are applied on the GUI thread
+        self.overlay_bridge = CallbackBridge(
+            lambda active: self.show_moving_overlay() if active else self.hide_moving_overlay(), self)
+    
+    def batch_is_running(self) -> bool:
+        """True (with a status message) while auto-scout owns the emulator"""
+        if self.batch_runner and self.batch_runner.running:
+            self.statusBar().showMessage("Auto-Scout is running - pause or cancel it first (F6 / Shift+F6)", 5000)
+            return True
+        return False
+    
+    def emulator_is_busy(self) -> bool:
+        """True (with a status message) while auto-scout or a background task drives the emulator"""
+        if self.batch_is_running():
+            return True
+        if (self.calibrator or self.macro_player or self.engine.busy
+                or (self.nav_queue and (self.nav_queue.busy or self.nav_queue.pending()))):
+            self.statusBar().showMessage("The emulator is busy with a calibration, macro or queued jump - "
+                                         "try again when it finishes", 5000)
+            return True
+        return False
+    
+    def update_batch_actions(self):
+        """Reflect the runner state in the auto-scout menu entries"""
+        running = bool(self.batch_runner and self.batch_runner.running)
+        if not running:
+            self.actionBatchStart.setText("Start &Auto-Scout")
+        elif self.batch_runner.state in (PAUSING, PAUSED):
+            self.actionBatchStart.setText("Resume &Auto-Scout")
+        else:
+            self.actionBatchStart.setText("Pause &Auto-Scout")
+        for action in (self.actionBatchDone, self.actionBatchSkip, self.actionBatchCancel):
+            action.setEnabled(running)
+    
+    def on_batch_start_clicked(self):
+        """Start auto-scout over the unchecked targets, or pause/resume a running one"""
+        try:
+            if self.batch_runner and self.batch_runner.running:
+                if self.batch_runner.state in (PAUSING, PAUSED):
+                    self.batch_runner.resume()
                 else:
-                    QMessageBox.warning(self, "NavX Error", "Failed to click NavX field")
+                    self.batch_runner.pause()
+                return
+            
+            if self.dispatcher:
+                QMessageBox.information(self, "Auto-Scout",
+                                        "Auto-Scout drives the primary device. Turn off Multi-Instance Mode first, "
+                                        "or use the target Go buttons to queue targets across instances.")
+                return
+            items = [BatchItem(i, t.x_coordinate, t.y_coordinate, t.target_type)
+                     for i, t in enumerate(self.targets) if not t.completed]
+            if not items:
+                QMessageBox.information(self, "Auto-Scout", "No unchecked targets to scout")
+                return
+            try:
+                enemy_server = int(self.intEnemyServer.text() or "0")
+            except ValueError:
+                enemy_server = 0
+            if enemy_server == 0:
+                QMessageBox.warning(self, "Invalid Server", "Please enter a valid Enemy Server number")
+                return
+            dwell, ok = QInputDialog.getDouble(
+                self, "Auto-Scout", f"Seconds at each of {len(items)} targets (0 = wait for F7):",
+                self.batch_dwell, 0.0, 600.0, 1)
+            if not ok:
+                return
+            self.batch_dwell = dwell
+            
+            # The server is entered for the first target only; later jumps stay on it
+            server_entered = [False]
+            def navigate(item: BatchItem):
+                device = self.connection.wait_connected(10.0) if self.connection else None
+                if device is None:
+                    raise ConnectionError("No connection to BlueStacks")
+                self.engine.navigate(item.x, item.y, enemy_server, skip_server=server_entered[0],
+                                     on_entry=self.overlay_bridge)
+                server_entered[0] = True
+            
+            self.batch_runner = BatchRunner(items, navigate, dwell=dwell or None,
+                                            listener=CallbackBridge(self.on_batch_progress, self))
+            self.batch_runner.start()
+            
+        except Exception as e:
+            nav_log.error("Error starting auto-scout: %s", e)
+            QMessageBox.critical(self, "Auto-Scout Error", f"Error starting auto-scout: {e}")
+    
+    def on_batch_progress(self, progress: BatchProgress):
+        """Show auto-scout progress and tick off completed targets"""
+        try:
+            self.publish_api_event('batch', progress)
+            where = f"[{progress.position}/{progress.total}]"
+            item = progress.item
+            if progress.kind == NAVIGATING:
+                self.statusBar().showMessage(f"Auto-Scout {where} going to {item.x},{item.y}...")
+            elif progress.kind == ARRIVED:
+                self.tblBossList.selectRow(item.index)
+                hint = "F7 next, F8 skip" if not self.batch_dwell else f"{self.batch_dwell:.0f}s, F7 next"
+                self.statusBar().showMessage(f"Auto-Scout {where} at {item.label} ({hint})")
+            elif progress.kind == COMPLETED:
+                self.set_target_checked(item.index, True)
+            elif progress.kind == SKIPPED:
+                self.statusBar().showMessage(f"Auto-Scout {where} skipped {item.x},{item.y}", 3000)
+            elif progress.kind == BATCH_FAILED:
+                nav_log.warning("Auto-Scout %s %s,%s failed: %s", where, item.x, item.y, progress.message)
+                self.statusBar().showMessage(f"Auto-Scout {where} {item.x},{item.y} failed: {progress.message}", 5000)
+            elif progress.state in (BATCH_FINISHED, CANCELLED):
+                self.statusBar().showMessage(f"Auto-Scout {progress.state}: "
+                                             f"{self.count_completed_targets()}/{len(self.targets)} targets done", 10000)
+            elif progress.state == PAUSING:
+                self.statusBar().showMessage("Auto-Scout pausing after this jump (F6 to resume)")
+            elif progress.state == PAUSED:
+                self.statusBar().showMessage("Auto-Scout paused (F6 to resume)")
+            self.update_batch_actions()
+            
+        except Exception as e:
+            nav_log.error("Error handling auto-scout progress: %s", e)
+    
+    def set_target_checked(self, row: int, checked: bool):
+        """Tick the Got It checkbox of a table row (updates the model through its signal)"""
+        if checkbox_container := self.tblBossList.cellWidget(row, 1):  # Column 1 has checkbox containers
+            if checkbox_layout := checkbox_container.layout():
+                if checkbox := checkbox_layout.itemAt(0).widget():
+                    checkbox.setChecked(checked)
+    
+    # Macro Methods
+    
+    def setup_macro_menu(self):
+        """Add macro recording and replay to the Tools menu"""
+        self.menuTools.addSeparator()
+        self.actionRecordMacro = QtWidgets.QAction("&Record Macro", self)
+        self.actionRecordMacro.setCheckable(True)
+        self.actionRecordMacro.toggled.connect(self.set_macro_recording)
+        self.menuTools.addAction(self.actionRecordMacro)
+        self.actionReplayMacro = QtWidgets.QAction("Re&play Macro...", self)
+        self.actionReplayMacro.triggered.connect(self.on_replay_macro_clicked)
+        self.menuTools.addAction(self.actionReplayMacro)
+        self.macro_bridge = CallbackBridge(self.on_macro_finished, self)
+    
+    def set_macro_recording(self, enabled: bool):
+        """Start recording app inputs (and optionally emulator touches), or stop and save the macro"""
+        try:
+            if enabled:
+                device = self.engine.device
+                self.macro_recorder = MacroRecorder(self.engine.screen_size() if device else (0, 0))
+                self.macro_recorder.start()
+                if device and QMessageBox.question(
+                        self, "Record Macro", "Also record touches made directly in the emulator window?",
+                        QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
+                    self.macro_recorder.start_touches(device)
+                self.statusBar().showMessage("Recording macro - Tools > Record Macro again to stop")
+                return
+            
+            if not self.macro_recorder:
+                return
+            macro = self.macro_recorder.stop()
+            self.macro_recorder = None
+            if not macro.steps:
+                self.statusBar().showMessage("Macro recording stopped - nothing recorded", 5000)
+                return
+            path, _ = QFileDialog.getSaveFileName(self, "Save Macro", os.path.dirname(os.path.abspath(__file__)),
+                                                  "Macros (*.macro)")
+            if path:
+                save_macro(path, macro)
+                self.statusBar().showMessage(f"Saved {len(macro.steps)} macro steps to {path}", 5000)
+            else:
+                self.statusBar().showMessage("Macro discarded", 5000)
+            
+        except Exception as e:
+            nav_log.error("Error recording macro: %s", e)
+            QMessageBox.critical(self, "Macro Error", f"Error recording macro: {e}")
+    
+    def on_replay_macro_clicked(self):
+        """Replay a macro file on a worker thread; clicking again while it runs cancels it"""
+        try:
+            if self.macro_player:
+                self.macro_player.cancelled = True
+                return
+            if self.batch_is_running():
+                return
+            path, _ = QFileDialog.getOpenFileName(self, "Replay Macro", os.path.dirname(os.path.abspath(__file__)),
+                                                  "Macros (*.macro);;All files (*)")
+            if not path:
+                return
+            macro = load_macro(path)
+            compression, ok = QInputDialog.getDouble(
+                self, "Replay Macro", f"Time compression for {len(macro.steps)} steps (2 = twice as fast):",
+                1.0, 0.1, 20.0, 1)
+            if not ok:
+                return
+            
+            self.macro_player = MacroPlayer(macro, compression)
+            self.actionReplayMacro.setText("Cancel Macro Re&play")
+            def run():
+                try:
+                    self.macro_bridge(self.engine.play_macro(self.macro_player))
+                except Exception as e:
+                    self.macro_bridge(e)
+            threading.Thread(target=run, name="iScoutMacro", daemon=True).start()
+            self.statusBar().showMessage(f"Replaying {os.path.basename(path)}...")
+            
+        except Exception as e:
+            nav_log.error("Error replaying macro: %s", e)
+            QMessageBox.critical(self, "Macro Error", f"Error replaying macro: {e}")
+    
+    def on_macro_finished(self, result):
+        """Report the end of a replay: elapsed seconds or the exception that stopped it"""
+        self.macro_player = None
+        self.actionReplayMacro.setText("Re&play Macro...")
+        if isinstance(result, Exception):
+            nav_log.warning("Macro replay failed: %s", result)
+            self.statusBar().showMessage(f"Macro replay failed: {result}", 5000)
+        else:
+            self.statusBar().showMessage(f"Macro replayed in {result:.2f}s", 5000)
+    
+    # Delay Calibration Methods
+    
+    def setup_calibration_menu(self):
+        """Add delay calibration to the Tools menu"""
+        self.actionCalibrateDelays = QtWidgets.QAction("Calibrate &Delays...", self)
+        self.actionCalibrateDelays.triggered.connect(self.on_calibrate_delays_clicked)
+        self.menuTools.addAction(self.actionCalibrateDelays)
+        self.actionRecordSignatures = QtWidgets.QAction("Record &Pixel Checks", self)
+        self.actionRecordSignatures.triggered.connect(self.on_record_signatures_clicked)
+        self.menuTools.addAction(self.actionRecordSignatures)
+        self.signatures_done_bridge = CallbackBridge(self.on_signatures_recorded, self)
+        self.actionLearnDigits = QtWidgets.QAction("Learn Coordinate &Digits", self)
+        self.actionLearnDigits.triggered.connect(self.on_learn_digits_clicked)
+        self.menuTools.addAction(self.actionLearnDigits)
+        self.digits_done_bridge = CallbackBridge(self.on_digits_learnt, self)
+        self.actionCalibrateLayout = QtWidgets.QAction("Calibrate Screen &Layout", self)
+        self.actionCalibrateLayout.triggered.connect(self.on_calibrate_layout_clicked)
+        self.menuTools.addAction(self.actionCalibrateLayout)
+        self.layout_progress_bridge = CallbackBridge(self.statusBar().showMessage, self)
+        self.layout_done_bridge = CallbackBridge(self.on_layout_calibrated, self)
+        self.calibration_bridge = CallbackBridge(self.on_calibration_progress, self)
+        self.calibration_done_bridge = CallbackBridge(self.on_calibration_finished, self)
+    
+    def on_calibrate_delays_clicked(self):
+        """Tune the navigation delays for this emulator on a worker thread; clicking again cancels"""
+        try:
+            if self.calibrator:
+                self.calibrator.cancel()
+                return
+            if self.batch_is_running():
+                return
+            if self.engine.device is None:
+                QMessageBox.warning(self, "Calibrate Delays", "No connection to BlueStacks")
+                return
+            if QMessageBox.question(
+                    self, "Calibrate Delays",
+                    f"The map will jump back and forth on server {self.config.enemy_server} for a few minutes "
+                    f"to find the shortest reliable delays for {self.engine.profile or 'this emulator'}.\n\n"
+                    "Keep Evony on the map screen and do not touch the emulator. Start?",
+                    QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+                return
+            
+            self.calibrator = self.engine.calibrator(listener=self.calibration_bridge)
+            self.actionCalibrateDelays.setText("Cancel &Delay Calibration")
+            def run():
+                try:
+                    self.calibration_done_bridge(self.engine.calibrate(self.calibrator))
+                except Exception as e:
+                    self.calibration_done_bridge(e)
+            threading.Thread(target=run, name="iScoutCalibration", daemon=True).start()
+            self.statusBar().showMessage("Calibrating delays...")
+            
+        except Exception as e:
+            nav_log.error("Error starting calibration: %s", e)
+            QMessageBox.critical(self, "Calibration Error", f"Error starting calibration: {e}")
+    
+    def on_calibration_progress(self, progress: CalibrationProgress):
+        if progress.passed is None:
+            nav_log.info("Calibrated %s: %s", progress.label, progress.message)
+            self.statusBar().showMessage(f"Calibrated {progress.label}: {progress.message}")
+        else:
+            self.statusBar().showMessage(f"Calibrating {progress.label}: {progress.wait:.3f}s "
+                                         f"{'ok' if progress.passed else 'missed'}")
+    
+    def on_calibration_finished(self, result):
+        """Report the tuned delays, or why calibration stopped"""
+        self.calibrator = None
+        self.actionCalibrateDelays.setText("Calibrate &Delays...")
+        if isinstance(result, Exception):
+            nav_log.warning("Delay calibration failed: %s", result)
+            self.statusBar().showMessage(f"Delay calibration failed: {result}", 10000)
+        else:
+            self.statusBar().showMessage(f"Calibrated {len(result)} delays for {self.engine.profile}", 10000)
+    
+    def on_record_signatures_clicked(self):
+        """Record the pixels that confirm the navigation dialog and field focus, from one jump"""
+        try:
+            if self.batch_is_running() or self.calibrator:
+                return
+            if self.engine.device is None:
+                QMessageBox.warning(self, "Record Pixel Checks", "No connection to BlueStacks")
+                return
+            if QMessageBox.question(
+                    self, "Record Pixel Checks",
+                    f"The map will jump to {self.config.enemy_server}:{VIEW_ENEMY_LANDING[0]},{VIEW_ENEMY_LANDING[1]} "
+                    "once while the dialog and field colours are recorded.\n\n"
+                    "Keep Evony on the map screen and do not touch the emulator. Start?",
+                    QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+                return
+            def run():
+                try:
+                    self.signatures_done_bridge(self.engine.record_signatures(*VIEW_ENEMY_LANDING))
+                except Exception as e:
+                    self.signatures_done_bridge(e)
+            threading.Thread(target=run, name="iScoutSignatures", daemon=True).start()
+            self.statusBar().showMessage("Recording pixel checks...")
+            
+        except Exception as e:
+            nav_log.error("Error recording pixel checks: %s", e)
+            QMessageBox.critical(self, "Pixel Check Error", f"Error recording pixel checks: {e}")
+    
+    def on_signatures_recorded(self, result):
+        if isinstance(result, Exception):
+            nav_log.warning("Recording pixel checks failed: %s", result)
+            self.statusBar().showMessage(f"Recording pixel checks failed: {result}", 10000)
+        else:
+            self.statusBar().showMessage(f"Recorded {len(result)} pixel checks for {self.engine.profile}; "
+                                         "check that the jump landed correctly", 10000)
+    
+    def on_learn_digits_clicked(self):
+        """Learn the coordinate readout font so arrivals can be confirmed on screen"""
+        try:
+            if self.batch_is_running() or self.calibrator:
+                return
+            if not numpy_available():
+                QMessageBox.information(self, "Learn Coordinate Digits",
+                                        "Confirming arrivals needs NumPy. Install it with 'pip install numpy'.")
+                return
+            if self.engine.device is None:
+                QMessageBox.warning(self, "Learn Coordinate Digits", "No connection to BlueStacks")
+                return
+            if QMessageBox.question(
+                    self, "Learn Coordinate Digits",
+                    f"The map will jump twice on server {self.config.enemy_server} while the digits of the "
+                    "coordinate box are learnt.\n\n"
+                    "Keep Evony on the map screen and do not touch the emulator. Start?",
+                    QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+                return
+            def run():
+                try:
+                    self.digits_done_bridge(self.engine.learn_digits())
+                except Exception as e:
+                    self.digits_done_bridge(e)
+            threading.Thread(target=run, name="iScoutDigits", daemon=True).start()
+            self.statusBar().showMessage("Learning coordinate digits...")
+            
+        except Exception as e:
+            nav_log.error("Error learning coordinate digits: %s", e)
+            QMessageBox.critical(self, "Coordinate Digits Error", f"Error learning coordinate digits: {e}")
+    
+    def on_calibrate_layout_clicked(self):
+        """Locate the navigation elements on this resolution (or capture them from a working layout)"""
+        try:
+            if self.batch_is_running() or self.calibrator:
+                return
+            if self.engine.device is None:
+                QMessageBox.warning(self, "Calibrate Screen Layout", "No connection to BlueStacks")
+                return
+            if not os.path.exists(self.engine.layout_templates_file):
+                if QMessageBox.question(
+                        self, "Calibrate Screen Layout",
+                        "No element templates yet. If navigation works on this emulator now, capture them "
+                        "from this screen (the navigation dialog opens and closes once)?\n\n"
+                        "Keep Evony on the map screen.",
+                        QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
                     return
-
-            # Step 4: Enter Y=600 in NavY field
-            if 'NavY' in self.location_presets:
-                preset = self.location_presets['NavY']
-                center_x, center_y = self.calculate_click_coordinates(screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
-                if self.click_at_pixel(center_x, center_y, "NavY"):
-                    time.sleep(0.1)
-                    self.send_text_input("600")
-                else:
-                    QMessageBox.warning(self, "NavY Error", "Failed to click NavY field")
+                work = lambda: self.engine.capture_layout_templates(self.layout_progress_bridge)
+            else:
+                if QMessageBox.question(
+                        self, "Calibrate Screen Layout",
+                        f"Find the navigation box, fields and Go button on this "
+                        f"{self.screen_width}x{self.screen_height} screen and save them as its layout? "
+                        "The navigation dialog opens and closes once.\n\nKeep Evony on the map screen.",
+                        QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
                     return
-
-            # Step 5: Click NavGo button
-            if 'NavGo' in self.location_presets:
-                preset = self.location_presets['NavGo']
-                center_x, center_y = self.calculate_click_coordinates(screen_width, screen_height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
-                self.click_at_pixel(center_x, center_y, "NavGo")
-            print(f"ViewEnemy: Navigated to Enemy Server {self.config.enemy_server} at 600,600")
-        except Exception as e:
-            print(f"Error in ViewEnemy: {e}")
-            QMessageBox.critical(self, "ViewEnemy Error", f"Failed to view enemy: {e}")
+                work = lambda: self.engine.calibrate_layout(self.layout_progress_bridge)
+            def run():
+                try:
+                    self.layout_done_bridge(work())
+                except Exception as e:
+                    self.layout_done_bridge(e)
+            threading.Thread(target=run, name="iScoutLayout", daemon=True).start()
+            self.statusBar().showMessage("Calibrating screen layout...")
+            
+        except Exception as e:
+            nav_log.error("Error calibrating screen layout: %s", e)
+            QMessageBox.critical(self, "Screen Layout Error", f"Error calibrating screen layout: {e}")
+    
+    def on_layout_calibrated(self, result):
+        if isinstance(result, Exception):
+            nav_log.warning("Screen layout calibration failed: %s", result)
+            self.statusBar().showMessage(f"Screen layout calibration failed: {result}", 10000)
+        elif isinstance(result, list):
+            self.statusBar().showMessage(f"Captured layout templates of {', '.join(result)}", 10000)
+        else:
+            self.update_overlay_target()
+            self.statusBar().showMessage(f"Saved screen layout for {self.screen_width}x{self.screen_height} "
+                                         f"({len(result)} presets)", 10000)
+    
+    def on_digits_learnt(self, result):
+        if isinstance(result, Exception):
+            nav_log.warning("Learning coordinate digits failed: %s", result)
+            self.statusBar().showMessage(f"Learning coordinate digits failed: {result}", 10000)
+        else:
+            self.statusBar().showMessage(f"Learnt coordinate digits {' '.join(result)}", 10000)
+    
+    # Logging Methods
+    
+    def setup_logging_menu(self):
+        """Add the debug logging switch to the Tools menu"""
+        self.actionDebugLogging = QtWidgets.QAction("Debug &Logging", self)
+        self.actionDebugLogging.setCheckable(True)
+        self.actionDebugLogging.setChecked(ui_log.isEnabledFor(logging.DEBUG))
+        self.actionDebugLogging.toggled.connect(set_debug)
+        self.menuTools.addAction(self.actionDebugLogging)
+    
+    # Tracing Methods
+    
+    def setup_trace_menu(self):
+        """Add trace export to the Tools menu"""
+        self.actionExportTrace = QtWidgets.QAction("Export &Trace...", self)
+        self.actionExportTrace.triggered.connect(self.on_export_trace_clicked)
+        self.menuTools.addAction(self.actionExportTrace)
+        self.actionDumpFlightRecord = QtWidgets.QAction("Dump ADB &Flight Record", self)
+        self.actionDumpFlightRecord.triggered.connect(self.on_dump_flight_record_clicked)
+        self.menuTools.addAction(self.actionDumpFlightRecord)
+    
+    def on_export_trace_clicked(self):
+        """Save recent navigation spans for chrome://tracing or ui.perfetto.dev"""
+        try:
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Export Trace", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   time.strftime("iScoutTrace-%Y%m%d-%H%M%S.json")),
+                "Chrome trace (*.json)")
+            if not path:
+                return
+            count = tracer.export(path)
+            ui_log.info("Exported %s trace spans to %s", count, path)
+            self.statusBar().showMessage(f"Exported {count} spans - open in ui.perfetto.dev or chrome://tracing",
+                                         10000)
+            
+        except Exception as e:
+            ui_log.error("Error exporting trace: %s", e)
+            QMessageBox.critical(self, "Trace Error", f"Error exporting trace: {e}")
+    
+    def on_dump_flight_record_clicked(self):
+        """Write the recent ADB commands to FlightRecords/"""
+        path = flight_recorder.dump("Requested from the Tools menu")
+        if path:
+            self.statusBar().showMessage(f"ADB flight record written to {path}", 10000)
+        else:
+            QMessageBox.warning(self, "Flight Record", "Could not write the ADB flight record (see log)")
+    
+    # Control API Methods
+    
+    def setup_control_api(self):
+        """Add the control API toggle to the Tools menu and start the server when enabled"""
+        self.nav_queue = NavigationQueue(self.engine, CallbackBridge(self.on_instance_event, self),
+                                         on_entry=self.overlay_bridge)
+        self.actionControlApi = QtWidgets.QAction("Local Control &API", self)
+        self.actionControlApi.setCheckable(True)
+        self.actionControlApi.setChecked(bool(self.config.api_port))
+        self.actionControlApi.toggled.connect(self.set_control_api_enabled)
+        self.menuTools.addAction(self.actionControlApi)
+    
+    def set_control_api_enabled(self, enabled: bool):
+        """Start or stop the localhost control server and remember the choice"""
+        try:
+            if self.api_server:
+                self.api_server.stop()
+                self.api_server = None
+            from iscout.api import DEFAULT_PORT
+            self.config.api_port = (self.config.api_port or DEFAULT_PORT) if enabled else 0
+            self.save_config()
+            if enabled:
+                self.start_control_api()
+            else:
+                self.statusBar().showMessage("Control API stopped", 5000)
+            
+        except Exception as e:
+            api_log.error("Error switching control API: %s", e)
+    
+    def start_control_api(self):
+        """Serve the control API on 127.0.0.1 (token from ISCOUT_API_TOKEN, if set)"""
+        try:
+            from iscout.api import ControlServer
+            self.api_server = ControlServer(self.control_api_methods(), self.config.api_port,
+                                            invoke=GuiInvoker(self), token=os.environ.get('ISCOUT_API_TOKEN', ''))
+            self.api_server.start()
+            api_log.info("Control API listening on %s", self.api_server.url)
+            self.statusBar().showMessage(f"Control API listening on {self.api_server.url}", 5000)
+            
+        except OSError as e:
+            api_log.error("Error starting control API: %s", e)
+            self.api_server = None
+            QMessageBox.warning(self, "Control API", f"Could not listen on port {self.config.api_port}: {e}")
+            self.actionControlApi.blockSignals(True)
+            self.actionControlApi.setChecked(False)
+            self.actionControlApi.blockSignals(False)
+    
+    def publish_api_event(self, event: str, data=None):
+        """Forward a notification to control API event streams"""
+        if self.api_server:
+            self.api_server.publish(event, data)
+    
+    def control_api_methods(self) -> dict:
+        """JSON-RPC method table; every method runs on the GUI thread"""
+        return {
+            'status': self.api_status,
+            'targets': self.api_targets,
+            'load_report': self.api_load_report,
+            'set_completed': self.api_set_completed,
+            'navigate': self.api_navigate,
+            'go_target': self.api_go_target,
+            'go_home': self.api_go_home,
+            'go_enemy': self.api_go_enemy,
+            'clear_queue': self.api_clear_queue,
+        }
+    
+    def api_status(self) -> dict:
+        status = self.connection.status if self.connection else ConnectionStatus(DISCONNECTED)
+        running = self.timer_thread.running
+        return {
+            'connection': status.state,
+            'message': status.message,
+            'device': status.device_info.label if status.device_info else None,
+            'screen_size': list(status.screen_size),
+            'timer': {'running': running, 'remaining': self.timer_thread.timer_seconds if running else 0},
+            'targets': {'total': len(self.targets), 'completed': self.count_completed_targets()},
+            'queued': self.dispatcher.pending() if self.dispatcher else self.nav_queue.pending(),
+            'batch': self.batch_runner.state if self.batch_runner else "idle",
+            'instances': [{'name': i.name, 'connected': i.connection.device is not None, 'busy': i.busy,
+                           'bubble_remaining': i.bubble_remaining()}
+                          for i in (self.dispatcher.instances if self.dispatcher else [])],
+        }
+    
+    def api_targets(self) -> list:
+        return [{'index': i, 'target': t.target_type, 'x': t.x_coordinate, 'y': t.y_coordinate,
+                 'completed': t.completed} for i, t in enumerate(self.targets)]
+    
+    def api_load_report(self, text: str, append: bool = False) -> dict:
+        """Load a scout report into the table, as if pasted (append adds it to the current report)"""
+        from iscout.api import ApiError     # Loaded with the server
+        if self.batch_runner and self.batch_runner.running:
+            raise ApiError("Auto-Scout is running")
+        if not str(text).strip():
+            raise ApiError("Report is empty")
+        if append and (current := self.txtiScoutBoss.toPlainText().strip()):
+            text = f"{current}\n{text}"
+        self.txtiScoutBoss.setPlainText(text)
+        try:
+            self.load_targets_to_table(interactive=False)
+        except Exception as e:
+            raise ApiError(f"Error loading targets: {e}") from e
+        return {'targets': len(self.targets)}
+    
+    def api_set_completed(self, index: int, completed: bool = True) -> dict:
+        from iscout.api import ApiError
+        index = int(index)
+        if not 0 <= index < len(self.targets):
+            raise ApiError(f"No target with index {index}")
+        self.set_target_checked(index, bool(completed))
+        return {'index': index, 'completed': self.targets[index].completed}
+    
+    def api_navigate(self, x: int, y: int, server: int = None, skip_server: bool = False,
+                     route: str = DEFAULT_ROUTE) -> dict:
+        """Queue a jump to server:x,y (server defaults to the enemy server) along a locations.xml route"""
+        from iscout.api import ApiError
+        if route not in self.engine.routes.routes:
+            raise ApiError(f"Unknown route: {route}")
+        if server is None and not self.dispatcher:
+            server = int(self.intEnemyServer.text() or "0")
+        return self.queue_navigation(NavRequest(int(x), int(y), server, skip_server=bool(skip_server),
+                                                route=route, label=f"{x},{y}"))
+    
+    def api_go_target(self, index: int) -> dict:
+        """Queue a jump to a table row and tick it off, like its Go button"""
+        from iscout.api import ApiError
+        index = int(index)
+        if not 0 <= index < len(self.targets):
+            raise ApiError(f"No target with index {index}")
+        target = self.targets[index]
+        server = None if self.dispatcher else int(self.intEnemyServer.text() or "0")
+        result = self.queue_navigation(NavRequest(target.x_coordinate, target.y_coordinate, server,
+                                                  target_index=index, skip_server=not self.dispatcher,
+                                                  label=f"target {index + 1}"))
+        self.set_target_checked(index, True)
+        return result
+    
+    def api_go_home(self) -> dict:
+        if self.dispatcher:
+            self.dispatcher.submit_to_all(lambda p: NavRequest(p.home_x, p.home_y, p.home_server, label="home"))
+            return {'queued': self.dispatcher.pending()}
+        return self.queue_navigation(NavRequest(self.config.home_x, self.config.home_y, self.config.home_server,
+                                                label="home"))
+    
+    def api_go_enemy(self) -> dict:
+        if self.dispatcher:
+            self.dispatcher.submit_to_all(
+                lambda p: NavRequest(*ENEMY_LANDING, p.enemy_server, start_bubble=True, label="enemy"))
+            return {'queued': self.dispatcher.pending()}
+        return self.queue_navigation(NavRequest(*ENEMY_LANDING, self.config.enemy_server, start_bubble=True,
+                                                label="enemy"))
+    
+    def api_clear_queue(self) -> dict:
+        (self.dispatcher or self.nav_queue).clear()
+        return {'queued': 0}
+    
+    def queue_navigation(self, request: NavRequest) -> dict:
+        """Put an API navigation on the multi-instance queue, or the primary device's queue"""
+        from iscout.api import ApiError
+        if self.batch_runner and self.batch_runner.running:
+            raise ApiError("Auto-Scout is running")
+        validate_coordinates(request.x, request.y, 1 if request.server is None else request.server)
+        if self.dispatcher:
+            self.dispatcher.submit(request)
+            return {'queued': self.dispatcher.pending()}
+        self.nav_queue.submit(request)
+        return {'queued': self.nav_queue.pending()}
     
     def paste_from_clipboard(self):
         """Paste data from clipboard to text input"""
@@ -1828,10 +2162,10 @@ class iScoutToolApp(QMainWindow):
             clipboard = QApplication.clipboard()
             if text := clipboard.text():
                 self.txtiScoutBoss.setPlainText(text)
-                print("Data pasted from clipboard")
+                ui_log.info("Data pasted from clipboard")
             
         except Exception as e:
-            print(f"Error pasting from clipboard: {e}")
+            ui_log.error("Error pasting from clipboard: %s", e)
     
     def test_connection(self):
         """Test ADB connection as specified in PRD"""
@@ -1843,7 +2177,7 @@ class iScoutToolApp(QMainWindow):
                 QMessageBox.warning(self, "Connection Test", "❌ Failed to connect to BlueStacks")
             
         except Exception as e:
-            print(f"Error testing connection: {e}")
+            adb_log.error("Error testing connection: %s", e)
             QMessageBox.critical(self, "Connection Error", f"Error testing connection: {e}")
     
     def closeEvent(self, event):
@@ -1856,16 +2190,56 @@ class iScoutToolApp(QMainWindow):
             # Save configuration
             self.save_config()
 
-            print("Application closing...")
+            # Release the audio device
+            if self._audio:
+                self._audio.shutdown()
+            
+            # Stop background discovery, the heartbeat and the presets watcher
+            self.engine.stop()
+            if self.dispatcher:
+                self.dispatcher.stop()
+            if self.batch_runner:
+                self.batch_runner.cancel()
+            if self.nav_queue:
+                self.nav_queue.stop()
+            if self.api_server:
+                self.api_server.stop()
+            if self.macro_recorder:
+                self.macro_recorder.stop()
+            if self.macro_player:
+                self.macro_player.cancelled = True
+            if self.calibrator:
+                self.calibrator.cancel()
+
+            # Destroy the overlay window and its emulator window hook
+            if getattr(self, 'moving_overlay', None):
+                self.moving_overlay.close()
+
+            ui_log.info("Application closing...")
         except Exception as e:
-            print(f"Error during close: {e}")
+            ui_log.error("Error during close: %s", e)
         event.accept()
 
-# Ensure entry point is at the end of the file
-if __name__ == "__main__":
-    import sys
-    from PyQt5.QtWidgets import QApplication
+def main():
+    """Application entry point"""
+    # ISCOUT_LOG sets levels per subsystem, e.g. "info,nav=debug"
+    setup_logging(os.path.join(os.path.dirname(os.path.abspath(__file__)), LOG_FILE),
+                  os.environ.get('ISCOUT_LOG', ''))
     app = QApplication(sys.argv)
     window = iScoutToolApp()
+    # --startup-probe: exit once the first frame is painted (for timing builds)
+    exit_after_paint = '--startup-probe' in sys.argv
+    def on_first_paint(elapsed_ms):
+        window.statusBar().showMessage(f"Started in {elapsed_ms:.0f} ms", 5000)
+        if exit_after_paint:
+            app.quit()
+        else:
+            window.after_first_paint()
+    window.startup_probe = FirstPaintProbe(window, on_first_paint, process_start_time())
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
+
+
+# Ensure entry point is at the end of the file
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,8 @@ a = Analysis(
         # Include Resources directory and contents
         ('Resources', 'Resources'),
         
-        # Include config file if it exists
+        # Include config files if they exist
+        ('iScoutConfig.json', '.') if os.path.exists(os.path.join(spec_dir, 'iScoutConfig.json')) else None,
         ('iScoutTool.cfg', '.') if os.path.exists(os.path.join(spec_dir, 'iScoutTool.cfg')) else None,
         
         # Include generated UI Python files for backup
@@ -29,6 +30,7 @@ a = Analysis(
         'PyQt5.QtWidgets', 
         'PyQt5.QtGui',
         'PyQt5.uic',
+        'iScoutToolModern_ui',  # Loaded by name in iscout.gui.startup
         'ppadb.client',
         'ppadb.device',
         'xml.etree.ElementTree',
@@ -0,0 +1,9 @@
+"""
+iscout - support package for iScoutTool
+
+Services used by the iScoutTool GUI that do not belong on the main window
+class. Modules in this package avoid importing PyQt5 unless they live under
+``iscout.gui``.
+"""
+
+__version__ = "1.0.0"
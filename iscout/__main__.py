@@ -0,0 +1,9 @@
+"""
+Entry point for ``python -m iscout``.
+"""
+
+import sys
+
+from iscout.cli import main
+
+sys.exit(main())
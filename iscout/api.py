@@ -0,0 +1,263 @@
+"""
+Localhost control API.
+
+``ControlServer`` serves JSON-RPC 2.0 over HTTP so local tools (spreadsheet
+macros, chat bots) can drive the app without clipboard round trips::
+
+    POST /rpc      {"jsonrpc": "2.0", "id": 1, "method": "navigate", "params": {"x": 600, "y": 600}}
+    GET  /events   Server-Sent Events stream of published notifications
+    GET  /health   {"ok": true, "version": "..."}
+
+The server binds to 127.0.0.1 only and handles each request on its own
+thread. Requests must carry ``Content-Type: application/json`` (browsers
+cannot send that cross-site without a preflight this server never
+answers) and a localhost ``Host`` header, which blocks DNS rebinding. An
+optional token is checked against ``Authorization: Bearer <token>``.
+"""
+
+import inspect
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from iscout import __version__
+from iscout.log import get_logger
+
+log = get_logger("api")
+
+DEFAULT_PORT = 8765
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = -32000
+
+
+class ApiError(Exception):
+    """Error returned to the caller as a JSON-RPC error object"""
+
+    def __init__(self, message: str, code: int = APPLICATION_ERROR):
+        super().__init__(message)
+        self.code = code
+
+
+class ControlServer:
+    """JSON-RPC and event stream server for a table of methods"""
+
+    MAX_BODY = 1024 * 1024          # Scout reports are a few KB
+    EVENT_BACKLOG = 256             # Events buffered per stream before old ones are dropped
+    KEEPALIVE_SECONDS = 15.0
+
+    def __init__(self, methods: Dict[str, Callable[..., Any]], port: int = DEFAULT_PORT,
+                 invoke: Optional[Callable[[Callable[[], Any]], Any]] = None, token: str = ""):
+        self.methods = methods
+        self.port = port
+        self.invoke = invoke            # Runs a call where the methods may touch state (e.g. GUI thread)
+        self.token = token
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._streams: List[queue.Queue] = []
+        self._streams_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        """Bind and serve on a background thread; raises OSError when the port is taken"""
+        if self._server is not None:
+            return
+        handler = type('Handler', (_Handler,), {'control': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="iScoutApi", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+        with self._streams_lock:
+            for stream in self._streams:
+                stream.put(None)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def publish(self, event: str, data: Any = None):
+        """Send a notification to every connected event stream (any thread)"""
+        message = f"event: {event}\ndata: {json.dumps(data, default=_to_json)}\n\n".encode('utf-8')
+        with self._streams_lock:
+            for stream in self._streams:
+                try:
+                    stream.put_nowait(message)
+                except queue.Full:
+                    # Slow reader: drop its oldest event rather than block the publisher
+                    try:
+                        stream.get_nowait()
+                        stream.put_nowait(message)
+                    except (queue.Empty, queue.Full):
+                        pass
+
+    # Request handling (server threads)
+
+    def call(self, request: Any) -> Optional[dict]:
+        """Execute one JSON-RPC request object; None for notifications"""
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+                or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, "Invalid Request")
+        request_id = request.get('id')
+        notification = 'id' not in request
+        method = self.methods.get(request['method'])
+        params = request.get('params', {})
+        try:
+            if method is None:
+                raise ApiError(f"Method not found: {request['method']}", METHOD_NOT_FOUND)
+            if not isinstance(params, (dict, list)):
+                raise ApiError("params must be an object or an array", INVALID_PARAMS)
+            args, kwargs = (params, {}) if isinstance(params, list) else ([], params)
+            try:
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                raise ApiError(str(e), INVALID_PARAMS)
+            call = lambda: method(*args, **kwargs)
+            result = self.invoke(call) if self.invoke else call()
+        except ApiError as e:
+            return None if notification else _error(request_id, e.code, str(e))
+        except ValueError as e:
+            return None if notification else _error(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            log.error("Error in API method %s: %s", request['method'], e)
+            return None if notification else _error(request_id, INTERNAL_ERROR, str(e))
+        return None if notification else {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def _open_stream(self) -> queue.Queue:
+        stream = queue.Queue(self.EVENT_BACKLOG)
+        with self._streams_lock:
+            self._streams.append(stream)
+        return stream
+
+    def _close_stream(self, stream: queue.Queue):
+        with self._streams_lock:
+            if stream in self._streams:
+                self._streams.remove(stream)
+
+
+def _error(request_id, code: int, message: str) -> dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _to_json(value):
+    """json.dumps fallback for dataclasses and other simple objects"""
+    if hasattr(value, '__dataclass_fields__'):
+        return {name: getattr(value, name) for name in value.__dataclass_fields__}
+    return str(value)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    control: ControlServer = None
+    protocol_version = 'HTTP/1.1'
+    server_version = f"iScoutTool/{__version__}"
+
+    def log_message(self, format, *args):
+        pass    # Requests are not worth a console line each
+
+    def do_GET(self):
+        if not self._allowed():
+            return
+        if self.path == '/health':
+            self._send_json(200, {'ok': True, 'version': __version__})
+        elif self.path == '/events':
+            self._stream_events()
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if not self._allowed():
+            return
+        # Answers before the body is read close the connection: the unread body is not a next request
+        if self.path != '/rpc':
+            self._send_json(404, {'error': 'not found'}, close=True)
+            return
+        if self.headers.get('Content-Type', '').split(';')[0].strip().lower() != 'application/json':
+            self._send_json(415, {'error': 'Content-Type must be application/json'}, close=True)
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {'error': 'bad Content-Length'}, close=True)
+            return
+        if length > self.control.MAX_BODY:
+            self._send_json(413, {'error': 'request too large'}, close=True)
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            self._send_json(200, _error(None, PARSE_ERROR, "Parse error"))
+            return
+
+        if isinstance(payload, list):
+            responses = [r for r in (self.control.call(p) for p in payload) if r is not None]
+            if not payload:
+                responses = _error(None, INVALID_REQUEST, "Invalid Request")
+        else:
+            responses = self.control.call(payload)
+        if responses is None or responses == []:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self._send_json(200, responses)
+
+    def _allowed(self) -> bool:
+        host = self.headers.get('Host', '').rsplit(':', 1)[0]
+        if host not in ('127.0.0.1', 'localhost', '[::1]'):
+            self._send_json(403, {'error': 'forbidden host'}, close=True)
+            return False
+        if self.control.token and self.headers.get('Authorization') != f"Bearer {self.control.token}":
+            self._send_json(401, {'error': 'missing or wrong token'}, close=True)
+            return False
+        return True
+
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        stream = self.control._open_stream()
+        try:
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while True:
+                try:
+                    message = stream.get(timeout=self.control.KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+        except OSError:
+            pass    # Client went away
+        finally:
+            self.control._close_stream(stream)
+
+    def _send_json(self, status: int, body: Any, close: bool = False):
+        data = json.dumps(body, default=_to_json).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if close:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,222 @@
+"""
+Non-blocking audio alerts for the bubble timer.
+
+Tones are rendered once into in-memory WAV buffers and played from a
+background worker thread, so an alert never stalls the Qt event loop.
+The actual output device is a pluggable backend:
+
+* ``WinsoundBackend`` - ``winsound.PlaySound`` from memory (Windows)
+* ``CommandBackend``  - ``aplay``/``paplay``/``pw-play`` on cached WAV files (Linux)
+* ``NullBackend``     - records what would have played (headless runs, tests)
+
+Set ``ISCOUT_AUDIO=null`` to force the null sink.
+"""
+
+import io
+import math
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from iscout.log import get_logger
+
+log = get_logger("timer")
+
+SAMPLE_RATE = 22050
+
+
+@dataclass(frozen=True)
+class Tone:
+    """Sine tone description"""
+    frequency: int          # Hz
+    duration_ms: int        # Length of the tone
+    volume: float = 0.6     # 0.0-1.0
+
+
+def render_tone(tone: Tone, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Render a tone to a 16-bit mono WAV file image"""
+    sample_count = int(sample_rate * tone.duration_ms / 1000)
+    amplitude = 32767 * max(0.0, min(tone.volume, 1.0))
+    # Short linear fade in/out so the tone does not click at the edges
+    fade = max(1, min(sample_count // 10, sample_rate // 200))
+    step = 2 * math.pi * tone.frequency / sample_rate
+
+    samples = array('h', bytes(2 * sample_count))
+    for i in range(sample_count):
+        envelope = min(1.0, i / fade, (sample_count - 1 - i) / fade)
+        samples[i] = int(amplitude * envelope * math.sin(step * i))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class NullBackend:
+    """Silent sink that records played alert names"""
+
+    name = "null"
+
+    def __init__(self):
+        self.played: List[str] = []
+
+    def prepare(self, name: str, wav_data: bytes):
+        pass
+
+    def play(self, name: str, wav_data: bytes):
+        self.played.append(name)
+
+    def close(self):
+        pass
+
+
+class WinsoundBackend:
+    """Play pre-rendered buffers with winsound.PlaySound (Windows)"""
+
+    name = "winsound"
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def prepare(self, name: str, wav_data: bytes):
+        pass
+
+    def play(self, name: str, wav_data: bytes):
+        # SND_MEMORY cannot be combined with SND_ASYNC, so this blocks the
+        # audio worker thread (never the GUI thread) for the tone duration.
+        self._winsound.PlaySound(wav_data, self._winsound.SND_MEMORY | self._winsound.SND_NODEFAULT)
+
+    def close(self):
+        pass
+
+
+class CommandBackend:
+    """Play cached WAV files through a command line player (ALSA/Pulse/PipeWire)"""
+
+    PLAYERS = (
+        ('paplay', []),
+        ('pw-play', []),
+        ('aplay', ['-q']),
+    )
+
+    def __init__(self, executable: str, args: Optional[List[str]] = None):
+        self.name = os.path.basename(executable)
+        self._command = [executable] + list(args or [])
+        self._directory = tempfile.mkdtemp(prefix="iscout-audio-")
+        self._files: Dict[str, str] = {}
+        self._process: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def find(cls) -> Optional['CommandBackend']:
+        """Return a backend for the first player found on PATH"""
+        for player, args in cls.PLAYERS:
+            if executable := shutil.which(player):
+                return cls(executable, args)
+        return None
+
+    def prepare(self, name: str, wav_data: bytes):
+        path = os.path.join(self._directory, f"{name}.wav")
+        with open(path, 'wb') as f:
+            f.write(wav_data)
+        self._files[name] = path
+
+    def play(self, name: str, wav_data: bytes):
+        if name not in self._files:
+            self.prepare(name, wav_data)
+        # Wait for the previous tone so alerts do not overlap and the
+        # finished player process is reaped.
+        if self._process is not None:
+            self._process.wait()
+        self._process = subprocess.Popen(
+            self._command + [self._files[name]],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def close(self):
+        if self._process is not None:
+            self._process.wait()
+            self._process = None
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+def default_backend():
+    """Pick the best available backend for this platform"""
+    if os.environ.get('ISCOUT_AUDIO', '').lower() == 'null':
+        return NullBackend()
+    if sys.platform == 'win32':
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            return NullBackend()
+    return CommandBackend.find() or NullBackend()
+
+
+class AudioService:
+    """Queue alerts to a background thread that owns the audio backend"""
+
+    MAX_PENDING = 4
+
+    def __init__(self, backend=None):
+        self.backend = backend or default_backend()
+        self._tones: Dict[str, Tone] = {}
+        self._buffers: Dict[str, bytes] = {}
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="iScoutAudio", daemon=True)
+        self._thread.start()
+
+    def register(self, name: str, tone: Tone):
+        """Register an alert and pre-render its buffer on the worker thread"""
+        with self._lock:
+            self._tones[name] = tone
+            self._buffers.pop(name, None)
+        self._queue.put((name, False))
+
+    def play(self, name: str) -> bool:
+        """Queue an alert and return immediately; drops it if the queue is full"""
+        try:
+            self._queue.put_nowait((name, True))
+            return True
+        except queue.Full:
+            return False
+
+    def shutdown(self, timeout: float = 2.0):
+        """Stop the worker thread and release the backend"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _buffer(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            if name not in self._buffers and name in self._tones:
+                self._buffers[name] = render_tone(self._tones[name])
+                self.backend.prepare(name, self._buffers[name])
+            return self._buffers.get(name)
+
+    def _run(self):
+        try:
+            while (item := self._queue.get()) is not None:
+                name, audible = item
+                try:
+                    if (data := self._buffer(name)) is not None and audible:
+                        self.backend.play(name, data)
+                except Exception as e:
+                    log.error("Error playing alert '%s': %s", name, e)
+        finally:
+            self.backend.close()
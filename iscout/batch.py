@@ -0,0 +1,203 @@
+"""
+Auto-scout batch runner.
+
+Walks a list of targets on a background thread: navigate, dwell (a fixed
+time, or until ``done()`` is signalled), mark the target done, move on.
+The run can be paused, resumed, skipped forward and cancelled at any
+point. Failed navigations are retried within a per-target limit and an
+overall budget, then skipped, so one bad target does not stop the sweep.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from iscout.log import get_logger
+
+log = get_logger("nav")
+
+# Runner states
+IDLE = "idle"
+RUNNING = "running"
+PAUSING = "pausing"      # Pause requested; the current navigation finishes first
+PAUSED = "paused"
+CANCELLED = "cancelled"
+FINISHED = "finished"
+
+# Per-item progress kinds
+NAVIGATING = "navigating"
+ARRIVED = "arrived"
+COMPLETED = "completed"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass
+class BatchItem:
+    """One target of a batch run"""
+    index: int          # Row in the scout table
+    x: int
+    y: int
+    label: str = ""
+
+
+@dataclass
+class BatchProgress:
+    """Notification published for every state or item change"""
+    state: str
+    kind: str = ""
+    item: Optional[BatchItem] = None
+    position: int = 0       # 1-based position of item in the run
+    total: int = 0
+    attempt: int = 0
+    message: str = ""
+
+
+class BatchRunner:
+    """Navigate to a list of targets one after another on a worker thread"""
+
+    def __init__(self, items: List[BatchItem], navigate: Callable[[BatchItem], None],
+                 dwell: Optional[float] = 8.0, max_retries: int = 2, retry_budget: int = 10,
+                 listener: Optional[Callable[[BatchProgress], None]] = None):
+        self.items = list(items)
+        self.navigate = navigate            # Raises on failure
+        self.dwell = dwell                  # Seconds at each target; None/0 = wait for done()
+        self.max_retries = max_retries      # Extra attempts per target
+        self.retry_budget = retry_budget    # Extra attempts for the whole run
+        self.listener = listener
+        self.state = IDLE
+        self._condition = threading.Condition()
+        self._paused = False
+        self._cancelled = False
+        self._advance = False               # done()/skip() ends the current dwell
+        self._skip = False
+        self._thread: Optional[threading.Thread] = None
+
+    # Controls (any thread)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="iScoutBatch", daemon=True)
+            self._thread.start()
+
+    def pause(self):
+        with self._condition:
+            self._paused = True
+            if self.state == RUNNING:
+                self._set_state(PAUSING)
+            self._condition.notify_all()
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            if self.state in (PAUSING, PAUSED):
+                self._set_state(RUNNING)
+            self._condition.notify_all()
+
+    def done(self):
+        """Finish the dwell at the current target and move to the next one"""
+        with self._condition:
+            self._advance = True
+            self._condition.notify_all()
+
+    def skip(self):
+        """Leave the current target without marking it done"""
+        with self._condition:
+            self._advance = True
+            self._skip = True
+            self._condition.notify_all()
+
+    def cancel(self):
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self.state in (RUNNING, PAUSING, PAUSED)
+
+    # Worker thread
+
+    def _run(self):
+        total = len(self.items)
+        budget = self.retry_budget
+        self._set_state(RUNNING)
+        for position, item in enumerate(self.items, start=1):
+            if not self._wait_while_paused():
+                break
+            with self._condition:
+                self._advance = self._skip = False
+
+            arrived = False
+            attempt = 0
+            while not arrived and not self._cancelled:
+                attempt += 1
+                self._publish(BatchProgress(self.state, NAVIGATING, item, position, total, attempt))
+                try:
+                    self.navigate(item)
+                    arrived = True
+                except Exception as e:
+                    retry = attempt <= self.max_retries and budget > 0
+                    self._publish(BatchProgress(self.state, FAILED, item, position, total, attempt,
+                                                f"{e}{' - retrying' if retry else ''}"))
+                    if not retry:
+                        break
+                    budget -= 1
+                    if not self._wait_while_paused():
+                        break
+            if self._cancelled:
+                break
+            if not arrived:
+                continue
+
+            self._publish(BatchProgress(self.state, ARRIVED, item, position, total, attempt))
+            self._dwell()
+            if self._cancelled:
+                break
+            kind = SKIPPED if self._skip else COMPLETED
+            self._publish(BatchProgress(self.state, kind, item, position, total, attempt))
+
+        self._set_state(CANCELLED if self._cancelled else FINISHED)
+
+    def _dwell(self):
+        """Stay at the target for the dwell time or until done/skip/cancel; pausing stops the clock"""
+        with self._condition:
+            remaining = self.dwell if self.dwell else None
+            while not (self._advance or self._cancelled):
+                if self._paused:
+                    if self.state != PAUSED:
+                        self._set_state(PAUSED)
+                    while self._paused and not (self._advance or self._cancelled):
+                        self._condition.wait()
+                    continue
+                if remaining is None:
+                    self._condition.wait()
+                    continue
+                if remaining <= 0:
+                    break
+                started = time.monotonic()
+                self._condition.wait(remaining)
+                if not self._paused:
+                    remaining -= time.monotonic() - started
+
+    def _wait_while_paused(self) -> bool:
+        """Block while paused (resume() sets the state back); False when the run was cancelled"""
+        with self._condition:
+            if self._paused and not self._cancelled:
+                if self.state != PAUSED:
+                    self._set_state(PAUSED)
+                while self._paused and not self._cancelled:
+                    self._condition.wait()
+            return not self._cancelled
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._publish(BatchProgress(state, message=state))
+
+    def _publish(self, progress: BatchProgress):
+        if self.listener:
+            try:
+                self.listener(progress)
+            except Exception as e:
+                log.error("Error publishing batch progress: %s", e)
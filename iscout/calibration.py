@@ -0,0 +1,213 @@
+"""
+Self-tuning step delays.
+
+The waits written in a route were tuned by hand for one machine.
+``DelayCalibrator`` measures them on the connected emulator instead: it
+jumps back and forth between two map positions, reads the screen back after
+each jump and compares it with what a jump using the written delays
+produced. Each wait is binary-searched down to the shortest value that
+still lands reliably, then padded with a safety margin.
+
+Results are stored per device profile (model and resolution) in
+iScoutDelays.json and used by ``RouteBook`` for navigations on that
+profile::
+
+    {"profiles": {"SM-G960N 1080x1920": {"navigate": [
+        {"step": 0, "kind": "tap", "preset": "NavBox", "wait": 0.18}, ...]}}}
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from iscout.files import write_atomic
+from iscout.log import get_logger
+from iscout.navigator import DEFAULT_ROUTE
+from iscout.routes import DRAG, SHELL, TAP, TEXT, WAIT, Route, RouteBook, compile_route, with_waits
+from iscout.screen import Rgb, capture, colour_distance, grid_points
+
+log = get_logger("nav")
+
+# Two map positions far enough apart that the screens differ
+CALIBRATION_TARGETS = ((300, 300), (900, 900))
+TUNABLE_KINDS = (TAP, TEXT, DRAG, WAIT, SHELL)
+
+
+class CalibrationError(Exception):
+    """Calibration could not run or could not get back to a known state"""
+
+
+@dataclass
+class CalibrationProgress:
+    """Published after every trial and when a step is settled"""
+    step: int               # Index in the route
+    label: str              # e.g. "text NavX"
+    wait: float             # Candidate (or final) seconds
+    passed: Optional[bool] = None   # Trial result; None once the step is settled
+    message: str = ""
+
+
+def load_delays(path: str, routes: Dict[str, Route]) -> Dict[str, Dict[str, Dict[int, float]]]:
+    """Calibrated waits by profile and route; entries that no longer match the route's step are dropped"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profiles = json.load(f).get('profiles', {})
+    except (OSError, ValueError) as e:
+        log.error("Error loading calibrated delays: %s", e)
+        return {}
+    delays = {}
+    for profile, by_route in profiles.items():
+        for name, entries in by_route.items():
+            route = routes.get(name)
+            if route is None:
+                continue
+            waits = {e['step']: float(e['wait']) for e in entries
+                     if e['step'] < len(route.steps)
+                     and route.steps[e['step']].kind == e.get('kind')
+                     and route.steps[e['step']].preset == e.get('preset', '')}
+            if waits:
+                delays.setdefault(profile, {})[name] = waits
+    return delays
+
+
+def save_delays(path: str, profile: str, route: Route, waits: Dict[int, float]):
+    """Store the waits of one route for one profile, keeping the other entries of the file"""
+    data = {'profiles': {}}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    data.setdefault('profiles', {}).setdefault(profile, {})[route.name] = [
+        {'step': i, 'kind': route.steps[i].kind, 'preset': route.steps[i].preset, 'wait': wait}
+        for i, wait in sorted(waits.items())
+    ]
+    write_atomic(path, json.dumps(data, indent=2))
+
+
+def step_label(route: Route, index: int) -> str:
+    step = route.steps[index]
+    return f"{step.kind} {step.preset}".strip()
+
+
+class DelayCalibrator:
+    """Binary-search the waits of one route on one device"""
+
+    MATCH_RATIO = 0.8       # Share of sample points that must match the reference screen
+    TOLERANCE = 30          # Per-channel colour difference still counted as a match
+
+    def __init__(self, device, routes: RouteBook, screen_size: Tuple[int, int], server: int,
+                 route: str = DEFAULT_ROUTE, targets: Sequence[Tuple[int, int]] = CALIBRATION_TARGETS,
+                 trials: int = 3, margin: float = 0.25, resolution: float = 0.02, settle: float = 2.0,
+                 listener: Optional[Callable[[CalibrationProgress], None]] = None,
+                 sleep: Callable[[float], None] = time.sleep, devices: Sequence[str] = ()):
+        self.device = device
+        self.routes = routes
+        self.screen_size = screen_size
+        self.presets = routes.presets_for(screen_size, devices)     # Fixed for the run, even if reloaded
+        self.server = server
+        self.route = routes.routes[route]
+        self.targets = list(targets)
+        self.trials = trials            # Consecutive good jumps for a wait to count as reliable
+        self.margin = margin            # Added to the shortest reliable wait (0.25 = +25%)
+        self.resolution = resolution    # Search stops when the bracket is this narrow (seconds)
+        self.settle = settle            # Seconds for the map to finish moving before the read-back
+        self.listener = listener
+        self.sleep = sleep
+        self.points = grid_points(*screen_size)
+        self._references: Dict[Tuple[int, int], List[Rgb]] = {}
+        self._current = 0               # Index of the target the map shows
+        self._cancelled = threading.Event()
+
+    def tunable_steps(self) -> List[int]:
+        """Indexes of the steps with a wait that run on a full (server entered) jump"""
+        params = self._params(self.targets[0])
+        return [i for i, step in enumerate(self.route.steps)
+                if step.kind in TUNABLE_KINDS and step.wait > 0 and step.active(params)]
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self) -> Dict[int, float]:
+        """Calibrate every tunable step; returns {step index: seconds}"""
+        original = {i: self.route.steps[i].wait for i in self.tunable_steps()}
+        if not original:
+            raise CalibrationError(f"Route {self.route.name} has no waits to calibrate")
+
+        # Reference screens with the written delays
+        for index, target in enumerate(self.targets):
+            self._jump(original, index)
+            self._references[target] = self._read_back()
+        first, second = (self._references[t] for t in self.targets[:2])
+        if self._matches(first, second):
+            raise CalibrationError("Both calibration targets look the same; move the map to a busier area")
+
+        waits = dict(original)
+        for step in original:
+            low, high = 0.0, original[step]
+            while high - low > self.resolution:
+                self._check_cancelled()
+                candidate = round((low + high) / 2, 3)
+                if self._reliable({**waits, step: candidate}, step):
+                    high = candidate
+                else:
+                    low = candidate
+            waits[step] = round(min(original[step], high * (1 + self.margin) + self.resolution), 3)
+            self._publish(CalibrationProgress(step, step_label(self.route, step), waits[step],
+                                              message=f"{original[step]:.3f}s -> {waits[step]:.3f}s"))
+
+        # The tuned waits must also hold up together
+        if not self._reliable(waits, -1, self.trials * 2):
+            raise CalibrationError("Tuned delays were not reliable together; kept the written delays")
+        return waits
+
+    def _reliable(self, waits: Dict[int, float], step: int, trials: Optional[int] = None) -> bool:
+        for _ in range(trials or self.trials):
+            self._check_cancelled()
+            target = (self._current + 1) % len(self.targets)
+            self._jump(waits, target)
+            passed = self._matches(self._read_back(), self._references[self.targets[target]])
+            if step >= 0:
+                self._publish(CalibrationProgress(step, step_label(self.route, step), waits[step], passed))
+            if not passed:
+                self._recover(target)
+                return False
+        return True
+
+    def _recover(self, target: int):
+        """Jump again with the written delays until the map is back at a known target"""
+        for _ in range(2):
+            self._jump({}, target)
+            if self._matches(self._read_back(), self._references[self.targets[target]]):
+                return
+        raise CalibrationError("Could not get back to a known map position; check the game screen")
+
+    def _jump(self, waits: Dict[int, float], target: int):
+        plan = compile_route(with_waits(self.route, waits), self.presets, self.screen_size)
+        plan.run(self.device, self._params(self.targets[target]), self.sleep)
+        self._current = target
+
+    def _params(self, target: Tuple[int, int]) -> dict:
+        return {'x': target[0], 'y': target[1], 'server': self.server, 'skip_server': False}
+
+    def _read_back(self) -> List[Rgb]:
+        self.sleep(self.settle)
+        return capture(self.device).pixels(self.points)
+
+    def _matches(self, sample: List[Rgb], reference: List[Rgb]) -> bool:
+        same = sum(colour_distance(a, b) <= self.TOLERANCE for a, b in zip(sample, reference))
+        return same >= self.MATCH_RATIO * len(reference)
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise CalibrationError("Calibration cancelled")
+
+    def _publish(self, progress: CalibrationProgress):
+        if self.listener:
+            try:
+                self.listener(progress)
+            except Exception as e:
+                log.error("Error publishing calibration progress: %s", e)
@@ -0,0 +1,427 @@
+"""
+Command line interface: ``python -m iscout <command>``.
+
+Runs the engine without Qt, so scripts can drive the emulator from a
+console or a display-less host::
+
+    python -m iscout devices
+    python -m iscout navigate --server 123 600 600
+    python -m iscout home
+    python -m iscout run report.txt --dwell 10
+    python -m iscout record jump.macro
+    python -m iscout replay jump.macro --compress 2 --ready echo
+    python -m iscout calibrate --trials 3
+    python -m iscout signatures 600 600
+    python -m iscout digits
+    python -m iscout layout calibrate
+    python -m iscout spawns --server 123 --type arctic --level 5 --days 7
+
+Exit status is 0 on success, 1 when a navigation failed, 2 for usage
+errors and 3 when no emulator could be reached.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from iscout import __version__
+from iscout.batch import (
+    BatchItem, BatchProgress, BatchRunner,
+    ARRIVED, FAILED, NAVIGATING, SKIPPED, CANCELLED, FINISHED
+)
+from iscout.calibration import CalibrationError, CalibrationProgress
+from iscout.engine import Engine, PresetReload
+from iscout.flight import flight_recorder
+from iscout.layout import LayoutError
+from iscout.log import setup_logging
+from iscout.trace import tracer
+from iscout.macros import READY_ECHO, MacroError, MacroPlayer, MacroRecorder, load_macro, macro_to_route_xml, \
+    save_macro
+from iscout.navigator import DEFAULT_ROUTE, NavigationError
+from iscout.readback import ReadbackError
+from iscout.spawns import SpawnError, save_heatmap
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_OFFLINE = 3
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="iscout", description="Headless iScoutTool navigation")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--base-dir', help="directory with iScoutConfig.json and Resources (default: install dir)")
+    parser.add_argument('--profile', help="config profile to use (default: the one last used in the GUI)")
+    parser.add_argument('--port', type=int, help="preferred emulator ADB port (default: from config)")
+    parser.add_argument('--serial', help="ADB serial of the emulator to drive (default: from config)")
+    parser.add_argument('--timeout', type=float, default=15.0, help="seconds to wait for the emulator")
+    parser.add_argument('--log', default=os.environ.get('ISCOUT_LOG', 'warning'),
+                        help="log levels on stderr, e.g. 'info' or 'warning,adb=debug' (default: %(default)s)")
+    parser.add_argument('--trace', metavar='FILE', help="write a Chrome/Perfetto trace of the run to FILE")
+    parser.add_argument('--flight-record', metavar='FILE', help="write the ADB commands of the run to FILE")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    commands.add_parser('devices', help="list the emulators that discovery finds")
+
+    navigate = commands.add_parser('navigate', help="jump to map coordinates")
+    navigate.add_argument('x', type=int)
+    navigate.add_argument('y', type=int)
+    navigate.add_argument('--server', type=int, help="server number (default: enemy server from config)")
+    navigate.add_argument('--skip-server', action='store_true', help="keep the server the map already shows")
+    navigate.add_argument('--route', default=DEFAULT_ROUTE, help="route from locations.xml (default: %(default)s)")
+
+    commands.add_parser('routes', help="list the navigation routes")
+
+    commands.add_parser('home', help="jump to the home coordinates from config")
+    commands.add_parser('enemy', help="jump to the enemy server from config")
+    commands.add_parser('view-enemy', help="jump to the centre (600,600) of the enemy server")
+
+    parse = commands.add_parser('parse', help="list the targets of a scout report without navigating")
+    parse.add_argument('report')
+
+    run = commands.add_parser('run', help="visit every target of a scout report in turn")
+    run.add_argument('report')
+    run.add_argument('--server', type=int, help="server of the targets (default: enemy server from config)")
+    run.add_argument('--dwell', type=float, default=8.0,
+                     help="seconds at each target; 0 waits for Enter (s + Enter skips, q + Enter stops)")
+
+    record = commands.add_parser('record', help="record touches made in the emulator until Enter")
+    record.add_argument('macro', help="macro file to write")
+
+    replay = commands.add_parser('replay', help="replay a recorded macro")
+    replay.add_argument('macro')
+    replay.add_argument('--compress', type=float, default=1.0, help="time compression, 2 = twice as fast")
+    replay.add_argument('--min-delay', type=int, default=0, help="lower bound of every step delay in ms")
+    replay.add_argument('--ready', choices=[READY_ECHO], help="device round trip before every step")
+
+    calibrate = commands.add_parser('calibrate', help="measure the shortest reliable route delays for this emulator")
+    calibrate.add_argument('--route', default=DEFAULT_ROUTE, help="route to calibrate (default: %(default)s)")
+    calibrate.add_argument('--server', type=int, help="server to jump around on (default: enemy server from config)")
+    calibrate.add_argument('--trials', type=int, default=3, help="good jumps needed per candidate delay")
+    calibrate.add_argument('--margin', type=float, default=0.25, help="safety margin added to each delay (0.25 = 25%%)")
+
+    signatures = commands.add_parser('signatures', help="record the pixel checks of verify= route steps")
+    signatures.add_argument('x', type=int)
+    signatures.add_argument('y', type=int)
+    signatures.add_argument('--server', type=int, help="server (default: enemy server from config)")
+    signatures.add_argument('--route', default=DEFAULT_ROUTE, help="route to record (default: %(default)s)")
+
+    digits = commands.add_parser('digits', help="learn the coordinate readout font for arrival readback")
+    digits.add_argument('--server', type=int, help="server (default: enemy server from config)")
+
+    layout = commands.add_parser('layout', help="find the navigation elements on this emulator's resolution")
+    layout.add_argument('action', choices=('capture', 'calibrate'),
+                        help="capture: cut element templates from a layout that works; "
+                             "calibrate: find them on this screen and save a resolution profile")
+
+    spawns = commands.add_parser('spawns', help="where and how often spawn types appeared in past reports")
+    spawns.add_argument('--add', metavar='REPORT', help="record the targets of a scout report first")
+    spawns.add_argument('--server', type=int, help="only this server (with --add: server of the report, "
+                                                   "default: enemy server from config)")
+    spawns.add_argument('--type', default="", help="only spawn names containing this, e.g. 'arctic'")
+    spawns.add_argument('--level', type=int, help="only this level")
+    spawns.add_argument('--days', type=float, help="only the last N days")
+    spawns.add_argument('--heatmap', metavar='FILE', help="write the matching sightings per tile (.npy or CSV)")
+    spawns.add_argument('--cell', type=int, default=1, help="tiles per heatmap cell side (default: %(default)s)")
+
+    macro_route = commands.add_parser('macro-route', help="print a macro as a <route> for locations.xml")
+    macro_route.add_argument('macro')
+    macro_route.add_argument('name', help="route name")
+    macro_route.add_argument('--compress', type=float, default=1.0, help="time compression of the step waits")
+    macro_route.add_argument('--min-delay', type=int, default=0, help="lower bound of every step wait in ms")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        setup_logging(levels=args.log, console=sys.stderr)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return EXIT_USAGE
+    engine = Engine(args.base_dir)
+    # Every command ends in the finally below: engine.stop() writes a pending config migration
+    try:
+        try:
+            engine.load()
+        except Exception as e:
+            print(f"Error loading configuration: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        if args.profile is not None:
+            if args.profile not in engine.store.profiles:
+                print(f"No config profile '{args.profile}' (have: {', '.join(engine.store.names())})",
+                      file=sys.stderr)
+                return EXIT_USAGE
+            engine.store.active = args.profile     # For this run only; the GUI's choice is kept
+        if args.port is not None:
+            engine.config.adb_port = args.port
+        if args.serial is not None:
+            engine.config.device_serial = args.serial
+
+        if args.command not in OFFLINE_COMMANDS and engine.connect(args.timeout) is None \
+                and args.command != 'devices':
+            print(f"No emulator connected: {engine.connection.status.message}", file=sys.stderr)
+            return EXIT_OFFLINE
+        return COMMANDS[args.command](engine, args)
+    except (NavigationError, ValueError) as e:
+        print(f"Navigation failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except (MacroError, OSError) as e:
+        print(f"Macro failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except CalibrationError as e:
+        print(f"Calibration failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except ReadbackError as e:
+        print(f"Learning digits failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except LayoutError as e:
+        print(f"Layout calibration failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        return EXIT_FAILED
+    finally:
+        engine.stop()
+        if args.trace:
+            print(f"Wrote {tracer.export(args.trace)} trace spans to {args.trace}", file=sys.stderr)
+        if args.flight_record:
+            flight_recorder.dump(f"iscout {args.command}", args.flight_record)
+
+
+def cmd_devices(engine: Engine, args) -> int:
+    devices = engine.connection.devices
+    if not devices:
+        print(f"No emulators found: {engine.connection.status.message}", file=sys.stderr)
+        return EXIT_OFFLINE
+    current = engine.device.serial if engine.device else None
+    for info in devices:
+        layout = engine.routes.layout_key(info.resolution, (info.serial, info.model))
+        print(f"{'*' if info.serial == current else ' '} {info.label}{f' [{layout} layout]' if layout else ''}")
+    return EXIT_OK
+
+
+def cmd_navigate(engine: Engine, args) -> int:
+    landed = engine.navigate(args.x, args.y, args.server, skip_server=args.skip_server, route=args.route)
+    print(f"Navigated to {args.server or engine.config.enemy_server}:{args.x},{args.y}"
+          f"{' (confirmed on screen)' if landed else ''}")
+    return EXIT_OK
+
+
+def cmd_home(engine: Engine, args) -> int:
+    engine.return_home()
+    print("Navigated home - remember to bubble!")
+    return EXIT_OK
+
+
+def cmd_enemy(engine: Engine, args) -> int:
+    engine.go_enemy()
+    print(f"Navigated to enemy server {engine.config.enemy_server}")
+    return EXIT_OK
+
+
+def cmd_view_enemy(engine: Engine, args) -> int:
+    engine.view_enemy()
+    print(f"Viewing enemy server {engine.config.enemy_server} at 600,600")
+    return EXIT_OK
+
+
+def cmd_parse(engine: Engine, args) -> int:
+    for i, target in enumerate(engine.load_targets(args.report), start=1):
+        print(f"{i:3d}  {target.x_coordinate:4d} {target.y_coordinate:4d}  {target.target_type}")
+    return EXIT_OK
+
+
+def cmd_routes(engine: Engine, args) -> int:
+    for name in engine.routes.names():
+        steps = engine.routes.routes[name].steps
+        print(f"{name:16s} {' '.join(s.kind + (':' + s.preset if s.preset else '') for s in steps)}")
+    return EXIT_OK
+
+
+def cmd_run(engine: Engine, args) -> int:
+    targets = engine.load_targets(args.report)
+    if not targets:
+        print("No targets in report", file=sys.stderr)
+        return EXIT_FAILED
+    server = args.server or engine.config.enemy_server
+    items = [BatchItem(i, t.x_coordinate, t.y_coordinate, t.target_type) for i, t in enumerate(targets)]
+
+    # The server is entered for the first target only; later jumps stay on it
+    server_entered = [False]
+    def navigate(item: BatchItem):
+        engine.navigate(item.x, item.y, server, skip_server=server_entered[0])
+        server_entered[0] = True
+
+    reached = set()
+    finished = threading.Event()
+    def on_progress(progress: BatchProgress):
+        where = f"[{progress.position}/{progress.total}]"
+        item = progress.item
+        if progress.kind == NAVIGATING:
+            print(f"{where} {item.x},{item.y} {item.label}")
+        elif progress.kind == ARRIVED:
+            reached.add(item.index)
+            if not args.dwell:
+                print("      Enter = next, s = skip, q = stop")
+        elif progress.kind == FAILED:
+            print(f"      failed: {progress.message}")
+        elif progress.kind == SKIPPED:
+            print("      skipped")
+        elif progress.state in (FINISHED, CANCELLED):
+            finished.set()
+
+    def on_reload(result: PresetReload):
+        print(f"      presets {'not reloaded: ' + result.error if result.error else 'reloaded'}")
+
+    engine.spawns.record(targets, server)
+    # A long run picks up edits to locations.xml between targets
+    engine.watch_presets(on_reload)
+    runner = BatchRunner(items, navigate, dwell=args.dwell or None, listener=on_progress)
+    runner.start()
+    if not args.dwell:
+        threading.Thread(target=read_controls, args=(runner,), name="iScoutStdin", daemon=True).start()
+    try:
+        while not finished.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        runner.cancel()
+        finished.wait(5.0)
+        print("Cancelled")
+        return EXIT_FAILED
+
+    print(f"Done: {len(reached)}/{len(items)} targets reached")
+    return EXIT_OK if len(reached) == len(items) else EXIT_FAILED
+
+
+def cmd_record(engine: Engine, args) -> int:
+    recorder = MacroRecorder(engine.screen_size())
+    recorder.start()
+    recorder.start_touches(engine.device)
+    print("Recording touches - press Enter to stop")
+    try:
+        sys.stdin.readline()
+    finally:
+        macro = recorder.stop()
+    save_macro(args.macro, macro)
+    print(f"Saved {len(macro.steps)} steps ({macro.duration_ms} ms) to {args.macro}")
+    return EXIT_OK
+
+
+def cmd_replay(engine: Engine, args) -> int:
+    player = MacroPlayer(load_macro(args.macro), args.compress, args.min_delay, args.ready or "")
+    elapsed = engine.play_macro(player)
+    print(f"Replayed {len(player.macro.steps)} steps in {elapsed:.2f}s")
+    return EXIT_OK
+
+
+def cmd_calibrate(engine: Engine, args) -> int:
+    def on_progress(progress: CalibrationProgress):
+        if progress.passed is None:
+            print(f"  {progress.label:16s} {progress.message}")
+        else:
+            print(f"    {progress.label:14s} {progress.wait:.3f}s {'ok' if progress.passed else 'missed'}")
+
+    calibrator = engine.calibrator(args.route, args.server, on_progress, trials=args.trials, margin=args.margin)
+    print(f"Calibrating {args.route} on {engine.profile} - the map will jump back and forth for a few minutes")
+    waits = engine.calibrate(calibrator)
+    print(f"Saved {len(waits)} delays to {engine.delays_file}")
+    return EXIT_OK
+
+
+def cmd_signatures(engine: Engine, args) -> int:
+    recorded = engine.record_signatures(args.x, args.y, args.server, args.route)
+    print(f"Recorded {', '.join(sorted(recorded)) or 'no'} pixel signatures for {engine.profile} "
+          f"in {engine.signatures_file} - check that the jump landed correctly")
+    return EXIT_OK
+
+
+def cmd_digits(engine: Engine, args) -> int:
+    learnt = engine.learn_digits(args.server)
+    print(f"Learnt {' '.join(learnt)} from the coordinate readout; saved to {engine.digits_file}")
+    return EXIT_OK
+
+
+def cmd_layout(engine: Engine, args) -> int:
+    def on_progress(message: str):
+        print(f"  {message}")
+
+    if args.action == 'capture':
+        names = engine.capture_layout_templates(on_progress)
+        print(f"Saved templates of {', '.join(names)} to {engine.layout_templates_file}")
+    else:
+        presets = engine.calibrate_layout(on_progress)
+        width, height = engine.screen_size()
+        print(f"Saved {len(presets)} presets for {width}x{height}; they are used on this resolution from now on")
+    return EXIT_OK
+
+
+def cmd_macro_route(engine: Engine, args) -> int:
+    try:
+        print(macro_to_route_xml(load_macro(args.macro), args.name, args.compress, args.min_delay))
+    except (MacroError, OSError) as e:
+        print(f"Macro failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+def cmd_spawns(engine: Engine, args) -> int:
+    if args.add:
+        targets = engine.load_targets(args.add)
+        added = engine.spawns.record(targets, args.server or engine.config.enemy_server)
+        print(f"Recorded {added} new sightings of {len(targets)} targets")
+    try:
+        spawns = engine.spawns.load()
+    except SpawnError as e:
+        print(e, file=sys.stderr)
+        return EXIT_FAILED
+    since = time.time() - args.days * 86400 if args.days else None
+    mask = spawns.select(args.server, args.type, args.level, since)
+    stats = spawns.recurrence(mask)
+    if not stats:
+        print("No sightings match")
+    for s in stats:
+        level = f"Lv{s.level}" if s.level else ""
+        print(f"{s.name:24s} {level:5s} {s.sightings:6d} sightings on {s.days:3d} days, {s.locations:5d} tiles "
+              f"({s.repeat_rate:4.0%} repeat), busiest around {s.hotspot[0]},{s.hotspot[1]} ({s.hotspot_share:.0%})")
+    if args.heatmap:
+        save_heatmap(args.heatmap, spawns.heatmap(mask, max(args.cell, 1)))
+        print(f"Wrote the heatmap of {int(mask.sum())} sightings to {args.heatmap}")
+    return EXIT_OK
+
+
+def read_controls(runner: BatchRunner):
+    """Turn console lines into runner controls: Enter = done, s = skip, q or EOF = cancel"""
+    for line in sys.stdin:
+        command = line.strip().lower()
+        if command == 'q':
+            break
+        if command == 's':
+            runner.skip()
+        else:
+            runner.done()
+    runner.cancel()
+
+
+COMMANDS = {
+    'parse': cmd_parse,
+    'routes': cmd_routes,
+    'macro-route': cmd_macro_route,
+    'spawns': cmd_spawns,
+    'devices': cmd_devices,
+    'navigate': cmd_navigate,
+    'home': cmd_home,
+    'enemy': cmd_enemy,
+    'view-enemy': cmd_view_enemy,
+    'run': cmd_run,
+    'record': cmd_record,
+    'replay': cmd_replay,
+    'calibrate': cmd_calibrate,
+    'signatures': cmd_signatures,
+    'digits': cmd_digits,
+    'layout': cmd_layout,
+}
+OFFLINE_COMMANDS = {'parse', 'routes', 'macro-route', 'spawns'}    # Run without connecting to an emulator
@@ -0,0 +1,235 @@
+"""
+Configuration store: named profiles in iScoutConfig.json.
+
+Each profile is a complete ``AppConfig`` (account home, enemy server and
+emulator device), so switching accounts or emulators is one choice::
+
+    {"version": 1, "active": "main",
+     "profiles": {"main": {"home_server": 123, "home_x": 600, ...}}}
+
+``ConfigStore`` keeps the profiles in memory. ``save()`` validates on the
+calling thread and returns at once; a background thread writes the file
+only when its content actually changed, atomically (temporary file, then
+rename), so a crash never leaves half a config behind and pressing Go
+Home or Go Enemy costs no disk write.
+
+The old iScoutTool.cfg, a single CSV line
+``home_server,home_x,home_y,enemy_server,adb_port,device_serial,scan_ports,api_port``,
+is migrated into a "default" profile when no iScoutConfig.json exists
+yet. It is left in place but no longer written.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict, fields, replace
+from typing import Dict, List, Optional, Tuple
+
+from iscout.files import write_atomic
+from iscout.log import get_logger
+from iscout.models import AppConfig
+from iscout.navigator import MAX_SERVER, MAX_X, MAX_Y
+
+log = get_logger("ui")
+
+CONFIG_VERSION = 1
+DEFAULT_PROFILE = "default"
+
+
+def load_legacy_config(path: str) -> AppConfig:
+    """Read an iScoutTool.cfg CSV line; defaults when it is missing or empty, ValueError when malformed
+
+    Files written before the device fields existed carry only the first
+    four values and still load.
+    """
+    config = AppConfig()
+    if not os.path.exists(path):
+        return config
+    with open(path, 'r') as f:
+        line = f.readline().strip()
+    if not line:
+        return config
+    parts = line.split(',')
+    if len(parts) < 4:
+        raise ValueError(f"Expected at least 4 values in {os.path.basename(path)}, found {len(parts)}")
+    config.home_server = int(parts[0])
+    config.home_x = int(parts[1])
+    config.home_y = int(parts[2])
+    config.enemy_server = int(parts[3])
+    # Optional device fields added after the original four
+    if len(parts) >= 5 and parts[4].strip():
+        config.adb_port = int(parts[4])
+    if len(parts) >= 6:
+        config.device_serial = parts[5].strip()
+    if len(parts) >= 7:
+        config.scan_ports = parts[6].strip()
+    if len(parts) >= 8 and parts[7].strip():
+        config.api_port = int(parts[7])
+    return config
+
+
+def validate_config(config: AppConfig):
+    """Raise ValueError when a home or enemy value is outside the game bounds"""
+    if not (1 <= config.home_server <= MAX_SERVER):
+        raise ValueError(f"Home server must be between 1-{MAX_SERVER}")
+    if not (1 <= config.home_x <= MAX_X):
+        raise ValueError(f"Home X coordinate must be between 1-{MAX_X}")
+    if not (1 <= config.home_y <= MAX_Y):
+        raise ValueError(f"Home Y coordinate must be between 1-{MAX_Y}")
+    if not (1 <= config.enemy_server <= MAX_SERVER):
+        raise ValueError(f"Enemy server must be between 1-{MAX_SERVER}")
+
+
+def config_from_dict(data: dict, profile: str = "") -> AppConfig:
+    """Typed AppConfig from a profile entry; missing fields keep their defaults, wrong types raise ValueError"""
+    config = AppConfig()
+    for f in fields(AppConfig):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        if f.type is int and isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            value = int(value)
+        if type(value) is not f.type:
+            raise ValueError(f"Profile '{profile}': {f.name} must be {f.type.__name__}, not {value!r}")
+        setattr(config, f.name, value)
+    unknown = set(data) - {f.name for f in fields(AppConfig)}
+    if unknown:
+        log.warning("Profile '%s': ignoring unknown settings %s", profile, ", ".join(sorted(unknown)))
+    return config
+
+
+class ConfigStore:
+    """Named config profiles cached in memory and written in the background when they change"""
+
+    WRITE_DELAY = 0.5   # Seconds to gather further changes before writing
+
+    def __init__(self, path: str, legacy_path: str = "", write_delay: float = WRITE_DELAY):
+        self.path = path
+        self.legacy_path = legacy_path     # iScoutTool.cfg to migrate from
+        self.write_delay = write_delay
+        self.profiles: Dict[str, AppConfig] = {DEFAULT_PROFILE: AppConfig()}
+        self.active = DEFAULT_PROFILE
+        self._written: Optional[str] = None    # File content as last read or written
+        self._pending: Optional[Tuple[int, str]] = None    # (sequence, content) waiting for the writer
+        self._sequence = 0                      # Orders writes, so an older content never wins
+        self._written_sequence = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def config(self) -> AppConfig:
+        """Settings of the active profile"""
+        return self.profiles[self.active]
+
+    @config.setter
+    def config(self, config: AppConfig):
+        self.profiles[self.active] = config
+
+    @property
+    def exists(self) -> bool:
+        """Whether there is a config file to load (new or legacy)"""
+        return os.path.exists(self.path) or bool(self.legacy_path and os.path.exists(self.legacy_path))
+
+    def names(self) -> List[str]:
+        return sorted(self.profiles)
+
+    def load(self) -> AppConfig:
+        """Read the profiles (migrating iScoutTool.cfg if needed); raises ValueError on malformed files"""
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{os.path.basename(self.path)}: {e}") from e
+            profiles = {name: config_from_dict(entry, name) for name, entry in data.get('profiles', {}).items()}
+            self.profiles = profiles or {DEFAULT_PROFILE: AppConfig()}
+            self.active = data.get('active') if data.get('active') in self.profiles else min(self.profiles)
+            # Compared in canonical form, so hand-edited formatting alone causes no rewrite
+            self._written = self._serialise()
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            self.profiles = {DEFAULT_PROFILE: load_legacy_config(self.legacy_path)}
+            self.active = DEFAULT_PROFILE
+            log.info("Migrating %s to %s", os.path.basename(self.legacy_path), os.path.basename(self.path))
+            self._schedule(self._serialise())
+        return self.config
+
+    def save(self, config: Optional[AppConfig] = None) -> bool:
+        """Validate and keep config (default: the active profile's); False when nothing changed
+
+        The file is written on a background thread; call flush() before exit.
+        """
+        config = config or self.config
+        validate_config(config)
+        self.config = config
+        return self._schedule(self._serialise())
+
+    def select(self, name: str, template: Optional[AppConfig] = None) -> AppConfig:
+        """Make a profile active, creating it from template (default: the active one) when new"""
+        if name not in self.profiles:
+            self.profiles[name] = replace(template or self.config)
+        self.active = name
+        self._schedule(self._serialise())
+        return self.config
+
+    def delete(self, name: str):
+        """Remove a profile; the last one cannot be removed"""
+        if name not in self.profiles or len(self.profiles) == 1:
+            raise ValueError(f"Cannot delete profile '{name}'")
+        del self.profiles[name]
+        if self.active == name:
+            self.active = min(self.profiles)
+        self._schedule(self._serialise())
+
+    def flush(self):
+        """Write pending changes now, on the calling thread, after any write already under way"""
+        with self._condition:
+            pending, self._pending = self._pending, None
+        with self._write_lock:
+            if pending is not None:
+                self._write(*pending)
+
+    def _serialise(self) -> str:
+        return json.dumps({'version': CONFIG_VERSION, 'active': self.active,
+                           'profiles': {name: asdict(c) for name, c in sorted(self.profiles.items())}},
+                          indent=2) + "\n"
+
+    def _schedule(self, text: str) -> bool:
+        with self._condition:
+            if text == (self._pending[1] if self._pending is not None else self._written):
+                return False
+            self._sequence += 1
+            self._pending = (self._sequence, text)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="iScoutConfig", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                # Let a burst of changes settle into one write
+                self._condition.wait(self.write_delay)
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    continue
+                # Taken together with the change, so a flush() from now on waits for this write
+                self._write_lock.acquire()
+            try:
+                self._write(*pending)
+            finally:
+                self._write_lock.release()
+
+    def _write(self, sequence: int, text: str):
+        """Write one content; the caller holds _write_lock"""
+        if sequence <= self._written_sequence:
+            return      # flush() already wrote newer content
+        try:
+            write_atomic(self.path, text)
+            self._written, self._written_sequence = text, sequence
+        except OSError as e:
+            log.error("Error writing %s: %s", self.path, e)
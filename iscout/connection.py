@@ -0,0 +1,239 @@
+"""
+Background ADB connection manager.
+
+Device discovery runs on a worker thread so the GUI never blocks on
+``adb start-server`` or ``remote_connect``. State changes are published to
+a listener callable (the GUI wraps it in a Qt signal), and failed attempts
+are retried with exponential backoff until the emulator shows up.
+Candidate emulators are found by ``iscout.discovery.DeviceDiscovery``.
+Failed commands on a connected device are recovered by
+``iscout.recovery.Recovery``, which uses ``reconnect_transport`` and
+``restart_server`` before giving the device up with ``mark_lost``.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from iscout.device import Device
+from iscout.discovery import DeviceDiscovery, DeviceInfo
+from iscout.log import get_logger
+from iscout.metrics import metrics
+from iscout.recovery import Recovery
+
+log = get_logger("adb")
+
+# Connection states published to the listener
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+CONNECTED = "connected"
+FAILED = "failed"
+
+
+@dataclass
+class ConnectionStatus:
+    """Snapshot of the connection published on every state change"""
+    state: str
+    message: str = ""
+    device: Optional[Device] = None         # Connected emulator
+    client: object = None                   # ppadb Client when connected
+    screen_size: Tuple[int, int] = (0, 0)   # Detected with 'wm size' at connect time
+    attempt: int = 0
+    devices: Tuple[DeviceInfo, ...] = ()    # Everything found by the last scan
+    device_info: Optional[DeviceInfo] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.state == CONNECTED
+
+
+class AdbConnectionError(Exception):
+    """Raised when a connection attempt fails with a user-facing reason"""
+
+
+def start_adb_server(timeout: float = 10.0, command: str = 'start-server'):
+    """Run 'adb start-server' (or kill-server), raising AdbConnectionError with a readable reason"""
+    import subprocess
+    try:
+        subprocess.run(['adb', command], check=True, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        raise AdbConnectionError("ADB executable not found. Install Android SDK platform-tools and add them to PATH")
+    except subprocess.CalledProcessError as e:
+        raise AdbConnectionError(f"Failed to start ADB server: {e}")
+    except subprocess.TimeoutExpired:
+        raise AdbConnectionError("ADB server startup timed out")
+
+
+class ConnectionManager:
+    """Discover and maintain the emulator connection on a background thread"""
+
+    BACKOFF_SECONDS = (1, 2, 4, 8, 15, 30)
+    SERVER_READY_TIMEOUT = 3.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5555,
+                 adb_host: str = "localhost", adb_port: int = 5037,
+                 listener: Optional[Callable[[ConnectionStatus], None]] = None,
+                 discovery: Optional[DeviceDiscovery] = None, pinned_serial: str = ""):
+        self.host = host
+        self.port = port                    # Preferred emulator port when nothing is pinned
+        self.adb_host = adb_host
+        self.adb_port = adb_port
+        self.listener = listener
+        self.discovery = discovery or DeviceDiscovery(host)
+        self.pinned_serial = pinned_serial
+        self.status = ConnectionStatus(DISCONNECTED)
+        self._ever_connected = False        # Later connects count as reconnects in the metrics
+        self.recovery = Recovery(self)
+        self._wake = threading.Event()
+        self._connected = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # Public API (any thread)
+
+    def start(self):
+        """Start background discovery; returns immediately"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="iScoutConnection", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def request_connect(self):
+        """Ask the worker to (re)connect now instead of waiting out the backoff"""
+        self._connected.clear()
+        self._wake.set()
+
+    def select_device(self, serial: str):
+        """Pin a device serial ('' for automatic choice) and reconnect to it"""
+        self.pinned_serial = serial
+        self.request_connect()
+
+    @property
+    def devices(self) -> List[DeviceInfo]:
+        """Devices found by the most recent scan"""
+        return list(self.discovery.devices)
+
+    def mark_lost(self, reason: str = "Connection lost"):
+        """Report a dead connection found by a caller; the worker reconnects"""
+        self._connected.clear()
+        self._publish(ConnectionStatus(DISCONNECTED, reason))
+        self._wake.set()
+
+    def reconnect_transport(self, serial: str):
+        """Re-attach serial to the running ADB server and return a fresh ppadb device"""
+        client = self.status.client
+        if client is None:
+            raise AdbConnectionError("Not connected")
+        if ':' in serial:
+            host, port = serial.rsplit(':', 1)
+            client.remote_connect(host, int(port))
+        adb_device = client.device(serial)
+        if adb_device is None:
+            raise AdbConnectionError(f"Device {serial} not found")
+        return adb_device
+
+    def restart_server(self, serial: str):
+        """Restart the ADB server, then reconnect the transport to serial"""
+        client = self.status.client
+        if client is None:
+            raise AdbConnectionError("Not connected")
+        start_adb_server(command='kill-server')
+        self._ensure_server(client)
+        return self.reconnect_transport(serial)
+
+    def wait_connected(self, timeout: Optional[float] = None):
+        """Block until connected and return the device, or None on timeout"""
+        self.start()
+        if self._connected.wait(timeout):
+            return self.status.device
+        return None
+
+    @property
+    def device(self):
+        return self.status.device if self.status.connected else None
+
+    # Worker thread
+
+    def _run(self):
+        attempt = 0
+        while not self._stopped:
+            if self._connected.is_set():
+                # Connected: sleep until someone reports a problem
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            attempt += 1
+            self._publish(ConnectionStatus(CONNECTING, "Searching for emulators...", attempt=attempt))
+            try:
+                self._publish(self._connect(attempt))
+                self._connected.set()
+                attempt = 0
+                continue
+            except AdbConnectionError as e:
+                message = str(e)
+            except Exception as e:
+                message = f"Error connecting to BlueStacks: {e}"
+
+            delay = self.BACKOFF_SECONDS[min(attempt, len(self.BACKOFF_SECONDS)) - 1]
+            self._publish(ConnectionStatus(FAILED, f"{message} (retrying in {delay}s)", attempt=attempt,
+                                           devices=tuple(self.discovery.devices)))
+            # Sleep for the backoff, but wake early on request_connect()/stop()
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _connect(self, attempt: int) -> ConnectionStatus:
+        from ppadb.client import Client as AdbClient
+
+        client = AdbClient(host=self.adb_host, port=self.adb_port)
+        self._ensure_server(client)
+
+        found = self.discovery.discover(client)
+        info = self.discovery.choose(found, self.pinned_serial, self.port)
+        if info is None:
+            if self.pinned_serial:
+                raise AdbConnectionError(f"Pinned device {self.pinned_serial} not found")
+            raise AdbConnectionError("No emulator found on any ADB port")
+
+        adb_device = client.device(info.serial)
+        if adb_device is None:
+            raise AdbConnectionError(f"Device {info.serial} went away during discovery")
+        return ConnectionStatus(CONNECTED, f"Connected to {info.label}",
+                                device=Device(adb_device, self.recovery), client=client, screen_size=info.resolution,
+                                attempt=attempt, devices=tuple(found), device_info=info)
+
+    def _ensure_server(self, client):
+        """Start the ADB server unless it already answers"""
+        if self._server_running(client):
+            return
+        start_adb_server()
+        deadline = time.monotonic() + self.SERVER_READY_TIMEOUT
+        while not self._server_running(client):
+            if time.monotonic() > deadline:
+                raise AdbConnectionError("ADB server did not come up after start-server")
+            time.sleep(0.1)
+
+    @staticmethod
+    def _server_running(client) -> bool:
+        try:
+            client.version()
+            return True
+        except Exception:
+            return False
+
+    def _publish(self, status: ConnectionStatus):
+        if status.connected and not self.status.connected:
+            self.recovery.breaker.reset()
+            if self._ever_connected:
+                metrics.record_reconnect()
+            self._ever_connected = True
+        self.status = status
+        if self.listener:
+            try:
+                self.listener(status)
+            except Exception as e:
+                log.error("Error publishing connection status: %s", e)
@@ -0,0 +1,123 @@
+"""
+ADB device wrapper used by the engine.
+
+Every command the tool sends to an emulator goes through ``Device.shell``,
+so connection handling and diagnostics have a single place to hook into:
+callables in ``Device.observers`` are told about every command, and a
+``Recovery`` (see ``iscout.recovery``) recovers from commands that fail,
+resending only those that merely read state.
+"""
+
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from iscout.discovery import read_screen_size
+from iscout.log import get_logger
+from iscout.recovery import is_idempotent
+
+log = get_logger("adb")
+
+
+@dataclass
+class ShellCall:
+    """One shell command sent to a device"""
+    serial: str
+    command: str
+    started: float          # time.perf_counter() when the command was sent
+    elapsed: float          # Seconds until the output arrived
+    error: str = ""
+    result: str = ""        # Command output (text commands only)
+
+
+class Device:
+    """A connected emulator: thin layer over a ppadb Device"""
+
+    # Notified after every shell command on any device (recorders, diagnostics)
+    observers: List[Callable[[ShellCall], None]] = []
+
+    def __init__(self, adb_device, recovery=None):
+        self.adb = adb_device
+        self.serial = getattr(adb_device, 'serial', '')
+        self.recovery = recovery            # Retries failed commands; None = fail on first error
+
+    def _call(self, fn, command: str):
+        if self.recovery is None:
+            return fn(self.adb)
+        return self.recovery.call(self, fn, is_idempotent(command))
+
+    def shell(self, command: str) -> str:
+        started = time.perf_counter()
+        try:
+            result = self._call(lambda adb: adb.shell(command), command)
+        except Exception as e:
+            self._notify(ShellCall(self.serial, command, started, time.perf_counter() - started, str(e)))
+            raise
+        elapsed = time.perf_counter() - started
+        log.debug("%s $ %s (%.1f ms)", self.serial, command, elapsed * 1000)
+        self._notify(ShellCall(self.serial, command, started, elapsed, result=result or ""))
+        return result
+
+    def shell_bytes(self, command: str) -> bytes:
+        """Undecoded output of a command, for binary data such as raw 'screencap'"""
+        output = []
+        def handler(connection):
+            try:
+                output.append(connection.read_all())
+            finally:
+                connection.close()
+        def run(adb):
+            output.clear()
+            adb.shell(command, handler=handler)
+        started = time.perf_counter()
+        try:
+            self._call(run, command)
+        except Exception as e:
+            self._notify(ShellCall(self.serial, command, started, time.perf_counter() - started, str(e)))
+            raise
+        self._notify(ShellCall(self.serial, command, started, time.perf_counter() - started))
+        return output[0] if output else b""
+
+    def stream(self, command: str, on_line: Callable[[str], None], stop: threading.Event):
+        """Run a long-lived command (e.g. getevent), passing output lines to on_line until stop is set"""
+        def handler(connection):
+            connection.socket.settimeout(0.5)
+            pending = b""
+            try:
+                while not stop.is_set():
+                    try:
+                        data = connection.socket.recv(4096)
+                    except socket.timeout:
+                        continue
+                    if not data:
+                        break
+                    *lines, pending = (pending + data).split(b"\n")
+                    for line in lines:
+                        on_line(line.decode('utf-8', 'replace').rstrip('\r'))
+            finally:
+                connection.close()
+        self.adb.shell(command, handler=handler)
+
+    def tap(self, x: int, y: int):
+        self.shell(f"input tap {x} {y}")
+
+    def keyevent(self, *codes: int):
+        self.shell("input keyevent " + " ".join(str(c) for c in codes))
+
+    def input_text(self, text: str):
+        self.shell(f"input text '{text}'")
+
+    def screen_size(self) -> Tuple[int, int]:
+        return read_screen_size(self)
+
+    def _notify(self, call: ShellCall):
+        for observer in list(self.observers):
+            try:
+                observer(call)
+            except Exception as e:
+                log.error("Error in device observer: %s", e)
+
+    def __repr__(self):
+        return f"Device({self.serial!r})"
@@ -0,0 +1,198 @@
+"""
+Concurrent emulator discovery over ADB.
+
+All candidate TCP ports are probed in parallel, so a scan costs about one
+connect timeout instead of one per port. Open ports are attached with
+``adb connect`` and every device is identified by model and screen
+resolution. Identification results are cached per serial.
+
+One ``DeviceDiscovery`` may serve several connections (the main one and
+every multi-instance connection), each discovering on its own worker
+thread: scans take turns, so ``adb connect`` never runs twice for a port
+and ``devices`` always holds one complete scan.
+"""
+
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from iscout.log import get_logger
+
+log = get_logger("adb")
+
+# Default ADB ports of common emulators
+BLUESTACKS_PORTS = tuple(range(5555, 5626, 10))     # 5555, 5565, ... one per instance
+LDPLAYER_PORTS = tuple(range(5555, 5586, 2))        # emulator-5554 / 5555 + 2n
+NOX_PORTS = (62001,) + tuple(range(62025, 62031))
+MUMU_PORTS = (7555, 16384, 16416, 16448)
+MEMU_PORTS = tuple(range(21503, 21554, 10))
+DEFAULT_PORTS = tuple(sorted(set(
+    BLUESTACKS_PORTS + LDPLAYER_PORTS + NOX_PORTS + MUMU_PORTS + MEMU_PORTS
+)))
+
+
+def parse_port_spec(spec: str) -> Tuple[int, ...]:
+    """Parse a port list such as '5555-5625:10;62001;7555'
+
+    Entries are separated by ';', ',' or spaces. Ranges are inclusive and
+    take an optional ':step'. An empty spec returns DEFAULT_PORTS.
+    """
+    if not spec or not spec.strip():
+        return DEFAULT_PORTS
+    ports = set()
+    for part in re.split(r'[;,\s]+', spec):
+        part = part.strip()
+        if not part:
+            continue
+        step = 1
+        if ':' in part:
+            part, step_str = part.split(':', 1)
+            step = int(step_str)
+        if '-' in part:
+            first, last = (int(p) for p in part.split('-', 1))
+            ports.update(range(first, last + 1, max(step, 1)))
+        else:
+            ports.add(int(part))
+    invalid = [p for p in ports if not 1 <= p <= 65535]
+    if invalid:
+        raise ValueError(f"Invalid ADB port(s): {invalid}")
+    return tuple(sorted(ports))
+
+
+@dataclass
+class DeviceInfo:
+    """An ADB device found by discovery"""
+    serial: str
+    model: str = ""
+    resolution: Tuple[int, int] = (0, 0)
+    identified_at: float = 0.0      # time.monotonic() of identification
+
+    @property
+    def port(self) -> Optional[int]:
+        """ADB TCP port of the device, if its serial carries one"""
+        if ':' in self.serial:
+            tail = self.serial.rsplit(':', 1)[1]
+            return int(tail) if tail.isdigit() else None
+        if self.serial.startswith('emulator-'):
+            tail = self.serial.split('-', 1)[1]
+            # Console port is N, ADB port is N + 1
+            return int(tail) + 1 if tail.isdigit() else None
+        return None
+
+    @property
+    def profile(self) -> str:
+        """Key for per-device settings such as calibrated delays: model and resolution"""
+        width, height = self.resolution
+        if not width or not height:
+            return ""
+        return f"{self.model or self.serial} {width}x{height}"
+
+    @property
+    def label(self) -> str:
+        width, height = self.resolution
+        size = f"{width}x{height}" if width and height else "unknown size"
+        return f"{self.model or 'Unknown device'} - {size} ({self.serial})"
+
+
+def read_screen_size(device) -> Tuple[int, int]:
+    """Return the device screen size reported by 'wm size', or (0, 0)"""
+    result = device.shell("wm size")
+    if "Physical size:" not in result:
+        return (0, 0)
+    # An 'Override size:' line may follow; the physical size is what taps use
+    size_str = result.split("Physical size: ")[1].split()[0]
+    width, height = map(int, size_str.split('x'))
+    return (width, height)
+
+
+def probe_port(host: str, port: int, timeout: float) -> bool:
+    """True when something accepts TCP connections on host:port"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class DeviceDiscovery:
+    """Find and identify emulator instances reachable through one ADB server"""
+
+    PROBE_TIMEOUT = 0.4
+    IDENTIFY_TTL = 300.0    # Seconds before a cached identification is refreshed
+    MAX_WORKERS = 32
+
+    def __init__(self, host: str = "127.0.0.1", ports: Iterable[int] = DEFAULT_PORTS):
+        self.host = host
+        self.ports = tuple(ports)
+        self.cache: Dict[str, DeviceInfo] = {}
+        self.devices: List[DeviceInfo] = []      # Result of the last scan
+        self._lock = threading.Lock()           # Held for a whole scan
+
+    def open_ports(self) -> List[int]:
+        """Probe all candidate ports concurrently"""
+        if not self.ports:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(self.ports))) as pool:
+            results = pool.map(lambda p: probe_port(self.host, p, self.PROBE_TIMEOUT), self.ports)
+            return [port for port, is_open in zip(self.ports, results) if is_open]
+
+    def discover(self, client) -> List[DeviceInfo]:
+        """Attach open emulator ports to the ADB server and identify every device
+
+        client is a ppadb Client. Returns the devices sorted by port. A scan
+        already running on another thread is waited for, then this one runs
+        against the ports it attached.
+        """
+        with self._lock:
+            known = {getattr(d, 'serial', '') for d in client.devices()}
+            to_connect = [port for port in self.open_ports()
+                          if f"{self.host}:{port}" not in known
+                          and f"localhost:{port}" not in known
+                          and f"emulator-{port - 1}" not in known]
+            if to_connect:
+                with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(to_connect))) as pool:
+                    list(pool.map(lambda p: self._remote_connect(client, p), to_connect))
+
+            devices = client.devices()
+            if devices:
+                with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(devices))) as pool:
+                    infos = list(pool.map(self.identify, devices))
+            else:
+                infos = []
+            self.devices = sorted(infos, key=lambda d: (d.port or 0, d.serial))
+            return self.devices
+
+    def identify(self, device) -> DeviceInfo:
+        """Return model and resolution of a ppadb device, using the cache when fresh"""
+        serial = getattr(device, 'serial', '')
+        cached = self.cache.get(serial)
+        if cached and time.monotonic() - cached.identified_at < self.IDENTIFY_TTL:
+            return cached
+        info = DeviceInfo(serial=serial, identified_at=time.monotonic())
+        try:
+            info.model = device.shell("getprop ro.product.model").strip()
+            info.resolution = read_screen_size(device)
+        except Exception as e:
+            log.error("Error identifying device %s: %s", serial, e)
+        self.cache[serial] = info
+        return info
+
+    def _remote_connect(self, client, port: int):
+        try:
+            client.remote_connect(self.host, port)
+        except Exception as e:
+            log.warning("adb connect %s:%s failed: %s", self.host, port, e)
+
+    @staticmethod
+    def choose(devices: List[DeviceInfo], pinned_serial: str = "", preferred_port: int = 0) -> Optional[DeviceInfo]:
+        """Pick the pinned device, else the one on the preferred port, else the first"""
+        if pinned_serial:
+            return next((d for d in devices if d.serial == pinned_serial), None)
+        if preferred_port:
+            if match := next((d for d in devices if d.port == preferred_port), None):
+                return match
+        return devices[0] if devices else None
@@ -0,0 +1,484 @@
+"""
+Headless iScoutTool engine.
+
+``Engine`` ties configuration, location presets, the ADB connection and
+the navigator together without importing PyQt5. The command line
+interface (``python -m iscout``) and the GUI both drive the emulator
+through it.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+from iscout.calibration import CalibrationProgress, DelayCalibrator, load_delays, save_delays
+from iscout.config import ConfigStore
+from iscout.connection import ConnectionManager, ConnectionStatus
+from iscout.device import Device
+from iscout.discovery import DeviceDiscovery, parse_port_spec
+from iscout.flight import flight_recorder, install as install_flight_recorder
+from iscout.heartbeat import DeviceHealth, Heartbeat
+from iscout.instances import FAILED, FINISHED, STARTED, Instance, InstanceEvent, NavRequest
+from iscout.log import get_logger
+from iscout.macros import MacroPlayer
+from iscout.metrics import install as install_metrics, metrics
+from iscout.models import AppConfig, LocationPreset, ScoutTarget
+from iscout.navigator import DEFAULT_ROUTE, NavigationError, Navigator
+from iscout.parser import parse_scout_file
+from iscout.probe import Signature, Verifier, load_signatures, probe_for, save_signatures
+from iscout.readback import LEARN_TARGETS, READOUT_FORMAT, CoordinateReader, ReadbackError, default_reader, \
+    load_templates, numpy_available, readout_rect, save_templates
+from iscout.layout import LayoutCalibrator, load_templates as load_layout_templates
+from iscout.presets import load_presets, load_profiles, profile_files, profile_path, save_presets
+from iscout.routes import RouteBook, load_routes
+from iscout.spawns import SpawnHistory
+from iscout.trace import NAV, install as install_tracing, tracer
+from iscout.watch import FileWatcher
+
+if TYPE_CHECKING:   # Loaded with sqlite3 on first use, off the startup path
+    from iscout.session import SessionStore
+
+log = get_logger("nav")
+
+# Landing spots of the fixed jumps
+ENEMY_LANDING = (10, 10)        # Go Enemy: any valid tile on the enemy server
+VIEW_ENEMY_LANDING = (600, 600) # View Enemy: centre of the enemy server map
+
+CONFIG_FILE = 'iScoutConfig.json'
+LEGACY_CONFIG_FILE = 'iScoutTool.cfg'    # Single CSV line, migrated on first load
+PRESETS_FILE = os.path.join('Resources', 'locations.xml')
+DELAYS_FILE = 'iScoutDelays.json'
+SESSION_FILE = 'iScoutSession.db'
+SPAWN_DIR = 'SpawnHistory'
+SIGNATURES_FILE = 'iScoutSignatures.json'
+DIGITS_FILE = 'iScoutDigits.txt'
+DEFAULT_DIGITS_FILE = os.path.join('Resources', 'digits.txt')
+LAYOUT_TEMPLATES_FILE = os.path.join('Resources', 'layout-templates.npz')
+LOG_FILE = 'iScoutTool.log'
+FLIGHT_DIR = 'FlightRecords'
+
+
+class EngineBusy(NavigationError):
+    """Another task (calibration, macro replay, a queued jump) is driving the emulator"""
+
+
+@dataclass
+class PresetReload:
+    """Result of reloading the presets after locations.xml or a profile file changed"""
+    files: List[str] = field(default_factory=list)
+    layouts: List[str] = field(default_factory=list)    # Profile keys now loaded
+    error: str = ""                                     # Set when the old presets stay in use
+
+
+def default_base_dir() -> str:
+    """Directory holding iScoutTool.py, its config and Resources"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Engine:
+    """Configuration, connection and navigation for one emulator"""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or default_base_dir()
+        self.config_file = os.path.join(self.base_dir, CONFIG_FILE)
+        self.store = ConfigStore(self.config_file, os.path.join(self.base_dir, LEGACY_CONFIG_FILE))
+        self.presets_file = os.path.join(self.base_dir, PRESETS_FILE)
+        self.delays_file = os.path.join(self.base_dir, DELAYS_FILE)
+        self.signatures_file = os.path.join(self.base_dir, SIGNATURES_FILE)
+        self.digits_file = os.path.join(self.base_dir, DIGITS_FILE)
+        self.layout_templates_file = os.path.join(self.base_dir, LAYOUT_TEMPLATES_FILE)
+        self.presets: Dict[str, LocationPreset] = {}
+        self.routes = RouteBook(load_routes(""), self.presets)
+        self.reader: Optional[CoordinateReader] = None     # Arrival readback; None without NumPy or learnt digits
+        self.connection: Optional[ConnectionManager] = None
+        self.heartbeat: Optional[Heartbeat] = None
+        self.preset_watcher: Optional[FileWatcher] = None
+        self.sessions: Optional["SessionStore"] = None
+        self.spawns = SpawnHistory(os.path.join(self.base_dir, SPAWN_DIR))
+        self._navigation_lock = threading.RLock()  # One tap sequence at a time per emulator
+        install_tracing()
+        install_metrics()
+        install_flight_recorder()
+        flight_recorder.directory = os.path.join(self.base_dir, FLIGHT_DIR)
+
+    # Files
+
+    def load(self):
+        """Load the config file and location presets; raises on malformed files"""
+        self.load_config()
+        self.load_presets()
+
+    @property
+    def config(self) -> AppConfig:
+        """Settings of the active config profile"""
+        return self.store.config
+
+    @config.setter
+    def config(self, config: AppConfig):
+        self.store.config = config
+
+    def load_config(self) -> AppConfig:
+        return self.store.load()
+
+    def save_config(self) -> bool:
+        """Validate the config and write it in the background if it changed; raises ValueError"""
+        return self.store.save()
+
+    def select_profile(self, name: str) -> AppConfig:
+        """Switch to a named config profile, creating it from the current settings when new"""
+        config = self.store.select(name)
+        if self.connection:
+            self.connection.port = config.adb_port
+            self.connection.select_device(config.device_serial)
+        return config
+
+    def load_presets(self) -> Dict[str, LocationPreset]:
+        """Load presets, resolution and device layouts, routes, calibrated delays and pixel signatures
+
+        Compiled plans start afresh.
+        """
+        self.presets, self.routes = self._read_presets()
+        self.reader = default_reader(self.digits_file)
+        return self.presets
+
+    def reload_presets(self, files: Optional[List[str]] = None) -> PresetReload:
+        """Re-read locations.xml and its profile files and swap the new tables in at once
+
+        Navigations already running finish on the route book they started
+        with. A file that does not parse (e.g. saved halfway through an
+        edit) leaves the current presets in use.
+        """
+        try:
+            presets, routes = self._read_presets()
+        except Exception as e:
+            log.error("Presets not reloaded: %s", e)
+            return PresetReload(files or [], error=str(e))
+        self.presets, self.routes = presets, routes
+        log.info("Reloaded presets (%s routes, layouts: %s)", len(routes.routes), ", ".join(routes.layouts) or "none")
+        return PresetReload(files or [], sorted(routes.layouts))
+
+    def watch_presets(self, listener: Optional[Callable[[PresetReload], None]] = None) -> FileWatcher:
+        """Reload the presets whenever locations.xml or one of its profile files changes"""
+        if self.preset_watcher is None:
+            def changed(files: List[str]):
+                result = self.reload_presets(files)
+                if listener:
+                    listener(result)
+            self.preset_watcher = FileWatcher(
+                lambda: [self.presets_file, *profile_files(self.presets_file).values()], changed)
+        self.preset_watcher.start()
+        return self.preset_watcher
+
+    def _read_presets(self) -> Tuple[Dict[str, LocationPreset], RouteBook]:
+        presets = load_presets(self.presets_file)
+        routes = load_routes(self.presets_file)
+        return presets, RouteBook(routes, presets, load_delays(self.delays_file, routes),
+                                  load_signatures(self.signatures_file), load_profiles(self.presets_file))
+
+    @staticmethod
+    def load_targets(path: str) -> List[ScoutTarget]:
+        return parse_scout_file(path)
+
+    def open_sessions(self) -> "SessionStore":
+        """Store of loaded reports and their Got It state (iScoutSession.db)"""
+        if self.sessions is None:
+            from iscout.session import SessionStore
+            self.sessions = SessionStore(os.path.join(self.base_dir, SESSION_FILE))
+        return self.sessions
+
+    # Connection
+
+    def start_connection(self, listener: Optional[Callable[[ConnectionStatus], None]] = None) -> ConnectionManager:
+        """Start background discovery with the configured port, pinned serial and scan ports"""
+        if self.connection is None:
+            self.connection = ConnectionManager(
+                port=self.config.adb_port,
+                listener=listener,
+                discovery=DeviceDiscovery(ports=parse_port_spec(self.config.scan_ports)),
+                pinned_serial=self.config.device_serial
+            )
+        self.connection.start()
+        return self.connection
+
+    def start_heartbeat(self, listener: Optional[Callable[[DeviceHealth], None]] = None) -> Heartbeat:
+        """Keep cached device health (responsive, foreground app) current in the background"""
+        if self.heartbeat is None:
+            self.heartbeat = Heartbeat(self.start_connection(), listener)
+        self.heartbeat.start()
+        return self.heartbeat
+
+    def connect(self, timeout: float = 10.0) -> Optional[Device]:
+        """Block until an emulator is connected; None on timeout"""
+        return self.start_connection().wait_connected(timeout)
+
+    def stop(self):
+        self.store.flush()
+        if self.sessions:
+            self.sessions.close()
+        if self.preset_watcher:
+            self.preset_watcher.stop()
+        if self.heartbeat:
+            self.heartbeat.stop()
+        if self.connection:
+            self.connection.stop()
+
+    @property
+    def device(self) -> Optional[Device]:
+        return self.connection.device if self.connection else None
+
+    def screen_size(self) -> Tuple[int, int]:
+        """Resolution of the connected emulator; raises NavigationError when offline"""
+        device = self.device
+        if device is None:
+            raise NavigationError("No connection to BlueStacks")
+        screen_size = self.connection.status.screen_size
+        return screen_size if all(screen_size) else device.screen_size()
+
+    @property
+    def active_presets(self) -> Dict[str, LocationPreset]:
+        """Presets for the connected emulator: its device or resolution layout if there is one, else locations.xml"""
+        screen_size = self.connection.status.screen_size if self.connection else (0, 0)
+        return self.routes.presets_for(screen_size, self.device_keys)
+
+    @property
+    def active_layout(self) -> str:
+        """Profile key of the layout used for the connected emulator; '' for locations.xml alone"""
+        screen_size = self.connection.status.screen_size if self.connection else (0, 0)
+        return self.routes.layout_key(screen_size, self.device_keys)
+
+    @property
+    def device_keys(self) -> Tuple[str, ...]:
+        """Serial and model of the connected emulator, which select device-specific preset profiles"""
+        info = self.connection.status.device_info if self.connection else None
+        return (info.serial, info.model) if info else ()
+
+    @property
+    def profile(self) -> str:
+        """Device profile (model and resolution) of the connected emulator, or ''"""
+        info = self.connection.status.device_info if self.connection else None
+        return info.profile if info else ""
+
+    # Navigation
+
+    def navigator(self, on_entry: Optional[Callable[[bool], None]] = None) -> Navigator:
+        """Navigator bound to the connected device; raises NavigationError when offline"""
+        screen_size = self.screen_size()
+        return Navigator(self.device, self.routes, screen_size, on_entry=on_entry, profile=self.profile,
+                         reader=self.reader, devices=self.device_keys)
+
+    @property
+    def busy(self) -> bool:
+        """True while another thread drives the emulator (calibration, macro replay, a queued jump)"""
+        if self._navigation_lock.acquire(blocking=False):
+            self._navigation_lock.release()
+            return False
+        return True
+
+    def navigate(self, x: int, y: int, server: Optional[int] = None, skip_server: bool = False,
+                 on_entry: Optional[Callable[[bool], None]] = None,
+                 route: str = DEFAULT_ROUTE, wait: bool = True) -> Optional[Tuple[int, int]]:
+        """Jump to server:x,y (server defaults to the enemy server); raises on failure
+
+        Returns the coordinates read back from the screen, or None when arrival was not checked.
+        Without wait, raises EngineBusy instead of waiting for another task to finish (GUI thread).
+        """
+        if server is None:
+            server = self.config.enemy_server
+        with tracer.span("navigate", NAV, x=x, y=y, server=server, route=route), self._driving(wait):
+            started = time.perf_counter()
+            try:
+                landed = self.navigator(on_entry).navigate(x, y, server, skip_server=skip_server, route=route)
+            except Exception as e:
+                metrics.record_navigation(time.perf_counter() - started, ok=False)
+                flight_recorder.dump(f"Navigation to {server}:{x},{y} failed: {e}")
+                raise
+            metrics.record_navigation(time.perf_counter() - started)
+            return landed
+
+    @contextmanager
+    def _driving(self, wait: bool):
+        if not self._navigation_lock.acquire(blocking=wait):
+            raise EngineBusy("The emulator is busy with a calibration, macro or queued jump")
+        try:
+            yield
+        finally:
+            self._navigation_lock.release()
+
+    def return_home(self, on_entry: Optional[Callable[[bool], None]] = None):
+        self.navigate(self.config.home_x, self.config.home_y, self.config.home_server, on_entry=on_entry)
+
+    def go_enemy(self, on_entry: Optional[Callable[[bool], None]] = None):
+        self.navigate(*ENEMY_LANDING, self.config.enemy_server, on_entry=on_entry)
+
+    def view_enemy(self, on_entry: Optional[Callable[[bool], None]] = None):
+        self.navigate(*VIEW_ENEMY_LANDING, self.config.enemy_server, on_entry=on_entry, route="view_enemy")
+
+    def calibrator(self, route: str = DEFAULT_ROUTE, server: Optional[int] = None,
+                   listener: Optional[Callable[[CalibrationProgress], None]] = None, **options) -> DelayCalibrator:
+        """Delay calibrator for the connected emulator; options are DelayCalibrator keywords"""
+        if not self.profile:
+            raise NavigationError("Emulator model and resolution unknown; cannot store calibrated delays")
+        return DelayCalibrator(self.device, self.routes, self.screen_size(), server or self.config.enemy_server,
+                               route=route, listener=listener, devices=self.device_keys, **options)
+
+    def calibrate(self, calibrator: DelayCalibrator) -> Dict[int, float]:
+        """Run a calibration, then store and use its delays for this device profile"""
+        with self._navigation_lock:
+            waits = calibrator.run()
+        save_delays(self.delays_file, self.profile, calibrator.route, waits)
+        self.routes.set_delays(self.profile, calibrator.route.name, waits)
+        return waits
+
+    def record_signatures(self, x: int, y: int, server: Optional[int] = None,
+                          route: str = DEFAULT_ROUTE) -> Dict[str, Signature]:
+        """Navigate once with the written waits, recording the pixels of every verify= step
+
+        The jump must be watched to land correctly: what the screen shows now
+        becomes the reference for this device profile.
+        """
+        if not self.profile:
+            raise NavigationError("Emulator model and resolution unknown; cannot store pixel signatures")
+        signatures: Dict[str, Signature] = {}
+        with self._navigation_lock:
+            self.navigator().navigate(x, y, server or self.config.enemy_server, route=route,
+                                      verifier=Verifier(probe_for(self.device), signatures, record=True))
+        recorded = dict(self.routes.signatures.get(self.profile, {}), **signatures)
+        save_signatures(self.signatures_file, self.profile, recorded)
+        self.routes.signatures[self.profile] = recorded
+        return signatures
+
+    def learn_digits(self, server: Optional[int] = None) -> List[str]:
+        """Learn the coordinate readout font from two jumps that show every digit
+
+        Returns the learnt characters; they are saved to iScoutDigits.txt and
+        used for arrival readback from now on.
+        """
+        if not numpy_available():
+            raise ReadbackError("Coordinate readback needs NumPy (pip install numpy)")
+        server = server or self.config.enemy_server
+        screen_size = self.screen_size()
+        routes = self.routes
+        rect = readout_rect(routes.presets_for(screen_size, self.device_keys), screen_size)
+        if rect is None:
+            raise ReadbackError("No NavReadout preset (the coordinate box) in locations.xml")
+        # Learning only splits glyphs; the bundled font just makes a reader to do it with
+        learner = self.reader or CoordinateReader(load_templates(os.path.join(self.base_dir, DEFAULT_DIGITS_FILE)))
+        templates = load_templates(self.digits_file)
+        with self._navigation_lock:
+            for x, y in LEARN_TARGETS:
+                # Without a reader: the templates are what is being learnt
+                Navigator(self.device, routes, screen_size, profile=self.profile,
+                          devices=self.device_keys).navigate(x, y, server)
+                time.sleep(CoordinateReader.TIMEOUT)    # Let the camera settle on the readout
+                frame = probe_for(self.device).read_rect(*rect)
+                templates.update(learner.learn(frame, READOUT_FORMAT.format(server=server, x=x, y=y)))
+        save_templates(self.digits_file, templates)
+        self.reader = CoordinateReader(templates, learnt=True)
+        return sorted(templates)
+
+    def capture_layout_templates(self, listener: Optional[Callable[[str], None]] = None) -> List[str]:
+        """Cut the navigation elements from the current (working) layout for later layout calibration"""
+        screen_size = self.screen_size()
+        calibrator = LayoutCalibrator(self.device, self.routes.presets_for(screen_size, self.device_keys),
+                                      screen_size, listener)
+        with self._navigation_lock:
+            templates = calibrator.capture_templates(self.layout_templates_file)
+        return sorted(templates)
+
+    def calibrate_layout(self, listener: Optional[Callable[[str], None]] = None) -> Dict[str, LocationPreset]:
+        """Find the navigation elements on this screen and save them as its resolution profile"""
+        screen_size = self.screen_size()
+        templates, source = load_layout_templates(self.layout_templates_file)
+        calibrator = LayoutCalibrator(self.device, self.presets, screen_size, listener)
+        with self._navigation_lock:
+            presets = calibrator.presets_from(calibrator.run(templates, source))
+        if not presets:
+            raise NavigationError("No navigation element was found on this screen")
+        path = profile_path(self.presets_file, screen_size)
+        save_presets(path, presets, f"Calibrated for {screen_size[0]}x{screen_size[1]} by iScoutTool")
+        self.routes.set_layout(screen_size, presets)
+        log.info("Saved %s presets for %sx%s to %s", len(presets), *screen_size, path)
+        return presets
+
+    def play_macro(self, player: MacroPlayer) -> float:
+        """Replay a recorded macro on the emulator; returns the elapsed seconds"""
+        screen_size = self.screen_size()
+        with self._navigation_lock:
+            return player.play(self.device, screen_size)
+
+
+class NavigationQueue:
+    """Run queued navigations on the engine's emulator one at a time on a worker thread
+
+    Events use the same ``InstanceEvent`` shape as the multi-instance
+    dispatcher, with the instance name ``NAME``.
+    """
+
+    NAME = "primary"
+
+    def __init__(self, engine: Engine, listener: Optional[Callable[[InstanceEvent], None]] = None,
+                 on_entry: Optional[Callable[[bool], None]] = None):
+        self.engine = engine
+        self.listener = listener
+        self.on_entry = on_entry            # Passed to every navigation (overlay)
+        self.busy = False
+        self._requests: Deque[NavRequest] = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, request: NavRequest):
+        with self._condition:
+            self._requests.append(request)
+            self._condition.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="iScoutNavQueue", daemon=True)
+                self._thread.start()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._requests)
+
+    def clear(self):
+        """Drop all queued (not yet started) requests"""
+        with self._condition:
+            self._requests.clear()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._requests and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                request = self._requests.popleft()
+            self.busy = True
+            started = time.monotonic()
+            self._publish(InstanceEvent(STARTED, self.NAME, request))
+            try:
+                if self.engine.connect(Instance.CONNECT_TIMEOUT) is None:
+                    raise NavigationError("No connection to BlueStacks")
+                self.engine.navigate(request.x, request.y, request.server, skip_server=request.skip_server,
+                                     on_entry=self.on_entry, route=request.route)
+                self._publish(InstanceEvent(FINISHED, self.NAME, request, elapsed=time.monotonic() - started))
+            except Exception as e:
+                self._publish(InstanceEvent(FAILED, self.NAME, request, error=str(e),
+                                            elapsed=time.monotonic() - started))
+            finally:
+                self.busy = False
+
+    def _publish(self, event: InstanceEvent):
+        if self.listener:
+            try:
+                self.listener(event)
+            except Exception as e:
+                log.error("Error publishing navigation event: %s", e)
@@ -0,0 +1,19 @@
+"""
+File helpers shared by the modules that save state next to iScoutTool.py.
+
+Imports nothing else from the package, so any module can use it without
+import cycles.
+"""
+
+import os
+from typing import Optional
+
+
+def write_atomic(path: str, text: str, newline: Optional[str] = None):
+    """Replace path with text so readers see either the old or the new file, never a partial one"""
+    temp = f"{path}.tmp"
+    with open(temp, 'w', encoding='utf-8', newline=newline) as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
@@ -0,0 +1,111 @@
+"""
+ADB flight recorder.
+
+Keeps the last ``capacity`` commands sent through ``iscout.device.Device``
+in preallocated slots (timestamp, device, command, duration, output or
+error), so recording costs a few list stores per command and can stay on
+all the time. ``dump`` writes the buffer to a text file; the engine does
+that automatically when a navigation fails.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from iscout.log import get_logger
+
+log = get_logger("adb")
+
+Entry = Tuple[float, str, str, float, str, bool]    # started, serial, command, elapsed, output/error, failed
+
+
+class FlightRecorder:
+    """Fixed-size ring buffer of ADB commands"""
+
+    KEEP_DUMPS = 20         # Older dump files are deleted
+    MAX_OUTPUT = 200        # Characters of command output written per entry
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self.directory: Optional[str] = None    # Where dump() writes; set by the engine
+        self._started = [0.0] * capacity
+        self._serial = [""] * capacity
+        self._command = [""] * capacity
+        self._elapsed = [0.0] * capacity
+        self._outcome = [""] * capacity
+        self._failed = [False] * capacity
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe_shell(self, call):
+        """Device observer: store one command in the next slot"""
+        with self._lock:
+            slot = self._count % self.capacity
+            self._started[slot] = call.started
+            self._serial[slot] = call.serial
+            self._command[slot] = call.command
+            self._elapsed[slot] = call.elapsed
+            self._failed[slot] = bool(call.error)
+            self._outcome[slot] = call.error or call.result
+            self._count += 1
+
+    def entries(self) -> List[Entry]:
+        """Recorded commands, oldest first"""
+        with self._lock:
+            count = min(self._count, self.capacity)
+            first = self._count - count
+            slots = [(first + i) % self.capacity for i in range(count)]
+            return [(self._started[s], self._serial[s], self._command[s], self._elapsed[s],
+                     self._outcome[s], self._failed[s]) for s in slots]
+
+    def format(self, reason: str = "") -> str:
+        now = time.perf_counter()
+        lines = [f"# iScoutTool ADB flight record {datetime.now():%Y-%m-%d %H:%M:%S}",
+                 f"# Reason: {reason or 'on demand'}",
+                 "#   t (s)  dur (ms)  device  command  -> output | !! error"]
+        for started, serial, command, elapsed, outcome, failed in self.entries():
+            text = outcome.strip().replace('\r', '').replace('\n', '\\n')
+            if len(text) > self.MAX_OUTPUT:
+                text = text[:self.MAX_OUTPUT] + "..."
+            arrow = "!!" if failed else "->"
+            lines.append(f"{started - now:9.3f} {elapsed * 1000:9.1f}  {serial}  {command}  {arrow} {text}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, reason: str = "", path: Optional[str] = None) -> Optional[str]:
+        """Write the buffer to path (default: a new file in directory); returns the path written"""
+        if path is None:
+            if not self.directory:
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"flight-{datetime.now():%Y%m%d-%H%M%S-%f}.txt")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.format(reason))
+        except OSError as e:
+            log.error("Error writing flight record: %s", e)
+            return None
+        log.info("ADB flight record written to %s", path)
+        self._prune()
+        return path
+
+    def _prune(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        dumps = sorted(f for f in os.listdir(self.directory) if f.startswith('flight-') and f.endswith('.txt'))
+        for name in dumps[:-self.KEEP_DUMPS]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+flight_recorder = FlightRecorder()
+
+
+def install():
+    """Record every ADB command (idempotent)"""
+    from iscout.device import Device
+    if flight_recorder.observe_shell not in Device.observers:
+        Device.observers.append(flight_recorder.observe_shell)
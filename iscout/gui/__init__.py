@@ -0,0 +1,3 @@
+"""
+iscout.gui - PyQt5 helpers used by the iScoutTool main window
+"""
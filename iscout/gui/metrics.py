@@ -0,0 +1,59 @@
+"""
+Status bar latency readout and its detail view.
+"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from iscout.metrics import MetricsCollector
+
+WARN_STYLE = "color: #ffb347; font-weight: bold;"
+
+
+class MetricsDialog(QtWidgets.QDialog):
+    """Full metrics report, refreshed while open"""
+
+    def __init__(self, collector: MetricsCollector, parent=None, interval_ms: int = 1000):
+        super().__init__(parent)
+        self.collector = collector
+        self.setWindowTitle("Latency Metrics")
+        self.text = QtWidgets.QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.text)
+        self.resize(520, 420)
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+        self.refresh()
+
+    def refresh(self):
+        self.text.setPlainText(self.collector.snapshot().details())
+
+
+class MetricsReadout(QtWidgets.QPushButton):
+    """Flat status bar button with the compact readout; click opens MetricsDialog"""
+
+    def __init__(self, collector: MetricsCollector, parent=None, interval_ms: int = 1000):
+        super().__init__(parent)
+        self.collector = collector
+        self.dialog = None
+        self.setFlat(True)
+        self.setCursor(QtCore.Qt.PointingHandCursor)
+        self.setToolTip("ADB latency p95 | jump time p50/p95 | reconnects - click for details")
+        self.clicked.connect(self.show_details)
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.collector.snapshot()
+        self.setText(snapshot.summary())
+        self.setStyleSheet(WARN_STYLE if snapshot.degraded else "")
+
+    def show_details(self):
+        if self.dialog is None:
+            self.dialog = MetricsDialog(self.collector, self.window())
+        self.dialog.show()
+        self.dialog.raise_()
@@ -0,0 +1,249 @@
+"""
+Persistent "MOVING..." overlay drawn over the emulator's NavGo button.
+
+The overlay window is created once and only shown/hidden per navigation.
+The emulator window handle and rectangle are cached by a platform window
+tracker and refreshed only when the emulator window moves or resizes:
+
+* ``Win32WindowTracker`` - ``SetWinEventHook`` location-change events (Windows)
+* ``QtWindowTracker``    - foreign ``QWindow`` geometry signals (Linux/X11)
+* ``NullWindowTracker``  - no emulator window available (Wayland, headless)
+"""
+
+import re
+import shutil
+import sys
+from typing import Callable, Optional, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtGui import QPainter, QColor, QFont, QGuiApplication
+
+from iscout.log import get_logger
+
+log = get_logger("overlay")
+
+Rect = Tuple[int, int, int, int]    # left, top, right, bottom (absolute pixels)
+
+
+class ColoredRect(QtWidgets.QWidget):
+    """Overlay widget for blocking Go button during navigation"""
+
+    def __init__(self, text, color=QColor("#00d4ff")):
+        super().__init__()
+        self.text = text
+        self.color = color
+        self.resize(200, 100)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setBrush(self.color)
+        painter.drawRect(self.rect())
+        painter.setFont(QFont("Consolas", 16, QFont.Bold))
+        painter.setPen(QColor("white"))
+        painter.drawText(self.rect(), QtCore.Qt.AlignCenter, self.text)
+
+
+class NullWindowTracker:
+    """Tracker used when the emulator window cannot be located on this platform"""
+
+    def __init__(self, title: str = "Main"):
+        self.title = title
+        self.on_changed: Optional[Callable[[], None]] = None
+
+    def rect(self) -> Optional[Rect]:
+        return None
+
+    def close(self):
+        pass
+
+
+class Win32WindowTracker(NullWindowTracker):
+    """Cache the emulator HWND and rectangle, refreshed by WinEvent notifications"""
+
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+
+    def __init__(self, title: str = "Main"):
+        super().__init__(title)
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._user32 = ctypes.windll.user32
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._proc_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        self._proc = self._proc_type(self._on_win_event)   # Keep a reference for the hook lifetime
+        self._hwnd = 0
+        self._hook = None
+        self._rect: Optional[Rect] = None
+
+    def rect(self) -> Optional[Rect]:
+        if self._rect is None:
+            self._refresh()
+        return self._rect
+
+    def close(self):
+        if self._hook:
+            self._user32.UnhookWinEvent(self._hook)
+            self._hook = None
+
+    def _refresh(self):
+        """Locate the window (once) and read its rectangle"""
+        from ctypes import wintypes
+        if not self._hwnd or not self._user32.IsWindow(self._hwnd):
+            self.close()
+            self._hwnd = self._user32.FindWindowW(None, self.title)
+            if not self._hwnd:
+                return
+            pid = wintypes.DWORD()
+            self._user32.GetWindowThreadProcessId(self._hwnd, self._ctypes.byref(pid))
+            # Out-of-context hooks are delivered through the Qt message loop of this thread
+            self._hook = self._user32.SetWinEventHook(
+                self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_LOCATIONCHANGE, 0,
+                self._proc, pid.value, 0, self.WINEVENT_OUTOFCONTEXT
+            )
+        rect = wintypes.RECT()
+        if self._user32.GetWindowRect(self._hwnd, self._ctypes.byref(rect)):
+            self._rect = (rect.left, rect.top, rect.right, rect.bottom)
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread, time_ms):
+        if hwnd != self._hwnd or id_object != self.OBJID_WINDOW:
+            return
+        if event == self.EVENT_OBJECT_DESTROY:
+            self._hwnd = 0
+        self._rect = None
+        if self.on_changed:
+            self.on_changed()
+
+
+class QtWindowTracker(NullWindowTracker):
+    """Track an X11 emulator window through a foreign QWindow wrapper"""
+
+    def __init__(self, title: str = "Main"):
+        super().__init__(title)
+        self._window = None
+        self._rect: Optional[Rect] = None
+
+    def rect(self) -> Optional[Rect]:
+        if self._window is None:
+            self._attach()
+        if self._rect is None and self._window is not None:
+            geometry = self._window.geometry()
+            self._rect = (geometry.left(), geometry.top(), geometry.right() + 1, geometry.bottom() + 1)
+        return self._rect
+
+    def close(self):
+        if self._window is not None:
+            self._window.deleteLater()
+            self._window = None
+
+    def _attach(self):
+        """Find the emulator window id once and wrap it"""
+        if not (xdotool := shutil.which('xdotool')):
+            return
+        import subprocess   # Only needed here, on Linux
+        try:
+            result = subprocess.run(
+                [xdotool, 'search', '--name', f"^{re.escape(self.title)}$"],
+                capture_output=True, text=True, timeout=2
+            )
+            window_ids = result.stdout.split()
+            if not window_ids:
+                return
+            from PyQt5.QtGui import QWindow
+            self._window = QWindow.fromWinId(int(window_ids[0]))
+            for signal in (self._window.xChanged, self._window.yChanged,
+                           self._window.widthChanged, self._window.heightChanged):
+                signal.connect(self._on_geometry_changed)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            log.warning("Unable to locate emulator window '%s': %s", self.title, e)
+
+    def _on_geometry_changed(self, *_):
+        self._rect = None
+        if self.on_changed:
+            self.on_changed()
+
+
+def create_window_tracker(title: str = "Main"):
+    """Return the window tracker for the running platform"""
+    if sys.platform == 'win32':
+        return Win32WindowTracker(title)
+    if QGuiApplication.platformName() == 'xcb':
+        return QtWindowTracker(title)
+    return NullWindowTracker(title)
+
+
+class MovingOverlay:
+    """Single overlay window placed over a preset rectangle of the emulator screen"""
+
+    BORDER_OFFSET = 2       # Emulator window left edge pixel
+    TITLE_BAR_OFFSET = 60   # Emulator title bar height
+    MIN_SIZE = (80, 32)
+
+    def __init__(self, tracker, text: str = "MOVING...", color: QColor = QColor("#222")):
+        self.tracker = tracker
+        self.tracker.on_changed = self._on_window_changed
+        self.widget = ColoredRect(text, color)
+        self.widget.setWindowFlags(
+            QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint | QtCore.Qt.Tool
+        )
+        self.widget.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+        self.widget.setAttribute(QtCore.Qt.WA_ShowWithoutActivating)
+        self._target: Optional[Tuple[float, float, float, float]] = None
+        self._device_size = (0, 0)
+        self._geometry: Optional[Rect] = None
+
+    def set_target(self, x_loc: float, y_loc: float, x_dest: float, y_dest: float):
+        """Set the relative (0.0-1.0) rectangle the overlay should cover"""
+        self._target = (x_loc, y_loc, x_dest, y_dest)
+        self._geometry = None
+
+    def set_device_size(self, width: int, height: int):
+        """Set the emulator screen size detected at connect time"""
+        if (width, height) != self._device_size:
+            self._device_size = (width, height)
+            self._geometry = None
+
+    def show(self) -> bool:
+        """Show the overlay at its cached position"""
+        if self._geometry is None and not self._place():
+            return False
+        self.widget.show()
+        self.widget.raise_()
+        return True
+
+    def hide(self):
+        self.widget.hide()
+
+    def close(self):
+        self.tracker.close()
+        self.widget.close()
+
+    def _place(self) -> bool:
+        """Compute and apply the overlay geometry from cached window and device data"""
+        if self._target is None or 0 in self._device_size:
+            return False
+        if (window_rect := self.tracker.rect()) is None:
+            return False
+        left, top = window_rect[0], window_rect[1]
+        width, height = self._device_size
+        x_loc, y_loc, x_dest, y_dest = self._target
+        x1, y1 = int(x_loc * width), int(y_loc * height)
+        x2, y2 = int(x_dest * width), int(y_dest * height)
+        self._geometry = (
+            left + min(x1, x2) + self.BORDER_OFFSET,
+            top + min(y1, y2) + self.TITLE_BAR_OFFSET,
+            max(abs(x2 - x1), self.MIN_SIZE[0]),
+            max(abs(y2 - y1), self.MIN_SIZE[1]),
+        )
+        self.widget.setGeometry(*self._geometry)
+        return True
+
+    def _on_window_changed(self):
+        self._geometry = None
+        if self.widget.isVisible():
+            self._place()
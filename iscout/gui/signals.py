@@ -0,0 +1,56 @@
+"""
+Thread-safe delivery of background service callbacks to the Qt GUI thread.
+"""
+
+import threading
+from concurrent.futures import Future
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class CallbackBridge(QObject):
+    """Callable that forwards its argument to a slot on the GUI thread
+
+    Pass an instance as the listener of a Qt-free service; calls made from
+    worker threads are queued onto the thread that owns the bridge.
+    """
+
+    fired = pyqtSignal(object)
+
+    def __init__(self, slot, parent=None):
+        super().__init__(parent)
+        self.fired.connect(slot)
+
+    def __call__(self, payload=None):
+        self.fired.emit(payload)
+
+
+class GuiInvoker(QObject):
+    """Run callables on the GUI thread and hand the result back to the calling thread
+
+    Create it on the GUI (main) thread. Calls from that thread run directly;
+    calls from worker threads block until the event loop has run them.
+    """
+
+    requested = pyqtSignal(object)
+
+    def __init__(self, parent=None, timeout: float = 10.0):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.requested.connect(self._run)
+
+    def __call__(self, fn):
+        if threading.current_thread() is threading.main_thread():
+            return fn()
+        future = Future()
+        self.requested.emit((fn, future))
+        return future.result(self.timeout)
+
+    def _run(self, payload):
+        fn, future = payload
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
@@ -0,0 +1,90 @@
+"""
+Fast main window construction and startup-time measurement.
+
+``load_ui_class`` returns the pyuic-generated ``Ui_MainWindow`` instead of
+parsing the .ui XML at runtime, regenerating the module first when the .ui
+file is newer. ``FirstPaintProbe`` reports the milliseconds from process
+launch to the first painted main window.
+"""
+
+import importlib
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+from PyQt5 import QtCore
+
+from iscout.log import get_logger
+from iscout.procinfo import process_start_time
+
+log = get_logger("ui")
+
+# Modification times this close together are treated as the same checkout
+MTIME_TOLERANCE = 2.0
+
+
+def load_ui_class(ui_file: str, module_name: str):
+    """Return the compiled Ui_MainWindow class for ui_file
+
+    Falls back to compiling the .ui file in memory when the generated module
+    is stale and cannot be rewritten (for example a read-only install).
+    """
+    module_file = os.path.join(os.path.dirname(ui_file), f"{module_name}.py")
+    frozen = getattr(sys, 'frozen', False)
+    if not frozen and os.path.exists(ui_file):
+        stale = (not os.path.exists(module_file)
+                 or os.path.getmtime(ui_file) > os.path.getmtime(module_file) + MTIME_TOLERANCE)
+        if stale:
+            from PyQt5 import uic
+            try:
+                with open(ui_file, 'r', encoding='utf-8') as source, \
+                        open(module_file, 'w', encoding='utf-8') as target:
+                    uic.compileUi(source, target)
+                log.info("Regenerated %s from %s", os.path.basename(module_file), os.path.basename(ui_file))
+            except OSError as e:
+                log.warning("Could not regenerate %s: %s", module_file, e)
+                return uic.loadUiType(ui_file)[0]
+    return importlib.import_module(module_name).Ui_MainWindow
+
+
+def setup_compiled_ui(window, ui_class):
+    """Build ui_class onto window, exposing widgets as window attributes like uic.loadUi"""
+    form = ui_class()
+    form.setupUi(window)
+    for name, widget in vars(form).items():
+        setattr(window, name, widget)
+    return form
+
+
+class FirstPaintProbe(QtCore.QObject):
+    """Measure launch-to-first-paint time of a window"""
+
+    def __init__(self, window, on_report: Optional[Callable[[float], None]] = None,
+                 start_time: Optional[float] = None):
+        super().__init__(window)
+        self.window = window
+        self.on_report = on_report
+        self.start_time = start_time if start_time is not None else process_start_time()
+        self.elapsed_ms: Optional[float] = None
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QtCore.QEvent.Paint and self.elapsed_ms is None:
+            self.window.removeEventFilter(self)
+            # Report once the paint event has been delivered
+            QtCore.QTimer.singleShot(0, self._report)
+        return False
+
+    def _report(self):
+        self.elapsed_ms = (time.time() - self.start_time) * 1000.0
+        log.info("Startup: first window paint after %.0f ms", self.elapsed_ms)
+        if log_file := os.environ.get('ISCOUT_STARTUP_LOG'):
+            try:
+                with open(log_file, 'a') as f:
+                    f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')},{self.elapsed_ms:.1f},"
+                            f"{int(bool(getattr(sys, 'frozen', False)))}\n")
+            except OSError as e:
+                log.error("Error writing startup log: %s", e)
+        if self.on_report:
+            self.on_report(self.elapsed_ms)
@@ -0,0 +1,153 @@
+"""
+Background device heartbeat.
+
+``Heartbeat`` keeps a cached ``DeviceHealth`` for the connected emulator so
+callers on the hot path (navigation, clicks) can trust it instead of
+probing the device themselves. It runs every few seconds and costs almost
+nothing: commands the tool sends anyway count as proof of life, so the
+``echo`` probe only goes out when the device has been idle, and the
+foreground app is read from ``dumpsys activity`` only on (re)connect,
+once a minute, or when ``refresh()`` asks for it. Changes are published to
+a listener callable (the GUI wraps it in a Qt signal).
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+
+from iscout.device import Device
+from iscout.log import get_logger
+
+log = get_logger("adb")
+
+EVONY_PACKAGE_HINT = "evony"    # Evony package names differ per store/region but all contain this
+FOREGROUND_COMMAND = "dumpsys activity activities | grep -E 'mResumedActivity|topResumedActivity'"
+_PACKAGE_RE = re.compile(r" u\d+ ([\w.]+)/")
+
+
+@dataclass
+class DeviceHealth:
+    """Cached connection health published by the heartbeat"""
+    connected: bool = False
+    responsive: bool = False
+    foreground_package: str = ""    # '' when unknown
+    message: str = ""
+    checked_at: float = 0.0         # time.monotonic() of the last heartbeat
+
+    @property
+    def evony_foreground(self) -> Optional[bool]:
+        """Whether Evony is the foreground app; None when unknown"""
+        if not self.foreground_package:
+            return None
+        return EVONY_PACKAGE_HINT in self.foreground_package.lower()
+
+    def same_state(self, other: 'DeviceHealth') -> bool:
+        return (self.connected, self.responsive, self.foreground_package, self.message) == \
+               (other.connected, other.responsive, other.foreground_package, other.message)
+
+
+def parse_foreground_package(output: str) -> str:
+    """Package of the resumed activity in 'dumpsys activity activities' output, or ''"""
+    match = _PACKAGE_RE.search(output or "")
+    return match.group(1) if match else ""
+
+
+class Heartbeat:
+    """Keep DeviceHealth of one connection current on a background thread"""
+
+    INTERVAL = 5.0              # Seconds between heartbeats
+    PACKAGE_INTERVAL = 60.0     # Seconds between foreground app checks
+
+    def __init__(self, connection, listener: Optional[Callable[[DeviceHealth], None]] = None,
+                 interval: float = INTERVAL, package_interval: float = PACKAGE_INTERVAL):
+        self.connection = connection        # ConnectionManager
+        self.listener = listener
+        self.interval = interval
+        self.package_interval = package_interval
+        self.health = DeviceHealth()
+        self._device = None
+        self._last_ok = 0.0                 # perf_counter() of the last successful command
+        self._package_at: Optional[float] = None
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            Device.observers.append(self.observe_shell)
+            self._thread = threading.Thread(target=self._run, name="iScoutHeartbeat", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        if self.observe_shell in Device.observers:
+            Device.observers.remove(self.observe_shell)
+
+    def refresh(self):
+        """Check the foreground app on the next beat, which happens now"""
+        self._package_at = None
+        self._wake.set()
+
+    def observe_shell(self, call):
+        """Device observer: successful traffic proves the device is alive"""
+        device = self._device
+        if not call.error and device is not None and call.serial == device.serial:
+            self._last_ok = call.started + call.elapsed
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                self.beat()
+            except Exception as e:
+                log.error("Error in heartbeat: %s", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def beat(self) -> DeviceHealth:
+        """Run one heartbeat and publish the result if it changed"""
+        device = self.connection.device
+        if device is None:
+            self._device = None
+            return self._publish(DeviceHealth(message=self.connection.status.message))
+        if device is not self._device:
+            # New connection: the foreground app is unknown again
+            self._device = device
+            self._package_at = None
+            self._last_ok = 0.0
+
+        health = replace(self.health, connected=True, message="")
+        if time.perf_counter() - self._last_ok > self.interval:
+            try:
+                device.shell("echo ok")
+            except Exception as e:
+                return self._publish(replace(health, responsive=False, message=f"Not responding: {e}"))
+        if not self.health.responsive:
+            self._package_at = None     # Back from a hiccup: the user may have switched apps
+        health.responsive = True
+
+        now = time.monotonic()
+        if self._package_at is None or now - self._package_at >= self.package_interval:
+            try:
+                health.foreground_package = parse_foreground_package(device.shell(FOREGROUND_COMMAND))
+                self._package_at = now
+            except Exception as e:
+                log.warning("Could not read the foreground app: %s", e)
+        if health.evony_foreground is False:
+            health.message = f"Evony is not in the foreground ({health.foreground_package})"
+        return self._publish(health)
+
+    def _publish(self, health: DeviceHealth) -> DeviceHealth:
+        health.checked_at = time.monotonic()
+        changed = not health.same_state(self.health)
+        self.health = health
+        if changed:
+            log.info("Device health: %s", health.message or ("responsive" if health.responsive else "offline"))
+            if self.listener:
+                try:
+                    self.listener(health)
+                except Exception as e:
+                    log.error("Error publishing device health: %s", e)
+        return health
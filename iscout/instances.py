@@ -0,0 +1,239 @@
+"""
+Multi-instance orchestration: drive several emulators from one app.
+
+Each ``Instance`` pairs an account profile (home and enemy server) with its
+own ADB connection, navigation worker thread and bubble timer. The
+``Dispatcher`` keeps a shared queue of target navigations that any idle
+instance picks up, plus per-instance queues for account-specific jumps
+(Go Home / Go Enemy). Throughput therefore scales with the number of
+emulators instead of one device's navigation latency.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, Deque, List, Optional
+
+from iscout.connection import ConnectionManager
+from iscout.discovery import DeviceDiscovery
+from iscout.flight import flight_recorder
+from iscout.log import get_logger
+from iscout.metrics import metrics
+from iscout.navigator import DEFAULT_ROUTE, Navigator
+from iscout.routes import RouteBook
+from iscout.trace import NAV, tracer
+
+log = get_logger("nav")
+
+# Event kinds published to the dispatcher listener
+STARTED = "started"
+FINISHED = "finished"
+FAILED = "failed"
+
+
+@dataclass
+class InstanceProfile:
+    """Per-account settings of one emulator instance"""
+    name: str
+    device_serial: str
+    home_server: int = 0
+    home_x: int = 0
+    home_y: int = 0
+    enemy_server: int = 0
+
+
+@dataclass
+class NavRequest:
+    """A queued navigation; server None means the instance's enemy server"""
+    x: int
+    y: int
+    server: Optional[int] = None
+    target_index: Optional[int] = None      # Row in the scout table, for target jumps
+    start_bubble: bool = False              # Start the instance bubble timer on success
+    skip_server: bool = False               # The map already shows the requested server
+    route: str = DEFAULT_ROUTE              # Route from locations.xml that performs the jump
+    label: str = ""
+
+
+@dataclass
+class InstanceEvent:
+    """Progress notification for one request on one instance"""
+    kind: str
+    instance: str
+    request: NavRequest
+    error: str = ""
+    elapsed: float = 0.0
+
+
+def load_profiles(path: str) -> List[InstanceProfile]:
+    """Read instance profiles from a JSON file ([] when missing)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [InstanceProfile(**entry) for entry in data.get('instances', [])]
+
+
+def save_profiles(path: str, profiles: List[InstanceProfile]):
+    """Write instance profiles to a JSON file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'instances': [asdict(p) for p in profiles]}, f, indent=2)
+
+
+class Instance:
+    """One emulator: connection, navigation worker and bubble timer"""
+
+    CONNECT_TIMEOUT = 10.0
+
+    def __init__(self, profile: InstanceProfile, dispatcher: 'Dispatcher', connection: ConnectionManager):
+        self.profile = profile
+        self.dispatcher = dispatcher
+        self.connection = connection
+        self.busy = False
+        self.current_server: Optional[int] = None   # Server the map shows after the last jump
+        self.bubble_deadline: Optional[float] = None
+        self._own: Deque[NavRequest] = deque()
+        self._thread = threading.Thread(target=self._run, name=f"iScoutNav-{profile.name}", daemon=True)
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    def start(self):
+        self.connection.start()
+        self._thread.start()
+
+    def start_bubble(self, seconds: int = 300):
+        self.bubble_deadline = time.monotonic() + seconds
+
+    def stop_bubble(self):
+        self.bubble_deadline = None
+
+    def bubble_remaining(self) -> Optional[int]:
+        """Whole seconds left on the bubble timer, or None when not running"""
+        if self.bubble_deadline is None:
+            return None
+        return max(0, int(round(self.bubble_deadline - time.monotonic())))
+
+    def _run(self):
+        while (request := self.dispatcher._next_request(self)) is not None:
+            self.busy = True
+            started = time.monotonic()
+            self.dispatcher._publish(InstanceEvent(STARTED, self.name, request))
+            try:
+                self._navigate(request)
+                if request.start_bubble:
+                    self.start_bubble()
+                self.dispatcher._publish(InstanceEvent(FINISHED, self.name, request,
+                                                       elapsed=time.monotonic() - started))
+            except Exception as e:
+                self.dispatcher._publish(InstanceEvent(FAILED, self.name, request, error=str(e),
+                                                       elapsed=time.monotonic() - started))
+            finally:
+                self.busy = False
+
+    def _navigate(self, request: NavRequest):
+        device = self.connection.wait_connected(self.CONNECT_TIMEOUT)
+        if device is None:
+            raise ConnectionError(f"{self.name}: no connection to {self.profile.device_serial}")
+        server = request.server if request.server is not None else self.profile.enemy_server
+        status = self.connection.status
+        info = status.device_info
+        navigator = Navigator(device, self.dispatcher.routes, status.screen_size,
+                              profile=info.profile if info else "", devices=(info.serial, info.model) if info else ())
+        # The server field can be skipped once this account already looks at that server
+        with tracer.span("navigate", NAV, instance=self.name, x=request.x, y=request.y, server=server,
+                         route=request.route):
+            started = time.perf_counter()
+            try:
+                navigator.navigate(request.x, request.y, server,
+                                   skip_server=request.skip_server or server == self.current_server,
+                                   route=request.route)
+            except Exception as e:
+                metrics.record_navigation(time.perf_counter() - started, ok=False)
+                flight_recorder.dump(f"{self.name}: navigation to {server}:{request.x},{request.y} failed: {e}")
+                raise
+            metrics.record_navigation(time.perf_counter() - started)
+        self.current_server = server
+
+
+class Dispatcher:
+    """Distribute navigation requests over a pool of emulator instances"""
+
+    IDLE_POLL = 1.0     # Seconds between re-checks while waiting for a connection
+
+    def __init__(self, routes: RouteBook, listener: Optional[Callable[[InstanceEvent], None]] = None,
+                 discovery: Optional[DeviceDiscovery] = None):
+        self.routes = routes
+        self.listener = listener
+        self.discovery = discovery or DeviceDiscovery()     # Shared by every instance's connection
+        self.instances: List[Instance] = []
+        self._shared: Deque[NavRequest] = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def add_instance(self, profile: InstanceProfile, port: int = 5555) -> Instance:
+        """Create and start an instance for profile"""
+        connection = ConnectionManager(port=port, discovery=self.discovery, pinned_serial=profile.device_serial)
+        instance = Instance(profile, self, connection)
+        self.instances.append(instance)
+        instance.start()
+        return instance
+
+    def submit(self, request: NavRequest):
+        """Queue a request for whichever instance becomes idle first"""
+        with self._condition:
+            self._shared.append(request)
+            self._condition.notify_all()
+
+    def submit_to(self, instance: Instance, request: NavRequest):
+        """Queue a request for one specific instance"""
+        with self._condition:
+            instance._own.append(request)
+            self._condition.notify_all()
+
+    def submit_to_all(self, make_request: Callable[[InstanceProfile], NavRequest]):
+        """Queue one request per instance, built from its profile"""
+        for instance in self.instances:
+            self.submit_to(instance, make_request(instance.profile))
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._shared) + sum(len(i._own) for i in self.instances)
+
+    def clear(self):
+        """Drop all queued (not yet started) requests"""
+        with self._condition:
+            self._shared.clear()
+            for instance in self.instances:
+                instance._own.clear()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for instance in self.instances:
+            instance.connection.stop()
+
+    def _next_request(self, instance: Instance) -> Optional[NavRequest]:
+        """Block until instance has work: its own queue first, then the shared queue"""
+        with self._condition:
+            while not self._stopped:
+                if instance._own:
+                    return instance._own.popleft()
+                # Only connected instances take shared work, so a dead emulator
+                # does not swallow targets meant for the healthy ones
+                if self._shared and instance.connection.device is not None:
+                    return self._shared.popleft()
+                self._condition.wait(self.IDLE_POLL)
+            return None
+
+    def _publish(self, event: InstanceEvent):
+        if self.listener:
+            try:
+                self.listener(event)
+            except Exception as e:
+                log.error("Error publishing instance event: %s", e)
@@ -0,0 +1,239 @@
+"""
+Automatic screen layout calibration.
+
+The navigation presets in locations.xml were measured by hand for one
+emulator layout; after a resolution or DPI change the taps drift.
+``LayoutCalibrator`` finds each navigation element again by template
+matching and writes a ``locations-<width>x<height>.xml`` profile that is
+used automatically on screens of that size (see ``iscout.presets``).
+
+Templates are cut once from a layout that works (``capture_templates``):
+the NavBox from the map screen, the dialog fields and NavGo from the
+screen after tapping it. They are stored as grey-scale arrays in
+Resources/layout-templates.npz. Calibration takes the same two frames on
+the new layout and searches every template over a range of scales; each
+scale is one FFT-based normalised cross-correlation over the whole
+(downsampled) frame, with the frame's spectrum and integral images computed
+once and shared by all templates and scales, so a calibration takes a few
+seconds.
+
+Needs NumPy (optional dependency).
+"""
+
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from iscout.log import get_logger
+from iscout.models import LocationPreset
+from iscout.routes import rect_center
+from iscout.screen import Frame, capture
+
+try:
+    import numpy as np
+except ImportError:     # Optional dependency
+    np = None
+
+log = get_logger("nav")
+
+MAP_ELEMENTS = ("NavBox",)                                  # Visible on the map screen
+DIALOG_ELEMENTS = ("NavServer", "NavX", "NavY", "NavGo")    # Visible after tapping NavBox
+WORK_WIDTH = 360        # Frames are downsampled to about this width before matching
+
+
+class LayoutError(Exception):
+    """Templates missing or an element could not be found"""
+
+
+@dataclass
+class ElementMatch:
+    """Where one template was found, in relative screen coordinates"""
+    name: str
+    x_loc: float
+    y_loc: float
+    x_dest: float
+    y_dest: float
+    score: float            # Normalised cross-correlation, 1.0 = identical
+    scale: float
+
+
+def grey(frame: Frame):
+    """Float32 luminance array of a frame"""
+    rgb = np.frombuffer(frame.data, dtype=np.uint8).reshape(frame.height, frame.width, 4)[..., :3]
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def downsample(image, factor: int):
+    """Mean of factor x factor blocks"""
+    if factor <= 1:
+        return image
+    height, width = (image.shape[0] // factor) * factor, (image.shape[1] // factor) * factor
+    return image[:height, :width].reshape(height // factor, factor, width // factor, factor).mean(axis=(1, 3))
+
+
+def resize(image, height: int, width: int):
+    """Nearest-neighbour resize"""
+    rows = ((np.arange(height) + 0.5) * image.shape[0] / height).astype(int)
+    columns = ((np.arange(width) + 0.5) * image.shape[1] / width).astype(int)
+    return image[rows][:, columns]
+
+
+class TemplateSearch:
+    """Normalised cross-correlation of any template against one image
+
+    The image spectrum (padded to twice its size, so every template fits
+    without wrap-around) and its integral images are computed once.
+    """
+
+    def __init__(self, image):
+        self.image = image.astype(np.float64)
+        self.shape = (2 * image.shape[0], 2 * image.shape[1])
+        self.spectrum = np.fft.rfft2(self.image, self.shape)
+        self.integral = np.pad(self.image.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+        self.integral_sq = np.pad((self.image ** 2).cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+
+    def scores(self, template):
+        """Correlation at every position where template fits (1.0 = identical up to brightness/contrast)"""
+        th, tw = template.shape
+        ih, iw = self.image.shape
+        t = template - template.mean()
+        t_norm = np.sqrt((t * t).sum())
+        if t_norm == 0:
+            return np.zeros((ih - th + 1, iw - tw + 1))
+        # Cross-correlation = convolution with the flipped template
+        correlation = np.fft.irfft2(self.spectrum * np.fft.rfft2(t[::-1, ::-1], self.shape), self.shape)
+        correlation = correlation[th - 1:ih, tw - 1:iw]
+        sums = self._window_sums(self.integral, th, tw)
+        squares = self._window_sums(self.integral_sq, th, tw)
+        variance = np.maximum(squares - sums * sums / (th * tw), 1e-6)
+        return correlation / (np.sqrt(variance) * t_norm)
+
+    @staticmethod
+    def _window_sums(integral, th: int, tw: int):
+        return integral[th:, tw:] - integral[:-th, tw:] - integral[th:, :-tw] + integral[:-th, :-tw]
+
+    def find(self, template, scales: Sequence[float]) -> Tuple[float, int, int, int, int, float]:
+        """Best (score, left, top, width, height, scale) of template over the scales"""
+        best = (-1.0, 0, 0, 0, 0, 1.0)
+        for scale in scales:
+            height, width = round(template.shape[0] * scale), round(template.shape[1] * scale)
+            if height < 4 or width < 4 or height > self.image.shape[0] or width > self.image.shape[1]:
+                continue
+            scores = self.scores(resize(template, height, width))
+            top, left = np.unravel_index(int(scores.argmax()), scores.shape)
+            if scores[top, left] > best[0]:
+                best = (float(scores[top, left]), int(left), int(top), width, height, scale)
+        return best
+
+
+def load_templates(path: str) -> Tuple[Dict[str, object], Tuple[int, int]]:
+    """Element templates and the (width, height) of the screen they were cut from"""
+    if np is None:
+        raise LayoutError("Layout calibration needs NumPy (pip install numpy)")
+    try:
+        with np.load(path) as data:
+            source = tuple(int(v) for v in data['_source'])
+            return {name: data[name] for name in data.files if name != '_source'}, source
+    except (OSError, KeyError, ValueError) as e:
+        raise LayoutError(f"Cannot read layout templates {path}: {e}")
+
+
+class LayoutCalibrator:
+    """Cut element templates on a working layout, or find the elements on a new one"""
+
+    MIN_SCORE = 0.6         # Matches below this are reported and keep the default preset
+    SCALES = tuple(np.geomspace(0.6, 1.6, 11)) if np is not None else ()    # Around the width ratio
+    DIALOG_WAIT = 1.0       # Seconds for the navigation dialog to open
+
+    def __init__(self, device, presets: Dict[str, LocationPreset], screen_size: Tuple[int, int],
+                 listener: Optional[Callable[[str], None]] = None, sleep: Callable[[float], None] = time.sleep):
+        if np is None:
+            raise LayoutError("Layout calibration needs NumPy (pip install numpy)")
+        self.device = device
+        self.presets = presets
+        self.screen_size = screen_size
+        self.listener = listener
+        self.sleep = sleep
+
+    def capture_templates(self, path: str) -> Dict[str, object]:
+        """Cut every element from this (known good) layout and save them to path"""
+        missing = [n for n in MAP_ELEMENTS + DIALOG_ELEMENTS if n not in self.presets]
+        if missing:
+            raise LayoutError(f"Presets missing from locations.xml: {', '.join(missing)}")
+        map_frame, dialog_frame = self._frames(self.presets['NavBox'])
+        templates = {}
+        for names, frame in ((MAP_ELEMENTS, map_frame), (DIALOG_ELEMENTS, dialog_frame)):
+            image = grey(frame)
+            for name in names:
+                p = self.presets[name]
+                left, right = sorted((int(p.x_loc * frame.width), int(p.x_dest * frame.width)))
+                top, bottom = sorted((int(p.y_loc * frame.height), int(p.y_dest * frame.height)))
+                templates[name] = image[top:bottom, left:right].astype(np.float32)
+        np.savez_compressed(path, _source=np.array([map_frame.width, map_frame.height]), **templates)
+        self._publish(f"Saved {len(templates)} element templates")
+        return templates
+
+    def run(self, templates: Dict[str, object], source: Tuple[int, int]) -> Dict[str, ElementMatch]:
+        """Find every templated element on the current screen; returns matches by preset name"""
+        matches = {}
+        map_search, factor = self._search(capture(self.device))
+        navbox = self._find('NavBox', map_search, factor, templates, source)
+        matches['NavBox'] = navbox
+        if navbox.score < self.MIN_SCORE:
+            raise LayoutError(f"NavBox not found (best match {navbox.score:.2f}); open the map screen")
+        dialog_frame = self._frames(navbox, map_first=False)[1]
+        dialog_search, factor = self._search(dialog_frame)
+        for name in DIALOG_ELEMENTS:
+            if name in templates:
+                matches[name] = self._find(name, dialog_search, factor, templates, source)
+        return matches
+
+    def presets_from(self, matches: Dict[str, ElementMatch]) -> Dict[str, LocationPreset]:
+        """Presets for this resolution: good matches replace the default rectangles"""
+        result = {}
+        for name, match in matches.items():
+            if match.score < self.MIN_SCORE:
+                log.warning("Layout: %s not found (best %.2f); keeping the default preset", name, match.score)
+                continue
+            default = self.presets.get(name) or LocationPreset(name, 0, 0, 0, 0, False)
+            result[name] = replace(default, x_loc=match.x_loc, y_loc=match.y_loc,
+                                   x_dest=match.x_dest, y_dest=match.y_dest)
+        return result
+
+    def _find(self, name: str, search: TemplateSearch, factor: int, templates: Dict[str, object],
+              source: Tuple[int, int]) -> ElementMatch:
+        width, height = self.screen_size
+        # Matched at work resolution; the UI scales roughly with the screen width
+        source_factor = max(1, source[0] // WORK_WIDTH)
+        template = downsample(templates[name], source_factor)
+        base = (width / source[0]) * source_factor / factor
+        score, left, top, w, h, scale = search.find(template, [base * s for s in self.SCALES])
+        match = ElementMatch(name, left * factor / width, top * factor / height,
+                             (left + w) * factor / width, (top + h) * factor / height, score, scale / base)
+        self._publish(f"{name}: score {score:.2f} at {match.x_loc:.3f},{match.y_loc:.3f}")
+        return match
+
+    @staticmethod
+    def _search(frame: Frame) -> Tuple[TemplateSearch, int]:
+        factor = max(1, frame.width // WORK_WIDTH)
+        return TemplateSearch(downsample(grey(frame), factor)), factor
+
+    def _frames(self, navbox, map_first: bool = True) -> Tuple[Optional[Frame], Frame]:
+        """Map frame (optional), then the dialog frame after tapping NavBox; closes the dialog again"""
+        map_frame = capture(self.device) if map_first else None
+        width, height = self.screen_size
+        x, y = rect_center(width, height, navbox.x_loc, navbox.y_loc, navbox.x_dest, navbox.y_dest)
+        self.device.shell(f"input tap {x} {y}")
+        self.sleep(self.DIALOG_WAIT)
+        try:
+            return map_frame, capture(self.device)
+        finally:
+            self.device.shell("input keyevent 4")   # Back: close the dialog
+
+    def _publish(self, message: str):
+        log.info("Layout: %s", message)
+        if self.listener:
+            try:
+                self.listener(message)
+            except Exception as e:
+                log.error("Error publishing layout progress: %s", e)
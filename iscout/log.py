@@ -0,0 +1,103 @@
+"""
+Leveled logging for iScoutTool.
+
+Each subsystem logs through its own logger (``get_logger("nav")`` is
+``iscout.nav``) with lazy %-style arguments, so a disabled level costs a
+single cached level check. ``setup_logging`` sends every record through a
+queue: a ``QueueListener`` thread writes the rotating log file and the
+console, so a navigation never waits on a slow Windows console or disk.
+
+Levels can be set per subsystem with a spec such as
+``"info,nav=debug,adb=warning"`` (the ``ISCOUT_LOG`` environment variable).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Dict, Optional
+
+ROOT = "iscout"
+SUBSYSTEMS = ("adb", "nav", "overlay", "ui", "timer", "api")
+
+FILE_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+CONSOLE_FORMAT = "%(message)s"      # Same look as the print() output it replaces
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """'info,nav=debug' -> {'': INFO, 'nav': DEBUG}; '' is the default for all subsystems"""
+    levels = {}
+    for part in (spec or "").replace(';', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition('=')
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level: {level}")
+        levels[name.strip()] = value
+    return levels
+
+
+def set_levels(levels: Dict[str, int]):
+    """Apply levels from parse_levels; subsystems not listed follow the default"""
+    logging.getLogger(ROOT).setLevel(levels.get('', logging.INFO))
+    for subsystem in SUBSYSTEMS:
+        get_logger(subsystem).setLevel(levels.get(subsystem, logging.NOTSET))
+
+
+def set_debug(enabled: bool):
+    """Switch every subsystem between DEBUG and INFO"""
+    set_levels({'': logging.DEBUG if enabled else logging.INFO})
+
+
+def setup_logging(log_file: Optional[str] = None, levels: str = "", console=sys.stdout,
+                  console_level: int = logging.DEBUG, max_bytes: int = 1_000_000, backups: int = 3):
+    """Route iscout.* records through a queue to a rotating file and the console
+
+    Safe to call again (e.g. to change the file); the previous listener is
+    stopped first. Pass console=None for no console output.
+    """
+    global _listener
+    if _listener:
+        _listener.stop()
+
+    handlers = []
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups,
+                                                            encoding='utf-8', delay=True)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT, "%Y-%m-%d %H:%M:%S"))
+        handlers.append(file_handler)
+    if console is not None:
+        console_handler = logging.StreamHandler(console)
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger(ROOT)
+    root.handlers[:] = [logging.handlers.QueueHandler(records)]
+    root.propagate = False
+    set_levels(parse_levels(levels))
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records; registered to run at exit"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
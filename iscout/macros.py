@@ -0,0 +1,320 @@
+"""
+Macro recording and replay of ADB input sequences.
+
+``MacroRecorder`` logs every ``input`` command the app sends (through the
+``Device.observers`` hook) and, optionally, touches made directly in the
+emulator, decoded from ``getevent``. Macros are saved as small text
+files, one step per line: milliseconds since the previous step, then the
+shell command::
+
+    # iScoutTool macro v1
+    @screen 1080x1920
+    0 input tap 562 1698
+    412 input tap 613 899
+    ? dumpsys window windows ~ mCurrentFocus
+    180 input keyevent 123
+
+A ``? <command> ~ <text>`` line is a readiness check: before the next step
+runs, the command is polled until its output contains the text.
+
+``MacroPlayer`` replays a macro with time compression (2.0 = twice as
+fast), an optional floor on every delay and readiness checks, scaling
+coordinates when the screen size differs from the recording.
+``macro_to_route_xml`` turns a tightened macro into a ``<route>`` for
+locations.xml.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+from xml.sax.saxutils import quoteattr
+
+from iscout.device import Device, ShellCall
+from iscout.log import get_logger
+
+log = get_logger("nav")
+
+HEADER = "# iScoutTool macro v1"
+READY_ECHO = "echo"     # Readiness mode: a device round trip before every step
+
+
+class MacroError(Exception):
+    """A macro file is malformed or a replay step failed"""
+
+
+@dataclass
+class MacroStep:
+    delay_ms: int           # Since the previous step started
+    command: str            # Shell command, e.g. "input tap 540 1192"
+    check: str = ""         # Readiness check command polled before this step
+    expect: str = ""        # Text the check output must contain
+
+
+@dataclass
+class Macro:
+    screen_size: Tuple[int, int] = (0, 0)   # Resolution the coordinates belong to
+    steps: List[MacroStep] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> int:
+        return sum(step.delay_ms for step in self.steps)
+
+
+# File format
+
+def format_macro(macro: Macro) -> str:
+    lines = [HEADER]
+    width, height = macro.screen_size
+    if width and height:
+        lines.append(f"@screen {width}x{height}")
+    for step in macro.steps:
+        if step.check:
+            lines.append(f"? {step.check} ~ {step.expect}")
+        lines.append(f"{step.delay_ms} {step.command}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_macro(text: str) -> Macro:
+    macro = Macro()
+    check = expect = ""
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('@screen'):
+            match = re.fullmatch(r'@screen\s+(\d+)x(\d+)', line)
+            if not match:
+                raise MacroError(f"Line {number}: expected '@screen WIDTHxHEIGHT'")
+            macro.screen_size = (int(match.group(1)), int(match.group(2)))
+        elif line.startswith('?'):
+            check, _, expect = line[1:].partition('~')
+            check, expect = check.strip(), expect.strip()
+            if not check:
+                raise MacroError(f"Line {number}: readiness check without a command")
+        else:
+            delay, _, command = line.partition(' ')
+            if not delay.isdigit() or not command.strip():
+                raise MacroError(f"Line {number}: expected '<delay ms> <command>'")
+            macro.steps.append(MacroStep(int(delay), command.strip(), check, expect))
+            check = expect = ""
+    return macro
+
+
+def load_macro(path: str) -> Macro:
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_macro(f.read())
+
+
+def save_macro(path: str, macro: Macro):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(format_macro(macro))
+
+
+def scale_command(command: str, sx: float, sy: float) -> str:
+    """Rescale the coordinates of an 'input tap' or 'input swipe' command"""
+    parts = command.split()
+    if len(parts) >= 4 and parts[0] == 'input' and parts[1] in ('tap', 'swipe'):
+        count = 2 if parts[1] == 'tap' else 4
+        try:
+            coords = [int(round(float(v) * (sx if i % 2 == 0 else sy)))
+                      for i, v in enumerate(parts[2:2 + count])]
+        except ValueError:
+            return command
+        return " ".join(parts[:2] + [str(c) for c in coords] + parts[2 + count:])
+    return command
+
+
+# Touch capture
+
+class TouchDecoder:
+    """Turn 'getevent -lt' lines of a touchscreen into tap/swipe commands"""
+
+    TAP_SLOP = 12           # Pixels a finger may move and still count as a tap
+
+    def __init__(self, axis_max: Tuple[int, int], screen_size: Tuple[int, int]):
+        self.sx = screen_size[0] / max(axis_max[0], 1)
+        self.sy = screen_size[1] / max(axis_max[1], 1)
+        self._down = False
+        self._x = self._y = None
+        self._start: Optional[Tuple[int, int, float]] = None
+
+    def feed(self, line: str) -> Optional[str]:
+        """Consume one line; returns a command when a gesture completes"""
+        match = re.match(r'\[\s*([\d.]+)\]\s+\S+:\s+(\S+)\s+(\S+)\s+(\S+)', line)
+        if not match:
+            return None
+        stamp, _, code, value = float(match.group(1)), match.group(2), match.group(3), match.group(4)
+        if code == 'ABS_MT_POSITION_X':
+            self._x = int(value, 16)
+        elif code == 'ABS_MT_POSITION_Y':
+            self._y = int(value, 16)
+        elif code == 'BTN_TOUCH' or code == 'ABS_MT_TRACKING_ID':
+            down = value == 'DOWN' if code == 'BTN_TOUCH' else value != 'ffffffff'
+            if down and not self._down:
+                self._down = True
+                self._start = None
+            elif not down and self._down:
+                self._down = False
+                return self._finish(stamp)
+        elif code == 'SYN_REPORT' and self._down and self._start is None and self._x is not None \
+                and self._y is not None:
+            self._start = (self._x, self._y, stamp)
+        return None
+
+    def _finish(self, stamp: float) -> Optional[str]:
+        if self._start is None or self._x is None or self._y is None:
+            return None
+        x0, y0 = int(self._start[0] * self.sx), int(self._start[1] * self.sy)
+        x1, y1 = int(self._x * self.sx), int(self._y * self.sy)
+        if abs(x1 - x0) <= self.TAP_SLOP and abs(y1 - y0) <= self.TAP_SLOP:
+            return f"input tap {x0} {y0}"
+        duration = max(int((stamp - self._start[2]) * 1000), 1)
+        return f"input swipe {x0} {y0} {x1} {y1} {duration}"
+
+
+def touch_axis_max(device) -> Tuple[int, int]:
+    """ABS_MT_POSITION_X/Y maxima of the touchscreen reported by 'getevent -pl'"""
+    output = device.shell("getevent -pl")
+    x_max = re.search(r'ABS_MT_POSITION_X\s*:.*?max (\d+)', output)
+    y_max = re.search(r'ABS_MT_POSITION_Y\s*:.*?max (\d+)', output)
+    if not x_max or not y_max:
+        raise MacroError("No multi-touch screen found in 'getevent -pl'")
+    return (int(x_max.group(1)), int(y_max.group(1)))
+
+
+# Recording
+
+class MacroRecorder:
+    """Collect app input commands and optional raw touches into a Macro"""
+
+    def __init__(self, screen_size: Tuple[int, int] = (0, 0)):
+        self.macro = Macro(screen_size)
+        self.recording = False
+        self._last: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop_touches = threading.Event()
+        self._touch_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Record every 'input' command sent through iscout.device.Device"""
+        if not self.recording:
+            self.recording = True
+            Device.observers.append(self._on_shell_call)
+
+    def start_touches(self, device: Device):
+        """Also record touches made in the emulator window (reads 'getevent' on a thread)"""
+        decoder = TouchDecoder(touch_axis_max(device), self.macro.screen_size or device.screen_size())
+        if not all(self.macro.screen_size):
+            self.macro.screen_size = device.screen_size()
+
+        def on_line(line: str):
+            if command := decoder.feed(line):
+                self._append(time.perf_counter(), command)
+
+        def run():
+            try:
+                device.stream("getevent -lt", on_line, self._stop_touches)
+            except Exception as e:
+                log.info("Touch capture stopped: %s", e)
+
+        self._stop_touches.clear()
+        self._touch_thread = threading.Thread(target=run, name="iScoutTouches", daemon=True)
+        self._touch_thread.start()
+
+    def stop(self) -> Macro:
+        if self.recording:
+            Device.observers.remove(self._on_shell_call)
+            self.recording = False
+        self._stop_touches.set()
+        if self._touch_thread:
+            self._touch_thread.join(2.0)
+        return self.macro
+
+    def _on_shell_call(self, call: ShellCall):
+        if call.command.startswith('input ') and not call.error:
+            self._append(call.started, call.command)
+
+    def _append(self, when: float, command: str):
+        with self._lock:
+            delay = 0 if self._last is None else int(round((when - self._last) * 1000))
+            self._last = when
+            self.macro.steps.append(MacroStep(max(delay, 0), command))
+
+
+# Replay
+
+class MacroPlayer:
+    """Replay a macro on a device with time compression and readiness checks"""
+
+    def __init__(self, macro: Macro, compression: float = 1.0, min_delay_ms: int = 0, ready: str = "",
+                 check_timeout: float = 3.0, check_poll: float = 0.05,
+                 sleep: Callable[[float], None] = time.sleep):
+        if compression <= 0:
+            raise ValueError("compression must be positive")
+        self.macro = macro
+        self.compression = compression
+        self.min_delay_ms = min_delay_ms
+        self.ready = ready                  # READY_ECHO or "" (checks written in the macro always run)
+        self.check_timeout = check_timeout
+        self.check_poll = check_poll
+        self.sleep = sleep
+        self.cancelled = False
+
+    def delays_ms(self) -> List[int]:
+        """Delays the replay will use before each step"""
+        return [max(self.min_delay_ms, int(round(s.delay_ms / self.compression))) if i else 0
+                for i, s in enumerate(self.macro.steps)]
+
+    def play(self, device, screen_size: Tuple[int, int] = (0, 0)) -> float:
+        """Run every step; returns the elapsed seconds, raises MacroError when a check times out"""
+        sx = sy = 1.0
+        if all(self.macro.screen_size) and all(screen_size):
+            sx = screen_size[0] / self.macro.screen_size[0]
+            sy = screen_size[1] / self.macro.screen_size[1]
+        started = previous = time.perf_counter()
+        for step, delay_ms in zip(self.macro.steps, self.delays_ms()):
+            if self.cancelled:
+                raise MacroError("Replay cancelled")
+            if self.ready == READY_ECHO:
+                device.shell("echo ready")
+            if step.check:
+                self._wait_for(device, step)
+            remaining = previous + delay_ms / 1000 - time.perf_counter()
+            if remaining > 0:
+                self.sleep(remaining)
+            previous = time.perf_counter()
+            device.shell(scale_command(step.command, sx, sy) if (sx, sy) != (1.0, 1.0) else step.command)
+        return time.perf_counter() - started
+
+    def _wait_for(self, device, step: MacroStep):
+        deadline = time.monotonic() + self.check_timeout
+        while step.expect not in (device.shell(step.check) or ""):
+            if time.monotonic() >= deadline:
+                raise MacroError(f"Not ready after {self.check_timeout}s: '{step.check}' lacks '{step.expect}'")
+            self.sleep(self.check_poll)
+
+
+def macro_to_route_xml(macro: Macro, name: str, compression: float = 1.0, min_delay_ms: int = 0) -> str:
+    """A <route> element replaying the macro; taps and swipes use relative coordinates"""
+    width, height = macro.screen_size
+    if not width or not height:
+        raise MacroError("Macro has no @screen size; relative route coordinates need one")
+    delays = MacroPlayer(macro, compression, min_delay_ms).delays_ms()[1:] + [0]
+    lines = [f"    <route name={quoteattr(name)}>"]
+    for step, wait_ms in zip(macro.steps, delays):
+        if step.check:
+            lines.append(f"        <waitUntil shell={quoteattr(step.check)} contains={quoteattr(step.expect)}/>")
+        wait = f' wait="{wait_ms / 1000:g}"' if wait_ms else ""
+        parts = step.command.split()
+        if parts[:2] == ['input', 'tap'] and len(parts) == 4:
+            lines.append(f'        <tap at="{int(parts[2]) / width:.4f},{int(parts[3]) / height:.4f}"{wait}/>')
+        elif parts[:2] == ['input', 'swipe'] and len(parts) >= 6:
+            duration = f' duration="{parts[6]}"' if len(parts) > 6 else ""
+            lines.append(f'        <drag from="{int(parts[2]) / width:.4f},{int(parts[3]) / height:.4f}" '
+                         f'to="{int(parts[4]) / width:.4f},{int(parts[5]) / height:.4f}"{duration}{wait}/>')
+        else:
+            lines.append(f"        <shell command={quoteattr(step.command)}{wait}/>")
+    lines.append("    </route>")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""
+Live latency metrics.
+
+``metrics`` counts ADB commands (with a latency histogram), navigation
+time-to-target, reconnects and time spent in route sleeps. Percentiles
+are computed over a sliding window of recent samples, so a degrading
+emulator shows up within a few jumps instead of being averaged away.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Tuple
+
+# Upper bounds (ms) of the ADB latency histogram buckets; the last bucket is open
+ADB_BUCKETS_MS = (2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Readout turns to a warning above these
+WARN_ADB_P95_MS = 150.0
+WARN_NAV_P95_S = 4.0
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0.0 when empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@dataclass
+class MetricsSnapshot:
+    """Values for the status bar readout and the detail view"""
+    adb_commands: int = 0
+    adb_errors: int = 0
+    adb_p50_ms: float = 0.0
+    adb_p95_ms: float = 0.0
+    adb_histogram: List[Tuple[str, int]] = field(default_factory=list)   # (bucket label, count)
+    navigations: int = 0
+    navigation_failures: int = 0
+    nav_p50_s: float = 0.0
+    nav_p95_s: float = 0.0
+    reconnects: int = 0
+    sleep_s: float = 0.0            # Total time spent in route sleeps
+    nav_total_s: float = 0.0        # Total navigation time, for the sleep share
+    uptime_s: float = 0.0
+
+    @property
+    def degraded(self) -> bool:
+        return self.adb_p95_ms > WARN_ADB_P95_MS or self.nav_p95_s > WARN_NAV_P95_S
+
+    def summary(self) -> str:
+        """Compact one-line readout"""
+        parts = [f"ADB p95 {self.adb_p95_ms:.0f} ms"]
+        if self.navigations:
+            parts.append(f"jump {self.nav_p50_s:.2f}/{self.nav_p95_s:.2f} s")
+        if self.reconnects:
+            parts.append(f"{self.reconnects} reconnect{'s' if self.reconnects != 1 else ''}")
+        return " | ".join(parts)
+
+    def details(self) -> str:
+        """Multi-line report for the detail view"""
+        sleep_share = 100.0 * self.sleep_s / self.nav_total_s if self.nav_total_s else 0.0
+        lines = [
+            f"Uptime               {self.uptime_s / 60:8.1f} min",
+            f"ADB commands         {self.adb_commands:8d}   errors {self.adb_errors}",
+            f"ADB latency p50/p95  {self.adb_p50_ms:8.1f} / {self.adb_p95_ms:.1f} ms",
+            f"Navigations          {self.navigations:8d}   failed {self.navigation_failures}",
+            f"Time to target p50   {self.nav_p50_s:8.2f} s",
+            f"Time to target p95   {self.nav_p95_s:8.2f} s",
+            f"Reconnects           {self.reconnects:8d}",
+            f"Time in sleeps       {self.sleep_s:8.1f} s   ({sleep_share:.0f}% of navigation time)",
+            "",
+            "ADB latency histogram",
+        ]
+        peak = max((count for _, count in self.adb_histogram), default=0)
+        for label, count in self.adb_histogram:
+            bar = "#" * (round(30 * count / peak) if peak else 0)
+            lines.append(f"  {label:>9s} {count:7d} {bar}")
+        return "\n".join(lines)
+
+
+class MetricsCollector:
+    """Thread-safe counters and sliding windows fed by the device, routes, engine and connection"""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._adb_latency: Deque[float] = deque(maxlen=window)     # ms
+        self._nav_latency: Deque[float] = deque(maxlen=window)     # s
+        self._histogram = [0] * (len(ADB_BUCKETS_MS) + 1)
+        self.adb_commands = 0
+        self.adb_errors = 0
+        self.navigations = 0
+        self.navigation_failures = 0
+        self.reconnects = 0
+        self.sleep_s = 0.0
+        self.nav_total_s = 0.0
+
+    def observe_shell(self, call):
+        """Device observer: one ADB command"""
+        elapsed_ms = call.elapsed * 1000
+        with self._lock:
+            self.adb_commands += 1
+            if call.error:
+                self.adb_errors += 1
+            self._adb_latency.append(elapsed_ms)
+            self._histogram[bisect_left(ADB_BUCKETS_MS, elapsed_ms)] += 1
+
+    def record_navigation(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self.navigations += 1
+            self.nav_total_s += seconds
+            if ok:
+                self._nav_latency.append(seconds)
+            else:
+                self.navigation_failures += 1
+
+    def record_sleep(self, seconds: float):
+        with self._lock:
+            self.sleep_s += seconds
+
+    def record_reconnect(self):
+        with self._lock:
+            self.reconnects += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            adb = list(self._adb_latency)
+            nav = list(self._nav_latency)
+            labels = [f"<{b} ms" for b in ADB_BUCKETS_MS] + [f">{ADB_BUCKETS_MS[-1]} ms"]
+            return MetricsSnapshot(
+                adb_commands=self.adb_commands, adb_errors=self.adb_errors,
+                adb_p50_ms=percentile(adb, 0.5), adb_p95_ms=percentile(adb, 0.95),
+                adb_histogram=list(zip(labels, self._histogram)),
+                navigations=self.navigations, navigation_failures=self.navigation_failures,
+                nav_p50_s=percentile(nav, 0.5), nav_p95_s=percentile(nav, 0.95),
+                reconnects=self.reconnects, sleep_s=self.sleep_s, nav_total_s=self.nav_total_s,
+                uptime_s=time.monotonic() - self._started
+            )
+
+
+metrics = MetricsCollector()
+
+
+def install():
+    """Count every ADB command (idempotent)"""
+    from iscout.device import Device
+    if metrics.observe_shell not in Device.observers:
+        Device.observers.append(metrics.observe_shell)
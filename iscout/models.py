@@ -0,0 +1,38 @@
+"""
+Data structures shared by the engine, the CLI and the GUI.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class ScoutTarget:
+    """Target data structure as specified in PRD section 4.1"""
+    target_type: str        # Boss/Barbarian name with level, power, status
+    x_coordinate: int       # Map X position
+    y_coordinate: int       # Map Y position
+    completed: bool = False # User marked as completed
+
+
+@dataclass
+class LocationPreset:
+    """Location preset structure as specified in PRD section 4.2"""
+    name: str              # Preset identifier
+    x_loc: float          # X coordinate (0.0-1.0)
+    y_loc: float          # Y coordinate (0.0-1.0)
+    x_dest: float         # Destination X (0.0-1.0)
+    y_dest: float         # Destination Y (0.0-1.0)
+    click_and_drag: bool  # Action type flag
+
+
+@dataclass
+class AppConfig:
+    """Configuration data structure as specified in PRD section 4.3"""
+    home_server: int = 0      # User's home server
+    home_x: int = 0          # Home X coordinate
+    home_y: int = 0          # Home Y coordinate
+    enemy_server: int = 0    # Target server for operations
+    adb_port: int = 5555     # BlueStacks connection port
+    device_serial: str = ""  # Pinned ADB device serial ("" = automatic)
+    scan_ports: str = ""     # Discovery port spec, e.g. "5555-5625:10;62001" ("" = defaults)
+    api_port: int = 0        # Localhost control API port (0 = off)
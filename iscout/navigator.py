@@ -0,0 +1,106 @@
+"""
+Qt-free navigation for the Evony "go to coordinates" dialog.
+
+``Navigator`` runs a route (see ``iscout.routes``) on one ADB device: by
+default the "navigate" route taps NavBox, fills the NavServer, NavX and
+NavY fields and presses NavGo. It raises ``NavigationError`` instead of
+showing dialogs, so it can run on worker threads (one per emulator
+instance).
+"""
+
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+from iscout.log import get_logger
+from iscout.probe import Verifier, probe_for
+from iscout.readback import CoordinateReader, readout_rect
+from iscout.routes import RouteBook, RouteError
+
+log = get_logger("nav")
+
+# Game coordinate bounds (PRD section 7.2)
+MAX_X = 1198
+MAX_Y = 1200
+MAX_SERVER = 9999
+
+DEFAULT_ROUTE = "navigate"
+
+
+class NavigationError(Exception):
+    """A navigation step failed"""
+
+
+def validate_coordinates(x: int, y: int, server: int):
+    """Raise ValueError when coordinates are outside the game bounds"""
+    if not (1 <= x <= MAX_X):
+        raise ValueError(f"X coordinate {x} out of range (1-{MAX_X})")
+    if not (1 <= y <= MAX_Y):
+        raise ValueError(f"Y coordinate {y} out of range (1-{MAX_Y})")
+    if not (1 <= server <= MAX_SERVER):
+        raise ValueError(f"Server {server} out of range (1-{MAX_SERVER})")
+
+
+class Navigator:
+    """Run navigation routes on one device"""
+
+    def __init__(self, device, routes: RouteBook, screen_size: Tuple[int, int],
+                 on_entry: Optional[Callable[[bool], None]] = None,
+                 sleep: Callable[[float], None] = time.sleep, profile: str = "",
+                 reader: Optional[CoordinateReader] = None, devices: Sequence[str] = ()):
+        self.device = device                # iscout Device (anything with .shell(cmd))
+        self.routes = routes                # Held for the navigator's life: a reload swaps in a new book
+        self.screen_size = screen_size
+        self.profile = profile              # Device profile whose calibrated delays apply
+        self.devices = tuple(devices)       # Device keys (serial, model) of device-specific preset profiles
+        self.on_entry = on_entry            # Called with True/False around field entry (overlay)
+        self.sleep = sleep
+        self.reader = reader                # Confirms arrival from the on-screen coordinates
+
+    def navigate(self, x: int, y: int, server: int, skip_server: bool = False, route: str = DEFAULT_ROUTE,
+                 verifier: Optional[Verifier] = None) -> Optional[Tuple[int, int]]:
+        """Jump the map to server:x,y; raises NavigationError or ValueError
+
+        Steps written with verify= are checked against the pixel signatures
+        recorded for the device profile, unless another verifier is given.
+        With a reader and a NavReadout preset the on-screen coordinates are
+        read back after the jump; returns the confirmed (x, y), or None when
+        arrival was not confirmed. A jump that a reader with learnt digits
+        reads elsewhere is repeated once; other readers only log it.
+        """
+        validate_coordinates(x, y, server)
+        if not all(self.screen_size):
+            raise NavigationError("Could not detect screen dimensions")
+        if self.device is None:
+            raise NavigationError("No connection to BlueStacks")
+
+        if verifier is None and (signatures := self.routes.signatures.get(self.profile)):
+            verifier = Verifier(probe_for(self.device), signatures)
+        rect = readout_rect(self.routes.presets_for(self.screen_size, self.devices), self.screen_size) \
+            if self.reader else None
+        for attempt in range(2):
+            self._run(route, {'x': int(x), 'y': int(y), 'server': server,
+                              'skip_server': skip_server and attempt == 0}, verifier)
+            if rect is None or not self.reader.enabled:
+                return None
+            try:
+                landed = self.reader.wait_for(probe_for(self.device), rect, (int(x), int(y)), self.sleep)
+            except Exception as e:
+                log.warning("Could not read back the coordinates: %s", e)
+                return None
+            if landed is None or landed == (x, y):
+                return landed
+            retry = self.reader.learnt and attempt == 0
+            log.warning("Coordinate readout shows %s,%s after the jump to %s,%s%s", *landed, x, y,
+                        "; jumping again" if retry else "")
+            if not retry:
+                return None
+        return None
+
+    def _run(self, route: str, params: dict, verifier: Optional[Verifier]):
+        try:
+            plan = self.routes.plan(route, self.screen_size, self.profile, self.devices)
+            plan.run(self.device, params, self.sleep, self.on_entry, verifier)
+        except RouteError as e:
+            raise NavigationError(str(e)) from e
+        except Exception as e:
+            raise NavigationError(f"Failed to navigate: {e}") from e
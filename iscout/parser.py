@@ -0,0 +1,59 @@
+"""
+Scout report parser.
+
+A report has one target per line, tab-separated, with the X and Y
+coordinates in the last two fields; everything before them is the target
+description (PRD section 3.1.3)::
+
+    Arctic Barbarians Lv5 502M	Free	338	249
+"""
+
+from typing import List, Tuple
+
+from iscout.log import get_logger
+from iscout.models import ScoutTarget
+from iscout.navigator import MAX_X, MAX_Y
+
+log = get_logger("ui")
+
+# Targets inside this box (min_x, max_x, min_y, max_y) are dropped
+EXCLUDE_BOX = (574, 626, 574, 626)
+
+
+def parse_scout_text(text_input: str, exclude_box: Tuple[int, int, int, int] = EXCLUDE_BOX) -> List[ScoutTarget]:
+    """Parse a tab-separated scout report into targets outside exclude_box"""
+    targets = []
+    min_x, max_x, min_y, max_y = exclude_box
+    for line in text_input.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        parts = line.split('\t')
+        if len(parts) < 3:
+            continue
+        # Parse from right to left as specified in PRD
+        try:
+            y_coordinate = int(parts[-1].strip())  # Last field: Y coordinate
+            x_coordinate = int(parts[-2].strip())  # Second-to-last: X Coordinate
+        except ValueError as e:
+            log.error("Error parsing line '%s': %s", line, e)
+            continue
+        # Validate coordinates per PRD section 7.2
+        if not (1 <= x_coordinate <= MAX_X and 1 <= y_coordinate <= MAX_Y):
+            continue
+        if min_x <= x_coordinate <= max_x and min_y <= y_coordinate <= max_y:
+            continue
+        # Remaining fields (left side): Combined into Boss/Barb description
+        targets.append(ScoutTarget(
+            target_type=' '.join(parts[:-2]).strip(),
+            x_coordinate=x_coordinate,
+            y_coordinate=y_coordinate
+        ))
+    log.info("Parsed %s targets successfully (outside bounding box)", len(targets))
+    return targets
+
+
+def parse_scout_file(path: str) -> List[ScoutTarget]:
+    """Parse a scout report saved to a text file"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_scout_text(f.read())
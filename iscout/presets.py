@@ -0,0 +1,104 @@
+"""
+Screen location presets from Resources/locations.xml.
+
+Each ``<navigation>`` element names a rectangle in relative (0.0-1.0)
+screen coordinates, e.g.
+``<navigation name="NavBox" xLoc="0.394" yLoc="0.872" xDest="0.648" yDest="0.897"/>``.
+
+A layout that differs per resolution goes into a profile file next to it,
+``locations-<width>x<height>.xml`` (written by ``iscout.layout``); its
+presets replace the ones of locations.xml on screens of that size. A
+profile can also be keyed by device, ``locations-<model>.xml`` or
+``locations-<serial>.xml`` (characters other than letters, digits, '.' and
+'-' become '_'), and then wins over the resolution profile on that device.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Tuple, Union
+
+from iscout.files import write_atomic
+from iscout.log import get_logger
+from iscout.models import LocationPreset
+
+log = get_logger("nav")
+
+
+def load_presets(path: str) -> Dict[str, LocationPreset]:
+    """Read presets keyed by name ({} when the file is missing)"""
+    presets: Dict[str, LocationPreset] = {}
+    if not os.path.exists(path):
+        log.info("Location presets file not found: %s", path)
+        return presets
+
+    import xml.etree.ElementTree as ET
+    root = ET.parse(path).getroot()
+    # Parse navigation elements (not preset elements)
+    for navigation in root.findall('navigation'):
+        name = navigation.get('name')
+        x_loc = float(navigation.get('xLoc', '0.0'))
+        y_loc = float(navigation.get('yLoc', '0.0'))
+        presets[name] = LocationPreset(
+            name=name,
+            x_loc=x_loc,
+            y_loc=y_loc,
+            x_dest=float(navigation.get('xDest', x_loc)),
+            y_dest=float(navigation.get('yDest', y_loc)),
+            click_and_drag=navigation.get('ClickAndDrag', 'false').lower() == 'true'
+        )
+    log.info("Loaded %s location presets", len(presets))
+    return presets
+
+
+def profile_key(key: Union[str, Tuple[int, int]]) -> str:
+    """Profile key of a screen size or device name: (1080, 1920) -> '1080x1920', '127.0.0.1:5555' -> '127.0.0.1_5555'"""
+    if isinstance(key, tuple):
+        return f"{key[0]}x{key[1]}"
+    return re.sub(r'[^\w.-]', '_', key.strip()).lower()
+
+
+def profile_keys(screen_size: Tuple[int, int], devices: Iterable[str] = ()) -> List[str]:
+    """Profile keys to try for a device, most specific first: devices (serial, model), then the resolution"""
+    keys = [profile_key(d) for d in devices if d]
+    if all(screen_size):
+        keys.append(profile_key(tuple(screen_size)))
+    return keys
+
+
+def profile_path(path: str, key: Union[str, Tuple[int, int]]) -> str:
+    """Resources/locations.xml -> Resources/locations-1080x1920.xml (or locations-<device>.xml)"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{profile_key(key)}{ext}"
+
+
+def profile_files(path: str) -> Dict[str, str]:
+    """Profile files next to path keyed by profile key"""
+    directory, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    pattern = re.compile(rf"{re.escape(stem)}-(.+){re.escape(ext)}$", re.IGNORECASE)
+    files = {}
+    if not os.path.isdir(directory or '.'):
+        return files
+    for entry in sorted(os.listdir(directory or '.')):
+        if match := pattern.match(entry):
+            files[profile_key(match.group(1))] = os.path.join(directory, entry)
+    return files
+
+
+def load_profiles(path: str) -> Dict[str, Dict[str, LocationPreset]]:
+    """Presets of every profile file next to path, keyed by profile key"""
+    return {key: load_presets(file) for key, file in profile_files(path).items()}
+
+
+def save_presets(path: str, presets: Dict[str, LocationPreset], comment: str = ""):
+    """Write presets as <navigation> elements"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>']
+    if comment:
+        lines.append(f"<!-- {comment} -->")
+    lines.append("<EvonyClickLocations>")
+    for p in presets.values():
+        lines.append(f'    <navigation name="{p.name}" xLoc="{p.x_loc:.4f}" yLoc="{p.y_loc:.4f}" '
+                     f'xDest="{p.x_dest:.4f}" yDest="{p.y_dest:.4f}" '
+                     f'ClickAndDrag="{str(p.click_and_drag).lower()}"/>')
+    lines.append("</EvonyClickLocations>")
+    write_atomic(path, "\n".join(lines) + "\n", newline='\r\n')
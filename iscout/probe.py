@@ -0,0 +1,204 @@
+"""
+Pixel-probe verification of route steps.
+
+Instead of sleeping a fixed time after a tap, a route step written with
+``verify="name"`` samples a few pixels inside a preset rectangle and
+compares them with a colour signature recorded on this device profile,
+e.g. the NavGo button colours once the dialog is open or the highlighted
+border of a focused NavX field. The step continues as soon as the pixels
+match and fails with ``VerificationError`` when they do not within the
+timeout, so a mis-sequenced entry is caught before NavGo is pressed.
+
+``PixelProbe`` never transfers a full frame: ``screencap`` writes the
+framebuffer to a file on the device and ``dd`` reads back just the 3 bytes
+of each sample point, hex-encoded by ``od``, all in one shell command.
+
+Signatures are stored per device profile in iScoutSignatures.json::
+
+    {"profiles": {"SM-G960N 1080x1920": {"dialog": {
+        "points": [[354, 1124], ...], "colours": [[250, 196, 41], ...]}}}}
+"""
+
+import json
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from iscout.files import write_atomic
+from iscout.log import get_logger
+from iscout.screen import Frame, Rgb, colour_distance
+
+log = get_logger("nav")
+
+Point = Tuple[int, int]
+
+PROBE_FILE = "/data/local/tmp/iscout-probe.raw"
+
+
+class VerificationError(Exception):
+    """The screen did not show the expected signature in time"""
+
+
+def rect_probe_points(screen_width: int, screen_height: int, x_loc: float, y_loc: float,
+                      x_dest: float, y_dest: float, inset: float = 0.12) -> Tuple[Point, ...]:
+    """Eight points just inside the border of a relative rectangle: corners and edge centres
+
+    Borders carry focus highlights and button backgrounds while staying
+    clear of the text typed into a field.
+    """
+    left, right = sorted((x_loc * screen_width, x_dest * screen_width))
+    top, bottom = sorted((y_loc * screen_height, y_dest * screen_height))
+    xs = (left + (right - left) * inset, (left + right) / 2, right - (right - left) * inset)
+    ys = (top + (bottom - top) * inset, (top + bottom) / 2, bottom - (bottom - top) * inset)
+    return tuple((int(x), int(y)) for y in ys for x in xs if (x, y) != (xs[1], ys[1]))
+
+
+@dataclass
+class Signature:
+    """Expected colours at a set of sample points"""
+    points: Tuple[Point, ...]
+    colours: Tuple[Rgb, ...]
+
+    def matching(self, pixels: Sequence[Rgb], tolerance: int) -> int:
+        return sum(1 for a, b in zip(self.colours, pixels) if colour_distance(a, b) <= tolerance)
+
+
+def load_signatures(path: str) -> Dict[str, Dict[str, Signature]]:
+    """Recorded signatures by profile and name ({} when the file is missing or unreadable)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profiles = json.load(f).get('profiles', {})
+        return {profile: {name: Signature(tuple(tuple(p) for p in entry['points']),
+                                          tuple(tuple(c) for c in entry['colours']))
+                          for name, entry in by_name.items()}
+                for profile, by_name in profiles.items()}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log.error("Error loading pixel signatures: %s", e)
+        return {}
+
+
+def save_signatures(path: str, profile: str, signatures: Dict[str, Signature]):
+    """Store the signatures of one profile, keeping the other profiles of the file"""
+    data = {'profiles': {}}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    data.setdefault('profiles', {})[profile] = {
+        name: {'points': [list(p) for p in s.points], 'colours': [list(c) for c in s.colours]}
+        for name, s in sorted(signatures.items())
+    }
+    write_atomic(path, json.dumps(data, indent=2))
+
+
+@dataclass
+class ProbeLayout:
+    """Geometry of the device's raw screencap file"""
+    width: int
+    height: int
+    header: int     # 12 or 16 bytes before the first pixel
+
+
+class PixelProbe:
+    """Read individual screen pixels with bounded on-device reads"""
+
+    def __init__(self, device):
+        self.device = device
+        self.layout: Optional[ProbeLayout] = None
+
+    def learn_layout(self) -> ProbeLayout:
+        """Read the screencap file size and header once per device (one small round trip)"""
+        output = self.device.shell(f"screencap > {PROBE_FILE} && stat -c %s {PROBE_FILE} && "
+                                   f"dd if={PROBE_FILE} bs=12 count=1 2>/dev/null | od -An -tu4")
+        try:
+            size, width, height, pixel_format = (int(v) for v in output.split()[:4])
+        except ValueError:
+            raise VerificationError(f"Unexpected screencap layout: {output.strip()[:80]!r}")
+        header = size - width * height * 4
+        if header not in (12, 16) or pixel_format != 1:
+            raise VerificationError(f"Unsupported screencap layout ({width}x{height}, format {pixel_format})")
+        self.layout = ProbeLayout(width, height, header)
+        return self.layout
+
+    def read(self, points: Sequence[Point]) -> List[Rgb]:
+        """RGB colours at points, from one fresh screencap"""
+        layout = self.layout or self.learn_layout()
+        offsets = " ".join(str(layout.header + (y * layout.width + x) * 4) for x, y in points)
+        output = self.device.shell(
+            f"screencap > {PROBE_FILE} && {{ dd if={PROBE_FILE} bs=4 count=2 2>/dev/null; "
+            f"for o in {offsets}; do dd if={PROBE_FILE} bs=1 skip=$o count=3 2>/dev/null; done; }} "
+            f"| od -An -tx1 -v")
+        data = bytes(int(v, 16) for v in output.split())
+        if len(data) != 8 + 3 * len(points):
+            raise VerificationError(f"Pixel probe returned {len(data)} bytes for {len(points)} points")
+        if (int.from_bytes(data[0:4], 'little'), int.from_bytes(data[4:8], 'little')) != \
+                (layout.width, layout.height):
+            self.layout = None      # Rotated or resized: learn again next time
+            raise VerificationError("Screen geometry changed since the probe layout was read")
+        return [tuple(data[i:i + 3]) for i in range(8, len(data), 3)]
+
+    def read_rect(self, left: int, top: int, width: int, height: int) -> Frame:
+        """RGBA pixels of one screen rectangle: a dd per row, nothing outside the rectangle is sent"""
+        layout = self.layout or self.learn_layout()
+        left, top = max(0, left), max(0, top)
+        width, height = min(width, layout.width - left), min(height, layout.height - top)
+        if width <= 0 or height <= 0:
+            raise VerificationError("Rectangle is outside the screen")
+        first = layout.header // 4 + top * layout.width + left     # In 4-byte pixels
+        offsets = " ".join(str(first + row * layout.width) for row in range(height))
+        raw = self.device.shell_bytes(f"screencap > {PROBE_FILE} && for o in {offsets}; do "
+                                      f"dd if={PROBE_FILE} bs=4 skip=$o count={width} 2>/dev/null; done")
+        size = width * height * 4
+        for data in (raw, raw.replace(b'\r\n', b'\n')):     # pty line-ending translation (old adbd)
+            if len(data) == size:
+                return Frame(width, height, data)
+        raise VerificationError(f"Screen read returned {len(raw)} bytes for a {width}x{height} rectangle")
+
+
+_probes: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def probe_for(device) -> PixelProbe:
+    """The PixelProbe of a device, so its screencap layout is learnt once per connection"""
+    probe = _probes.get(device)
+    if probe is None:
+        probe = _probes[device] = PixelProbe(device)
+    return probe
+
+
+class Verifier:
+    """Confirm route steps against recorded signatures, or record them"""
+
+    TOLERANCE = 30          # Per-channel colour difference still counted as a match
+    MATCH_RATIO = 0.75      # Share of the points that must match
+    MIN_TIMEOUT = 1.0       # Seconds to wait for a signature at least (longer for long step waits)
+    POLL = 0.1              # Seconds between reads, so screencaps do not starve the game of CPU
+
+    def __init__(self, probe: PixelProbe, signatures: Dict[str, Signature], record: bool = False):
+        self.probe = probe
+        self.signatures = signatures    # Updated in place when recording
+        self.record = record
+
+    def confirm(self, name: str, points: Tuple[Point, ...], wait: float, sleep: Callable[[float], None]):
+        """Stand in for the step's wait: return once the screen matches name, raise when it does not"""
+        if self.record:
+            sleep(wait)
+            self.signatures[name] = Signature(points, tuple(self.probe.read(points)))
+            log.info("Recorded pixel signature %s", name)
+            return
+        signature = self.signatures.get(name)
+        if signature is None or signature.points != points:
+            sleep(wait)     # Not recorded for these presets on this profile
+            return
+        needed = max(1, round(len(points) * self.MATCH_RATIO))
+        deadline = time.monotonic() + max(self.MIN_TIMEOUT, 3 * wait)
+        while True:
+            matched = signature.matching(self.probe.read(points), self.TOLERANCE)
+            if matched >= needed:
+                return
+            if time.monotonic() >= deadline:
+                raise VerificationError(f"Screen check '{name}' failed ({matched}/{len(points)} pixels match)")
+            sleep(self.POLL)
@@ -0,0 +1,79 @@
+"""
+Process information helpers used by the startup-time probe.
+"""
+
+import os
+import sys
+import time
+from typing import Optional
+
+from iscout.log import get_logger
+
+log = get_logger("ui")
+
+# Fallback when the OS cannot report a start time: the moment this module loaded
+_IMPORT_TIME = time.time()
+
+
+def _windows_start_time(pid: int) -> Optional[float]:
+    """Return the creation time of a Windows process as a Unix timestamp"""
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    EPOCH_DIFFERENCE = 11644473600  # Seconds between 1601-01-01 and 1970-01-01
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_),
+                                        ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime   # 100 ns units
+        return ticks / 1e7 - EPOCH_DIFFERENCE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _linux_start_time(pid: int) -> Optional[float]:
+    """Return the start time of a Linux process from /proc as a Unix timestamp"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Field 22 (starttime) follows the parenthesised command name
+            fields = f.read().rsplit(')', 1)[1].split()
+        start_ticks = int(fields[19])
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+def launched_from_onefile_bootloader() -> bool:
+    """True when running from a PyInstaller one-file build (unpacked by a parent process)"""
+    meipass = getattr(sys, '_MEIPASS', None)
+    return bool(getattr(sys, 'frozen', False) and meipass
+                and os.path.basename(meipass).startswith('_MEI'))
+
+
+def process_start_time(pid: Optional[int] = None) -> float:
+    """Return when the process was launched, as a Unix timestamp
+
+    For PyInstaller one-file builds the bootloader parent process is used, so
+    the time spent unpacking the archive is included.
+    """
+    if pid is None:
+        pid = os.getppid() if launched_from_onefile_bootloader() else os.getpid()
+    started = None
+    try:
+        if sys.platform == 'win32':
+            started = _windows_start_time(pid)
+        elif sys.platform.startswith('linux'):
+            started = _linux_start_time(pid)
+    except Exception as e:
+        log.error("Error reading process start time: %s", e)
+    return started if started is not None else _IMPORT_TIME
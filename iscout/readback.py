@@ -0,0 +1,248 @@
+"""
+Coordinate readback: where did the camera actually go?
+
+The coordinate box at the bottom of the map shows the current server and
+X/Y; the ``NavReadout`` preset marks where. ``CoordinateReader`` reads that
+rectangle with ``PixelProbe.read_rect``, binarises it, splits it into
+glyphs at blank columns and matches each glyph against a small set of
+digit templates in one vectorised NumPy comparison, so no OCR engine is
+needed.
+
+Arrivals are read back with glyphs learnt from the emulator itself
+(``learn``), stored in iScoutDigits.txt: a confident reading elsewhere
+means a wrong jump, which the navigator repeats once. Resources/digits.txt,
+a generic 5x7 font, only gets learning started; a reader built on it is
+advisory and just logs a wrong reading. Several unconfirmed arrivals in a
+row switch readback off. Template files hold one block per character
+('#' = ink, lines starting with ';' are comments)::
+
+    [1]
+    .#.
+    ##.
+    .#.
+
+NumPy is optional: without it ``numpy_available()`` is False and arrivals
+are simply not confirmed. So are they without a NavReadout preset or
+learnt digits.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from iscout.files import write_atomic
+from iscout.log import get_logger
+from iscout.screen import Frame
+
+try:
+    import numpy as np
+except ImportError:     # Optional dependency
+    np = None
+
+log = get_logger("nav")
+
+READOUT_PRESET = "NavReadout"                   # Rectangle of the coordinate readout
+READOUT_FORMAT = "K:{server} X:{x} Y:{y}"       # What the readout shows, for learning templates
+LEARN_TARGETS = ((1098, 765), (432, 1200))      # Between them every digit appears
+GLYPH_SIZE = (14, 10)                           # Rows, columns glyphs are compared at
+
+
+class ReadbackError(Exception):
+    """Templates could not be loaded or learnt"""
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def load_templates(path: str) -> Dict[str, List[str]]:
+    """Glyph templates by character ({} when the file is missing)"""
+    if not os.path.exists(path):
+        return {}
+    templates: Dict[str, List[str]] = {}
+    rows: Optional[List[str]] = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(';'):
+                continue
+            if line.startswith('[') and line.endswith(']') and len(line) == 3:
+                rows = templates[line[1]] = []
+            elif rows is not None:
+                if not set(line) <= {'#', '.'}:
+                    raise ReadbackError(f"Bad template row in {path}: {line!r}")
+                rows.append(line)
+    return templates
+
+
+def save_templates(path: str, templates: Dict[str, List[str]]):
+    blocks = [f"\n[{char}]\n" + "\n".join(rows) + "\n" for char, rows in sorted(templates.items())]
+    write_atomic(path, "; iScoutTool glyph templates learnt from the emulator ('#' = ink)\n" + "".join(blocks))
+
+
+def readout_rect(presets: Dict[str, object], screen_size: Tuple[int, int]) -> Optional[Tuple[int, int, int, int]]:
+    """(left, top, width, height) of the coordinate readout in pixels, or None without a NavReadout preset"""
+    preset = presets.get(READOUT_PRESET)
+    if preset is None:
+        return None
+    width, height = screen_size
+    left, right = sorted((preset.x_loc * width, preset.x_dest * width))
+    top, bottom = sorted((preset.y_loc * height, preset.y_dest * height))
+    return (int(left), int(top), max(1, int(right - left)), max(1, int(bottom - top)))
+
+
+def _crop_ink(ink):
+    """Trim blank rows and columns around a glyph"""
+    rows = np.flatnonzero(ink.any(axis=1))
+    columns = np.flatnonzero(ink.any(axis=0))
+    return ink[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+
+
+def _normalise(glyph):
+    """Nearest-neighbour resample of a boolean glyph to GLYPH_SIZE"""
+    height, width = glyph.shape
+    rows = (np.arange(GLYPH_SIZE[0]) + 0.5) * height / GLYPH_SIZE[0]
+    columns = (np.arange(GLYPH_SIZE[1]) + 0.5) * width / GLYPH_SIZE[1]
+    return glyph[rows.astype(int)][:, columns.astype(int)].astype(np.float32)
+
+
+class CoordinateReader:
+    """Read the map coordinates shown on screen by digit template matching"""
+
+    MIN_CONTRAST = 40       # Luminance range below which the readout counts as blank
+    MIN_SCORE = 0.75        # Glyph agreement needed to accept a template match
+    ASPECT_WEIGHT = 0.3     # Score penalty per unit of log aspect-ratio difference
+    WORD_GAP = 0.6          # Gaps wider than this share of the glyph height separate numbers
+    TIMEOUT = 2.0           # Seconds for the readout to show the target after NavGo
+    POLL = 0.15
+    MAX_MISSES = 3          # Unconfirmed arrivals (unreadable or elsewhere) in a row before readback switches off
+
+    def __init__(self, templates: Dict[str, List[str]], learnt: bool = False):
+        if np is None:
+            raise ReadbackError("Coordinate readback needs NumPy (pip install numpy)")
+        if not any(c.isdigit() for c in templates):
+            raise ReadbackError("No digit templates")
+        self.templates = templates
+        self.learnt = learnt        # Templates from this emulator: a wrong reading means a wrong jump
+        self._labels = list(templates)
+        glyphs = [_crop_ink(np.array([[c == '#' for c in row] for row in rows]))
+                  for rows in templates.values()]
+        self._stack = np.stack([_normalise(g) for g in glyphs])
+        self._aspects = np.log(np.array([g.shape[1] / g.shape[0] for g in glyphs]))
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """False once several arrivals in a row could not be confirmed (wrong templates or rectangle)"""
+        return self.misses < self.MAX_MISSES
+
+    def wait_for(self, probe, rect: Tuple[int, int, int, int], target: Tuple[int, int],
+                 sleep: Callable[[float], None] = time.sleep) -> Optional[Tuple[int, int]]:
+        """Poll the readout until it shows target; returns the last reading (None = unreadable)
+
+        A reading other than target counts as a miss like an unreadable one,
+        so templates that keep misreading switch readback off.
+        """
+        deadline = time.monotonic() + self.TIMEOUT
+        while True:
+            reading = self.read(probe.read_rect(*rect))
+            if reading == target or time.monotonic() >= deadline:
+                break
+            sleep(self.POLL)
+        if reading == target:
+            self.misses = 0
+        else:
+            self.misses += 1
+            if not self.enabled:
+                log.warning("Arrival not confirmed %s times in a row; arrival readback off "
+                            "(check NavReadout and learn the digits again)", self.misses)
+        return reading
+
+    # Reading
+
+    def read(self, frame: Frame) -> Optional[Tuple[int, int]]:
+        """(x, y) shown in frame, or None when fewer than two numbers could be read"""
+        numbers = self.numbers(frame)
+        return (numbers[-2], numbers[-1]) if len(numbers) >= 2 else None
+
+    def numbers(self, frame: Frame) -> List[int]:
+        """All numbers in the readout, left to right"""
+        numbers, digits, last_end = [], "", None
+        glyphs = self.glyphs(frame)
+        tallest = max((g.shape[0] for g, _, _ in glyphs), default=0)
+        for glyph, start, end in glyphs:
+            if last_end is not None and start - last_end > self.WORD_GAP * tallest and digits:
+                numbers.append(int(digits))
+                digits = ""
+            label, score = self.match(glyph)
+            if label.isdigit() and score >= self.MIN_SCORE:
+                digits += label
+            elif digits:
+                numbers.append(int(digits))
+                digits = ""
+            last_end = end
+        if digits:
+            numbers.append(int(digits))
+        return numbers
+
+    def match(self, glyph) -> Tuple[str, float]:
+        """Best template for one glyph and its score (1.0 = identical)"""
+        agreement = 1.0 - np.abs(self._stack - _normalise(glyph)).mean(axis=(1, 2))
+        aspect = np.log(glyph.shape[1] / glyph.shape[0])
+        scores = agreement - self.ASPECT_WEIGHT * np.abs(self._aspects - aspect)
+        best = int(scores.argmax())
+        return self._labels[best], float(scores[best])
+
+    def glyphs(self, frame: Frame) -> List[Tuple[object, int, int]]:
+        """Ink glyphs of a frame as (boolean array, first column, end column)"""
+        ink = self.binarise(frame)
+        if ink is None:
+            return []
+        padded = np.concatenate(([False], ink.any(axis=0), [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        glyphs = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            glyph = ink[:, start:end]
+            if glyph.sum() < 3:
+                continue    # Speckle
+            glyphs.append((_crop_ink(glyph), int(start), int(end)))
+        return glyphs
+
+    def binarise(self, frame: Frame):
+        """Boolean ink mask (text = True, whichever polarity it has), or None when blank"""
+        rgb = np.frombuffer(frame.data, dtype=np.uint8).reshape(frame.height, frame.width, 4)[..., :3]
+        luminance = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        low, high = float(luminance.min()), float(luminance.max())
+        if high - low < self.MIN_CONTRAST:
+            return None
+        ink = luminance > (low + high) / 2
+        return ~ink if ink.mean() > 0.5 else ink
+
+    # Learning
+
+    def learn(self, frame: Frame, text: str) -> Dict[str, List[str]]:
+        """Templates for the characters of text (spaces ignored), taken from the glyphs in frame"""
+        expected = text.replace(' ', '')
+        glyphs = self.glyphs(frame)
+        if len(glyphs) != len(expected):
+            raise ReadbackError(f"Found {len(glyphs)} glyphs in the readout, expected {len(expected)} "
+                                f"for '{text}'; adjust the NavReadout preset")
+        learnt = {}
+        for char, (glyph, _, _) in zip(expected, glyphs):
+            learnt.setdefault(char, ["".join('#' if v else '.' for v in row) for row in glyph])
+        return learnt
+
+
+def default_reader(path: str) -> Optional[CoordinateReader]:
+    """Reader using the learnt templates in path, or None (no NumPy, digits not learnt)"""
+    if np is None:
+        log.info("NumPy not installed; arrival readback disabled")
+        return None
+    try:
+        templates = load_templates(path)
+        if templates:
+            return CoordinateReader(templates, learnt=True)
+        log.info("Coordinate digits not learnt; arrival readback disabled")
+    except (OSError, ReadbackError) as e:
+        log.error("Error loading digit templates %s: %s", path, e)
+    return None
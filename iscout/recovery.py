@@ -0,0 +1,168 @@
+"""
+Layered recovery for failed ADB commands.
+
+A command that raises is first retried on the same connection after a
+short jittered backoff, then the transport to the device is re-attached
+(``adb connect`` + a fresh device handle), and only then the ADB server is
+restarted. When all layers fail the device is considered down: a circuit
+breaker opens and further commands fail fast with ``DeviceUnavailable``
+until the cool-down passes, instead of each one paying for the whole
+ladder again. The connection manager is told, so it reconnects in the
+background as before.
+
+Only commands that merely read state (``is_idempotent``) are sent again.
+An ``input`` tap, swipe or text whose reply was lost may still have run
+on the device; sending it twice would type coordinates twice or close the
+dialog the first tap opened. For those the connection is recovered
+without resending and the error is raised, so the route or verifier
+decides what to do.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from iscout.log import get_logger
+
+log = get_logger("adb")
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Shell commands that only read state, so running one twice does no harm
+IDEMPOTENT_COMMANDS: Tuple[str, ...] = ("echo", "getprop", "wm size", "getevent -p", "getevent -pl", "screencap",
+                                        "dumpsys", "cat", "ls", "stat", "ps")
+
+
+def is_idempotent(command: str) -> bool:
+    """Whether command may be sent again after a failure (anything unknown is assumed not to be)"""
+    command = command.strip()
+    return any(command == prefix or command.startswith(prefix + " ") for prefix in IDEMPOTENT_COMMANDS)
+
+
+class DeviceUnavailable(ConnectionError):
+    """The circuit breaker is open: the device was confirmed down recently"""
+
+
+class CircuitBreaker:
+    """Fail fast while a device is down; let one trial call through after a cool-down"""
+
+    def __init__(self, reset_timeout: float = 5.0, max_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.reset_timeout = reset_timeout      # First cool-down; doubles while trials keep failing
+        self.max_timeout = max_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self._timeout = reset_timeout
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Raise DeviceUnavailable while open; after the cool-down allow a single trial"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and self.clock() - self._opened_at >= self._timeout:
+                self.state = HALF_OPEN
+                return
+            remaining = max(0.0, self._timeout - (self.clock() - self._opened_at))
+            raise DeviceUnavailable(f"Device unavailable (retrying in {remaining:.0f}s)")
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._timeout = self.reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_timeout)
+            self.state = OPEN
+            self._opened_at = self.clock()
+
+    def reset(self):
+        self.record_success()
+
+
+class Recovery:
+    """Run device commands through retry, transport reconnect and server restart"""
+
+    RETRIES = 2                 # Extra attempts on the same connection
+    BACKOFF = 0.02              # Seconds before the first retry; doubles per retry
+    JITTER = 0.5                # Backoff is scaled by 1 +/- JITTER
+
+    def __init__(self, connection, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep, rng: Callable[[], float] = random.random):
+        self.connection = connection        # ConnectionManager that owns the device
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.rng = rng
+        self._lock = threading.Lock()       # One thread climbs the ladder at a time
+
+    def backoff(self, retry: int) -> float:
+        """Jittered delay before retry number retry (1-based)"""
+        return self.BACKOFF * (2 ** (retry - 1)) * (1 + self.JITTER * (2 * self.rng() - 1))
+
+    def call(self, device, fn, idempotent: bool = True):
+        """Return fn(device.adb), recovering from transport errors; raises the last error when the device is down
+
+        When fn is not idempotent it is never called twice: a failure
+        recovers the connection, then raises the original error.
+        """
+        self.breaker.check()
+        if self.breaker.state == HALF_OPEN:
+            # Trial call: one attempt, no ladder
+            try:
+                result = fn(device.adb)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            return result
+
+        adb = device.adb
+        try:
+            return fn(adb)
+        except Exception as e:
+            error = e
+        for retry in range(1, (self.RETRIES if idempotent else 0) + 1):
+            self.sleep(self.backoff(retry))
+            try:
+                return fn(adb)
+            except Exception as e:
+                error = e
+
+        with self._lock:
+            if device.adb is not adb:
+                # Another thread re-attached the device while this one waited
+                if not idempotent:
+                    raise error
+                try:
+                    return fn(device.adb)
+                except Exception as e:
+                    error = e
+            failure = error
+            for layer, recover in (("transport reconnect", self.connection.reconnect_transport),
+                                   ("ADB server restart", self.connection.restart_server)):
+                log.warning("%s: command failed (%s), trying %s", device.serial, failure, layer)
+                try:
+                    device.adb = recover(device.serial)
+                    if not idempotent:
+                        log.info("%s reconnected after %s; the failed command is not sent again",
+                                 device.serial, layer)
+                        break
+                    result = fn(device.adb)
+                    log.info("%s recovered after %s", device.serial, layer)
+                    return result
+                except Exception as e:
+                    failure = e
+            else:
+                log.error("%s is down: %s", device.serial, failure)
+                self.breaker.record_failure()
+                self.connection.mark_lost(f"Device {device.serial} not responding: {failure}")
+                raise failure
+        # The command may have run before its reply was lost
+        raise error
@@ -0,0 +1,406 @@
+"""
+Declarative navigation routes.
+
+A route is a named sequence of steps read from ``<route>`` elements in
+Resources/locations.xml::
+
+    <route name="navigate">
+        <tap preset="NavBox" wait="0.4"/>
+        <wait seconds="0.2" when="skip_server"/>
+        <overlay/>
+        <text preset="NavServer" value="{server}" wait="0.1" when="!skip_server"/>
+        ...
+    </route>
+
+Steps:
+
+- ``tap preset= wait=``: tap the preset centre (a ``ClickAndDrag`` preset
+  is swiped instead), then sleep ``wait`` seconds; ``at="rx,ry"`` taps a
+  relative point instead of a preset
+- ``text preset= value= wait=``: tap a field, sleep, clear it and type
+  ``value``; ``{x}``, ``{y}`` and ``{server}`` are substituted
+- ``drag preset= duration=``: swipe from the preset's (xLoc, yLoc) to its
+  (xDest, yDest) corner over ``duration`` milliseconds, or between the
+  relative points ``from="rx,ry" to="rx,ry"``
+- ``shell command= wait=``: run a shell command (e.g. ``input keyevent 4``)
+- ``wait seconds=``: sleep
+- ``waitUntil shell= contains= timeout= poll=``: poll a shell command until
+  its output contains the text
+- ``overlay``: field entry starts here (the GUI shows its NavGo overlay
+  until the route ends)
+
+``tap`` and ``text`` steps accept ``verify="name"``: once a pixel
+signature of that name was recorded for the device profile (see
+``iscout.probe``), the step waits until a few pixels inside the preset (or
+the ``probe=`` preset) match it instead of sleeping, and fails when they
+do not.
+
+Every step accepts ``when="flag"`` / ``when="!flag"`` to run only when a
+boolean parameter is (not) set, and ``optional="true"`` to drop the step
+when its preset is not defined. Routes are compiled into plans with pixel
+coordinates once per screen resolution (with the presets calibrated for
+that resolution, if any); ``RouteBook`` caches the plans.
+Step waits measured by ``iscout.calibration`` for a device profile replace
+the written ones when that profile is navigated.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from iscout.log import get_logger
+from iscout.metrics import metrics
+from iscout.presets import profile_key, profile_keys
+from iscout.probe import rect_probe_points
+from iscout.trace import ROUTE, tracer
+
+log = get_logger("nav")
+
+# Step kinds (XML tag names)
+TAP = "tap"
+TEXT = "text"
+DRAG = "drag"
+WAIT = "wait"
+WAIT_UNTIL = "waitUntil"
+OVERLAY = "overlay"
+SHELL = "shell"
+STEP_KINDS = (TAP, TEXT, DRAG, WAIT, WAIT_UNTIL, OVERLAY, SHELL)
+PRESET_STEPS = (TAP, TEXT, DRAG)
+
+# Used when locations.xml defines no route of that name
+DEFAULT_ROUTES_XML = """
+<routes>
+    <route name="navigate">
+        <tap preset="NavBox" wait="0.4" verify="dialog" probe="NavGo"/>
+        <wait seconds="0.2" when="skip_server"/>
+        <overlay/>
+        <text preset="NavServer" value="{server}" wait="0.1" when="!skip_server" optional="true" verify="focus_server"/>
+        <text preset="NavX" value="{x}" wait="0.2" optional="true" verify="focus_x"/>
+        <wait seconds="0.1"/>
+        <text preset="NavY" value="{y}" wait="0.1" optional="true" verify="focus_y"/>
+        <tap preset="NavGo" optional="true"/>
+    </route>
+    <route name="view_enemy">
+        <tap preset="NavBox" wait="0.6" verify="dialog" probe="NavGo"/>
+        <overlay/>
+        <text preset="NavServer" value="{server}" wait="0.1" optional="true" verify="focus_server"/>
+        <text preset="NavX" value="{x}" wait="0.2" optional="true" verify="focus_x"/>
+        <text preset="NavY" value="{y}" wait="0.1" optional="true" verify="focus_y"/>
+        <tap preset="NavGo" optional="true"/>
+    </route>
+</routes>
+"""
+
+
+class RouteError(Exception):
+    """A route could not be parsed, compiled or executed"""
+
+
+@dataclass
+class Step:
+    """One action of a route, as written in XML"""
+    kind: str
+    preset: str = ""
+    value: str = ""          # Text to type; may contain {x}, {y}, {server}
+    wait: float = 0.0        # Seconds: after a tap, between field tap and typing for text, or the wait itself
+    duration_ms: int = 300   # Drag duration
+    shell: str = ""          # waitUntil: command to poll; shell: command to run
+    contains: str = ""       # waitUntil: expected fragment of the command output
+    timeout: float = 2.0     # waitUntil: give up after this many seconds
+    poll: float = 0.1        # waitUntil: seconds between polls
+    when: str = ""           # Flag parameter gating the step; "!flag" negates
+    optional: bool = False   # Drop the step when its preset is missing
+    at: Optional[Tuple[float, float]] = None    # Relative point used instead of a preset
+    to: Optional[Tuple[float, float]] = None    # Drag end point when the drag has no preset
+    verify: str = ""         # Pixel signature confirming the step (tap/text)
+    probe: str = ""          # Preset sampled for the signature; default: the step's preset
+
+    def active(self, params: dict) -> bool:
+        if not self.when:
+            return True
+        if self.when.startswith('!'):
+            return not params.get(self.when[1:])
+        return bool(params.get(self.when))
+
+
+@dataclass
+class Route:
+    name: str
+    steps: List[Step] = field(default_factory=list)
+
+
+@dataclass
+class PlannedStep:
+    """A step resolved against presets and a screen size"""
+    step: Step
+    command: str = ""        # Precomputed 'input tap'/'input swipe' command
+    probe_points: Tuple[Tuple[int, int], ...] = ()     # Pixels sampled when the step is verified
+
+
+def rect_center(screen_width: int, screen_height: int,
+                x_loc: float, y_loc: float, x_dest: float, y_dest: float) -> Tuple[int, int]:
+    """Pixel centre of a relative (0.0-1.0) rectangle"""
+    center_x = int(abs(x_loc * screen_width + x_dest * screen_width) / 2)
+    center_y = int(abs(y_loc * screen_height + y_dest * screen_height) / 2)
+    return (center_x, center_y)
+
+
+def with_waits(route: Route, waits: Dict[int, float]) -> Route:
+    """Copy of route with the waits of the given step indexes replaced"""
+    return Route(route.name, [replace(step, wait=waits[i]) if i in waits else step
+                              for i, step in enumerate(route.steps)])
+
+
+def parse_routes(root) -> Dict[str, Route]:
+    """Read <route> elements below an ElementTree element"""
+    routes = {}
+    for element in root.findall('route'):
+        name = element.get('name')
+        if not name:
+            raise RouteError("<route> without a name")
+        routes[name] = Route(name, [_parse_step(name, child) for child in element])
+    return routes
+
+
+def _parse_point(text: Optional[str]) -> Optional[Tuple[float, float]]:
+    """'0.52,0.88' -> (0.52, 0.88); ValueError when malformed or outside 0.0-1.0"""
+    if not text:
+        return None
+    rx, ry = (float(v) for v in text.split(','))
+    if not (0.0 <= rx <= 1.0 and 0.0 <= ry <= 1.0):
+        raise ValueError(f"point {text} is out of valid range (0.0-1.0)")
+    return (rx, ry)
+
+
+def _parse_step(route: str, element) -> Step:
+    if element.tag not in STEP_KINDS:
+        raise RouteError(f"Route {route}: unknown step <{element.tag}>")
+    get = element.get
+    try:
+        step = Step(
+            kind=element.tag,
+            preset=get('preset', ''),
+            value=get('value', ''),
+            wait=float(get('seconds', get('wait', '0'))),
+            duration_ms=int(get('duration', '300')),
+            shell=get('shell', get('command', '')),
+            contains=get('contains', ''),
+            timeout=float(get('timeout', '2')),
+            poll=float(get('poll', '0.1')),
+            when=get('when', ''),
+            optional=get('optional', 'false').lower() == 'true',
+            at=_parse_point(get('at', get('from'))),
+            to=_parse_point(get('to')),
+            verify=get('verify', ''),
+            probe=get('probe', '')
+        )
+    except ValueError as e:
+        raise RouteError(f"Route {route}: bad <{element.tag}> attribute: {e}")
+    if step.kind in PRESET_STEPS and not step.preset and step.at is None:
+        raise RouteError(f"Route {route}: <{step.kind}> needs a preset")
+    if step.kind == DRAG and not step.preset and step.to is None:
+        raise RouteError(f"Route {route}: <drag> needs a preset or from/to points")
+    if step.kind in (WAIT_UNTIL, SHELL) and not step.shell:
+        raise RouteError(f"Route {route}: <{step.kind}> needs a shell command")
+    return step
+
+
+def load_routes(path: str) -> Dict[str, Route]:
+    """Routes from a locations.xml file, with the built-in defaults for names it does not define"""
+    import xml.etree.ElementTree as ET
+    routes = parse_routes(ET.fromstring(DEFAULT_ROUTES_XML))
+    if os.path.exists(path):
+        routes.update(parse_routes(ET.parse(path).getroot()))
+    return routes
+
+
+class Plan:
+    """A route compiled for one screen resolution"""
+
+    def __init__(self, name: str, steps: List[PlannedStep]):
+        self.name = name
+        self.steps = steps
+
+    def run(self, device, params: dict, sleep: Callable[[float], None] = time.sleep,
+            on_entry: Optional[Callable[[bool], None]] = None, verifier=None):
+        """Execute on a device (anything with .shell(cmd)); raises RouteError
+
+        verifier (an iscout.probe.Verifier) confirms steps written with verify=.
+        """
+        def traced_sleep(seconds: float):
+            with tracer.span("sleep", ROUTE, seconds=seconds):
+                sleep(seconds)
+            metrics.record_sleep(seconds)
+
+        entered = False
+        try:
+            for planned in self.steps:
+                step = planned.step
+                if not step.active(params):
+                    continue
+                log.debug("Route %s: %s %s", self.name, step.kind, step.preset or planned.command)
+                if step.kind == OVERLAY:
+                    if on_entry and not entered:
+                        with tracer.span("overlay", ROUTE):
+                            on_entry(True)
+                    entered = True
+                    continue
+                with tracer.span(f"{step.kind} {step.preset}" if step.preset else step.kind, ROUTE,
+                                 route=self.name):
+                    self._run_step(device, planned, params, traced_sleep, verifier)
+        finally:
+            if entered and on_entry:
+                on_entry(False)
+
+    def _run_step(self, device, planned: PlannedStep, params: dict, sleep: Callable[[float], None],
+                  verifier=None):
+        step = planned.step
+        def settle():
+            if verifier is not None and planned.probe_points:
+                with tracer.span(f"verify {step.verify}", ROUTE):
+                    verifier.confirm(step.verify, planned.probe_points, step.wait, sleep)
+            elif step.wait:
+                sleep(step.wait)
+
+        if step.kind == WAIT:
+            sleep(step.wait)
+        elif step.kind == TEXT:
+            device.shell(planned.command)
+            settle()
+            self._enter_text(device, step.value.format(**params))
+        elif step.kind == WAIT_UNTIL:
+            self._wait_until(device, step, sleep)
+        else:   # Tap, drag or shell
+            device.shell(planned.command)
+            settle()
+
+    @staticmethod
+    def _enter_text(device, text: str):
+        """Clear the focused field and type text followed by Enter"""
+        device.shell("input keyevent 123")             # Move to end of field
+        device.shell("input keyevent 67")              # One extra backspace
+        device.shell("input keyevent 67 67 67 67 67")  # 5 backspaces at once
+        device.shell(f"input text '{text}'")
+        device.shell("input keyevent 66")
+
+    @staticmethod
+    def _wait_until(device, step: Step, sleep: Callable[[float], None]):
+        deadline = time.monotonic() + step.timeout
+        while step.contains not in (device.shell(step.shell) or ""):
+            if time.monotonic() >= deadline:
+                raise RouteError(f"Timed out after {step.timeout}s waiting for '{step.contains}'")
+            sleep(step.poll)
+
+
+def compile_route(route: Route, presets: Dict[str, object], screen_size: Tuple[int, int]) -> Plan:
+    """Resolve presets to pixel commands; raises RouteError for missing or invalid presets"""
+    width, height = screen_size
+    planned = []
+    for step in route.steps:
+        if step.kind == SHELL:
+            planned.append(PlannedStep(step, step.shell))
+            continue
+        if step.kind not in PRESET_STEPS:
+            planned.append(PlannedStep(step))
+            continue
+        if not step.preset:
+            # Explicit relative points (e.g. a route converted from a recorded macro)
+            x, y = round(step.at[0] * width), round(step.at[1] * height)
+            if step.kind == DRAG:
+                command = (f"input swipe {x} {y} {round(step.to[0] * width)} {round(step.to[1] * height)} "
+                           f"{step.duration_ms}")
+            else:
+                command = f"input tap {x} {y}"
+            planned.append(PlannedStep(step, command))
+            continue
+        preset = presets.get(step.preset)
+        if preset is None:
+            if step.optional:
+                continue
+            raise RouteError(f"{step.preset} coordinates not found in locations.xml")
+        if not all(0.0 <= v <= 1.0 for v in (preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)):
+            raise RouteError(f"{step.preset} coordinates are out of valid range (0.0-1.0)")
+        if step.kind == DRAG or (step.kind == TAP and preset.click_and_drag):
+            start = (int(preset.x_loc * width), int(preset.y_loc * height))
+            end = (int(preset.x_dest * width), int(preset.y_dest * height))
+            command = f"input swipe {start[0]} {start[1]} {end[0]} {end[1]} {step.duration_ms}"
+        else:
+            center = rect_center(width, height, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
+            command = f"input tap {center[0]} {center[1]}"
+        planned.append(PlannedStep(step, command, _probe_points(step, presets, screen_size)))
+    return Plan(route.name, planned)
+
+
+def _probe_points(step: Step, presets: Dict[str, object], screen_size: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+    """Sample points of a verified step; () when it is not verified or its probe preset is missing"""
+    if not step.verify or step.kind not in (TAP, TEXT):
+        return ()
+    preset = presets.get(step.probe or step.preset)
+    if preset is None:
+        return ()
+    return rect_probe_points(*screen_size, preset.x_loc, preset.y_loc, preset.x_dest, preset.y_dest)
+
+
+class RouteBook:
+    """Named routes over a preset table, with plans cached per resolution and device profile
+
+    A book is never reloaded in place: a changed locations.xml builds a new
+    one, so a navigation that holds this book keeps a consistent snapshot.
+    """
+
+    def __init__(self, routes: Dict[str, Route], presets: Dict[str, object],
+                 delays: Optional[Dict[str, Dict[str, Dict[int, float]]]] = None,
+                 signatures: Optional[Dict[str, Dict[str, object]]] = None,
+                 layouts: Optional[Dict[str, Dict[str, object]]] = None):
+        self.routes = routes
+        self.presets = presets
+        self.layouts = layouts or {}    # Presets of one resolution or device: profile key -> presets
+        self.delays = delays or {}      # Calibrated waits: profile -> route -> {step index: seconds}
+        self.signatures = signatures or {}  # Pixel signatures for verify= steps: profile -> name -> Signature
+        self._plans: Dict[Tuple[str, int, int, str, str], Plan] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return sorted(self.routes)
+
+    def layout_key(self, screen_size: Tuple[int, int], devices: Sequence[str] = ()) -> str:
+        """Layout used for a device: the first of its device keys, then its resolution; '' for locations.xml"""
+        return next((key for key in profile_keys(screen_size, devices) if key in self.layouts), "")
+
+    def presets_for(self, screen_size: Tuple[int, int], devices: Sequence[str] = ()) -> Dict[str, object]:
+        """Presets for a resolution (and device): its layout over the default presets"""
+        layout = self.layouts.get(self.layout_key(screen_size, devices))
+        return {**self.presets, **layout} if layout else self.presets
+
+    def plan(self, name: str, screen_size: Tuple[int, int], profile: str = "", devices: Sequence[str] = ()) -> Plan:
+        waits = self.delays.get(profile, {}).get(name) if profile else None
+        layout = self.layout_key(screen_size, devices)
+        key = (name, screen_size[0], screen_size[1], profile if waits else "", layout)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                route = self.routes.get(name)
+                if route is None:
+                    raise RouteError(f"Unknown route: {name}")
+                if waits:
+                    route = with_waits(route, waits)
+                layout_presets = {**self.presets, **self.layouts[layout]} if layout else self.presets
+                plan = self._plans[key] = compile_route(route, layout_presets, screen_size)
+            return plan
+
+    def set_layout(self, key: Union[str, Tuple[int, int]], presets: Dict[str, object]):
+        """Use calibrated presets on screens of one size (or on one device)"""
+        key = profile_key(key)
+        with self._lock:
+            self.layouts[key] = dict(presets)
+            # Plans of any device may now resolve to this layout
+            self._plans.clear()
+
+    def set_delays(self, profile: str, name: str, waits: Dict[int, float]):
+        """Use calibrated waits for one route on one device profile"""
+        with self._lock:
+            self.delays.setdefault(profile, {})[name] = dict(waits)
+            for key in [k for k in self._plans if k[0] == name and k[3] == profile]:
+                del self._plans[key]
@@ -0,0 +1,68 @@
+"""
+Screen sampling over ADB without image libraries.
+
+``capture`` reads the raw ``screencap`` framebuffer (a small header and
+RGBA pixels) through ``Device.shell_bytes``, so individual pixels can be
+compared without decoding a PNG.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+Rgb = Tuple[int, int, int]
+
+RGBA_8888 = 1   # PixelFormat of the raw screencap output
+
+
+@dataclass
+class Frame:
+    """One raw RGBA screenshot"""
+    width: int
+    height: int
+    data: bytes             # width * height * 4 bytes, row-major
+
+    def pixel(self, x: int, y: int) -> Rgb:
+        offset = (y * self.width + x) * 4
+        return (self.data[offset], self.data[offset + 1], self.data[offset + 2])
+
+    def pixels(self, points: Iterable[Tuple[int, int]]) -> List[Rgb]:
+        return [self.pixel(x, y) for x, y in points]
+
+
+def parse_raw_screencap(raw: bytes) -> Frame:
+    """Decode 'screencap' (no -p) output; raises ValueError for unknown layouts"""
+    if len(raw) < 12:
+        raise ValueError("screencap returned no data")
+    width, height, pixel_format = struct.unpack_from('<III', raw)
+    size = width * height * 4
+    if pixel_format != RGBA_8888:
+        raise ValueError(f"Unsupported screencap pixel format {pixel_format}")
+    # Android 9+ adds a colour space word to the 12-byte header; a pty
+    # (old adbd) turns every \n into \r\n
+    for data in (raw, raw.replace(b'\r\n', b'\n')):
+        for header in (16, 12):
+            if len(data) == header + size:
+                return Frame(width, height, data[header:])
+    raise ValueError(f"screencap size mismatch: {len(raw)} bytes for {width}x{height}")
+
+
+def capture(device) -> Frame:
+    return parse_raw_screencap(device.shell_bytes("screencap"))
+
+
+def colour_distance(a: Rgb, b: Rgb) -> int:
+    """Largest per-channel difference"""
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]), abs(a[2] - b[2]))
+
+
+def grid_points(width: int, height: int, columns: int = 6, rows: int = 6,
+                inset: float = 0.1) -> List[Tuple[int, int]]:
+    """Evenly spread sample points, keeping clear of the screen edges"""
+    points = []
+    for row in range(rows):
+        for column in range(columns):
+            rx = inset + (1 - 2 * inset) * (column + 0.5) / columns
+            ry = inset + (1 - 2 * inset) * (row + 0.5) / rows
+            points.append((int(rx * width), int(ry * height)))
+    return points
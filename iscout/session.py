@@ -0,0 +1,200 @@
+"""
+Scout session store in SQLite (iScoutSession.db).
+
+Every loaded report becomes a session: its text, the enemy server and one
+row per target, indexed by server and coordinates. "Got It" changes
+update the target row and append to a completion history, so a sweep can
+be resumed after a restart or crash and a location's history can be looked
+up across sessions.
+
+Writes never run on the caller's thread: they are queued and a background
+writer applies whatever has piled up in one transaction, so ticking off a
+run of targets costs one commit. Reads (the last session at startup,
+location history) use their own connection; the database runs in WAL mode
+so they never wait for the writer.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+from iscout.log import get_logger
+from iscout.models import ScoutTarget
+
+log = get_logger("ui")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    server INTEGER NOT NULL,
+    report TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS targets (
+    session INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    server INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    target_type TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (session, position)
+);
+CREATE INDEX IF NOT EXISTS targets_location ON targets (server, x, y);
+CREATE TABLE IF NOT EXISTS completions (
+    session INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Session:
+    """A loaded report and the state of its targets"""
+    id: int
+    server: int
+    report: str
+    created: float = 0.0
+    targets: List[ScoutTarget] = field(default_factory=list)
+
+
+class SessionStore:
+    """Persist scout sessions with batched writes on a background thread"""
+
+    KEEP_SESSIONS = 50      # Older sessions (and their targets) are deleted
+    BATCH_DELAY = 0.2       # Seconds to gather further writes into the same transaction
+
+    def __init__(self, path: str, batch_delay: float = BATCH_DELAY):
+        self.path = path
+        self.batch_delay = batch_delay
+        self.session_id: Optional[int] = None       # Session that changes apply to
+        # SQL and parameters, an Event to set once everything before it is committed, or None to stop
+        self._queue: "queue.Queue[Union[Tuple[str, tuple], threading.Event, None]]" = queue.Queue()
+        self._next_id = 1
+        self._thread: Optional[threading.Thread] = None
+        with closing(self._connect()) as db:
+            db.executescript(SCHEMA)
+            self._next_id = (db.execute("SELECT MAX(id) FROM sessions").fetchone()[0] or 0) + 1
+
+    # Reads (any thread)
+
+    def last_session(self) -> Optional[Session]:
+        """The most recent session that was not cleared, with its targets; None when there is none"""
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT id, server, report, created FROM sessions WHERE closed = 0 "
+                             "ORDER BY id DESC LIMIT 1").fetchone()
+            if row is None:
+                return None
+            session = Session(*row)
+            session.targets = [ScoutTarget(target_type, x, y, bool(completed)) for target_type, x, y, completed in
+                               db.execute("SELECT target_type, x, y, completed FROM targets WHERE session = ? "
+                                          "ORDER BY position", (session.id,))]
+        self.session_id = session.id
+        return session
+
+    def history(self, server: int, x: int, y: int) -> List[Tuple[float, bool]]:
+        """(time, completed) of every Got It change at a location, oldest first"""
+        with closing(self._connect()) as db:
+            return [(at, bool(completed)) for at, completed in db.execute(
+                "SELECT c.at, c.completed FROM targets t JOIN completions c "
+                "ON c.session = t.session AND c.position = t.position "
+                "WHERE t.server = ? AND t.x = ? AND t.y = ? ORDER BY c.at", (server, x, y))]
+
+    # Writes (queued)
+
+    def start(self, targets: List[ScoutTarget], server: int, report: str) -> int:
+        """Record a newly loaded report as the current session; returns its id"""
+        session_id, self._next_id = self._next_id, self._next_id + 1
+        self._submit("UPDATE sessions SET closed = 1 WHERE closed = 0", ())
+        self._submit("INSERT INTO sessions (id, created, server, report) VALUES (?, ?, ?, ?)",
+                     (session_id, time.time(), server, report))
+        for position, t in enumerate(targets):
+            self._submit("INSERT INTO targets (session, position, server, x, y, target_type, completed) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (session_id, position, server, t.x_coordinate, t.y_coordinate, t.target_type,
+                          int(t.completed)))
+        self._submit("DELETE FROM sessions WHERE id <= ?", (session_id - self.KEEP_SESSIONS,))
+        self._submit("DELETE FROM completions WHERE session <= ?", (session_id - self.KEEP_SESSIONS,))
+        self.session_id = session_id
+        return session_id
+
+    def set_completed(self, position: int, completed: bool):
+        """Record a Got It change of the current session's target at position"""
+        if self.session_id is None:
+            return
+        self._submit("UPDATE targets SET completed = ? WHERE session = ? AND position = ?",
+                     (int(completed), self.session_id, position))
+        self._submit("INSERT INTO completions (session, position, completed, at) VALUES (?, ?, ?, ?)",
+                     (self.session_id, position, int(completed), time.time()))
+
+    def clear(self):
+        """End the current session, so it is not resumed at the next start"""
+        self._submit("UPDATE sessions SET closed = 1 WHERE closed = 0", ())
+        self.session_id = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued write is committed; False on timeout"""
+        if self._thread is None:
+            return True
+        committed = threading.Event()
+        self._queue.put(committed)
+        return committed.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Commit the queued writes and stop the writer"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    # Writer thread
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=10.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        return db
+
+    def _submit(self, sql: str, params: tuple):
+        self._queue.put((sql, params))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="iScoutSession", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        db = self._connect()
+        try:
+            stopped = False
+            while not stopped:
+                batch = [self._queue.get()]
+                time.sleep(self.batch_delay)
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopped = None in batch
+                self._write(db, [op for op in batch if isinstance(op, tuple)])
+                for op in batch:
+                    if isinstance(op, threading.Event):
+                        op.set()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        if not batch:
+            return
+        try:
+            with db:    # One transaction for the whole batch
+                for sql, params in batch:
+                    db.execute(sql, params)
+        except sqlite3.Error as e:
+            log.error("Error writing %s session changes: %s", len(batch), e)
@@ -0,0 +1,290 @@
+"""
+Append-only spawn history with heatmaps and recurrence statistics.
+
+Every loaded scout report adds its targets to ``SpawnHistory/``: one
+little-endian binary file per column (``time``, ``server``, ``x``, ``y``,
+``kind``, ``level``, ``power``; 17 bytes a sighting) plus ``kinds.txt``,
+the names that ``kind`` indexes. Rows are only ever appended, in time
+order. A crash in the middle of an append can leave columns of unequal
+length: reading uses the rows that are complete in every column, and the
+next append first cuts every column back to them, so later rows stay
+aligned.
+
+Recording needs only the standard library: to skip sightings already
+recorded (the same report loaded twice) it reads just the tail of the
+files that falls within DEDUPE_WINDOW. Queries need NumPy: the
+columns are read in one go (a year of daily reports is a few MB) and
+selections, the 1198x1200 heatmap and per-type recurrence statistics are
+vectorised, so a query over months of data takes milliseconds.
+"""
+
+import os
+import re
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:     # Optional dependency
+    np = None
+
+from iscout.log import get_logger
+from iscout.models import ScoutTarget
+from iscout.navigator import MAX_X, MAX_Y
+
+log = get_logger("ui")
+
+# Column name -> (array typecode for appending, NumPy dtype for reading)
+COLUMNS = {
+    'time': ('I', '<u4'),       # Unix seconds
+    'server': ('H', '<u2'),
+    'x': ('H', '<u2'),
+    'y': ('H', '<u2'),
+    'kind': ('H', '<u2'),       # Line of kinds.txt
+    'level': ('B', 'u1'),       # 0 = unknown
+    'power': ('f', '<f4'),      # 0 = unknown
+}
+KINDS_FILE = "kinds.txt"
+DEDUPE_WINDOW = 6 * 3600        # A sighting repeated within this many seconds is the same spawn
+BLOCK = 50                      # Tiles per side of the hotspot blocks in recurrence statistics
+TAIL_ROWS = 4096                # Rows read at a time when looking back over the recent sightings
+
+_LEVEL_RE = re.compile(r'\bLv\.?\s*(\d+)', re.IGNORECASE)
+_POWER_RE = re.compile(r'\b(\d+(?:\.\d+)?)\s*([KMB])\b', re.IGNORECASE)
+_TAG_RE = re.compile(r'\([^)]*\)')
+_SCALE = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+
+class SpawnError(Exception):
+    """The spawn history cannot be queried"""
+
+
+def parse_target_type(text: str) -> Tuple[str, int, float]:
+    """'Arctic Barbarians Lv5 502M  Free' -> ('Arctic Barbarians', 5, 502e6); missing parts are '' / 0"""
+    level_match = _LEVEL_RE.search(text)
+    power_match = _POWER_RE.search(text, level_match.end() if level_match else 0)
+    name = text[:level_match.start()] if level_match else text[:power_match.start()] if power_match else text
+    name = ' '.join(_TAG_RE.sub(' ', name).split())
+    level = min(int(level_match.group(1)), 255) if level_match else 0
+    power = float(power_match.group(1)) * _SCALE[power_match.group(2).lower()] if power_match else 0.0
+    return name, level, power
+
+
+@dataclass
+class TypeStats:
+    """How one spawn type (name and level) recurs in a selection"""
+    name: str
+    level: int
+    sightings: int
+    days: int                   # Distinct days it was seen on
+    locations: int              # Distinct tiles
+    repeat_rate: float          # Share of sightings on a tile where it had been seen before
+    first_seen: float           # Unix time
+    last_seen: float
+    hotspot: Tuple[int, int]    # Centre of the BLOCK x BLOCK area with the most sightings
+    hotspot_share: float        # Share of the sightings in that area
+
+
+class Spawns:
+    """Loaded columns of the history (NumPy arrays of equal length)"""
+
+    def __init__(self, columns: Dict[str, 'np.ndarray'], kinds: List[str]):
+        self.columns = columns
+        self.kinds = kinds
+
+    def __len__(self) -> int:
+        return len(self.columns['time'])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def select(self, server: Optional[int] = None, name: str = "", level: Optional[int] = None,
+               since: Optional[float] = None, until: Optional[float] = None) -> 'np.ndarray':
+        """Boolean mask of the sightings that match; name matches case-insensitively as a substring"""
+        mask = np.ones(len(self), dtype=bool)
+        if server is not None:
+            mask &= self.server == server
+        if name:
+            wanted = [i for i, kind in enumerate(self.kinds) if name.lower() in kind.lower()]
+            mask &= np.isin(self.kind, wanted)
+        if level is not None:
+            mask &= self.level == level
+        if since is not None:
+            mask &= self.time >= since
+        if until is not None:
+            mask &= self.time < until
+        return mask
+
+    def heatmap(self, mask: Optional['np.ndarray'] = None, cell: int = 1) -> 'np.ndarray':
+        """Sightings per map tile as a (rows, columns) grid indexed [y - 1, x - 1]; cell > 1 bins tiles"""
+        x, y = (self.x, self.y) if mask is None else (self.x[mask], self.y[mask])
+        width, height = -(-MAX_X // cell), -(-MAX_Y // cell)
+        index = ((y.astype(np.int64) - 1) // cell) * width + (x.astype(np.int64) - 1) // cell
+        return np.bincount(index, minlength=width * height).reshape(height, width)
+
+    def recurrence(self, mask: Optional['np.ndarray'] = None) -> List[TypeStats]:
+        """Recurrence statistics per spawn type, most sighted first"""
+        if mask is not None and not mask.any() or not len(self):
+            return []
+        pick = (lambda c: c) if mask is None else (lambda c: c[mask])
+        t, x, y = pick(self.time).astype(np.int64), pick(self.x).astype(np.int64), pick(self.y).astype(np.int64)
+        types, group = np.unique(pick(self.kind).astype(np.int64) * 256 + pick(self.level), return_inverse=True)
+        groups = len(types)
+        sightings = np.bincount(group, minlength=groups)
+
+        def distinct(values: 'np.ndarray', span: int) -> 'np.ndarray':
+            return np.bincount(np.unique(group * span + values) // span, minlength=groups)
+
+        days = distinct(t // 86400, int(t.max() // 86400) + 1)
+        tile = (y - 1) * MAX_X + (x - 1)
+        locations = distinct(tile, MAX_X * MAX_Y)
+        by_group = t[np.argsort(group, kind='stable')]
+        starts = np.concatenate(([0], np.cumsum(sightings)[:-1]))
+        first, last = np.minimum.reduceat(by_group, starts), np.maximum.reduceat(by_group, starts)
+
+        # Busiest block per type: count (type, block) pairs, keep the largest of each type
+        blocks_x = -(-MAX_X // BLOCK)
+        block = ((y - 1) // BLOCK) * blocks_x + (x - 1) // BLOCK
+        span = blocks_x * -(-MAX_Y // BLOCK)
+        pairs, counts = np.unique(group * span + block, return_counts=True)
+        order = np.lexsort((-counts, pairs // span))
+        _, best = np.unique(pairs[order] // span, return_index=True)
+        top_block, top_count = pairs[order][best] % span, counts[order][best]
+
+        stats = [TypeStats(self.kinds[code // 256], int(code % 256), int(sightings[i]), int(days[i]),
+                           int(locations[i]), float(1 - locations[i] / sightings[i]),
+                           float(first[i]), float(last[i]),
+                           (int(top_block[i] % blocks_x * BLOCK + BLOCK // 2 + 1),
+                            int(top_block[i] // blocks_x * BLOCK + BLOCK // 2 + 1)),
+                           float(top_count[i] / sightings[i]))
+                 for i, code in enumerate(types)]
+        return sorted(stats, key=lambda s: (-s.sightings, s.name, s.level))
+
+
+def save_heatmap(path: str, grid: 'np.ndarray'):
+    """Write a heatmap grid as .npy, or as CSV (one map row per line) for any other extension"""
+    if path.lower().endswith('.npy'):
+        np.save(path, grid)
+    else:
+        np.savetxt(path, grid, fmt='%d', delimiter=',')
+
+
+class SpawnHistory:
+    """The SpawnHistory directory: append sightings, load them for queries"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._kinds: Optional[List[str]] = None
+        self._loaded: Optional[Tuple[tuple, Spawns]] = None     # (file sizes, columns) of the last load
+
+    def record(self, targets: List[ScoutTarget], server: int, when: Optional[float] = None) -> int:
+        """Append the targets of one report; returns the number of new sightings
+
+        Sightings already recorded within DEDUPE_WINDOW (the same report
+        loaded twice, or again as part of a longer one) are skipped.
+        """
+        when = int(when if when is not None else time.time())
+        os.makedirs(self.directory, exist_ok=True)
+        kinds = self.kinds()
+        known = {name: i for i, name in enumerate(kinds)}
+        rows = []
+        for target in targets:
+            name, level, power = parse_target_type(target.target_type)
+            if name not in known:
+                known[name] = len(kinds)
+                kinds.append(name)
+                with open(self._path(KINDS_FILE), 'a', encoding='utf-8') as f:
+                    f.write(name + "\n")
+            rows.append((when, server, target.x_coordinate, target.y_coordinate, known[name], level, power))
+        rows = self._new_rows(rows, when)
+        if not rows:
+            return 0
+        self._truncate(self._complete_rows())
+        for position, (column, (typecode, _)) in enumerate(COLUMNS.items()):
+            values = array(typecode, (row[position] for row in rows))
+            if sys.byteorder == 'big':
+                values.byteswap()
+            with open(self._path(column), 'ab') as f:
+                values.tofile(f)
+        return len(rows)
+
+    def kinds(self) -> List[str]:
+        if self._kinds is None:
+            path = self._path(KINDS_FILE)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._kinds = [line.rstrip("\n") for line in f]
+            else:
+                self._kinds = []
+        return self._kinds
+
+    def load(self) -> Spawns:
+        """All complete sightings; cached until a column file grows"""
+        if np is None:
+            raise SpawnError("Spawn statistics need NumPy (pip install numpy)")
+        sizes = tuple(os.path.getsize(p) if os.path.exists(p) else 0 for p in map(self._path, COLUMNS))
+        if self._loaded is None or self._loaded[0] != sizes:
+            rows = min(size // np.dtype(dtype).itemsize for size, (_, dtype) in zip(sizes, COLUMNS.values()))
+            columns = {column: np.fromfile(self._path(column), dtype=dtype, count=rows) if rows else
+                       np.zeros(0, dtype=dtype) for column, (_, dtype) in COLUMNS.items()}
+            self._loaded = (sizes, Spawns(columns, list(self.kinds())))
+        return self._loaded[1]
+
+    def _new_rows(self, rows: List[tuple], when: int) -> List[tuple]:
+        if not rows:
+            return rows
+        seen = self._recent(when - DEDUPE_WINDOW)
+        new = []
+        for row in rows:
+            if row[1:6] not in seen:
+                seen.add(row[1:6])
+                new.append(row)
+        return new
+
+    def _complete_rows(self) -> int:
+        """Number of rows present in every column file"""
+        sizes = [os.path.getsize(p) if os.path.exists(p) else 0 for p in map(self._path, COLUMNS)]
+        return min(size // array(typecode).itemsize for size, (typecode, _) in zip(sizes, COLUMNS.values()))
+
+    def _truncate(self, rows: int):
+        """Cut every column file back to rows, dropping what an interrupted append left behind"""
+        for column, (typecode, _) in COLUMNS.items():
+            path, size = self._path(column), rows * array(typecode).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                log.warning("Dropping the incomplete end of %s", path)
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def _recent(self, since: int) -> set:
+        """(server, x, y, kind, level) of the sightings recorded at or after since"""
+        rows = self._complete_rows()
+        # Rows are in time order: step back from the end until a block starts before since
+        start = rows
+        while start > 0:
+            start = max(0, start - TAIL_ROWS)
+            if self._read('time', start, start + 1)[0] < since:
+                break
+        tail = {column: self._read(column, start, rows) for column in ('time', 'server', 'x', 'y', 'kind', 'level')}
+        return {(server, x, y, kind, level)
+                for t, server, x, y, kind, level in zip(*tail.values()) if t >= since}
+
+    def _read(self, column: str, start: int, stop: int) -> array:
+        """Rows start to stop of one column file"""
+        typecode = COLUMNS[column][0]
+        values = array(typecode)
+        if stop > start:
+            with open(self._path(column), 'rb') as f:
+                f.seek(start * values.itemsize)
+                values.fromfile(f, stop - start)
+            if sys.byteorder == 'big':
+                values.byteswap()
+        return values
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name if name == KINDS_FILE else f"{name}.bin")
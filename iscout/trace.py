@@ -0,0 +1,114 @@
+"""
+Navigation tracing in Chrome trace format.
+
+``tracer`` keeps the most recent spans (navigations, route steps, ADB
+commands, UI updates) in a fixed-size ring buffer. ``export`` writes them
+as Chrome trace JSON, which chrome://tracing and https://ui.perfetto.dev
+show as a flame chart per thread::
+
+    with tracer.span("navigate", "nav", x=600, y=600):
+        ...
+
+Recording a span costs two ``perf_counter`` calls and a deque append, so
+tracing stays on all the time; ``tracer.enabled = False`` turns it off.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Categories shown in the trace viewer
+NAV = "nav"
+ROUTE = "route"
+ADB = "adb"
+UI = "ui"
+
+Event = Tuple[str, str, float, float, int, Optional[dict]]    # name, category, start, duration, thread, args
+
+
+class Span:
+    """Context manager recording one complete event"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc is not None:
+            self.args = dict(self.args or {}, error=str(exc))
+        self.tracer.complete(self.name, self.category, self.start, duration, self.args)
+        return False
+
+
+class Tracer:
+    """Ring buffer of spans with Chrome trace export"""
+
+    def __init__(self, capacity: int = 20000):
+        self.enabled = True
+        self.events: Deque[Event] = deque(maxlen=capacity)
+        self._threads: Dict[int, str] = {}
+
+    def span(self, name: str, category: str = NAV, **args) -> Span:
+        return Span(self, name, category, args or None)
+
+    def complete(self, name: str, category: str, start: float, duration: float, args: Optional[dict] = None,
+                 thread: Optional[int] = None):
+        """Record a finished span; start is a time.perf_counter() value"""
+        if not self.enabled:
+            return
+        if thread is None:
+            thread = threading.get_ident()
+            if thread not in self._threads:
+                self._threads[thread] = threading.current_thread().name
+        self.events.append((name, category, start, duration, thread, args))
+
+    def observe_shell(self, call):
+        """Device observer: one span per ADB command"""
+        args = {'serial': call.serial}
+        if call.error:
+            args['error'] = call.error
+        self.complete(call.command, ADB, call.started, call.elapsed, args)
+
+    def clear(self):
+        self.events.clear()
+
+    def chrome_events(self) -> list:
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in list(self._threads.items())]
+        for name, category, start, duration, thread, args in list(self.events):
+            event = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': thread,
+                     'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1)}
+            if args:
+                event['args'] = args
+            events.append(event)
+        return events
+
+    def export(self, path: str) -> int:
+        """Write a Chrome/Perfetto JSON trace; returns the number of spans"""
+        events = self.chrome_events()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+        return sum(1 for e in events if e['ph'] == 'X')
+
+
+tracer = Tracer()
+
+
+def install():
+    """Trace every ADB command (idempotent)"""
+    from iscout.device import Device
+    if tracer.observe_shell not in Device.observers:
+        Device.observers.append(tracer.observe_shell)
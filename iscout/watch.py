@@ -0,0 +1,84 @@
+"""
+Polling file watcher.
+
+``FileWatcher`` notices when files appear, change or disappear and calls
+back once they have settled. It polls ``os.stat`` on a background thread
+instead of using OS notifications, so it works the same everywhere and
+needs no extra package; a change is reported once the files look the
+same on two polls in a row, so an editor that writes a file in several
+steps triggers one reload with the finished content.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from iscout.log import get_logger
+
+log = get_logger("nav")
+
+Snapshot = Dict[str, Tuple[int, int]]   # path -> (mtime_ns, size)
+
+
+def snapshot(paths: Iterable[str]) -> Snapshot:
+    """Modification time and size of every existing path"""
+    result = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        result[path] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+
+class FileWatcher:
+    """Call on_change with the changed paths when any of the watched files changes"""
+
+    INTERVAL = 1.0      # Seconds between polls
+
+    def __init__(self, paths: Callable[[], Iterable[str]], on_change: Callable[[List[str]], None],
+                 interval: float = INTERVAL):
+        self.paths = paths                  # Called on every poll, so new files are picked up
+        self.on_change = on_change
+        self.interval = interval
+        self._seen: Snapshot = {}
+        self._pending: Optional[Snapshot] = None
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._seen = snapshot(self.paths())
+            self._thread = threading.Thread(target=self._run, name="iScoutWatch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def poll(self) -> List[str]:
+        """Check the files once; returns (and reports) the paths that changed and have settled"""
+        current = snapshot(self.paths())
+        if current == self._seen:
+            self._pending = None
+            return []
+        if current != self._pending:
+            self._pending = current     # Still being written, or just changed: look again next poll
+            return []
+        changed = sorted(path for path in set(current) | set(self._seen)
+                         if current.get(path) != self._seen.get(path))
+        self._seen, self._pending = current, None
+        self.on_change(changed)
+        return changed
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            if self._stopped:
+                break
+            try:
+                self.poll()
+            except Exception as e:
+                log.error("Error watching files: %s", e)
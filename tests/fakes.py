@@ -0,0 +1,49 @@
+"""
+Stand-ins for an emulator, so the Qt-free package can be tested headless.
+"""
+
+from typing import Dict, List, Optional
+
+
+class FakeDevice:
+    """Anything with .shell(cmd): records commands and answers from a table
+
+    replies maps a command prefix to its output (a string, or a callable
+    taking the command); commands without a reply return "".
+    """
+
+    def __init__(self, replies: Optional[Dict[str, object]] = None, serial: str = "emulator-5554"):
+        self.serial = serial
+        self.replies = replies or {}
+        self.commands: List[str] = []
+
+    def shell(self, command: str) -> str:
+        self.commands.append(command)
+        for prefix, reply in self.replies.items():
+            if command.startswith(prefix):
+                return reply(command) if callable(reply) else reply
+        return ""
+
+    @property
+    def inputs(self) -> List[str]:
+        """The 'input' commands sent, in order"""
+        return [c for c in self.commands if c.startswith("input ")]
+
+
+class FakeClock:
+    """Manual clock for code that takes clock= or sleep= parameters"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.slept: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def no_sleep(seconds: float):
+    pass
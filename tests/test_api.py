@@ -0,0 +1,146 @@
+import http.client
+import json
+import unittest
+
+from iscout.api import (APPLICATION_ERROR, INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND,
+                        PARSE_ERROR, ApiError, ControlServer)
+
+
+def navigate(x: int, y: int, server: int = None) -> dict:
+    if not 1 <= x <= 1198:
+        raise ValueError(f"X coordinate {x} out of range")
+    return {'x': x, 'y': y, 'server': server}
+
+
+def busy():
+    raise ApiError("Auto-Scout is running")
+
+
+def broken():
+    raise RuntimeError("boom")
+
+
+METHODS = {'navigate': navigate, 'busy': busy, 'broken': broken}
+
+
+def rpc(method: str, params=None, request_id=1) -> dict:
+    request = {'jsonrpc': '2.0', 'id': request_id, 'method': method}
+    if params is not None:
+        request['params'] = params
+    return request
+
+
+class ControlServerCallTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ControlServer(METHODS)
+
+    def error_code(self, request) -> int:
+        return self.server.call(request)['error']['code']
+
+    def test_result(self):
+        self.assertEqual(self.server.call(rpc('navigate', {'x': 5, 'y': 6})),
+                         {'jsonrpc': '2.0', 'id': 1, 'result': {'x': 5, 'y': 6, 'server': None}})
+        self.assertEqual(self.server.call(rpc('navigate', [5, 6, 7], request_id='a'))['result']['server'], 7)
+
+    def test_error_codes(self):
+        self.assertEqual(self.error_code({'id': 1, 'method': 'navigate'}), INVALID_REQUEST)
+        self.assertEqual(self.error_code([]), INVALID_REQUEST)
+        self.assertEqual(self.error_code(rpc(5)), INVALID_REQUEST)
+        self.assertEqual(self.error_code(rpc('teleport')), METHOD_NOT_FOUND)
+        self.assertEqual(self.error_code(rpc('navigate', {'x': 5})), INVALID_PARAMS)
+        self.assertEqual(self.error_code(rpc('navigate', {'x': 5, 'y': 6, 'z': 7})), INVALID_PARAMS)
+        self.assertEqual(self.error_code(rpc('navigate', "5,6")), INVALID_PARAMS)
+        self.assertEqual(self.error_code(rpc('navigate', {'x': 0, 'y': 6})), INVALID_PARAMS)
+        self.assertEqual(self.error_code(rpc('busy')), APPLICATION_ERROR)
+        self.assertEqual(self.error_code(rpc('broken')), INTERNAL_ERROR)
+
+    def test_notifications_get_no_response(self):
+        self.assertIsNone(self.server.call({'jsonrpc': '2.0', 'method': 'navigate', 'params': [5, 6]}))
+        self.assertIsNone(self.server.call({'jsonrpc': '2.0', 'method': 'broken'}))
+
+    def test_invoke_runs_the_call(self):
+        calls = []
+        server = ControlServer(METHODS, invoke=lambda call: calls.append(call) or call())
+        self.assertIn('result', server.call(rpc('navigate', [1, 2])))
+        self.assertEqual(len(calls), 1)
+
+
+class ControlServerHttpTest(unittest.TestCase):
+
+    TOKEN = "secret"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ControlServer(METHODS, port=0, token=cls.TOKEN)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def request(self, method: str, path: str, body: bytes = b"", headers=None):
+        sent = {'Host': f"127.0.0.1:{self.server.port}", 'Content-Type': 'application/json',
+                'Authorization': f"Bearer {self.TOKEN}", 'Content-Length': str(len(body))}
+        sent.update(headers or {})
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+        self.addCleanup(connection.close)
+        connection.putrequest(method, path, skip_host=True)
+        for name, value in sent.items():
+            if value is not None:
+                connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        data = response.read()
+        return response, json.loads(data) if data else None
+
+    def test_rpc(self):
+        response, body = self.request('POST', '/rpc', json.dumps(rpc('navigate', {'x': 5, 'y': 6})).encode())
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body['result']['x'], 5)
+
+    def test_batch_and_notification(self):
+        batch = [rpc('navigate', [1, 2]), {'jsonrpc': '2.0', 'method': 'busy'}, rpc('teleport', request_id=2)]
+        response, body = self.request('POST', '/rpc', json.dumps(batch).encode())
+        self.assertEqual([r.get('result', r.get('error', {}).get('code')) for r in body],
+                         [{'x': 1, 'y': 2, 'server': None}, METHOD_NOT_FOUND])
+        response, body = self.request('POST', '/rpc', json.dumps({'jsonrpc': '2.0', 'method': 'busy'}).encode())
+        self.assertEqual((response.status, body), (204, None))
+
+    def test_parse_error(self):
+        response, body = self.request('POST', '/rpc', b"{not json")
+        self.assertEqual((response.status, body['error']['code']), (200, PARSE_ERROR))
+
+    def test_http_errors(self):
+        cases = [
+            ('GET', '/nothing', {}, 404),
+            ('POST', '/rpc', {'Host': 'evil.example:80'}, 403),
+            ('POST', '/rpc', {'Authorization': 'Bearer wrong'}, 401),
+            ('POST', '/rpc', {'Authorization': None}, 401),
+            ('POST', '/rpc', {'Content-Type': 'text/plain'}, 415),
+            ('POST', '/rpc', {'Content-Length': 'many'}, 400),
+            ('POST', '/rpc', {'Content-Length': '-1'}, 400),
+            ('POST', '/rpc', {'Content-Length': str(ControlServer.MAX_BODY + 1)}, 413),
+        ]
+        for method, path, headers, status in cases:
+            with self.subTest(headers=headers, status=status):
+                response, _ = self.request(method, path, b"{}", headers)
+                self.assertEqual(response.status, status)
+
+    def test_rejected_body_is_not_read_as_the_next_request(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+        self.addCleanup(connection.close)
+        body = b"GET /health HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n"
+        connection.request('POST', '/rpc', body, {'Content-Type': 'text/plain', 'Authorization': f"Bearer {self.TOKEN}"})
+        response = connection.getresponse()
+        response.read()
+        self.assertEqual((response.status, response.getheader('Connection')), (415, 'close'))
+        self.assertTrue(response.will_close)
+
+    def test_health(self):
+        response, body = self.request('GET', '/health')
+        self.assertEqual((response.status, body['ok']), (200, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
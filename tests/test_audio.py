@@ -0,0 +1,37 @@
+import io
+import unittest
+import wave
+
+from iscout.audio import SAMPLE_RATE, AudioService, NullBackend, Tone, render_tone
+
+
+class RenderToneTest(unittest.TestCase):
+
+    def test_wav_image(self):
+        with wave.open(io.BytesIO(render_tone(Tone(880, 200))), 'rb') as wav:
+            self.assertEqual((wav.getnchannels(), wav.getsampwidth(), wav.getframerate()), (1, 2, SAMPLE_RATE))
+            self.assertEqual(wav.getnframes(), SAMPLE_RATE // 5)
+            frames = wav.readframes(wav.getnframes())
+        samples = [int.from_bytes(frames[i:i + 2], 'little', signed=True) for i in range(0, len(frames), 2)]
+        self.assertEqual(samples[0], 0)                     # Faded in: no click
+        self.assertLessEqual(max(map(abs, samples)), int(32767 * 0.6))
+
+    def test_silent_tone(self):
+        with wave.open(io.BytesIO(render_tone(Tone(440, 50, volume=0.0))), 'rb') as wav:
+            self.assertEqual(set(wav.readframes(wav.getnframes())), {0})
+
+
+class AudioServiceTest(unittest.TestCase):
+
+    def test_plays_registered_alerts_on_the_worker(self):
+        backend = NullBackend()
+        service = AudioService(backend)
+        service.register('alarm', Tone(880, 10))
+        self.assertTrue(service.play('alarm'))
+        service.play('unknown')
+        service.shutdown()
+        self.assertEqual(backend.played, ['alarm'])
+
+
+if __name__ == '__main__':
+    unittest.main()
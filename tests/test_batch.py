@@ -0,0 +1,136 @@
+import threading
+import unittest
+
+from iscout.batch import (ARRIVED, CANCELLED, COMPLETED, FAILED, FINISHED, NAVIGATING, PAUSED, PAUSING, RUNNING,
+                          SKIPPED, BatchItem, BatchRunner)
+
+TIMEOUT = 5.0
+
+
+class Recorder:
+    """Listener that lets a test wait for a given progress notification"""
+
+    def __init__(self):
+        self.events = []
+        self._condition = threading.Condition()
+
+    def __call__(self, progress):
+        with self._condition:
+            self.events.append(progress)
+            self._condition.notify_all()
+
+    def wait_for(self, kind: str = "", state: str = "", count: int = 1):
+        """Block until count notifications of kind (or, without kind, state changes to state) arrived"""
+        def seen():
+            return sum(1 for p in self.events if p.kind == kind and (not state or p.state == state)) >= count
+        with self._condition:
+            if not self._condition.wait_for(seen, TIMEOUT):
+                raise AssertionError(f"No {kind or state} after {TIMEOUT}s: {self.events}")
+
+    def kinds(self, kind: str):
+        return [p.item.index for p in self.events if p.kind == kind]
+
+
+def items(count: int):
+    return [BatchItem(i, 100 + i, 200 + i, f"target {i}") for i in range(count)]
+
+
+class BatchRunnerTest(unittest.TestCase):
+
+    def test_fixed_dwell_completes_every_target(self):
+        recorder, visited = Recorder(), []
+        runner = BatchRunner(items(3), visited.append, dwell=0.01, listener=recorder)
+        runner.start()
+        recorder.wait_for(state=FINISHED)
+        self.assertEqual([item.index for item in visited], [0, 1, 2])
+        self.assertEqual(recorder.kinds(COMPLETED), [0, 1, 2])
+        self.assertEqual(runner.state, FINISHED)
+        self.assertFalse(runner.running)
+
+    def test_skip_and_done(self):
+        recorder = Recorder()
+        runner = BatchRunner(items(3), lambda item: None, dwell=None, listener=recorder)
+        runner.start()
+        recorder.wait_for(ARRIVED, count=1)
+        runner.skip()
+        recorder.wait_for(ARRIVED, count=2)
+        runner.done()
+        recorder.wait_for(ARRIVED, count=3)
+        runner.done()
+        recorder.wait_for(state=FINISHED)
+        self.assertEqual(recorder.kinds(SKIPPED), [0])
+        self.assertEqual(recorder.kinds(COMPLETED), [1, 2])
+
+    def test_cancel_during_dwell(self):
+        recorder, visited = Recorder(), []
+        runner = BatchRunner(items(3), visited.append, dwell=None, listener=recorder)
+        runner.start()
+        recorder.wait_for(ARRIVED)
+        runner.cancel()
+        recorder.wait_for(state=CANCELLED)
+        self.assertEqual(len(visited), 1)
+        self.assertEqual(recorder.kinds(COMPLETED) + recorder.kinds(SKIPPED), [])
+        self.assertEqual(runner.state, CANCELLED)
+
+    def test_pause_holds_the_next_target(self):
+        recorder, visited = Recorder(), []
+        runner = BatchRunner(items(2), visited.append, dwell=None, listener=recorder)
+        runner.start()
+        recorder.wait_for(ARRIVED)
+        runner.pause()
+        runner.done()
+        recorder.wait_for(COMPLETED)
+        recorder.wait_for(state=PAUSED)
+        self.assertEqual(len(visited), 1)
+        runner.resume()
+        recorder.wait_for(ARRIVED, count=2)
+        runner.cancel()
+        recorder.wait_for(state=CANCELLED)
+        self.assertEqual(len(visited), 2)
+
+    def test_pause_during_navigation_toggles(self):
+        recorder, navigating, release = Recorder(), threading.Event(), threading.Event()
+        def navigate(item):
+            navigating.set()
+            release.wait(TIMEOUT)
+        runner = BatchRunner(items(2), navigate, dwell=0.01, listener=recorder)
+        runner.start()
+        self.assertTrue(navigating.wait(TIMEOUT))
+        runner.pause()
+        self.assertEqual(runner.state, PAUSING)     # At once, so a second F6 press resumes
+        self.assertTrue(runner.running)
+        runner.resume()
+        self.assertEqual(runner.state, RUNNING)
+        release.set()
+        recorder.wait_for(state=FINISHED)
+        self.assertEqual(recorder.kinds(COMPLETED), [0, 1])
+        self.assertNotIn(PAUSED, [p.state for p in recorder.events])
+
+    def test_failed_targets_are_retried_then_skipped(self):
+        recorder, attempts = Recorder(), []
+        def navigate(item):
+            attempts.append(item.index)
+            if item.index == 0:
+                raise ConnectionError("no dialog")
+        runner = BatchRunner(items(2), navigate, dwell=0.01, max_retries=2, listener=recorder)
+        runner.start()
+        recorder.wait_for(state=FINISHED)
+        self.assertEqual(attempts, [0, 0, 0, 1])
+        self.assertEqual(recorder.kinds(FAILED), [0, 0, 0])
+        self.assertEqual(recorder.kinds(COMPLETED), [1])
+        self.assertEqual(recorder.events[-2].kind, COMPLETED)
+
+    def test_retry_budget_is_shared(self):
+        recorder, attempts = Recorder(), []
+        def navigate(item):
+            attempts.append(item.index)
+            raise ConnectionError("offline")
+        runner = BatchRunner(items(3), navigate, dwell=0.01, max_retries=2, retry_budget=3, listener=recorder)
+        runner.start()
+        recorder.wait_for(state=FINISHED)
+        self.assertEqual(attempts, [0, 0, 0, 1, 1, 2])
+        self.assertEqual([p.attempt for p in recorder.events if p.kind == NAVIGATING], [1, 2, 3, 1, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.calibration import load_delays, save_delays, step_label
+from iscout.routes import TAP, TEXT, WAIT, Route, Step
+
+ROUTE = Route('jump', [Step(TAP, 'NavBox', wait=0.4), Step(TEXT, 'NavX', value='{x}'), Step(WAIT, wait=0.5)])
+
+
+class DelaysTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.path = os.path.join(directory, "delays.json")
+
+    def test_round_trip_keeps_other_profiles(self):
+        self.assertEqual(load_delays(self.path, {'jump': ROUTE}), {})
+        save_delays(self.path, "SM-G960N 1080x1920", ROUTE, {0: 0.25, 2: 0.3})
+        save_delays(self.path, "Pixel 720x1280", ROUTE, {1: 0.1})
+        self.assertEqual(load_delays(self.path, {'jump': ROUTE}), {
+            "SM-G960N 1080x1920": {'jump': {0: 0.25, 2: 0.3}},
+            "Pixel 720x1280": {'jump': {1: 0.1}},
+        })
+
+    def test_drops_entries_of_edited_routes(self):
+        save_delays(self.path, "SM-G960N 1080x1920", ROUTE, {0: 0.25, 1: 0.1, 2: 0.3})
+        edited = Route('jump', [Step(TAP, 'NavBox'), Step(TAP, 'NavGo'), Step(WAIT)])
+        self.assertEqual(load_delays(self.path, {'jump': edited}), {"SM-G960N 1080x1920": {'jump': {0: 0.25, 2: 0.3}}})
+        self.assertEqual(load_delays(self.path, {'jump': Route('jump', [Step(TAP, 'NavGo')])}), {})
+        self.assertEqual(load_delays(self.path, {}), {})
+
+    def test_unreadable_file(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{")
+        with self.assertLogs('iscout', 'ERROR'):
+            self.assertEqual(load_delays(self.path, {'jump': ROUTE}), {})
+
+    def test_step_label(self):
+        self.assertEqual([step_label(ROUTE, i) for i in range(3)], ["tap NavBox", "text NavX", "wait"])
+
+
+if __name__ == '__main__':
+    unittest.main()
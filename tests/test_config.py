@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+from iscout import config as config_module
+from iscout.config import ConfigStore, config_from_dict, load_legacy_config, validate_config
+from iscout.models import AppConfig
+
+
+class ConfigStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'iScoutConfig.json')
+        self.legacy = os.path.join(self.directory, 'iScoutTool.cfg')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def store(self) -> ConfigStore:
+        return ConfigStore(self.path, self.legacy, write_delay=0)
+
+    def write_legacy(self, line: str):
+        with open(self.legacy, 'w') as f:
+            f.write(line + "\n")
+
+    def test_migrates_the_csv_file(self):
+        self.write_legacy("123,600,610,456,5565,127.0.0.1:5565,5555-5625:10,8765")
+        store = self.store()
+        config = store.load()
+        store.flush()
+        self.assertEqual(config, AppConfig(123, 600, 610, 456, 5565, "127.0.0.1:5565", "5555-5625:10", 8765))
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['active'], 'default')
+        self.assertEqual(data['profiles']['default']['enemy_server'], 456)
+        # The CSV file stays as it was; the JSON file wins from now on
+        with open(self.legacy) as f:
+            self.assertTrue(f.read().startswith("123,600"))
+        self.write_legacy("1,2,3,4")
+        self.assertEqual(self.store().load().home_server, 123)
+
+    def test_short_csv_keeps_device_defaults(self):
+        self.write_legacy("1,2,3,4")
+        self.assertEqual(load_legacy_config(self.legacy), AppConfig(1, 2, 3, 4))
+        self.write_legacy("1,2,3")
+        with self.assertRaises(ValueError):
+            load_legacy_config(self.legacy)
+
+    def test_writes_only_changes(self):
+        store = self.store()
+        store.load()
+        with mock.patch.object(config_module, 'write_atomic', wraps=config_module.write_atomic) as write:
+            store.save(AppConfig(1, 100, 200, 2))
+            store.flush()
+            self.assertEqual(write.call_count, 1)
+            self.assertFalse(store.save(AppConfig(1, 100, 200, 2)))
+            store.flush()
+            self.assertEqual(write.call_count, 1)
+            self.assertTrue(store.save(AppConfig(1, 100, 200, 3)))
+            store.flush()
+            self.assertEqual(write.call_count, 2)
+        self.assertEqual(self.store().load().enemy_server, 3)
+
+    def test_reformatted_file_is_not_rewritten(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'active': 'main', 'profiles': {'main': {'home_server': 5, 'home_x': 1,
+                       'home_y': 1, 'enemy_server': 6}}}, f)
+        store = self.store()
+        store.load()
+        self.assertFalse(store.save())
+
+    def test_invalid_config_is_not_kept(self):
+        store = self.store()
+        store.load()
+        with self.assertRaises(ValueError):
+            store.save(AppConfig(0, 100, 200, 2))
+        store.flush()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_profiles(self):
+        store = self.store()
+        store.load()
+        store.save(AppConfig(1, 100, 200, 2))
+        second = store.select('alt')
+        self.assertEqual(second, store.profiles['default'])
+        store.save(replace(second, enemy_server=9))
+        store.flush()
+        reloaded = self.store()
+        self.assertEqual(reloaded.load().enemy_server, 9)
+        self.assertEqual(reloaded.names(), ['alt', 'default'])
+        self.assertEqual(reloaded.active, 'alt')
+        reloaded.delete('alt')
+        self.assertEqual(reloaded.active, 'default')
+        with self.assertRaises(ValueError):
+            reloaded.delete('default')
+        reloaded.flush()
+        self.assertEqual(self.store().load(), AppConfig(1, 100, 200, 2))
+
+    def test_malformed_json(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        with self.assertRaises(ValueError):
+            self.store().load()
+
+
+class ConfigFromDictTest(unittest.TestCase):
+
+    def test_types(self):
+        self.assertEqual(config_from_dict({'home_server': '12', 'device_serial': 'x', 'other': 1}),
+                         AppConfig(home_server=12, device_serial='x'))
+        with self.assertRaises(ValueError):
+            config_from_dict({'home_x': 1.5}, 'main')
+        with self.assertRaises(ValueError):
+            config_from_dict({'device_serial': 5555}, 'main')
+
+    def test_bounds(self):
+        validate_config(AppConfig(1, 1198, 1200, 9999))
+        for bad in (AppConfig(0, 1, 1, 1), AppConfig(1, 1199, 1, 1), AppConfig(1, 1, 1201, 1), AppConfig(1, 1, 1, 0)):
+            with self.subTest(config=bad), self.assertRaises(ValueError):
+                validate_config(bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from iscout.connection import (CONNECTED, DISCONNECTED, AdbConnectionError, ConnectionManager, ConnectionStatus)
+from iscout.metrics import metrics
+from iscout.recovery import OPEN
+
+from fakes import FakeDevice
+
+
+class FakeClient:
+    """ppadb Client stand-in for re-attaching a transport"""
+
+    def __init__(self, serials):
+        self.serials = set(serials)
+        self.connects = []
+
+    def remote_connect(self, host, port):
+        self.connects.append((host, port))
+
+    def device(self, serial):
+        return FakeDevice(serial=serial) if serial in self.serials else None
+
+
+class ConnectionManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.published = []
+        self.manager = ConnectionManager(listener=self.published.append)
+
+    def test_mark_lost_publishes_and_clears(self):
+        self.manager._publish(ConnectionStatus(CONNECTED, device=FakeDevice()))
+        self.assertIsNotNone(self.manager.device)
+        self.manager.mark_lost("adb went away")
+        self.assertIsNone(self.manager.device)
+        self.assertEqual((self.published[-1].state, self.published[-1].message), (DISCONNECTED, "adb went away"))
+        self.assertFalse(self.manager._connected.is_set())
+
+    def test_reconnect_transport(self):
+        with self.assertRaises(AdbConnectionError):
+            self.manager.reconnect_transport("127.0.0.1:5555")
+        client = FakeClient({"127.0.0.1:5555", "emulator-5554"})
+        self.manager._publish(ConnectionStatus(CONNECTED, client=client))
+        self.assertEqual(self.manager.reconnect_transport("127.0.0.1:5555").serial, "127.0.0.1:5555")
+        self.assertEqual(self.manager.reconnect_transport("emulator-5554").serial, "emulator-5554")
+        self.assertEqual(client.connects, [("127.0.0.1", 5555)])
+        with self.assertRaises(AdbConnectionError):
+            self.manager.reconnect_transport("127.0.0.1:5565")
+
+    def test_reconnect_resets_the_breaker_and_counts(self):
+        before = metrics.reconnects
+        self.manager._publish(ConnectionStatus(CONNECTED))
+        self.manager.mark_lost()
+        self.manager.recovery.breaker.state = OPEN
+        self.manager._publish(ConnectionStatus(CONNECTED))
+        self.assertNotEqual(self.manager.recovery.breaker.state, OPEN)
+        self.assertEqual(metrics.reconnects, before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from iscout.discovery import DEFAULT_PORTS, DeviceDiscovery, DeviceInfo, parse_port_spec
+
+from fakes import FakeDevice
+
+
+class FakeClient:
+    """ppadb Client stand-in: remote_connect attaches an emulator after a short delay"""
+
+    def __init__(self):
+        self.attached = []
+        self.connects = []
+        self._lock = threading.Lock()
+
+    def devices(self):
+        with self._lock:
+            return [FakeDevice({"getprop": "SM-G960N\n", "wm size": "Physical size: 1080x1920\n"}, serial)
+                    for serial in self.attached]
+
+    def remote_connect(self, host, port):
+        self.connects.append(port)
+        time.sleep(0.05)
+        with self._lock:
+            self.attached.append(f"{host}:{port}")
+
+
+class PortSpecTest(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_port_spec("5555-5575:10; 62001,7555"), (5555, 5565, 5575, 7555, 62001))
+        self.assertEqual(parse_port_spec("5555-5557"), (5555, 5556, 5557))
+        self.assertEqual(parse_port_spec(" "), DEFAULT_PORTS)
+        for spec in ("0", "5555-70000", "adb"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_port_spec(spec)
+
+
+class DeviceInfoTest(unittest.TestCase):
+
+    def test_port_profile_and_label(self):
+        self.assertEqual(DeviceInfo("127.0.0.1:5565").port, 5565)
+        self.assertEqual(DeviceInfo("emulator-5554").port, 5555)
+        self.assertIsNone(DeviceInfo("R58M123").port)
+        self.assertEqual(DeviceInfo("emulator-5554").profile, "")
+        info = DeviceInfo("emulator-5554", "SM-G960N", (1080, 1920))
+        self.assertEqual(info.profile, "SM-G960N 1080x1920")
+        self.assertEqual(info.label, "SM-G960N - 1080x1920 (emulator-5554)")
+
+    def test_choose(self):
+        devices = [DeviceInfo("emulator-5554"), DeviceInfo("127.0.0.1:5565")]
+        self.assertIs(DeviceDiscovery.choose(devices), devices[0])
+        self.assertIs(DeviceDiscovery.choose(devices, preferred_port=5565), devices[1])
+        self.assertIs(DeviceDiscovery.choose(devices, preferred_port=5575), devices[0])
+        self.assertIs(DeviceDiscovery.choose(devices, "127.0.0.1:5565", 5555), devices[1])
+        self.assertIsNone(DeviceDiscovery.choose(devices, "127.0.0.1:5575"))
+        self.assertIsNone(DeviceDiscovery.choose([]))
+
+
+class SharedDiscoveryTest(unittest.TestCase):
+
+    def test_concurrent_scans_take_turns(self):
+        discovery, client = DeviceDiscovery(ports=(5555,)), FakeClient()
+        results = []
+        with mock.patch('iscout.discovery.probe_port', return_value=True):
+            threads = [threading.Thread(target=lambda: results.append(discovery.discover(client)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(client.connects, [5555])
+        self.assertEqual([[d.serial for d in found] for found in results], [["127.0.0.1:5555"]] * 4)
+        self.assertEqual(discovery.devices[0].profile, "SM-G960N 1080x1920")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import shutil
+import tempfile
+import threading
+import unittest
+
+from iscout.engine import Engine, EngineBusy
+
+
+class EngineBusyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.engine = Engine(self.directory)
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_gui_jumps_do_not_wait_for_a_worker(self):
+        self.assertFalse(self.engine.busy)
+        holding, release = threading.Event(), threading.Event()
+        def worker():       # Stands in for a calibration or macro replay
+            with self.engine._navigation_lock:
+                holding.set()
+                release.wait(5.0)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        self.assertTrue(holding.wait(5.0))
+        self.assertTrue(self.engine.busy)
+        with self.assertRaises(EngineBusy):
+            self.engine.navigate(100, 200, 5, wait=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
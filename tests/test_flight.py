@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.device import ShellCall
+from iscout.flight import FlightRecorder
+
+
+def call(n, error="", result=""):
+    return ShellCall("emulator-5554", f"input tap {n} {n}", float(n), 0.01, error, result)
+
+
+class FlightRecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = FlightRecorder(capacity=3)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_wraparound_keeps_the_latest_oldest_first(self):
+        self.assertEqual(self.recorder.entries(), [])
+        for n in range(2):
+            self.recorder.observe_shell(call(n))
+        self.assertEqual([e[2] for e in self.recorder.entries()], ["input tap 0 0", "input tap 1 1"])
+        for n in range(2, 5):
+            self.recorder.observe_shell(call(n, error="closed" if n == 3 else ""))
+        entries = self.recorder.entries()
+        self.assertEqual([e[0] for e in entries], [2.0, 3.0, 4.0])
+        self.assertEqual([e[5] for e in entries], [False, True, False])
+
+    def test_dump(self):
+        self.assertIsNone(self.recorder.dump("no directory"))
+        self.recorder.observe_shell(call(1, result="line one\r\nline two\n"))
+        self.recorder.observe_shell(call(2, error="device offline"))
+        path = os.path.join(self.directory, "flight.txt")
+        with self.assertLogs('iscout.adb', 'INFO'):
+            self.assertEqual(self.recorder.dump("navigation failed", path), path)
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[1], "# Reason: navigation failed")
+        self.assertTrue(lines[3].endswith("input tap 1 1  -> line one\\nline two"))
+        self.assertTrue(lines[4].endswith("input tap 2 2  !! device offline"))
+
+    def test_prunes_old_dumps(self):
+        self.recorder.directory = self.directory
+        self.recorder.KEEP_DUMPS = 2
+        with self.assertLogs('iscout.adb', 'INFO'):
+            for _ in range(4):
+                self.recorder.dump()
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from iscout.connection import DISCONNECTED, ConnectionStatus
+from iscout.heartbeat import FOREGROUND_COMMAND, DeviceHealth, Heartbeat, parse_foreground_package
+
+from fakes import FakeDevice
+
+RESUMED = "  mResumedActivity: ActivityRecord{2c1f7a0 u0 com.topgamesinc.evony/.MainActivity t12}\n"
+LAUNCHER = "  mResumedActivity: ActivityRecord{8d2e1b1 u0 com.bluestacks.launcher/.activity.HomeActivity t3}\n"
+
+
+class FakeConnection:
+    """ConnectionManager stand-in: connected when it holds a device"""
+
+    def __init__(self, device=None):
+        self.device = device
+        self.status = ConnectionStatus(DISCONNECTED, message="No emulator found")
+
+
+class ParseTest(unittest.TestCase):
+
+    def test_parse_foreground_package(self):
+        self.assertEqual(parse_foreground_package(RESUMED), "com.topgamesinc.evony")
+        self.assertEqual(parse_foreground_package(LAUNCHER), "com.bluestacks.launcher")
+        self.assertEqual(parse_foreground_package(""), "")
+        self.assertEqual(parse_foreground_package(None), "")
+
+    def test_evony_foreground(self):
+        self.assertIsNone(DeviceHealth().evony_foreground)
+        self.assertTrue(DeviceHealth(foreground_package="com.topgamesinc.evony").evony_foreground)
+        self.assertFalse(DeviceHealth(foreground_package="com.bluestacks.launcher").evony_foreground)
+
+
+class HeartbeatTest(unittest.TestCase):
+
+    def test_beat(self):
+        device = FakeDevice({"echo": "ok\n", "dumpsys activity": RESUMED})
+        connection, published = FakeConnection(), []
+        heartbeat = Heartbeat(connection, published.append, package_interval=60.0)
+        with self.assertLogs('iscout.adb', 'INFO'):
+            self.assertEqual(heartbeat.beat().message, "No emulator found")
+            connection.device = device
+            health = heartbeat.beat()
+        self.assertTrue(health.connected and health.responsive and health.evony_foreground)
+        self.assertEqual(device.commands, ["echo ok", FOREGROUND_COMMAND])
+        heartbeat.beat()                        # Nothing changed: no new package check, nothing published
+        self.assertEqual(device.commands.count(FOREGROUND_COMMAND), 1)
+        self.assertEqual(len(published), 2)
+        device.replies["dumpsys activity"] = LAUNCHER
+        heartbeat.refresh()
+        with self.assertLogs('iscout.adb', 'INFO'):
+            health = heartbeat.beat()
+        self.assertEqual(health.message, "Evony is not in the foreground (com.bluestacks.launcher)")
+        self.assertEqual(published[-1], health)
+
+
+if __name__ == '__main__':
+    unittest.main()
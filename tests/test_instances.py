@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.instances import Dispatcher, Instance, InstanceProfile, NavRequest, load_profiles, save_profiles
+from iscout.routes import RouteBook, load_routes
+
+from fakes import FakeDevice
+
+
+class FakeConnection:
+    """ConnectionManager stand-in: connected when it holds a device"""
+
+    def __init__(self, device=None):
+        self.device = device
+
+    def stop(self):
+        pass
+
+
+class ProfilesTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        path = os.path.join(directory, "instances.json")
+        self.assertEqual(load_profiles(path), [])
+        profiles = [InstanceProfile("main", "127.0.0.1:5555", 12, 100, 200, 34), InstanceProfile("farm", "emulator-5554")]
+        save_profiles(path, profiles)
+        self.assertEqual(load_profiles(path), profiles)
+
+
+class DispatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatcher = Dispatcher(RouteBook(load_routes(""), {}))
+        self.connected = self.add("main", FakeDevice())
+        self.offline = self.add("farm", None)
+
+    def add(self, name, device):
+        # Not started: the tests pull requests the way the worker threads would
+        instance = Instance(InstanceProfile(name, ""), self.dispatcher, FakeConnection(device))
+        self.dispatcher.instances.append(instance)
+        return instance
+
+    def test_own_queue_first_and_shared_work_only_when_connected(self):
+        shared, own, offline_own = NavRequest(1, 1), NavRequest(2, 2), NavRequest(3, 3)
+        self.dispatcher.submit(shared)
+        self.dispatcher.submit_to(self.connected, own)
+        self.dispatcher.submit_to(self.offline, offline_own)
+        self.assertEqual(self.dispatcher.pending(), 3)
+        self.assertIs(self.dispatcher._next_request(self.offline), offline_own)
+        self.assertIs(self.dispatcher._next_request(self.connected), own)
+        self.assertIs(self.dispatcher._next_request(self.connected), shared)
+        self.assertEqual(self.dispatcher.pending(), 0)
+
+    def test_submit_to_all_and_clear(self):
+        self.dispatcher.submit_to_all(lambda profile: NavRequest(1, 1, label=profile.name))
+        self.assertEqual([r.label for i in self.dispatcher.instances for r in i._own], ["main", "farm"])
+        self.dispatcher.clear()
+        self.assertEqual(self.dispatcher.pending(), 0)
+
+    def test_stop_releases_workers(self):
+        self.dispatcher.submit(NavRequest(1, 1))
+        self.dispatcher.stop()
+        self.assertIsNone(self.dispatcher._next_request(self.offline))
+
+
+if __name__ == '__main__':
+    unittest.main()
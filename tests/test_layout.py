@@ -0,0 +1,35 @@
+import unittest
+
+from iscout.layout import TemplateSearch, downsample, np, resize
+
+
+@unittest.skipIf(np is None, "Layout calibration needs NumPy")
+class TemplateSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.image = rng.random((60, 80))
+
+    def test_downsample_and_resize(self):
+        image = np.arange(16, dtype=float).reshape(4, 4)
+        self.assertEqual(downsample(image, 2).tolist(), [[2.5, 4.5], [10.5, 12.5]])
+        self.assertIs(downsample(image, 1), image)
+        self.assertEqual(resize(image, 2, 2).tolist(), [[5.0, 7.0], [13.0, 15.0]])
+        self.assertEqual(resize(image, 8, 8).shape, (8, 8))
+
+    def test_finds_a_template_cut_from_the_image(self):
+        template = self.image[20:32, 30:46]
+        score, left, top, width, height, scale = TemplateSearch(self.image).find(template, (0.5, 1.0))
+        self.assertAlmostEqual(score, 1.0, places=6)
+        self.assertEqual((left, top, width, height, scale), (30, 20, 16, 12, 1.0))
+
+    def test_matches_up_to_brightness_and_contrast(self):
+        template = self.image[5:15, 50:70] * 0.5 + 0.2
+        scores = TemplateSearch(self.image).scores(template)
+        self.assertEqual(scores.shape, (51, 61))
+        self.assertEqual(np.unravel_index(int(scores.argmax()), scores.shape), (5, 50))
+        self.assertFalse(TemplateSearch(self.image).scores(np.ones((8, 8))).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
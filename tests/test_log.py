@@ -0,0 +1,30 @@
+import logging
+import unittest
+
+from iscout.log import ROOT, SUBSYSTEMS, get_logger, parse_levels, set_levels
+
+
+class LevelsTest(unittest.TestCase):
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels("info,nav=debug"), {'': logging.INFO, 'nav': logging.DEBUG})
+        self.assertEqual(parse_levels(" adb = warning ; ui=ERROR "), {'adb': logging.WARNING, 'ui': logging.ERROR})
+        self.assertEqual(parse_levels(""), {})
+        with self.assertRaises(ValueError):
+            parse_levels("nav=chatty")
+
+    def test_set_levels(self):
+        loggers = [logging.getLogger(ROOT)] + [get_logger(s) for s in SUBSYSTEMS]
+        saved = [logger.level for logger in loggers]
+        def restore():
+            for logger, level in zip(loggers, saved):
+                logger.setLevel(level)
+        self.addCleanup(restore)
+        set_levels(parse_levels("warning,nav=debug"))
+        self.assertTrue(get_logger("nav").isEnabledFor(logging.DEBUG))
+        self.assertFalse(get_logger("adb").isEnabledFor(logging.INFO))
+        self.assertTrue(get_logger("adb").isEnabledFor(logging.WARNING))
+
+
+if __name__ == '__main__':
+    unittest.main()
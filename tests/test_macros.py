@@ -0,0 +1,130 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from iscout.macros import (Macro, MacroError, MacroPlayer, MacroStep, TouchDecoder, format_macro, macro_to_route_xml,
+                           parse_macro)
+from iscout.routes import DRAG, SHELL, TAP, WAIT_UNTIL, compile_route, parse_routes
+
+from fakes import FakeClock, FakeDevice
+
+MACRO_TEXT = """# iScoutTool macro v1
+@screen 1000x2000
+0 input tap 500 1700
+? dumpsys window windows ~ mCurrentFocus
+400 input tap 300 1100
+200 input swipe 100 1000 900 1000 250
+100 input keyevent 4
+"""
+
+
+class ParseMacroTest(unittest.TestCase):
+
+    def test_parse(self):
+        macro = parse_macro(MACRO_TEXT)
+        self.assertEqual(macro.screen_size, (1000, 2000))
+        self.assertEqual([s.delay_ms for s in macro.steps], [0, 400, 200, 100])
+        self.assertEqual(macro.steps[1], MacroStep(400, "input tap 300 1100", "dumpsys window windows", "mCurrentFocus"))
+        self.assertEqual(macro.steps[2].check, "")
+        self.assertEqual(macro.duration_ms, 700)
+
+    def test_round_trip(self):
+        self.assertEqual(format_macro(parse_macro(MACRO_TEXT)), MACRO_TEXT)
+
+    def test_errors(self):
+        for text in ("@screen big", "? ~ ready", "soon input tap 1 2", "100", "100   "):
+            with self.subTest(text=text), self.assertRaises(MacroError):
+                parse_macro(text)
+
+
+def touch(stamp, x, y):
+    """getevent -lt lines of a finger going down at axis position x,y"""
+    return [f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_TRACKING_ID   00000001",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_POSITION_X    {x:08x}",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_POSITION_Y    {y:08x}",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_SYN       SYN_REPORT           00000000"]
+
+
+def move(stamp, x, y):
+    return [f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_POSITION_X    {x:08x}",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_POSITION_Y    {y:08x}",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_SYN       SYN_REPORT           00000000"]
+
+
+def lift(stamp):
+    return [f"[{stamp:>12.6f}] /dev/input/event1: EV_ABS       ABS_MT_TRACKING_ID   ffffffff",
+            f"[{stamp:>12.6f}] /dev/input/event1: EV_SYN       SYN_REPORT           00000000"]
+
+
+class TouchDecoderTest(unittest.TestCase):
+
+    def setUp(self):
+        # Touch axes at twice the screen resolution
+        self.decoder = TouchDecoder((2160, 3840), (1080, 1920))
+
+    def decode(self, lines):
+        return [command for line in lines if (command := self.decoder.feed(line))]
+
+    def test_tap(self):
+        lines = touch(12.0, 1000, 2000) + move(12.05, 1010, 2006) + lift(12.1)
+        self.assertEqual(self.decode(lines), ["input tap 500 1000"])
+
+    def test_swipe(self):
+        lines = touch(12.0, 200, 2000) + move(12.1, 1000, 2000) + move(12.25, 1800, 2000) + lift(12.25)
+        self.assertEqual(self.decode(lines), ["input swipe 100 1000 900 1000 250"])
+
+    def test_ignores_other_lines(self):
+        self.assertEqual(self.decode(["add device 1: /dev/input/event1", "", *lift(1.0)]), [])
+
+
+class MacroToRouteTest(unittest.TestCase):
+
+    def test_route_replays_the_macro(self):
+        xml = macro_to_route_xml(parse_macro(MACRO_TEXT), "open dialog", compression=2.0)
+        route = parse_routes(ET.fromstring(f"<routes>{xml}</routes>"))["open dialog"]
+        self.assertEqual([s.kind for s in route.steps], [TAP, WAIT_UNTIL, TAP, DRAG, SHELL])
+        self.assertEqual(route.steps[0].at, (0.5, 0.85))
+        self.assertEqual([s.wait for s in route.steps if s.kind != WAIT_UNTIL], [0.2, 0.1, 0.05, 0.0])
+        self.assertEqual((route.steps[1].shell, route.steps[1].contains), ("dumpsys window windows", "mCurrentFocus"))
+        self.assertEqual(route.steps[3].duration_ms, 250)
+        plan = compile_route(route, {}, (1000, 2000))
+        self.assertEqual([p.command for p in plan.steps if p.command],
+                         ["input tap 500 1700", "input tap 300 1100", "input swipe 100 1000 900 1000 250",
+                          "input keyevent 4"])
+
+    def test_min_delay_and_quoting(self):
+        macro = Macro((100, 100), [MacroStep(0, "input tap 10 10"), MacroStep(5, 'input text "a&b"')])
+        xml = macro_to_route_xml(macro, 'r"1', min_delay_ms=50)
+        route = parse_routes(ET.fromstring(f"<routes>{xml}</routes>"))['r"1']
+        self.assertEqual(route.steps[0].wait, 0.05)
+        self.assertEqual(route.steps[1].shell, 'input text "a&b"')
+
+    def test_needs_a_screen_size(self):
+        with self.assertRaises(MacroError):
+            macro_to_route_xml(Macro(steps=[MacroStep(0, "input tap 1 1")]), "r")
+
+
+class MacroPlayerTest(unittest.TestCase):
+
+    def test_scales_to_another_screen(self):
+        device = FakeDevice({"dumpsys": "mCurrentFocus=Evony"})
+        MacroPlayer(parse_macro(MACRO_TEXT), compression=1000).play(device, (500, 1000))
+        self.assertEqual(device.inputs, ["input tap 250 850", "input tap 150 550", "input swipe 50 500 450 500 250",
+                                         "input keyevent 4"])
+
+    def test_delays(self):
+        player = MacroPlayer(parse_macro(MACRO_TEXT), compression=2.0, min_delay_ms=80)
+        self.assertEqual(player.delays_ms(), [0, 200, 100, 80])
+        with self.assertRaises(ValueError):
+            MacroPlayer(Macro(), compression=0)
+
+    def test_readiness_check_times_out(self):
+        clock = FakeClock()
+        player = MacroPlayer(parse_macro(MACRO_TEXT), compression=1000, check_timeout=0, sleep=clock.sleep)
+        device = FakeDevice({"dumpsys": "Window #0 (booting)"})
+        with self.assertRaises(MacroError):
+            player.play(device)
+        self.assertEqual(device.inputs, ["input tap 500 1700"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from iscout.device import ShellCall
+from iscout.metrics import ADB_BUCKETS_MS, MetricsCollector, MetricsSnapshot, percentile
+
+
+def call(elapsed, error=""):
+    return ShellCall("emulator-5554", "input tap 1 2", 0.0, elapsed, error)
+
+
+class PercentileTest(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        self.assertEqual(percentile([], 0.95), 0.0)
+        self.assertEqual(percentile([7.0], 0.95), 7.0)
+        samples = [float(n) for n in range(100, 0, -1)]
+        self.assertEqual(percentile(samples, 0.5), 51.0)
+        self.assertEqual(percentile(samples, 0.95), 96.0)
+        self.assertEqual(percentile(samples, 1.0), 100.0)
+
+
+class MetricsCollectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = MetricsCollector(window=3)
+
+    def test_histogram_buckets(self):
+        for elapsed in (0.001, 0.0035, 0.3, 2.0, 0.05):
+            self.metrics.observe_shell(call(elapsed))
+        histogram = dict(self.metrics.snapshot().adb_histogram)
+        self.assertEqual(len(histogram), len(ADB_BUCKETS_MS) + 1)
+        self.assertEqual({label: n for label, n in histogram.items() if n},
+                         {"<2 ms": 1, "<5 ms": 1, "<50 ms": 1, "<500 ms": 1, ">1000 ms": 1})
+
+    def test_window_and_counters(self):
+        self.metrics.observe_shell(call(1.0, error="closed"))
+        for _ in range(3):
+            self.metrics.observe_shell(call(0.01))
+        self.metrics.record_navigation(2.0)
+        self.metrics.record_navigation(9.0, ok=False)
+        self.metrics.record_reconnect()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual((snapshot.adb_commands, snapshot.adb_errors), (4, 1))
+        self.assertEqual(snapshot.adb_p95_ms, 10.0)         # The slow call fell out of the window
+        self.assertEqual((snapshot.navigations, snapshot.navigation_failures, snapshot.nav_p95_s), (2, 1, 2.0))
+        self.assertEqual(snapshot.nav_total_s, 11.0)
+        self.assertFalse(snapshot.degraded)
+        self.assertEqual(snapshot.summary(), "ADB p95 10 ms | jump 2.00/2.00 s | 1 reconnect")
+
+    def test_degraded(self):
+        self.assertTrue(MetricsSnapshot(adb_p95_ms=200.0).degraded)
+        self.assertTrue(MetricsSnapshot(nav_p95_s=5.0).degraded)
+        self.assertFalse(MetricsSnapshot().degraded)
+
+
+if __name__ == '__main__':
+    unittest.main()
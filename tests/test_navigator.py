@@ -0,0 +1,29 @@
+import unittest
+
+from iscout.navigator import MAX_SERVER, MAX_X, MAX_Y, NavigationError, Navigator, validate_coordinates
+from iscout.routes import RouteBook, load_routes
+
+from fakes import FakeDevice, no_sleep
+
+
+class NavigatorTest(unittest.TestCase):
+
+    def test_validate_coordinates(self):
+        validate_coordinates(1, 1, 1)
+        validate_coordinates(MAX_X, MAX_Y, MAX_SERVER)
+        for x, y, server in ((0, 1, 1), (1, MAX_Y + 1, 1), (1, 1, 0), (MAX_X + 1, 1, 1)):
+            with self.subTest(x=x, y=y, server=server), self.assertRaises(ValueError):
+                validate_coordinates(x, y, server)
+
+    def test_errors(self):
+        book = RouteBook(load_routes(""), {})
+        with self.assertRaises(NavigationError):
+            Navigator(None, book, (1080, 1920), sleep=no_sleep).navigate(100, 200, 5)
+        with self.assertRaises(NavigationError):
+            Navigator(FakeDevice(), book, (0, 0), sleep=no_sleep).navigate(100, 200, 5)
+        with self.assertRaises(ValueError):
+            Navigator(FakeDevice(), book, (1080, 1920), sleep=no_sleep).navigate(0, 200, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+
+from iscout.parser import EXCLUDE_BOX, parse_scout_file, parse_scout_text
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, 'Test', 'iScout.txt')
+
+
+class ParseScoutTextTest(unittest.TestCase):
+
+    def test_description_and_coordinates(self):
+        targets = parse_scout_text("Arctic Barbarians Lv5 502M\tFree\t 338 \t249 ")
+        self.assertEqual(len(targets), 1)
+        self.assertEqual(targets[0].target_type, "Arctic Barbarians Lv5 502M Free")
+        self.assertEqual((targets[0].x_coordinate, targets[0].y_coordinate), (338, 249))
+        self.assertFalse(targets[0].completed)
+
+    def test_coordinates_are_read_from_the_right(self):
+        targets = parse_scout_text("Lava Turtle\tLv1\textra\t120\t709")
+        self.assertEqual(targets[0].target_type, "Lava Turtle Lv1 extra")
+        self.assertEqual((targets[0].x_coordinate, targets[0].y_coordinate), (120, 709))
+
+    def test_skips_blank_short_and_malformed_lines(self):
+        text = "\n".join([
+            "",
+            "Header without tabs",
+            "Two\tfields",
+            "Bad\tFree\tx\t12",
+            "Good\tFree\t10\t20",
+        ])
+        targets = parse_scout_text(text)
+        self.assertEqual([(t.x_coordinate, t.y_coordinate) for t in targets], [(10, 20)])
+
+    def test_drops_coordinates_outside_the_map(self):
+        text = "A\t\t0\t10\nB\t\t1199\t10\nC\t\t10\t1201\nD\t\t1198\t1200"
+        self.assertEqual([t.target_type for t in parse_scout_text(text)], ["D"])
+
+    def test_drops_targets_inside_the_exclude_box(self):
+        text = "Inside\t\t600\t600\nEdge\t\t574\t626\nOutside\t\t573\t600"
+        self.assertEqual([t.target_type for t in parse_scout_text(text)], ["Outside"])
+        self.assertEqual(len(parse_scout_text(text, exclude_box=(0, 0, 0, 0))), 3)
+
+    def test_sample_report(self):
+        targets = parse_scout_file(SAMPLE)
+        self.assertGreater(len(targets), 30)
+        min_x, max_x, min_y, max_y = EXCLUDE_BOX
+        for t in targets:
+            self.assertFalse(min_x <= t.x_coordinate <= max_x and min_y <= t.y_coordinate <= max_y, t)
+        self.assertEqual(targets[0].target_type, "Arctic Barbarians Lv5 502M     Free")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.models import LocationPreset
+from iscout.presets import (load_presets, load_profiles, profile_files, profile_key, profile_keys, profile_path,
+                            save_presets)
+
+
+class ProfilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.path = os.path.join(self.directory, "locations.xml")
+
+    def test_keys_and_paths(self):
+        self.assertEqual(profile_key((1080, 1920)), "1080x1920")
+        self.assertEqual(profile_key(" 127.0.0.1:5555 "), "127.0.0.1_5555")
+        self.assertEqual(profile_key("SM-G960N"), "sm-g960n")
+        self.assertEqual(profile_keys((1080, 1920), ("127.0.0.1:5555", "", "SM-G960N")),
+                         ["127.0.0.1_5555", "sm-g960n", "1080x1920"])
+        self.assertEqual(profile_keys((0, 0)), [])
+        self.assertEqual(profile_path(self.path, (720, 1280)), os.path.join(self.directory, "locations-720x1280.xml"))
+
+    def test_save_and_load_profiles(self):
+        presets = {'NavBox': LocationPreset('NavBox', 0.1, 0.2, 0.3, 0.4, False),
+                   'Scroll': LocationPreset('Scroll', 0.5, 0.5, 0.9, 0.5, True)}
+        with self.assertLogs('iscout.nav', 'INFO'):
+            self.assertEqual(load_presets(self.path), {})
+            save_presets(self.path, presets)
+            save_presets(profile_path(self.path, (720, 1280)), presets, comment="Calibrated")
+            save_presets(profile_path(self.path, "SM-G960N"), {})
+            self.assertEqual(load_presets(self.path), presets)
+            self.assertEqual(load_profiles(self.path), {'720x1280': presets, 'sm-g960n': {}})
+        with open(profile_path(self.path, (720, 1280)), 'rb') as f:
+            self.assertIn(b"<!-- Calibrated -->\r\n", f.read())
+        self.assertEqual(sorted(profile_files(self.path)), ['720x1280', 'sm-g960n'])
+        self.assertEqual(profile_files(os.path.join(self.directory, "missing", "locations.xml")), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
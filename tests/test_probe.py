@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from iscout.probe import Signature, VerificationError, Verifier, load_signatures, rect_probe_points, save_signatures
+
+from fakes import FakeClock
+
+
+class FakeProbe:
+    """read_rect/read answer from a list of replies, repeating the last one"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.reads = 0
+
+    def read(self, points):
+        self.reads += 1
+        return self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+
+    def read_rect(self, left, top, width, height):
+        return self.read(None)
+
+
+class SignaturesTest(unittest.TestCase):
+
+    def test_rect_probe_points(self):
+        points = rect_probe_points(1000, 2000, 0.1, 0.1, 0.2, 0.2)
+        self.assertEqual(len(points), 8)
+        self.assertNotIn((150, 300), points)                # The centre holds the typed text
+        self.assertTrue(all(100 < x < 200 and 200 < y < 400 for x, y in points))
+
+    def test_round_trip_keeps_other_profiles(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        path = os.path.join(directory, "signatures.json")
+        self.assertEqual(load_signatures(path), {})
+        dialog = Signature(((1, 2), (3, 4)), ((0, 200, 0), (10, 20, 30)))
+        save_signatures(path, "SM-G960N 1080x1920", {'dialog': dialog})
+        save_signatures(path, "Pixel 720x1280", {})
+        self.assertEqual(load_signatures(path), {"SM-G960N 1080x1920": {'dialog': dialog}, "Pixel 720x1280": {}})
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"profiles": {"x": {"dialog": {}}}}')
+        with self.assertLogs('iscout', 'ERROR'):
+            self.assertEqual(load_signatures(path), {})
+
+
+class VerifierTest(unittest.TestCase):
+
+    POINTS = ((1, 1), (2, 2), (3, 3), (4, 4))
+    GREEN = ((0, 200, 0),) * 4
+    BLACK = ((0, 0, 0),) * 4
+
+    def confirm(self, replies, wait=0.5):
+        probe, clock = FakeProbe(replies), FakeClock()
+        verifier = Verifier(probe, {'dialog': Signature(self.POINTS, self.GREEN)})
+        with mock.patch('iscout.probe.time.monotonic', clock):
+            try:
+                verifier.confirm('dialog', self.POINTS, wait, clock.sleep)
+            finally:
+                self.probe, self.clock = probe, clock
+
+    def test_returns_once_matched_and_polls_between_reads(self):
+        self.confirm([self.BLACK, self.BLACK, self.GREEN])
+        self.assertEqual(self.probe.reads, 3)
+        self.assertEqual(self.clock.slept, [Verifier.POLL, Verifier.POLL])
+
+    def test_times_out(self):
+        with self.assertRaises(VerificationError):
+            self.confirm([self.BLACK])
+        self.assertGreaterEqual(sum(self.clock.slept), Verifier.MIN_TIMEOUT)
+        self.assertTrue(all(s == Verifier.POLL for s in self.clock.slept))
+
+    def test_unrecorded_signature_sleeps_the_wait(self):
+        probe, clock = FakeProbe([self.BLACK]), FakeClock()
+        Verifier(probe, {}).confirm('dialog', self.POINTS, 0.5, clock.sleep)
+        self.assertEqual((probe.reads, clock.slept), (0, [0.5]))
+
+    def test_record(self):
+        probe, clock = FakeProbe([self.GREEN]), FakeClock()
+        signatures = {}
+        Verifier(probe, signatures, record=True).confirm('dialog', self.POINTS, 0.5, clock.sleep)
+        self.assertEqual(signatures['dialog'], Signature(self.POINTS, self.GREEN))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from iscout.models import LocationPreset
+from iscout.navigator import Navigator
+from iscout.readback import (READOUT_PRESET, CoordinateReader, ReadbackError, load_templates, readout_rect,
+                             save_templates)
+from iscout.routes import RouteBook, load_routes
+
+from fakes import FakeDevice, no_sleep
+
+from test_probe import FakeProbe
+from test_routes import PRESETS, SCREEN
+
+READOUT = LocationPreset(READOUT_PRESET, 0.3, 0.95, 0.7, 0.98, False)
+
+
+def reader_showing(learnt: bool = False) -> CoordinateReader:
+    """A CoordinateReader that takes the probe's reply as its reading (no templates or NumPy needed)"""
+    reader = CoordinateReader.__new__(CoordinateReader)
+    reader.learnt = learnt
+    reader.misses = 0
+    reader.TIMEOUT = 0
+    reader.read = lambda frame: frame
+    return reader
+
+
+class ReadbackTest(unittest.TestCase):
+
+    def navigate(self, reader, readings, presets=None):
+        device = FakeDevice()
+        book = RouteBook(load_routes(""), presets or dict(PRESETS, **{READOUT_PRESET: READOUT}))
+        navigator = Navigator(device, book, SCREEN, sleep=no_sleep, reader=reader)
+        with mock.patch('iscout.navigator.probe_for', return_value=FakeProbe(readings)):
+            landed = navigator.navigate(100, 200, 5)
+        return landed, device
+
+    def test_confirmed_arrival(self):
+        reader = reader_showing()
+        landed, _ = self.navigate(reader, [(100, 200)])
+        self.assertEqual(landed, (100, 200))
+        self.assertEqual(reader.misses, 0)
+
+    def test_generic_font_mismatch_is_logged_not_retried(self):
+        reader = reader_showing()
+        with self.assertLogs('iscout.nav', 'WARNING') as logs:
+            landed, device = self.navigate(reader, [(101, 200)])
+        self.assertIsNone(landed)
+        self.assertEqual(reader.misses, 1)
+        _, confirmed = self.navigate(reader_showing(), [(100, 200)])
+        self.assertEqual(device.inputs, confirmed.inputs)     # The route ran once, as for a confirmed jump
+        self.assertIn("100,200", logs.output[0])
+
+    def test_learnt_digits_retry_a_wrong_jump_once(self):
+        reader = reader_showing(learnt=True)
+        landed, device = self.navigate(reader, [(101, 200), (100, 200)])
+        self.assertEqual(landed, (100, 200))
+        self.assertEqual(reader.misses, 0)
+        _, once = self.navigate(reader_showing(learnt=True), [(100, 200)])
+        self.assertEqual(device.inputs, once.inputs * 2)
+
+    def test_learnt_digits_give_up_after_the_retry(self):
+        reader = reader_showing(learnt=True)
+        with self.assertLogs('iscout.nav', 'WARNING') as logs:
+            landed, device = self.navigate(reader, [(101, 200)])
+        self.assertIsNone(landed)
+        self.assertEqual(reader.misses, 2)
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("jumping again", logs.output[0])
+
+    def test_misses_switch_readback_off(self):
+        reader = reader_showing()
+        for _ in range(CoordinateReader.MAX_MISSES):
+            self.navigate(reader, [None])
+        self.assertFalse(reader.enabled)
+        probe = FakeProbe([(100, 200)])
+        navigator = Navigator(FakeDevice(), RouteBook(load_routes(""), dict(PRESETS, **{READOUT_PRESET: READOUT})),
+                              SCREEN, sleep=no_sleep, reader=reader)
+        with mock.patch('iscout.navigator.probe_for', return_value=probe):
+            self.assertIsNone(navigator.navigate(100, 200, 5))
+        self.assertEqual(probe.reads, 0)
+
+    def test_no_readout_preset_no_readback(self):
+        reader = reader_showing()
+        landed, _ = self.navigate(reader, [(100, 200)], presets=PRESETS)
+        self.assertIsNone(landed)
+        self.assertEqual(reader.misses, 0)
+
+
+class TemplatesTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.path = os.path.join(directory, "digits.txt")
+
+    def test_round_trip(self):
+        self.assertEqual(load_templates(self.path), {})
+        templates = {'1': [".#.", "##.", ".#."], '0': ["###", "#.#", "###"]}
+        save_templates(self.path, templates)
+        self.assertEqual(load_templates(self.path), templates)
+
+    def test_bad_row(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("[1]\n.#.\n.x.\n")
+        with self.assertRaises(ReadbackError):
+            load_templates(self.path)
+
+    def test_readout_rect(self):
+        self.assertIsNone(readout_rect(PRESETS, SCREEN))
+        self.assertEqual(readout_rect({READOUT_PRESET: READOUT}, (1000, 2000)), (300, 1900, 400, 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
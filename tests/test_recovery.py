@@ -0,0 +1,166 @@
+import unittest
+
+from iscout.recovery import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, DeviceUnavailable, Recovery, is_idempotent
+
+from fakes import FakeClock, no_sleep
+
+
+class FakeConnection:
+    """ConnectionManager stand-in: each recovery layer hands out a new handle or fails"""
+
+    def __init__(self, transport_ok: bool = True, server_ok: bool = True):
+        self.transport_ok = transport_ok
+        self.server_ok = server_ok
+        self.calls = []
+
+    def reconnect_transport(self, serial):
+        self.calls.append('transport')
+        if not self.transport_ok:
+            raise ConnectionError("adb connect failed")
+        return 'transport handle'
+
+    def restart_server(self, serial):
+        self.calls.append('server')
+        if not self.server_ok:
+            raise ConnectionError("adb server did not start")
+        return 'server handle'
+
+    def mark_lost(self, message):
+        self.calls.append('lost')
+
+
+class FakeHandle:
+    serial = 'emulator-5554'
+
+    def __init__(self, adb='first handle'):
+        self.adb = adb
+
+
+class Command:
+    """fn for Recovery.call: fails on the handles in failing, records every call"""
+
+    def __init__(self, failing=('first handle',)):
+        self.failing = set(failing)
+        self.handles = []
+
+    def __call__(self, adb):
+        self.handles.append(adb)
+        if adb in self.failing:
+            raise ConnectionResetError("connection reset")
+        return f"ok on {adb}"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_states(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(reset_timeout=5, max_timeout=12, clock=clock)
+        breaker.check()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(DeviceUnavailable):
+            breaker.check()
+        clock.now += 5
+        breaker.check()                 # Cool-down over: one trial
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(DeviceUnavailable):
+            breaker.check()             # Only one trial at a time
+        breaker.record_failure()        # Trial failed: twice the cool-down
+        clock.now += 9
+        with self.assertRaises(DeviceUnavailable):
+            breaker.check()
+        clock.now += 1
+        breaker.check()
+        breaker.record_failure()
+        clock.now += 12                 # Capped at max_timeout
+        breaker.check()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        clock.now += 5                  # Back to the first cool-down
+        breaker.check()
+
+
+class RecoveryTest(unittest.TestCase):
+
+    def recovery(self, connection):
+        return Recovery(connection, CircuitBreaker(clock=FakeClock()), sleep=no_sleep, rng=lambda: 0.5)
+
+    def test_backoff_doubles(self):
+        recovery = self.recovery(FakeConnection())
+        self.assertEqual([recovery.backoff(n) for n in (1, 2, 3)], [0.02, 0.04, 0.08])
+
+    def test_retry_on_the_same_connection(self):
+        command = Command()
+        attempts = iter([True, False])
+        def flaky(adb):
+            command.handles.append(adb)
+            if next(attempts):
+                raise ConnectionResetError("once")
+            return "ok"
+        connection = FakeConnection()
+        self.assertEqual(self.recovery(connection).call(FakeHandle(), flaky), "ok")
+        self.assertEqual(connection.calls, [])
+
+    def test_transport_reconnect(self):
+        connection, command, device = FakeConnection(), Command(), FakeHandle()
+        self.assertEqual(self.recovery(connection).call(device, command), "ok on transport handle")
+        self.assertEqual(command.handles, ['first handle'] * 3 + ['transport handle'])
+        self.assertEqual(connection.calls, ['transport'])
+        self.assertEqual(device.adb, 'transport handle')
+
+    def test_server_restart(self):
+        connection, command = FakeConnection(transport_ok=False), Command()
+        self.assertEqual(self.recovery(connection).call(FakeHandle(), command), "ok on server handle")
+        self.assertEqual(connection.calls, ['transport', 'server'])
+
+    def test_device_down_opens_the_breaker(self):
+        connection = FakeConnection()
+        recovery = self.recovery(connection)
+        command = Command(failing=('first handle', 'transport handle', 'server handle'))
+        with self.assertRaises(ConnectionResetError):
+            recovery.call(FakeHandle(), command)
+        self.assertEqual(connection.calls, ['transport', 'server', 'lost'])
+        self.assertEqual(recovery.breaker.state, OPEN)
+        with self.assertRaises(DeviceUnavailable):
+            recovery.call(FakeHandle(), command)
+        self.assertEqual(len(command.handles), 5)
+
+    def test_half_open_trial_is_a_single_attempt(self):
+        connection = FakeConnection()
+        recovery = self.recovery(connection)
+        recovery.breaker.record_failure()
+        recovery.breaker.clock.now += recovery.breaker.reset_timeout
+        command = Command()
+        with self.assertRaises(ConnectionResetError):
+            recovery.call(FakeHandle(), command)
+        self.assertEqual((len(command.handles), connection.calls, recovery.breaker.state), (1, [], OPEN))
+
+    def test_input_commands_are_never_sent_twice(self):
+        connection, command, device = FakeConnection(), Command(), FakeHandle()
+        with self.assertRaises(ConnectionResetError):
+            self.recovery(connection).call(device, command, idempotent=False)
+        self.assertEqual(command.handles, ['first handle'])
+        self.assertEqual(connection.calls, ['transport'])
+        self.assertEqual(device.adb, 'transport handle')
+
+    def test_input_command_on_a_dead_device(self):
+        connection = FakeConnection(transport_ok=False, server_ok=False)
+        recovery = self.recovery(connection)
+        command = Command()
+        with self.assertRaises(ConnectionError):
+            recovery.call(FakeHandle(), command, idempotent=False)
+        self.assertEqual(len(command.handles), 1)
+        self.assertEqual(connection.calls, ['transport', 'server', 'lost'])
+        self.assertEqual(recovery.breaker.state, OPEN)
+
+    def test_idempotent_commands(self):
+        for command in ("echo ok", "getprop ro.product.model", "wm size", "getevent -pl", "screencap > /x && stat"):
+            self.assertTrue(is_idempotent(command), command)
+        for command in ("input tap 1 2", "input text '600'", "input swipe 1 2 3 4 300", "input keyevent 4",
+                        "am start -n x", "echoing", "rm /sdcard/x"):
+            self.assertFalse(is_idempotent(command), command)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from iscout.models import LocationPreset
+from iscout.routes import (DRAG, TAP, TEXT, WAIT, Route, RouteBook, RouteError, Step, compile_route, load_routes,
+                           parse_routes, with_waits)
+
+from fakes import FakeDevice, FakeClock
+
+SCREEN = (1000, 2000)
+PRESETS = {
+    'NavBox': LocationPreset('NavBox', 0.4, 0.8, 0.6, 0.9, False),
+    'NavServer': LocationPreset('NavServer', 0.2, 0.4, 0.8, 0.5, False),
+    'NavX': LocationPreset('NavX', 0.2, 0.5, 0.4, 0.6, False),
+    'NavY': LocationPreset('NavY', 0.6, 0.5, 0.8, 0.6, False),
+    'NavGo': LocationPreset('NavGo', 0.3, 0.6, 0.7, 0.7, False),
+    'Scroll': LocationPreset('Scroll', 0.5, 0.8, 0.5, 0.2, True),
+}
+
+
+def routes_from(xml: str):
+    return parse_routes(ET.fromstring(f"<routes>{xml}</routes>"))
+
+
+class ParseRoutesTest(unittest.TestCase):
+
+    def test_steps_and_attributes(self):
+        route = routes_from("""
+            <route name="r">
+                <tap preset="NavBox" wait="0.4" verify="dialog" probe="NavGo"/>
+                <wait seconds="0.2" when="skip_server"/>
+                <text preset="NavX" value="{x}" wait="0.1" when="!skip_server" optional="true"/>
+                <drag from="0.1,0.2" to="0.3,0.4" duration="500"/>
+                <waitUntil shell="dumpsys window" contains="Focus" timeout="1.5" poll="0.05"/>
+            </route>""")['r']
+        tap, wait, text, drag, until = route.steps
+        self.assertEqual((tap.kind, tap.preset, tap.wait, tap.verify, tap.probe), (TAP, 'NavBox', 0.4, 'dialog', 'NavGo'))
+        self.assertEqual((wait.kind, wait.wait, wait.when), (WAIT, 0.2, 'skip_server'))
+        self.assertTrue(text.optional)
+        self.assertEqual((drag.at, drag.to, drag.duration_ms), ((0.1, 0.2), (0.3, 0.4), 500))
+        self.assertEqual((until.shell, until.contains, until.timeout, until.poll), ("dumpsys window", "Focus", 1.5, 0.05))
+
+    def test_errors(self):
+        for xml in ('<route><tap preset="A"/></route>',
+                    '<route name="r"><jump/></route>',
+                    '<route name="r"><tap/></route>',
+                    '<route name="r"><drag preset=""/></route>',
+                    '<route name="r"><shell/></route>',
+                    '<route name="r"><tap preset="A" wait="soon"/></route>',
+                    '<route name="r"><tap at="1.5,0.5"/></route>'):
+            with self.subTest(xml=xml), self.assertRaises(RouteError):
+                routes_from(xml)
+
+    def test_defaults_fill_in_missing_routes(self):
+        routes = load_routes("does-not-exist.xml")
+        self.assertEqual(sorted(routes), ['navigate', 'view_enemy'])
+
+
+class CompileRouteTest(unittest.TestCase):
+
+    def test_taps_preset_centres(self):
+        plan = compile_route(Route('r', [Step(TAP, 'NavBox'), Step(TEXT, 'NavX', value='{x}')]), PRESETS, SCREEN)
+        self.assertEqual([p.command for p in plan.steps], ["input tap 500 1700", "input tap 300 1100"])
+
+    def test_click_and_drag_preset_and_drag_points_swipe(self):
+        plan = compile_route(Route('r', [Step(TAP, 'Scroll'), Step(DRAG, at=(0.1, 0.5), to=(0.9, 0.5), duration_ms=250)]),
+                             PRESETS, SCREEN)
+        self.assertEqual([p.command for p in plan.steps],
+                         ["input swipe 500 1600 500 400 300", "input swipe 100 1000 900 1000 250"])
+
+    def test_missing_presets(self):
+        plan = compile_route(Route('r', [Step(TAP, 'Missing', optional=True), Step(TAP, 'NavGo')]), PRESETS, SCREEN)
+        self.assertEqual(len(plan.steps), 1)
+        with self.assertRaises(RouteError):
+            compile_route(Route('r', [Step(TAP, 'Missing')]), PRESETS, SCREEN)
+
+    def test_out_of_range_preset(self):
+        presets = {'Bad': LocationPreset('Bad', 0.5, 0.5, 1.5, 0.6, False)}
+        with self.assertRaises(RouteError):
+            compile_route(Route('r', [Step(TAP, 'Bad')]), presets, SCREEN)
+
+    def test_verified_steps_get_probe_points(self):
+        plan = compile_route(Route('r', [Step(TAP, 'NavBox', verify='dialog', probe='NavGo'), Step(TAP, 'NavGo')]),
+                             PRESETS, SCREEN)
+        self.assertTrue(plan.steps[0].probe_points)
+        self.assertEqual(plan.steps[1].probe_points, ())
+
+
+class PlanRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.book = RouteBook(load_routes(""), PRESETS)
+        self.clock = FakeClock()
+
+    def test_navigate_types_coordinates(self):
+        device = FakeDevice()
+        entries = []
+        self.book.plan('navigate', SCREEN).run(device, {'x': 338, 'y': 249, 'server': 12, 'skip_server': False},
+                                               self.clock.sleep, entries.append)
+        typed = [c for c in device.inputs if c.startswith("input text")]
+        self.assertEqual(typed, ["input text '12'", "input text '338'", "input text '249'"])
+        self.assertEqual(device.inputs[0], "input tap 500 1700")
+        self.assertEqual(device.inputs[-1], "input tap 500 1300")
+        self.assertEqual(entries, [True, False])
+
+    def test_skip_server_leaves_the_server_field(self):
+        device = FakeDevice()
+        self.book.plan('navigate', SCREEN).run(device, {'x': 1, 'y': 2, 'server': 12, 'skip_server': True},
+                                               self.clock.sleep)
+        self.assertNotIn("input text '12'", device.inputs)
+        self.assertIn(0.2, self.clock.slept)
+
+    def test_wait_until_polls_then_times_out(self):
+        route = routes_from('<route name="r"><waitUntil shell="getprop x" contains="ready" timeout="0"/></route>')
+        plan = compile_route(route['r'], PRESETS, SCREEN)
+        plan.run(FakeDevice({"getprop": "ready"}), {}, self.clock.sleep)
+        with self.assertRaises(RouteError):
+            plan.run(FakeDevice({"getprop": "booting"}), {}, self.clock.sleep)
+
+
+class WithWaitsTest(unittest.TestCase):
+
+    def test_replaces_only_the_given_steps(self):
+        route = Route('r', [Step(TAP, 'NavBox', wait=0.4), Step(WAIT, wait=0.2), Step(TAP, 'NavGo', wait=0.1)])
+        tuned = with_waits(route, {0: 0.15, 2: 0.05})
+        self.assertEqual([s.wait for s in tuned.steps], [0.15, 0.2, 0.05])
+        self.assertEqual([s.wait for s in route.steps], [0.4, 0.2, 0.1])
+        self.assertIs(tuned.steps[1], route.steps[1])
+
+
+class RouteBookTest(unittest.TestCase):
+
+    def test_plans_are_cached_per_resolution(self):
+        book = RouteBook(load_routes(""), PRESETS)
+        self.assertIs(book.plan('navigate', SCREEN), book.plan('navigate', SCREEN))
+        self.assertIsNot(book.plan('navigate', SCREEN), book.plan('navigate', (500, 1000)))
+        with self.assertRaises(RouteError):
+            book.plan('nowhere', SCREEN)
+
+    def test_calibrated_delays_apply_to_their_profile(self):
+        book = RouteBook(load_routes(""), PRESETS)
+        before = book.plan('navigate', SCREEN, 'model 1000x2000')
+        book.set_delays('model 1000x2000', 'navigate', {0: 0.05})
+        tuned = book.plan('navigate', SCREEN, 'model 1000x2000')
+        self.assertIsNot(before, tuned)
+        self.assertEqual(tuned.steps[0].step.wait, 0.05)
+        self.assertEqual(book.plan('navigate', SCREEN, 'other').steps[0].step.wait, 0.4)
+
+    def test_layouts_by_device_then_resolution(self):
+        moved = {'NavGo': LocationPreset('NavGo', 0.1, 0.1, 0.3, 0.2, False)}
+        book = RouteBook(load_routes(""), PRESETS)
+        book.set_layout(SCREEN, moved)
+        self.assertEqual(book.layout_key(SCREEN), '1000x2000')
+        self.assertEqual(book.plan('navigate', SCREEN).steps[-1].command, "input tap 200 300")
+        book.set_layout('127.0.0.1:5555', PRESETS)
+        self.assertEqual(book.layout_key(SCREEN, ('127.0.0.1:5555',)), '127.0.0.1_5555')
+        self.assertEqual(book.plan('navigate', SCREEN, devices=('127.0.0.1:5555',)).steps[-1].command,
+                         "input tap 500 1300")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.models import ScoutTarget
+from iscout.session import SessionStore
+
+TARGETS = [ScoutTarget("Arctic Barbarians Lv5 502M", 338, 249),
+           ScoutTarget("Lava Turtle Lv1", 120, 709),
+           ScoutTarget("Golden Goblin", 552, 606)]
+
+
+class SessionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'iScoutSession.db')
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def store(self) -> SessionStore:
+        store = SessionStore(self.path, batch_delay=0)
+        self.stores.append(store)
+        return store
+
+    def test_round_trip(self):
+        store = self.store()
+        session_id = store.start(TARGETS, 77, "report text")
+        store.set_completed(1, True)
+        store.set_completed(2, True)
+        store.set_completed(2, False)
+        self.assertTrue(store.flush())
+
+        session = self.store().last_session()
+        self.assertEqual((session.id, session.server, session.report), (session_id, 77, "report text"))
+        self.assertEqual([(t.target_type, t.x_coordinate, t.y_coordinate) for t in session.targets],
+                         [(t.target_type, t.x_coordinate, t.y_coordinate) for t in TARGETS])
+        self.assertEqual([t.completed for t in session.targets], [False, True, False])
+
+    def test_resumed_session_takes_further_changes(self):
+        store = self.store()
+        store.start(TARGETS, 77, "report")
+        store.close()
+        resumed = self.store()
+        resumed.last_session()
+        resumed.set_completed(0, True)
+        resumed.flush()
+        self.assertTrue(self.store().last_session().targets[0].completed)
+
+    def test_new_report_replaces_the_last_session(self):
+        store = self.store()
+        first = store.start(TARGETS, 77, "first")
+        second = store.start(TARGETS[:1], 78, "second")
+        store.flush()
+        self.assertGreater(second, first)
+        session = self.store().last_session()
+        self.assertEqual((session.id, session.report, len(session.targets)), (second, "second", 1))
+
+    def test_clear(self):
+        store = self.store()
+        store.start(TARGETS, 77, "report")
+        store.clear()
+        store.set_completed(0, True)    # No current session: ignored
+        store.flush()
+        self.assertIsNone(self.store().last_session())
+
+    def test_history_across_sessions(self):
+        store = self.store()
+        store.start(TARGETS, 77, "monday")
+        store.set_completed(1, True)
+        store.start(TARGETS, 77, "tuesday")
+        store.set_completed(1, True)
+        store.start(TARGETS, 78, "other server")
+        store.set_completed(1, True)
+        store.flush()
+        history = store.history(77, 120, 709)
+        self.assertEqual([completed for _, completed in history], [True, True])
+        self.assertEqual(history, sorted(history))
+        self.assertEqual(store.history(77, 1, 1), [])
+
+    def test_old_sessions_are_pruned(self):
+        store = self.store()
+        store.KEEP_SESSIONS = 2
+        for day in range(4):
+            store.start(TARGETS, 77, f"day {day}")
+            store.set_completed(0, True)
+        store.flush()
+        self.assertEqual(len(store.history(77, 338, 249)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
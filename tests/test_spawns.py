@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout import spawns as spawns_module
+from iscout.models import ScoutTarget
+from iscout.spawns import DEDUPE_WINDOW, SpawnHistory, parse_target_type
+
+DAY = 86400
+T0 = 1_700_000_000
+
+
+class ParseTargetTypeTest(unittest.TestCase):
+
+    def test_examples(self):
+        self.assertEqual(parse_target_type("Arctic Barbarians Lv5 502M  Free"), ("Arctic Barbarians", 5, 502e6))
+        self.assertEqual(parse_target_type("Lava Turtle   Lv1"), ("Lava Turtle", 1, 0.0))
+        self.assertEqual(parse_target_type("Golden Goblin (Free)"), ("Golden Goblin", 0, 0.0))
+        self.assertEqual(parse_target_type("Behemoth 1.5B"), ("Behemoth", 0, 1.5e9))
+
+
+class SpawnHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history = SpawnHistory(os.path.join(self.directory, 'SpawnHistory'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_record_skips_repeats_within_the_window(self):
+        targets = [ScoutTarget("Arctic Barbarians Lv5 502M", 338, 249), ScoutTarget("Lava Turtle Lv1", 120, 709)]
+        self.assertEqual(self.history.record(targets, 77, when=T0), 2)
+        self.assertEqual(self.history.record(targets, 77, when=T0 + 60), 0)
+        self.assertEqual(self.history.record(targets + [ScoutTarget("Lava Turtle Lv2", 120, 709)], 77, when=T0 + 120), 1)
+        self.assertEqual(self.history.record(targets, 78, when=T0 + 180), 2)
+        self.assertEqual(self.history.record(targets, 77, when=T0 + DEDUPE_WINDOW + 1), 2)
+        self.assertEqual(self.history.record([targets[0], targets[0]], 79, when=T0), 1)
+        self.assertEqual(self.history.kinds(), ["Arctic Barbarians", "Lava Turtle"])
+
+    def test_dedupe_reads_across_tail_blocks(self):
+        targets = [ScoutTarget("Lava Turtle Lv1", x, 10) for x in range(1, 301)]
+        self.history.record(targets, 77, when=T0)
+        old_rows = spawns_module.TAIL_ROWS
+        spawns_module.TAIL_ROWS = 7
+        try:
+            self.assertEqual(self.history.record(targets, 77, when=T0 + 10), 0)
+        finally:
+            spawns_module.TAIL_ROWS = old_rows
+
+    def test_torn_append_is_ignored(self):
+        self.history.record([ScoutTarget("Lava Turtle Lv1", 1, 2)], 77, when=T0)
+        with open(os.path.join(self.history.directory, 'time.bin'), 'ab') as f:
+            f.write(b'\x01\x02')    # Half a row, as after a crash
+        self.assertEqual(self.history.record([ScoutTarget("Lava Turtle Lv1", 1, 2)], 77, when=T0 + 1), 0)
+
+    def test_append_after_a_torn_append_keeps_rows_aligned(self):
+        self.history.record([ScoutTarget("Lava Turtle Lv1", 1, 2)], 77, when=T0)
+        with open(os.path.join(self.history.directory, 'time.bin'), 'ab') as f:
+            f.write((T0 + 5).to_bytes(4, 'little'))     # A whole time value, but no other column
+        self.assertEqual(self.history.record([ScoutTarget("Golden Goblin", 3, 4)], 77, when=T0 + DAY), 1)
+        self.assertEqual(list(self.history._read('time', 0, 2)), [T0, T0 + DAY])
+        self.assertEqual(list(self.history._read('x', 0, 2)), [1, 3])
+        self.assertEqual(self.history._complete_rows(), 2)
+
+
+@unittest.skipIf(spawns_module.np is None, "NumPy not installed")
+class SpawnQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history = SpawnHistory(os.path.join(self.directory, 'SpawnHistory'))
+        for day in range(3):
+            self.history.record([ScoutTarget("Arctic Barbarians Lv5 502M", 338, 249),
+                                 ScoutTarget("Arctic Barbarians Lv5 502M", 340 + day, 250),
+                                 ScoutTarget("Lava Turtle Lv1", 1, 1)], 77, when=T0 + day * DAY)
+        self.history.record([ScoutTarget("Arctic Barbarians Lv4 300M", 900, 900)], 78, when=T0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_select(self):
+        spawns = self.history.load()
+        self.assertEqual(len(spawns), 10)
+        self.assertEqual(int(spawns.select(server=77).sum()), 9)
+        self.assertEqual(int(spawns.select(name="arctic").sum()), 7)
+        self.assertEqual(int(spawns.select(name="arctic", level=5).sum()), 6)
+        self.assertEqual(int(spawns.select(since=T0 + DAY).sum()), 6)
+        self.assertEqual(int(spawns.select(server=77, until=T0 + 1).sum()), 3)
+
+    def test_heatmap(self):
+        spawns = self.history.load()
+        grid = spawns.heatmap(spawns.select(server=77))
+        self.assertEqual(grid.shape, (1200, 1198))
+        self.assertEqual(int(grid.sum()), 9)
+        self.assertEqual(int(grid[249 - 1, 338 - 1]), 3)
+        self.assertEqual(int(grid[0, 0]), 3)
+        binned = spawns.heatmap(cell=100)
+        self.assertEqual(binned.shape, (12, 12))
+        self.assertEqual(int(binned[2, 3]), 6)
+
+    def test_recurrence(self):
+        spawns = self.history.load()
+        stats = spawns.recurrence(spawns.select(server=77, name="arctic"))
+        self.assertEqual(len(stats), 1)
+        barbarians = stats[0]
+        self.assertEqual((barbarians.name, barbarians.level, barbarians.sightings), ("Arctic Barbarians", 5, 6))
+        self.assertEqual((barbarians.days, barbarians.locations), (3, 4))
+        self.assertAlmostEqual(barbarians.repeat_rate, 1 - 4 / 6)
+        self.assertEqual((barbarians.first_seen, barbarians.last_seen), (T0, T0 + 2 * DAY))
+        self.assertEqual(barbarians.hotspot, (326, 226))
+        self.assertEqual(spawns.recurrence(spawns.select(server=1)), [])
+
+    def test_load_is_cached_until_the_files_grow(self):
+        first = self.history.load()
+        self.assertIs(self.history.load(), first)
+        self.history.record([ScoutTarget("Lava Turtle Lv1", 5, 5)], 77, when=T0 + 10 * DAY)
+        self.assertEqual(len(self.history.load()), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED = ('sqlite3', 'http.server', 'subprocess', 'iscout.api', 'iscout.session', 'iscout.audio')
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_engine_import_defers_heavy_modules(self):
+        # A fresh interpreter, since this one has loaded everything the other tests use
+        code = ("import sys, iscout.engine, iscout.cli; "
+                f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))")
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, cwd=ROOT,
+                                check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from iscout.device import ShellCall
+from iscout.trace import ADB, NAV, Tracer
+
+
+class TracerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer(capacity=10)
+
+    def spans(self):
+        return [e for e in self.tracer.chrome_events() if e['ph'] == 'X']
+
+    def test_span(self):
+        with self.tracer.span("navigate", NAV, x=600, y=600):
+            pass
+        with self.assertRaises(ValueError):
+            with self.tracer.span("step"):
+                raise ValueError("no preset")
+        navigate, step = self.spans()
+        self.assertEqual((navigate['name'], navigate['cat'], navigate['args']), ("navigate", NAV, {'x': 600, 'y': 600}))
+        self.assertEqual(step['args'], {'error': "no preset"})
+        self.assertGreaterEqual(navigate['dur'], 0)
+        names = [e for e in self.tracer.chrome_events() if e['ph'] == 'M']
+        self.assertEqual([e['args']['name'] for e in names], [threading.current_thread().name])
+
+    def test_observe_shell_and_disable(self):
+        self.tracer.observe_shell(ShellCall("emulator-5554", "input tap 1 2", 1.0, 0.25, error="closed"))
+        self.tracer.enabled = False
+        with self.tracer.span("navigate"):
+            pass
+        [span] = self.spans()
+        self.assertEqual((span['name'], span['cat'], span['ts'], span['dur']), ("input tap 1 2", ADB, 1e6, 250000.0))
+        self.assertEqual(span['args'], {'serial': "emulator-5554", 'error': "closed"})
+
+    def test_ring_buffer_and_export(self):
+        for i in range(15):
+            self.tracer.complete(f"span {i}", NAV, i, 1.0)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        path = os.path.join(directory, "trace.json")
+        self.assertEqual(self.tracer.export(path), 10)
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual([e['name'] for e in events if e['ph'] == 'X'][0], "span 5")
+
+
+if __name__ == '__main__':
+    unittest.main()
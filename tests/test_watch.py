@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from iscout.watch import FileWatcher
+
+
+class FileWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.path = os.path.join(self.directory, "locations.xml")
+        self.reported = []
+        # Not started: the tests call poll() the way the thread would
+        self.watcher = FileWatcher(lambda: [self.path], self.reported.append)
+
+    def write(self, text, mtime):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_reports_once_settled(self):
+        self.assertEqual(self.watcher.poll(), [])
+        self.write("<a/>", 1000)
+        self.assertEqual(self.watcher.poll(), [])           # Just appeared: look again
+        self.write("<ab/>", 1001)
+        self.assertEqual(self.watcher.poll(), [])           # Still being written
+        self.assertEqual(self.watcher.poll(), [self.path])
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.reported, [[self.path]])
+
+    def test_reports_removal_and_ignores_a_reverted_change(self):
+        self.write("<a/>", 1000)
+        self.watcher.poll()
+        self.watcher.poll()
+        self.write("<b/>", 1001)
+        self.watcher.poll()
+        self.write("<a/>", 1000)                          # Back to what was last reported
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [])
+        os.remove(self.path)
+        self.watcher.poll()
+        self.assertEqual(self.watcher.poll(), [self.path])
+        self.assertEqual(self.reported, [[self.path], [self.path]])
+
+
+if __name__ == '__main__':
+    unittest.main()